@@ -206,6 +206,11 @@ def lower(value):
     return str(value).lower() if value else value
 
 
+def upper_batch(values):
+    """大文字に変換（batch_function 用: マッチした全値のリストを受け取り同じ長さのリストを返す）"""
+    return [str(v).upper() if v else v for v in values]
+
+
 # =============================================================================
 # サンプル動作確認用
 # =============================================================================
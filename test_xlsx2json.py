@@ -4009,7 +4009,7 @@ class TestJSONOutput:
                 [rule], prefix="json"
             )
             # 無効なルールは無視されるか、エラーハンドリングされる
-            assert isinstance(transform_rules, dict)
+            assert isinstance(transform_rules, xlsx2json.RuleIndex) and dict(transform_rules) == {}
 
     def test_prefix_customization(self, temp_dir):
         """プレフィックスのカスタマイズテスト"""
@@ -10803,6 +10803,2009 @@ def test_find_matching_paths_nested_arrays_with_partial_wildcards():
     values = [get_nested_value(data, p) for p in matches]
     assert sorted(values) == ["alpha", "beta", "gamma"]
 
+
+def test_sparse_load_mode_matches_full_and_skips_unreferenced_cells(tmp_path: Path):
+    """疎読込モードは通常読込と同一結果を返し、未参照のシート/列のセルを構築しない。"""
+    builder = SampleWorkbookBuilder()
+    builder._table1()
+    builder._list1()
+    builder._tree1()
+    # 未命名の作業データ（別シート + 参照範囲から離れた列）
+    scratch = builder.wb.create_sheet("scratch")
+    for r in range(1, 301):
+        scratch.cell(row=r, column=1, value=f"s{r}")
+    for r in range(1, 51):
+        builder.ws.cell(row=r, column=60, value=f"far{r}")
+    xlsx_path = tmp_path / "sparse.xlsx"
+    builder.wb.save(xlsx_path)
+
+    full = xlsx2json.parse_named_ranges_with_prefix(xlsx_path, prefix="json")
+    sparse = xlsx2json.parse_named_ranges_with_prefix(xlsx_path, prefix="json", load_mode="sparse")
+    assert sparse == full
+
+    swb = xlsx2json.load_workbook_sparse(xlsx_path)
+    assert swb.sheetnames == ["Sheet1", "scratch"]
+    assert swb["scratch"]._cells == {}
+    assert swb["scratch"].max_row == 300
+    ws = swb["Sheet1"]
+    assert ws.cell(row=1, column=60).value is None
+    assert ws["B2"].value == "A1"
+    assert [c.value for c in ws["B2:D2"][0]] == ["A1", "B1", "C1"]
+    # 罫線は通常読込と同じ判定になる
+    full_ws = load_workbook(xlsx_path, data_only=True)["Sheet1"]
+    for side in ("top", "left", "bottom", "right"):
+        assert xlsx2json.has_border(ws, 2, 2, side) == xlsx2json.has_border(full_ws, 2, 2, side)
+
+
+def test_sparse_load_mode_merged_cell_borders(tmp_path: Path):
+    """結合セルの外周罫線は通常読込と同じく結合範囲の各セルへ伝播する。"""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Sheet1"
+    ws["B2"] = "v"
+    draw_rect_border(ws, top=2, left=2, bottom=3, right=4)
+    ws.merge_cells("B2:D3")
+    set_defined_names(wb, {"json.v": "Sheet1!$B$2"})
+    xlsx_path = tmp_path / "merged.xlsx"
+    wb.save(xlsx_path)
+
+    full_ws = load_workbook(xlsx_path, data_only=True)["Sheet1"]
+    sparse_ws = xlsx2json.load_workbook_sparse(xlsx_path)["Sheet1"]
+    for r in range(1, 5):
+        for c in range(1, 6):
+            assert sparse_ws.cell(row=r, column=c).value == full_ws.cell(row=r, column=c).value
+            for side in ("top", "left", "bottom", "right"):
+                assert xlsx2json.has_border(sparse_ws, r, c, side) == xlsx2json.has_border(full_ws, r, c, side)
+
+
+def test_load_mode_config_and_validation(tmp_path: Path):
+    cfg = xlsx2json._build_processing_config_from_config({"input-files": ["a.xlsx"], "load-mode": "sparse"}, None)
+    assert cfg.load_mode == "sparse"
+    assert xlsx2json._build_processing_config_from_config({}, None).load_mode == "full"
+    with pytest.raises(xlsx2json.ConfigurationError):
+        xlsx2json._build_processing_config_from_config({"load-mode": "lazy"}, None)
+    args = xlsx2json.create_argument_parser().parse_args(["x.xlsx", "--load-mode", "sparse"])
+    assert args.load_mode == "sparse"
+    xlsx_path = tmp_path / "empty.xlsx"
+    Workbook().save(xlsx_path)
+    with pytest.raises(ValueError):
+        xlsx2json.parse_named_ranges_with_prefix(xlsx_path, prefix="json", load_mode="lazy")
+
+
+def _build_reader_corpus(tmp_path: Path) -> list[tuple[Path, dict | None]]:
+    """読込バックエンド比較用のテストコーパス（サンプル + 型/結合セル/複数シート）。"""
+    corpus: list[tuple[Path, dict | None]] = []
+    samples_dir = Path(__file__).parent / "samples"
+    sample_xlsx = samples_dir / "sample.xlsx"
+    if sample_xlsx.exists():
+        import yaml
+
+        cfg = yaml.safe_load((samples_dir / "config.yaml").read_text(encoding="utf-8"))
+        corpus.append((sample_xlsx, None))
+        corpus.append((sample_xlsx, cfg.get("containers")))
+
+    _, embedded = SampleWorkbookBuilder().build(tmp_path)
+    corpus.append((embedded, None))
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "データ 1"
+    set_cells(
+        ws,
+        {
+            "A1": "文字列",
+            "B1": 42,
+            "C1": 3.5,
+            "D1": True,
+            "E1": datetime(2024, 1, 2, 3, 4, 5),
+            "F1": date(2024, 2, 29),
+            "G1": "  前後空白  ",
+        },
+    )
+    ws["E1"].number_format = "yyyy-mm-dd hh:mm:ss"
+    ws["B3"] = "結合"
+    draw_rect_border(ws, top=3, left=2, bottom=4, right=3)
+    ws.merge_cells("B3:C4")
+    other = wb.create_sheet("Other")
+    other["A1"] = "x"
+    other["A2"] = "y"
+    set_defined_names(
+        wb,
+        {
+            "json.s": "'データ 1'!$A$1",
+            "json.n": "'データ 1'!$B$1",
+            "json.f": "'データ 1'!$C$1",
+            "json.b": "'データ 1'!$D$1",
+            "json.dt": "'データ 1'!$E$1",
+            "json.d": "'データ 1'!$F$1",
+            "json.sp": "'データ 1'!$G$1",
+            "json.row": "'データ 1'!$A$1:$D$1",
+            "json.merged": "'データ 1'!$B$3:$C$4",
+            "json.other": "Other!$A$1:$A$2",
+        },
+    )
+    typed = tmp_path / "typed.xlsx"
+    wb.save(typed)
+    corpus.append((typed, None))
+    return corpus
+
+
+def test_ooxml_reader_matches_openpyxl_reader_on_corpus(tmp_path: Path):
+    """ooxml バックエンドは openpyxl バックエンドと同一の出力を返す（full/sparse 双方）。"""
+    for xlsx_path, containers in _build_reader_corpus(tmp_path):
+        expected = xlsx2json.parse_named_ranges_with_prefix(xlsx_path, prefix="json", containers=containers)
+        for load_mode in ("full", "sparse"):
+            actual = xlsx2json.parse_named_ranges_with_prefix(
+                xlsx_path, prefix="json", containers=containers, load_mode=load_mode, reader="ooxml"
+            )
+            assert actual == expected, (xlsx_path.name, load_mode)
+
+
+def test_ooxml_reader_cells_borders_and_names_match_openpyxl(tmp_path: Path):
+    """セル値・罫線判定・寸法・シート名・定義名宛先が openpyxl 読込と一致する。"""
+    for xlsx_path, _ in _build_reader_corpus(tmp_path):
+        ref_wb = load_workbook(xlsx_path, data_only=True)
+        nat_wb = xlsx2json.load_workbook_native(xlsx_path)
+        assert nat_wb.sheetnames == ref_wb.sheetnames
+        assert sorted(nat_wb.defined_names.keys()) == sorted(ref_wb.defined_names.keys())
+        for name, dn in ref_wb.defined_names.items():
+            assert list(nat_wb.defined_names[name].destinations) == list(dn.destinations)
+        for ref_ws in ref_wb.worksheets:
+            nat_ws = nat_wb[ref_ws.title]
+            assert (nat_ws.max_row, nat_ws.max_column) == (ref_ws.max_row, ref_ws.max_column)
+            for r in range(1, ref_ws.max_row + 2):
+                for c in range(1, ref_ws.max_column + 2):
+                    assert nat_ws.cell(row=r, column=c).value == ref_ws.cell(row=r, column=c).value
+                    for side in ("top", "left", "bottom", "right"):
+                        assert xlsx2json.has_border(nat_ws, r, c, side) == xlsx2json.has_border(ref_ws, r, c, side)
+
+
+def test_reader_option_config_and_validation(tmp_path: Path):
+    cfg = xlsx2json._build_processing_config_from_config({"reader": "ooxml"}, None)
+    assert cfg.reader == "ooxml"
+    assert xlsx2json._build_processing_config_from_config({}, None).reader == "openpyxl"
+    with pytest.raises(xlsx2json.ConfigurationError):
+        xlsx2json._build_processing_config_from_config({"reader": "xlrd"}, None)
+    args = xlsx2json.create_argument_parser().parse_args(["x.xlsx", "--reader", "ooxml"])
+    assert args.reader == "ooxml"
+    xlsx_path = tmp_path / "empty.xlsx"
+    Workbook().save(xlsx_path)
+    with pytest.raises(ValueError):
+        xlsx2json.parse_named_ranges_with_prefix(xlsx_path, prefix="json", reader="xlrd")
+
+
+def test_border_grid_matches_cell_border_rule(tmp_path: Path):
+    """罫線グリッドの判定は「自セルの辺 または 隣接セルの対辺」規則と全セルで一致する。"""
+    opposite = {"top": ("bottom", -1, 0), "bottom": ("top", 1, 0), "left": ("right", 0, -1), "right": ("left", 0, 1)}
+
+    def direct(ws, r, c, side):
+        if getattr(getattr(ws.cell(row=r, column=c).border, side), "style", None):
+            return True
+        opp, dr, dc = opposite[side]
+        if r + dr < 1 or c + dc < 1:
+            return False
+        return bool(getattr(getattr(ws.cell(row=r + dr, column=c + dc).border, opp), "style", None))
+
+    for xlsx_path, _ in _build_reader_corpus(tmp_path):
+        wb = load_workbook(xlsx_path, data_only=True)
+        for ws in wb.worksheets:
+            grid = xlsx2json.BorderGrid.from_worksheet(ws)
+            assert grid is not None
+            assert xlsx2json.border_grid(ws) is xlsx2json.border_grid(ws)
+            # 1セル4ビット（2セル/バイト）
+            assert len(grid._data) == (grid.n_rows * grid.n_cols + 1) // 2
+            n_rows, n_cols = ws.max_row + 2, ws.max_column + 2
+            for r in range(1, n_rows + 1):
+                for c in range(1, n_cols + 1):
+                    for side in ("top", "left", "bottom", "right"):
+                        assert grid.has(r, c, side) == direct(ws, r, c, side), (ws.title, r, c, side)
+
+
+def test_border_grid_helpers_and_fallback():
+    """行/列の連続判定・完全度・矩形探索はグリッド経由でも従来どおり、ダミーシートはフォールバックする。"""
+    wb = Workbook()
+    ws = wb.active
+    draw_rect_border(ws, top=2, left=2, bottom=5, right=4)
+    grid = xlsx2json.border_grid(ws)
+    assert grid is not None
+    assert grid.row_all(2, 2, 4, "top") and grid.row_all(6, 2, 4, "top")
+    assert grid.col_all(5, 2, 5, "left")
+    assert not grid.row_all(3, 2, 4, "top")
+    assert grid.count_row(2, 1, 5, "top") == 3
+    assert xlsx2json.calculate_border_completeness(ws, 2, 2, 5, 4) == 1.0
+    assert xlsx2json._find_rect_from_anchor(ws, 2, 4, 2, 20) == (2, 2, 4, 5)
+    assert grid.bits(0, 1) == 0 and grid.bits(10_000, 10_000) == 0
+    assert xlsx2json.border_grid(DummySheet()) is None
+
+
+def test_border_cache_invalidation_and_stats():
+    """罫線変更は invalidate_border_cache で罫線グリッドの世代を進めて反映し、未変更シートのグリッドは保持される。"""
+    prev = xlsx2json.get_current_context()
+    ctx = xlsx2json.Context(processing_stats=xlsx2json.ProcessingStats())
+    xlsx2json.set_current_context(ctx)
+    try:
+        wb = Workbook()
+        ws = wb.active
+        other = wb.create_sheet("Other")
+        draw_rect_border(other, top=1, left=1, bottom=2, right=2)
+        assert xlsx2json.has_border(other, 1, 1, "top")
+        assert not xlsx2json.has_border(ws, 2, 2, "top")
+        other_grid = xlsx2json.border_grid(other)
+        st = ctx.processing_stats
+        # シート毎の初回参照で構築（ミス）、以降はヒット
+        assert (st.border_cache_misses, st.border_cache_hits) == (2, 1)
+
+        draw_rect_border(ws, top=2, left=2, bottom=3, right=3)
+        # 通知前は構築済みグリッドが使われる
+        assert not xlsx2json.has_border(ws, 2, 2, "top")
+        xlsx2json.invalidate_border_cache(ws)
+        assert ctx.border_version(ws) == 1
+        assert xlsx2json.has_border(ws, 2, 2, "top")
+        assert st.border_cache_misses == 3
+        assert xlsx2json.calculate_border_completeness(ws, 2, 2, 3, 3) == 1.0
+        assert xlsx2json.border_grid(other) is other_grid
+        assert st.border_cache_misses == 3
+
+        xlsx2json.invalidate_border_cache()
+        assert not ctx.border_versions and len(ctx.border_grids) == 0
+        assert xlsx2json.border_grid(other) is not other_grid
+    finally:
+        xlsx2json.set_current_context(prev)
+
+
+def test_summed_area_detector_matches_bruteforce(tmp_path: Path):
+    """ラン長/累積和による矩形検出は全探索と同一の領域列（順序含む）を返す。"""
+    import random
+
+    sheets = []
+    for xlsx_path, _ in _build_reader_corpus(tmp_path):
+        wb = load_workbook(xlsx_path, data_only=True)
+        names = xlsx2json.extract_cell_names_from_workbook(wb, "json")
+        sheets.extend((ws, names) for ws in wb.worksheets)
+    rng = random.Random(7)
+    for _ in range(5):
+        wb = Workbook()
+        ws = wb.active
+        for _ in range(6):
+            top, left = rng.randint(1, 12), rng.randint(1, 12)
+            draw_rect_border(ws, top=top, left=left, bottom=top + rng.randint(0, 5), right=left + rng.randint(0, 5))
+        ws.cell(row=20, column=20).border = Border(top=Side(style="thin"), left=Side(style="thin"))
+        names = {(rng.randint(1, 18), rng.randint(1, 18)): f"n{k}" for k in range(4)}
+        sheets.append((ws, names))
+        sheets.append((ws, None))
+
+    for ws, names in sheets:
+        bounds = xlsx2json.compute_scan_bounds_for_rect_detection(ws, names)
+        brute = xlsx2json.detect_regions_bruteforce(ws, *bounds, names)
+        fast = xlsx2json.detect_regions_summed_area(ws, *bounds, names)
+        assert fast == brute
+        assert xlsx2json.filter_overlapping_regions(
+            xlsx2json.dedup_and_sort_regions(fast)
+        ) == xlsx2json.filter_overlapping_regions(xlsx2json.dedup_and_sort_regions(brute))
+    assert xlsx2json.detect_regions_summed_area(DummySheet(), 1, 1, 5, 5) is None
+
+
+def test_scan_rects_seq_run_length_matches_cellwise_scan():
+    """ラン長表による縦連続矩形の検出は、セル単位の判定と同じ結果を返す。"""
+
+    class CellwiseSheet:
+        # title/_cells を持たないためグリッドを使わずセル単位で判定される
+        def __init__(self, ws):
+            self._ws = ws
+            self.max_row = ws.max_row
+
+        def cell(self, row, column):
+            return self._ws.cell(row=row, column=column)
+
+    wb = Workbook()
+    ws = wb.active
+    for k in range(100):
+        draw_rect_border(ws, top=2 + 2 * k, left=2, bottom=3 + 2 * k, right=5)
+    # 列ズレしたカードと閉じていない枠
+    draw_rect_border(ws, top=202, left=3, bottom=203, right=6)
+    ws.cell(row=210, column=2).border = Border(top=Side(style="thin"), left=Side(style="thin"))
+
+    expected = xlsx2json._scan_rects_seq(CellwiseSheet(ws), 2, 5, 2)
+    assert len(expected) == 100
+    assert xlsx2json._scan_rects_seq(ws, 2, 5, 2) == expected
+    assert xlsx2json._scan_rects_seq(ws, 2, 5, 2, max_bottom=21) == xlsx2json._scan_rects_seq(
+        CellwiseSheet(ws), 2, 5, 2, max_bottom=21
+    )
+    for args in [(2, 5, 202), (3, 6, 202), (2, 4, 2), (2, 5, 210), (2, 5, 3)]:
+        assert xlsx2json._find_rect_from_anchor(ws, *args) == xlsx2json._find_rect_from_anchor(
+            CellwiseSheet(ws), *args
+        ), args
+    grid = xlsx2json.border_grid(ws)
+    assert grid.run_length(2, 2, "top") == 4 and grid.run_length(2, 2, "left") == 200
+
+
+def test_detect_rectangular_regions_full_sheet_and_scan_budget(caplog):
+    """名前無しでも30x30外の矩形を検出し、予算到達時は打ち切って警告を記録する。"""
+    wb = Workbook()
+    ws = wb.active
+    draw_rect_border(ws, top=2, left=2, bottom=5, right=6)
+    draw_rect_border(ws, top=150, left=40, bottom=160, right=45)
+    draw_rect_border(ws, top=150, left=40, bottom=152, right=42)
+    coords = [r[:4] for r in xlsx2json.detect_rectangular_regions(ws)]
+    assert coords == [(150, 40, 160, 45), (2, 2, 5, 6)]
+
+    # 包含候補の間引きはフィルタ後の結果に影響しない
+    bounds = xlsx2json.compute_scan_bounds_for_rect_detection(ws, None, full_sheet=True)
+    full = xlsx2json.detect_regions_summed_area(ws, *bounds)
+    pruned = xlsx2json.detect_regions_summed_area(ws, *bounds, maximal_only=True)
+    assert len(pruned) < len(full)
+    assert xlsx2json.filter_overlapping_regions(
+        xlsx2json.dedup_and_sort_regions(pruned)
+    ) == xlsx2json.filter_overlapping_regions(xlsx2json.dedup_and_sort_regions(full))
+
+    with caplog.at_level(logging.WARNING):
+        limited = xlsx2json.detect_rectangular_regions(ws, scan_budget=1)
+    assert [r[:4] for r in limited] == [(2, 2, 5, 6)]
+    assert "探索予算" in caplog.text
+
+
+def test_rect_scan_budget_config_and_validation():
+    assert xlsx2json._build_processing_config_from_config({}, None).rect_scan_budget == (
+        xlsx2json.RECT_SCAN_BUDGET_DEFAULT
+    )
+    cfg = xlsx2json._build_processing_config_from_config({"rect-scan-budget": 0}, None)
+    assert cfg.rect_scan_budget == 0
+    for bad in (-1, "many"):
+        with pytest.raises(xlsx2json.ConfigurationError):
+            xlsx2json._build_processing_config_from_config({"rect-scan-budget": bad}, None)
+    args = xlsx2json.create_argument_parser().parse_args(["x.xlsx", "--rect-scan-budget", "1000"])
+    assert xlsx2json._apply_cli_overrides_to_config(args, {})["rect-scan-budget"] == 1000
+
+
+def test_summed_area_scan_budget_stops_within_one_top_left():
+    """探索予算は候補判定毎に確認し、1つの左上の候補の途中でも打ち切る。"""
+    wb = Workbook()
+    ws = wb.active
+    thin = Side(style="thin")
+    for r in range(1, 7):
+        for c in range(1, 7):
+            ws.cell(row=r, column=c).border = Border(top=thin, bottom=thin, left=thin, right=thin)
+    prev = xlsx2json.get_current_context()
+    xlsx2json.set_current_context(xlsx2json.Context(processing_stats=xlsx2json.ProcessingStats()))
+    try:
+        unlimited = xlsx2json.detect_regions_summed_area(ws, 1, 1, 6, 6)
+        assert len([r for r in unlimited if r[:2] == (1, 1)]) == 36
+        limited = xlsx2json.detect_regions_summed_area(ws, 1, 1, 6, 6, budget=5)
+        assert 0 < len(limited) <= 5 and all(r[:2] == (1, 1) for r in limited)
+        assert any("探索予算" in w for w in xlsx2json.stats().warnings)
+    finally:
+        xlsx2json.set_current_context(prev)
+
+
+def test_rect_scan_budget_default_keeps_output_unchanged(caplog):
+    """既定設定では予算で打ち切らず、予算を超える大きなシートでも全矩形を検出する。"""
+    wb = Workbook()
+    ws = wb.active
+    expected = []
+    for k in range(12):
+        top, left = 2 + k * 40, 2 + (k % 4) * 10
+        draw_rect_border(ws, top=top, left=left, bottom=top + 5, right=left + 6)
+        expected.append((top, left, top + 5, left + 6))
+    bounds = xlsx2json.compute_scan_bounds_for_rect_detection(ws, None, full_sheet=True)
+    reference = xlsx2json.filter_overlapping_regions(
+        xlsx2json.dedup_and_sort_regions(xlsx2json.detect_regions_bruteforce(ws, *bounds))
+    )
+    assert sorted(r[:4] for r in reference) == sorted(expected)
+
+    default_budget = xlsx2json._build_processing_config_from_config({}, None).rect_scan_budget
+    assert default_budget == xlsx2json.get_current_context().rect_scan_budget == 0
+    with caplog.at_level(logging.WARNING):
+        default = xlsx2json.detect_rectangular_regions(ws)
+    assert default == reference
+    assert "探索予算" not in caplog.text
+
+    # 同じシートが明示的な予算を超えることの確認（打ち切りは指定時のみ）
+    limited = xlsx2json.detect_rectangular_regions(ws, scan_budget=5)
+    assert len(limited) < len(default)
+
+
+def test_spatial_index_filter_and_name_lookup_match_naive():
+    """RegionIndex による包含除外と CellNameIndex による名前列挙は素朴な実装と一致する。"""
+    import random
+
+    def naive_filter(regions):
+        filtered = []
+        for region in regions:
+            top, left, bottom, right, _c = region
+            area = (bottom - top + 1) * (right - left + 1)
+            redundant = False
+            for ex in list(filtered):
+                et, el, eb, er, _ec = ex
+                ex_area = (eb - et + 1) * (er - el + 1)
+                if top >= et and left >= el and bottom <= eb and right <= er and area < ex_area:
+                    redundant = True
+                    break
+                if et >= top and el >= left and eb <= bottom and er <= right and ex_area < area:
+                    filtered.remove(ex)
+            if not redundant:
+                filtered.append(region)
+        return filtered
+
+    rng = random.Random(11)
+    for trial in range(30):
+        regions = []
+        for _ in range(rng.randint(0, 60)):
+            t, lf = rng.randint(1, 80), rng.randint(1, 80)
+            span = 40 if rng.random() < 0.8 else 400  # 巨大領域は別リストで保持される
+            regions.append((t, lf, t + rng.randint(0, span), lf + rng.randint(0, span), 1.0))
+        if trial % 2:
+            regions = xlsx2json.dedup_and_sort_regions(regions)
+        assert xlsx2json.filter_overlapping_regions(regions) == naive_filter(regions)
+
+        names = {(rng.randint(1, 60), rng.randint(1, 60)): f"n{k}" for k in range(rng.randint(0, 40))}
+        index = xlsx2json.CellNameIndex(names)
+        for _ in range(20):
+            t, lf = rng.randint(1, 60), rng.randint(1, 60)
+            b, r = t + rng.randint(0, 20), lf + rng.randint(0, 20)
+            expected = [names[(row, col)] for row in range(t, b + 1) for col in range(lf, r + 1) if (row, col) in names]
+            assert index.names_in_rect(t, lf, b, r) == expected
+            assert xlsx2json.get_cell_names_in_region(names, t, lf, b, r) == expected
+            assert index.any_in_rect(t, lf, b, r) == bool(expected)
+
+
+def test_defined_name_index_queries_match_linear_scans():
+    """DefinedNameIndex の各クエリは全名前の線形走査と一致する。"""
+    import random
+
+    rng = random.Random(5)
+    segs = ["json", "A", "B", "lv1", "1", "2", "10", "name", ""]
+    names = sorted({".".join(rng.choice(segs) for _ in range(rng.randint(1, 5))) for _ in range(300)})
+    late = [n + ".x" for n in names[:20]]
+    index = xlsx2json.DefinedNameIndex()
+    for n in names[:150]:
+        index.add(n, xlsx2json.NAME_KIND_DEFINED)
+    index = index.with_generated(names, late)
+    base = set(names)
+    every = base | set(late)
+    assert set(index.names()) == base and set(index.names(xlsx2json.NAME_KINDS_ALL)) == every
+
+    probes = names + ["json.A.1.1", "json.A", "json.A.1.lv", "json", "zz", "json.", ""]
+    for p in probes:
+        assert index.has_descendants(p) == any(k.startswith(p + ".") for k in base), p
+        assert index.has_descendants(p, xlsx2json.NAME_KINDS_ALL) == any(k.startswith(p + ".") for k in every)
+        assert set(index.iter_descendants(p, xlsx2json.NAME_KIND_DEFINED)) == {
+            k for k in names[:150] if k.startswith(p + ".")
+        }
+        tails = [k[len(p) + 1:].split(".")[0] for k in base if k.startswith(p + ".")]
+        assert index.has_non_numeric_child(p) == any(t and not t.isdigit() for t in tails), p
+        assert index.has_string_prefix(p) == any(k.startswith(p) for k in base), p
+
+
+def test_defined_name_index_destinations_and_parse_equivalence(tmp_path: Path, monkeypatch):
+    """索引経由の宛先列挙・パース結果は索引を使わない線形走査と一致する。"""
+    corpus = _build_reader_corpus(tmp_path)
+    for xlsx_path, _ in corpus:
+        wb = load_workbook(xlsx_path, data_only=True)
+        index = xlsx2json.defined_name_index(wb)
+        assert index is xlsx2json.defined_name_index(wb)
+        for name, dn in wb.defined_names.items():
+            assert list(xlsx2json.iter_defined_name_destinations_all(name, wb)) == list(dn.destinations)
+            for d in index.destinations(name):
+                assert d.sheet_index == wb.sheetnames.index(d.sheet)
+    wb = Workbook()
+    set_defined_names(wb, {"json.a": "Sheet!$A$1"})
+    assert list(xlsx2json.iter_defined_name_destinations_all("json.b", wb)) == []
+    set_defined_names(wb, {"json.b": "Sheet!$B$2:$C$3"})
+    assert list(xlsx2json.iter_defined_name_destinations_all("json.b", wb)) == [("Sheet", "$B$2:$C$3")]
+    assert xlsx2json.defined_name_index(wb).destinations("json.b")[0].bounds == (2, 2, 3, 3)
+
+    expected = {}
+    with monkeypatch.context() as m:
+        m.setattr(xlsx2json, "defined_name_index", lambda _wb: None)
+        for k, (xlsx_path, containers) in enumerate(corpus):
+            expected[k] = xlsx2json.parse_named_ranges_with_prefix(xlsx_path, prefix="json", containers=containers)
+    for k, (xlsx_path, containers) in enumerate(corpus):
+        assert xlsx2json.parse_named_ranges_with_prefix(xlsx_path, prefix="json", containers=containers) == expected[k]
+
+
+def test_generated_ref_for_subarray_names_and_generated_defined_name():
+    """補助生成名は解析済み GeneratedRef で保持され、文字列を再解析せずに値・位置を得られる。"""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "S"
+    set_cells(ws, {"B2": "x", "C2": "y", "D2": "z"})
+    set_defined_names(wb, {"json.arr.1.tags.1": "S!$B$2:$D$2"})
+    xlsx2json.generate_subarray_names_for_field_anchors(wb, "json.")
+    gen_map = xlsx2json.get_generated_names_map(wb)
+    ref = gen_map["json.arr.1.tags.3"]
+    assert ref == xlsx2json.GeneratedRef("S", 2, 4, 2, 4)
+    assert (ref.shape, str(ref)) == ("cell", "S!$D$2")
+
+    gdn = xlsx2json.GeneratedDefinedName(ref)
+    assert gdn.destinations == [("S", "$D$2")]
+    assert xlsx2json.get_named_range_values(wb, gdn) == "z"
+    assert xlsx2json.compute_top_left_pos(gdn, {"S": 0}) == (0, 2, 4)
+    assert xlsx2json.get_value_for_defined_or_generated_name(
+        wb=wb, name="json.arr.1.tags.2", defined_name=None, gen_map=gen_map
+    ) == (False, "y")
+    rng = xlsx2json.GeneratedDefinedName(xlsx2json.GeneratedRef("S", 2, 2, 2, 4))
+    assert rng.ref.shape == "row" and xlsx2json.get_named_range_values(wb, rng) == ["x", "y", "z"]
+
+    # コンテナが読み取った値はそのまま（"!" を複数含む値や非文字列でも失敗しない）
+    assert xlsx2json.GeneratedDefinedName("a!b!c").destinations == [("a", "b!c")]
+    assert xlsx2json.GeneratedDefinedName(42).destinations == []
+    # 座標に見えるセル値は宛先にしない（読取順・期待形状に影響させない）
+    assert xlsx2json.GeneratedDefinedName("A1:B2").destinations == []
+    assert xlsx2json.GeneratedDefinedName(["v"]).ref is None
+
+
+def test_jobs_process_pool_matches_serial_and_isolates_failures(tmp_path, monkeypatch):
+    """--jobs による並列変換は逐次処理と同一の出力を生成し、失敗ファイルのみをエラーとして集約する。"""
+    import multiprocessing
+
+    in_dir = tmp_path / "in"
+    in_dir.mkdir()
+    for i in range(4):
+        wb = Workbook()
+        ws = wb.active
+        set_cells(ws, {"A1": f"v{i}", "B1": i})
+        set_defined_names(wb, {"json.name": "Sheet!$A$1", "json.num": "Sheet!$B$1"})
+        wb.save(in_dir / f"book{i}.xlsx")
+    (in_dir / "broken.xlsx").write_bytes(b"not a zip")
+
+    def run(jobs, out):
+        cfg = xlsx2json.ProcessingConfig(input_files=[in_dir], output_dir=out, jobs=jobs)
+        conv = xlsx2json.Xlsx2JsonConverter(cfg)
+        assert conv.process_files([in_dir]) == 0
+        return conv.processing_stats, {f.name: f.read_text(encoding="utf-8") for f in sorted(out.glob("*.json"))}
+
+    serial_stats, serial_out = run(1, tmp_path / "serial")
+    par_stats, par_out = run(2, tmp_path / "par")
+    assert par_out == serial_out and len(par_out) == 4
+    assert par_stats.errors == serial_stats.errors and len(par_stats.errors) == 1
+    assert par_stats.cells_generated == serial_stats.cells_generated
+
+    if multiprocessing.get_start_method() != "fork":
+        return  # パッチをワーカーへ引き継げない
+    # ワーカーの異常終了: 原因ファイルのみがエラーとなり、他のファイルは出力される
+    orig = xlsx2json.parse_named_ranges_with_prefix
+
+    def crashing(path, *a, **k):
+        if Path(path).name == "book1.xlsx":
+            os._exit(3)
+        return orig(path, *a, **k)
+
+    monkeypatch.setattr(xlsx2json, "parse_named_ranges_with_prefix", crashing)
+    crash_stats, crash_out = run(2, tmp_path / "crash")
+    assert set(crash_out) == set(serial_out) - {"book1.json"}
+    assert sum("book1.xlsx" in e for e in crash_stats.errors) == 1
+
+
+def test_jobs_config_and_stats_merge():
+    assert xlsx2json._build_processing_config_from_config({}, None).jobs == 1
+    assert xlsx2json._build_processing_config_from_config({"jobs": "4"}, None).jobs == 4
+    for bad in (0, -2, "many"):
+        with pytest.raises(xlsx2json.ConfigurationError):
+            xlsx2json._build_processing_config_from_config({"jobs": bad}, None)
+    args = xlsx2json.create_argument_parser().parse_args(["x.xlsx", "--jobs", "3"])
+    assert xlsx2json._apply_cli_overrides_to_config(args, {})["jobs"] == 3
+
+    a, b = xlsx2json.ProcessingStats(), xlsx2json.ProcessingStats()
+    a.cells_generated, b.cells_generated = 2, 5
+    b.border_cache_hits = 7
+    b.errors.append("e")
+    b.warnings.append("w")
+    a.merge(b)
+    assert (a.cells_generated, a.border_cache_hits, a.errors, a.warnings) == (7, 7, ["e"], ["w"])
+
+
+def test_run_plan_compiled_once_per_converter(tmp_path, monkeypatch):
+    """変換ルール/スキーマ検証器はコンバータ生成時に1度だけ構築され、全ファイルで共有される。"""
+    in_dir = tmp_path / "in"
+    in_dir.mkdir()
+    for i in range(3):
+        wb = Workbook()
+        set_cells(wb.active, {"A1": f"a{i},b{i}", "B1": "x"})
+        set_defined_names(wb, {"json.items": "Sheet!$A$1", "json.key_name": "Sheet!$B$1"})
+        wb.save(in_dir / f"b{i}.xlsx")
+    schema = {
+        "type": "object",
+        "properties": {"items": {"type": "array"}, "key.name": {"type": "string"}},
+    }
+    calls = []
+    orig = xlsx2json.parse_array_transform_rules
+    monkeypatch.setattr(
+        xlsx2json, "parse_array_transform_rules", lambda *a, **k: calls.append(1) or orig(*a, **k)
+    )
+    cfg = xlsx2json.ProcessingConfig(
+        input_files=[in_dir], output_dir=tmp_path / "out", schema=schema, transform_rules=["json.items=split:,"]
+    )
+    conv = xlsx2json.Xlsx2JsonConverter(cfg)
+    assert conv.validator is conv.plan.validator is not None
+    assert conv.process_files([in_dir]) == 0
+    assert len(calls) == 1
+    out = json.loads((tmp_path / "out" / "b2.json").read_text(encoding="utf-8"))
+    assert out == {"items": ["a2", "b2"], "key.name": "x"}
+
+    index = conv.plan.schema_index
+    for keys in (["key_name"], ["items", "1"], ["missing", "x"]):
+        assert index.resolve(keys) == xlsx2json.resolve_path_keys_with_schema(path_keys=keys, schema=schema)
+    assert ("key_name",) in index._resolved
+
+
+def test_extraction_plan_compile_and_apply_matches_full_analysis(tmp_path, monkeypatch, caplog):
+    """テンプレートの抽出プランを適用した結果は通常解析と一致し、適用時はコンテナ推論・解析と罫線走査を行わない。
+
+    指紋不一致時は通常解析へフォールバックする。
+    """
+    import yaml
+
+    samples_dir = Path(__file__).parent / "samples"
+    template = samples_dir / "sample.xlsx"
+    if not template.exists():
+        pytest.skip("samples/sample.xlsx がありません")
+    containers = yaml.safe_load((samples_dir / "config.yaml").read_text(encoding="utf-8")).get("containers")
+
+    cfg = xlsx2json.ProcessingConfig(input_files=[template], containers=containers)
+    plan_path = tmp_path / "plan" / "template.json"
+    assert xlsx2json.Xlsx2JsonConverter(cfg).compile_template([template], plan_path) == 0
+    plan = xlsx2json.load_extraction_plan(plan_path)
+    assert plan["series"] and plan["prelude"]["entries"] and plan["border-samples"]
+    assert set(containers) <= set(plan["containers"])
+    assert plan["settings"] == xlsx2json.extraction_plan_settings(cfg)
+
+    # 値のみ異なるインスタンス（空欄化・書換え）
+    wb = load_workbook(template)
+    for ws in wb.worksheets:
+        for row in ws.iter_rows():
+            for cell in row:
+                if isinstance(cell.value, str) and cell.row % 3 == 0:
+                    cell.value = None
+                elif isinstance(cell.value, str):
+                    cell.value = cell.value + "改"
+    instance = tmp_path / "instance.xlsx"
+    wb.save(instance)
+    # 定義名が異なるブック（フォールバック対象）
+    wb.defined_names["json.追加"] = DefinedName("json.追加", attr_text=f"'{wb.worksheets[0].title}'!$A$1")
+    diverged = tmp_path / "diverged.xlsx"
+    wb.save(diverged)
+
+    skipped = (
+        "infer_containers_from_named_ranges",
+        "prepare_containers_and_generated_names",
+        "_analyze_sheet_for_container",
+        "border_grid",
+    )
+    for path, expect_plan_hit in ((template, True), (instance, True), (diverged, False)):
+        xlsx2json.set_current_context(xlsx2json.Context(processing_stats=xlsx2json.ProcessingStats()))
+        expected = xlsx2json.parse_named_ranges_with_prefix(path, "json", containers=containers)
+        xlsx2json.set_current_context(xlsx2json.Context(processing_stats=xlsx2json.ProcessingStats()))
+        calls: list = []
+        with monkeypatch.context() as m:
+            for fn_name in skipped:
+                orig = getattr(xlsx2json, fn_name)
+                m.setattr(
+                    xlsx2json, fn_name, lambda *a, _n=fn_name, _f=orig, **k: calls.append(_n) or _f(*a, **k)
+                )
+            actual = xlsx2json.parse_named_ranges_with_prefix(
+                path, "json", containers=containers, extraction_plan=plan
+            )
+        assert actual == expected
+        st = xlsx2json.stats()
+        if expect_plan_hit:
+            assert not calls and not st.warnings
+        else:
+            assert calls and len(st.warnings) == 1 and "抽出プラン" in st.warnings[0]
+
+    args = xlsx2json.create_argument_parser().parse_args(["x.xlsx", "--plan", str(plan_path)])
+    built = xlsx2json._build_processing_config_from_config(xlsx2json._apply_cli_overrides_to_config(args, {}), None)
+    assert built.plan == plan_path
+    # 作成時と設定（ここではコンテナ）が異なる実行ではプランを使わない
+    with caplog.at_level(logging.WARNING):
+        assert xlsx2json.Xlsx2JsonConverter(built).plan.extraction_plan is None
+    assert any("抽出プランの作成時と設定が異なる" in r.getMessage() for r in caplog.records)
+    import dataclasses
+
+    built = dataclasses.replace(built, containers=containers)
+    assert xlsx2json.Xlsx2JsonConverter(built).plan.extraction_plan == plan
+    (tmp_path / "bad.json").write_text("{}", encoding="utf-8")
+    with pytest.raises(xlsx2json.ConfigurationError):
+        xlsx2json.load_extraction_plan(tmp_path / "bad.json")
+
+
+def test_conversion_cache_skips_unchanged_inputs(tmp_path):
+    """--cache-dir: 入力内容と実効設定が同じファイルは再変換せず、--force/--cache-prune が機能する。"""
+    in_dir = tmp_path / "in"
+    in_dir.mkdir()
+
+    def save_book(name, value):
+        wb = Workbook()
+        set_cells(wb.active, {"A1": value})
+        set_defined_names(wb, {"json.v": "Sheet!$A$1"})
+        wb.save(in_dir / name)
+
+    save_book("a.xlsx", "A")
+    save_book("b.xlsx", "B")
+    out_dir = tmp_path / "out"
+    cache_dir = tmp_path / "cache"
+
+    def run(**overrides):
+        cfg = xlsx2json.ProcessingConfig(input_files=[in_dir], output_dir=out_dir, cache_dir=cache_dir, **overrides)
+        conv = xlsx2json.Xlsx2JsonConverter(cfg)
+        assert conv.process_files([in_dir]) == 0
+        st = conv.processing_stats
+        return st.conversion_cache_hits, st.conversion_cache_misses
+
+    assert run() == (0, 2)
+    (out_dir / "a.json").write_text('{"v": "stale-marker"}', encoding="utf-8")
+    assert run() == (2, 0)
+    assert "stale-marker" in (out_dir / "a.json").read_text(encoding="utf-8")
+
+    save_book("b.xlsx", "B2")
+    assert run() == (1, 1)
+    assert json.loads((out_dir / "b.json").read_text(encoding="utf-8")) == {"v": "B2"}
+
+    # 実効設定の変更・--force・出力の削除はいずれも再変換
+    assert run(trim=True) == (0, 2)
+    assert run(trim=True, force=True) == (0, 2)
+    (out_dir / "a.json").unlink()
+    assert run(trim=True) == (1, 1)
+
+    (in_dir / "b.xlsx").unlink()
+    run(trim=True, cache_prune=True)
+    manifest = json.loads((cache_dir / xlsx2json.ConversionCache.MANIFEST_NAME).read_text(encoding="utf-8"))
+    assert [Path(k).name for k in manifest["entries"]] == ["a.xlsx"]
+
+    args = xlsx2json.create_argument_parser().parse_args(
+        ["x.xlsx", "--cache-dir", str(cache_dir), "--force", "--cache-prune"]
+    )
+    built = xlsx2json._build_processing_config_from_config(xlsx2json._apply_cli_overrides_to_config(args, {}), None)
+    assert (built.cache_dir, built.force, built.cache_prune) == (cache_dir, True, True)
+
+
+def test_prelude_cache_reuses_derived_state_across_workbooks(tmp_path, monkeypatch):
+    """名前表が同じブック間でパース前派生情報を再利用し、結果はキャッシュなしと一致する。"""
+    import yaml
+
+    samples_dir = Path(__file__).parent / "samples"
+    template = samples_dir / "sample.xlsx"
+    if not template.exists():
+        pytest.skip("samples/sample.xlsx がありません")
+    containers = yaml.safe_load((samples_dir / "config.yaml").read_text(encoding="utf-8")).get("containers")
+    # 単一セルの非配列項目の値のみを書き換えたインスタンス（名前表・生成名の配置は同一）
+    wb = load_workbook(template)
+    changed = 0
+    for name in list(wb.defined_names):
+        dn = wb.defined_names[name]
+        if ":" in dn.attr_text or any(p.isdigit() for p in name.split(".")):
+            continue
+        for sn, coord in dn.destinations:
+            wb[sn][coord.replace("$", "")].value = f"改{changed}"
+            changed += 1
+    assert changed
+    instance = tmp_path / "instance.xlsx"
+    wb.save(instance)
+
+    monkeypatch.setattr(xlsx2json, "_prelude_cache", xlsx2json.PreludeCache(maxsize=4))
+    xlsx2json.set_current_context(xlsx2json.Context(processing_stats=xlsx2json.ProcessingStats()))
+    expected = {}
+    for path in (template, instance):
+        xlsx2json._prelude_cache.clear()
+        expected[path] = xlsx2json.parse_named_ranges_with_prefix(path, "json", containers=containers)
+    st = xlsx2json.stats()
+    assert (st.prelude_cache_hits, st.prelude_cache_misses) == (0, 2)
+    assert expected[template] != expected[instance]
+    for path in (template, instance, template):
+        assert xlsx2json.parse_named_ranges_with_prefix(path, "json", containers=containers) == expected[path]
+    assert st.prelude_cache_hits == 3
+
+    cache = xlsx2json.PreludeCache(maxsize=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, {"s": {key}})
+    assert cache.get("a") is None and st.prelude_cache_evictions == 1
+    got = cache.get("b")
+    got["s"].add("x")
+    assert cache.get("b") == {"s": {"b"}}
+
+
+def test_cell_block_reads_match_per_cell_reads():
+    """CellBlock 経由の行収集は read_cell_value による個別読取と値・統計・寸法が一致する。"""
+    import random
+
+    rng = random.Random(16)
+    data = {
+        (r, c): rng.choice(["x", 0, 1.5, "", None, "1-2"])
+        for r in range(1, 41)
+        for c in (2, 3, 5)
+        if rng.random() < 0.6
+    }
+    positions = {"a": (2, 3), "b": (3, 3), "c": (5, 4), "far": (9, 3)}
+
+    def make_sheet(kind):
+        if kind == "openpyxl":
+            sheet = Workbook().active
+            for (r, c), v in data.items():
+                sheet.cell(row=r, column=c, value=v)
+            return sheet
+        sheet = xlsx2json.SparseWorksheet("S", max_row=40, max_column=5)
+        for (r, c), v in data.items():
+            sheet._store(r, c, v, None)
+        return sheet
+
+    for kind in ("openpyxl", "sparse"):
+        for step in (1, 2, 3):
+            results = []
+            for use_block in (False, True):
+                sheet = make_sheet(kind)
+                xlsx2json.set_current_context(xlsx2json.Context(processing_stats=xlsx2json.ProcessingStats()))
+                block = xlsx2json.CellBlock.for_rows(sheet, 2, 48, [c for c, _r in positions.values()]) if use_block else None
+                rows = [
+                    xlsx2json.collect_row_values(
+                        ws=sheet,
+                        current_positions=positions,
+                        direction="row",
+                        local_index=i,
+                        step=step,
+                        eff_top=2,
+                        eff_bottom=48,
+                        block=block,
+                    )
+                    for i in range(1, 25)
+                ]
+                st = xlsx2json.stats()
+                results.append((rows, st.cells_read, st.empty_cells_skipped, (sheet.max_row, sheet.max_column)))
+            assert results[0] == results[1]
+
+    class ReadOnlySheet:
+        max_row = max_column = 1
+
+    assert xlsx2json.CellBlock.for_rows(ReadOnlySheet(), 1, 5, [1]) is None
+
+
+def test_count_label_series_matches_sequential_scan_without_cap():
+    """ラベル終端の件数エンジンは逐次読取と件数・統計が一致し、長い系列（上限超え）も数えられる。"""
+    import random
+
+    def naive(ws, positions, direction, inc, is_empty):
+        count = 0
+        while True:
+            for base in positions:
+                v = xlsx2json.read_cell_value(
+                    xlsx2json.calculate_target_position(base, direction, count + 1, inc), ws
+                )
+                if is_empty(v):
+                    return count
+            count += 1
+
+    class NoDictSheet:
+        def __init__(self, ws):
+            self._ws = ws
+
+        def cell(self, row, column):
+            return self._ws.cell(row=row, column=column)
+
+    rng = random.Random(17)
+    for trial in range(12):
+        length = rng.choice([0, 3, 11, 255, 256, 600])
+        direction = rng.choice(["row", "column"])
+        inc = rng.choice([1, 2, 3])
+        positions = [(2, 2), (4, 3)] if trial % 2 else [(3, 2)]
+        cells = {}
+        for base in positions:
+            for idx in range(1, length + 1):
+                cells[xlsx2json.calculate_target_position(base, direction, idx, inc)] = rng.choice(["a", 1, 0, 2.5])
+        # 途中の空欄（どこかのラベルを早期に空にする）
+        if length and rng.random() < 0.5:
+            cut = rng.randint(1, length)
+            cells[xlsx2json.calculate_target_position(rng.choice(positions), direction, cut, inc)] = rng.choice(["", None, 0])
+        for is_empty in (xlsx2json._is_blank_value, lambda v: not v):
+            results = []
+            for mode in ("naive", "engine", "nodict"):
+                wb = Workbook()
+                ws = wb.active
+                for (c, r), v in cells.items():
+                    ws.cell(row=r, column=c, value=v)
+                xlsx2json.set_current_context(xlsx2json.Context(processing_stats=xlsx2json.ProcessingStats()))
+                if mode == "naive":
+                    n = naive(ws, positions, direction, inc, is_empty)
+                else:
+                    target = ws if mode == "engine" else NoDictSheet(ws)
+                    n = xlsx2json.count_label_series(target, positions, direction, inc, is_empty=is_empty)
+                st = xlsx2json.stats()
+                results.append((n, st.cells_read, st.empty_cells_skipped, ws.max_row, ws.max_column))
+            assert results[0] == results[1] == results[2], (trial, results)
+
+    wb = Workbook()
+    ws = wb.active
+    for r in range(1, 31):
+        ws.cell(row=r, column=1, value=f"card{r}")
+    assert xlsx2json.detect_card_count({"title": (1, 1)}, "row", 1, ["title"], ws) == 30
+    assert xlsx2json.detect_card_count({"title": (1, 1)}, "row", 0, ["title"], ws) == 1
+
+
+@pytest.mark.skipif(
+    "fork" not in __import__("multiprocessing").get_all_start_methods(), reason="シート並列は fork 環境のみ"
+)
+def test_sheet_jobs_numbering_matches_sequential(monkeypatch):
+    """シート単位の並列解析でも、連番・生成値・統計は逐次処理と同一。"""
+    wb = Workbook()
+    for i in range(6):
+        ws = wb.active if i == 0 else wb.create_sheet()
+        ws.title = f"Branch{i}"
+        rows = 1 + i % 3
+        for r in range(rows):
+            set_cells(ws, {f"B{2 + r}": f"2025-0{i + 1}-{r + 1:02d}", f"C{2 + r}": f"B{i}-{r}", f"D{2 + r}": str(r)})
+        draw_rect_border(ws, top=2, left=2, bottom=4, right=4)
+    # 先頭シートのみ定義名を持ち、他シートはテンプレ座標＋範囲の罫線で解決される
+    set_defined_names(
+        wb,
+        {
+            "json.orders.1.date": "Branch0!$B$2",
+            "json.orders.1.customer": "Branch0!$C$2",
+            "json.orders.1.amount": "Branch0!$D$2",
+        },
+    )
+    containers = {"json.orders": {"direction": "row", "increment": 1, "range": "$B$2:$D$4"}}
+    pools = []
+    orig_create = xlsx2json.SheetAnalysisPool.create
+    monkeypatch.setattr(
+        xlsx2json.SheetAnalysisPool,
+        "create",
+        classmethod(lambda cls, wb_, n: pools.append(orig_create(wb_, n)) or pools[-1]),
+    )
+
+    def run(sheet_jobs, max_elements=None):
+        prev = xlsx2json.get_current_context()
+        ctx = xlsx2json.Context(processing_stats=xlsx2json.ProcessingStats(), sheet_jobs=sheet_jobs)
+        xlsx2json.set_current_context(ctx)
+        try:
+            generated = xlsx2json.generate_cell_names_from_containers(containers, wb, max_elements)
+        finally:
+            xlsx2json.set_current_context(prev)
+        st = ctx.processing_stats
+        return generated, (st.cells_read, st.cells_generated, st.empty_cells_skipped)
+
+    for max_elements in (None, 5):
+        serial = run(1, max_elements)
+        parallel = run(3, max_elements)
+        assert parallel == serial
+    assert pools[0] is None and pools[1] is not None
+    generated = run(3)[0]
+    assert generated["json.orders.1.customer"] == "B0-0"
+    assert generated["json.orders.4.customer"] == "B1-0"
+    assert generated["json.orders.18.customer"] == "B5-2"
+    assert "json.orders.19.customer" not in generated
+    assert xlsx2json._build_processing_config_from_config({"sheet-jobs": "4"}, None).sheet_jobs == 4
+    with pytest.raises(xlsx2json.ConfigurationError):
+        xlsx2json._build_processing_config_from_config({"sheet-jobs": 0}, None)
+
+
+@pytest.mark.skipif(
+    "fork" not in __import__("multiprocessing").get_all_start_methods(), reason="コンテナ並列は fork 環境のみ"
+)
+def test_container_jobs_merge_matches_sequential_and_records_times():
+    """ルート名の異なるコンテナ部分木を並列処理しても、生成名（挿入順含む）と統計は逐次処理と同一。"""
+    wb = Workbook()
+    for i in range(3):
+        ws = wb.active if i == 0 else wb.create_sheet()
+        ws.title = f"Branch{i}"
+        for r in range(1 + i):
+            set_cells(ws, {f"B{2 + r}": f"2025-0{i + 1}-{r + 1:02d}", f"C{2 + r}": f"B{i}-{r}", f"F{2 + r}": f"N{i}{r}"})
+        draw_rect_border(ws, top=2, left=2, bottom=4, right=3)
+        draw_rect_border(ws, top=2, left=6, bottom=4, right=6)
+    set_defined_names(
+        wb,
+        {
+            "json.orders.1.date": "Branch0!$B$2",
+            "json.orders.1.customer": "Branch0!$C$2",
+            "json.notes.1.text": "Branch0!$F$2",
+        },
+    )
+    containers = {
+        "json.orders": {"direction": "row", "increment": 1, "range": "$B$2:$C$4"},
+        "json.notes": {"direction": "row", "increment": 1, "range": "$F$2:$F$4"},
+    }
+
+    def run(container_jobs):
+        prev = xlsx2json.get_current_context()
+        ctx = xlsx2json.Context(processing_stats=xlsx2json.ProcessingStats(), container_jobs=container_jobs)
+        xlsx2json.set_current_context(ctx)
+        try:
+            generated = xlsx2json.generate_cell_names_from_containers(containers, wb)
+        finally:
+            xlsx2json.set_current_context(prev)
+        return generated, ctx.processing_stats
+
+    serial, serial_stats = run(1)
+    parallel, parallel_stats = run(2)
+    assert list(parallel.items()) == list(serial.items())
+    assert (serial["json.notes.4.text"], serial["json.notes.9.text"]) == ("N10", "N22")
+    for st in (serial_stats, parallel_stats):
+        assert set(st.container_seconds) == set(containers)
+    assert (parallel_stats.containers_processed, parallel_stats.cells_read, parallel_stats.cells_generated) == (
+        serial_stats.containers_processed,
+        serial_stats.cells_read,
+        serial_stats.cells_generated,
+    )
+
+    names = ["json.orders", "json.orders.1.items", "json.orders.1.items.1.tags", "json.notes", "json.a.1.b"]
+    assert xlsx2json.build_container_dag(names) == {
+        "json.orders": None,
+        "json.orders.1.items": "json.orders",
+        "json.orders.1.items.1.tags": "json.orders.1.items",
+        "json.notes": None,
+        "json.a.1.b": None,
+    }
+    groups = xlsx2json.group_containers_by_root([(n, {}) for n in names])
+    assert [[n for n, _ in g] for g in groups.values()] == [names[:3], ["json.notes"], ["json.a.1.b"]]
+    path, total = xlsx2json.container_critical_path(
+        {"json.orders": 1.0, "json.orders.1.items": 2.0, "json.orders.1.items.1.tags": 0.5, "json.notes": 3.0}
+    )
+    assert path == ["json.orders", "json.orders.1.items", "json.orders.1.items.1.tags"] and total == 3.5
+    assert xlsx2json._build_processing_config_from_config({"container-jobs": 2}, None).container_jobs == 2
+
+
+def test_max_elements_stops_label_scan_and_skips_capped_sheets():
+    """--max-elements は件数走査を上限で打ち切り、上限到達後のシートは走査しない（出力はクリップ結果と同一）。"""
+
+    class NoDictSheet:
+        def __init__(self, ws):
+            self._ws = ws
+
+        def cell(self, row, column):
+            return self._ws.cell(row=row, column=column)
+
+    wb = Workbook()
+    ws = wb.active
+    for r in range(2, 602):
+        set_cells(ws, {f"A{r}": f"C{r}", f"B{r}": f"N{r}"})
+    prev = xlsx2json.get_current_context()
+    try:
+        for sheet in (ws, NoDictSheet(ws)):
+            xlsx2json.set_current_context(xlsx2json.Context(processing_stats=xlsx2json.ProcessingStats()))
+            assert xlsx2json.count_label_series(sheet, [(1, 2), (2, 2)], "row", 1, limit=300) == 300
+            assert xlsx2json.stats().cells_read == 600
+            assert xlsx2json.count_label_series(sheet, [(1, 2)], "row", 1, limit=1000) == 600
+        ws2 = wb.create_sheet("Second")
+        set_cells(ws2, {"A2": "X", "B2": "Y"})
+        set_defined_names(wb, {"json.items.1.code": "Sheet!$A$2", "json.items.1.name": "Sheet!$B$2"})
+        containers = {"json.items": {"direction": "row", "increment": 1, "labels": ["code"]}}
+
+        def run(max_elements):
+            ctx = xlsx2json.Context(processing_stats=xlsx2json.ProcessingStats())
+            xlsx2json.set_current_context(ctx)
+            return xlsx2json.generate_cell_names_from_containers(containers, wb, max_elements), ctx.processing_stats
+
+        full, full_stats = run(None)
+        capped, capped_stats = run(5)
+    finally:
+        xlsx2json.set_current_context(prev)
+    assert len(full) == 1200 and full["json.items.600.name"] == "N601"
+    assert capped == {k: v for k, v in full.items() if int(k.split(".")[2]) <= 5}
+    assert capped_stats.cells_read < 30 < full_stats.cells_read
+
+
+def test_plain_container_streams_elements_without_generated_names(tmp_path, monkeypatch):
+    """単純な行コンテナは要素毎のセル名を作らずに結果ツリーへ逐次挿入し、出力は生成名の経路と同一になる。"""
+    rows = 2000
+    wb = Workbook()
+    ws = wb.active
+    set_cells(ws, {"E1": "title"})
+    for r in range(2, rows + 2):
+        # セル値 "A1:B2" は座標として扱わない（生成名の経路でも期待形状・読取順に影響しない）
+        set_cells(ws, {f"A{r}": f"C{r}", f"B{r}": r, f"C{r}": "A1:B2" if r % 3 else None})
+    set_defined_names(
+        wb,
+        {
+            "json.title": "Sheet!$E$1",
+            "json.items.1.qty": "Sheet!$B$2",
+            "json.items.1.code": "Sheet!$A$2",
+            "json.items.1.note": "Sheet!$C$2",
+        },
+    )
+    path = tmp_path / "rows.xlsx"
+    wb.save(path)
+    containers = {"json.items": {"direction": "row", "increment": 1, "labels": ["code"]}}
+
+    names_built: list = []
+    real_name_for = xlsx2json.generate_cell_name_for_element
+    monkeypatch.setattr(
+        xlsx2json, "generate_cell_name_for_element", lambda *a: names_built.append(a) or real_name_for(*a)
+    )
+    streamed = xlsx2json.parse_named_ranges_with_prefix(path, "json", containers=containers)
+    assert names_built == []
+    items = streamed["json"]["items"]
+    assert len(items) == rows
+    assert items[0] == {"code": "C2", "qty": 2, "note": "A1:B2"}
+    assert items[-1] == {"code": f"C{rows + 1}", "qty": rows + 1}
+
+    # 全体上限の指定時は生成名の経路（件数走査を上限で打ち切るため要素数は小さい）
+    xlsx2json.parse_named_ranges_with_prefix(path, "json", containers=containers, global_max_elements=5)
+    assert len(names_built) == 5 * 3
+
+    # スキーマ・ワイルドカード変換・配列に掛かる変換ルールがある場合も生成名の経路
+    def streams_for(**kwargs):
+        params = {"containers": containers, "schema": None, "array_transform_rules": None, "global_max_elements": None}
+        params.update(kwargs)
+        return xlsx2json.element_streams_for(**params)
+
+    assert streams_for(schema={"type": "object"}) is None
+    assert streams_for(array_transform_rules={"*.code": []}) is None
+    assert streams_for(containers=None) is None
+    assert not streams_for(array_transform_rules={"items.*.code": []}).accepts("items")
+    assert streams_for(array_transform_rules={"title": []}).accepts("items")
+
+    names_built.clear()
+    monkeypatch.setattr(xlsx2json, "element_streams_for", lambda **kwargs: None)
+    mapped = xlsx2json.parse_named_ranges_with_prefix(path, "json", containers=containers)
+    assert len(names_built) == rows * 3
+    assert json.dumps(streamed, ensure_ascii=False) == json.dumps(mapped, ensure_ascii=False)
+
+
+def test_pattern_trie_transforms_match_per_pattern_walks():
+    """全パターン1回走査のトライ適用は、パターン毎の全走査＋ルート解決（従来方式）と同一の結果になる。"""
+    import copy
+    import random
+
+    def legacy(data, transform_rules):
+        for pattern, rule_list in transform_rules.items():
+            effective = rule_list if "*" in pattern else [r for r in rule_list if r.transform_type != "split"]
+            if not effective:
+                continue
+            for path in xlsx2json.find_matching_paths(data, pattern):
+                value = xlsx2json.get_nested_value(data, path)
+                if value is None:
+                    continue
+                for rule in effective:
+                    if isinstance(value, list) and all(isinstance(e, dict) for e in value):
+                        value = [rule.transform(e) for e in value]
+                    else:
+                        value = rule.transform(value)
+                xlsx2json.set_nested_value(data, path, value)
+        return data
+
+    def rule(kind):
+        funcs = {
+            "upper": lambda v: v.upper() if isinstance(v, str) else v,
+            "split": lambda v: v.split("-") if isinstance(v, str) else v,
+            "wrap": lambda v: {"w": v} if not isinstance(v, dict) else v,
+            "count": lambda v: len(v) if isinstance(v, (list, dict)) else v,
+        }
+        return SimpleNamespace(transform_type="split" if kind == "split" else "function", transform=funcs[kind])
+
+    rng = random.Random(5)
+
+    def tree(depth):
+        if depth == 0 or rng.random() < 0.2:
+            return rng.choice(["a-b", "x", None, 3, "p-q-r"])
+        if rng.random() < 0.4:
+            return [tree(depth - 1) for _ in range(rng.randint(0, 3))]
+        return {rng.choice(["items", "name", "tags", "node", "1"]): tree(depth - 1) for _ in range(rng.randint(1, 3))}
+
+    segs = ["*", "*", "*", "items", "name", "tags", "node", "1", "2", "*s", "n*e", "ta*"]
+    for _ in range(200):
+        data = {"json": tree(4)}
+        rules = {}
+        for _ in range(rng.randint(1, 5)):
+            pattern = ".".join(["json"] + [rng.choice(segs) for _ in range(rng.randint(1, 3))])
+            rules[pattern] = [rule(rng.choice(["upper", "split", "wrap", "count"])) for _ in range(rng.randint(1, 2))]
+        expected = legacy(copy.deepcopy(data), rules)
+        assert xlsx2json.apply_wildcard_transforms(copy.deepcopy(data), rules, "json") == expected
+
+    trie = xlsx2json.PatternTrie.compile(["json.items.*.name", "json.*.*.na*", "json.other"])
+    data = {"json": {"items": [{"name": "a"}, {"name": "b", "nat": 1}], "other": 2, "skip": {"deep": [1, 2]}}}
+    matches = trie.match_all(data, 3)
+    assert [m[0] for m in matches[0]] == [("json", "items", "1", "name"), ("json", "items", "2", "name")]
+    assert [".".join(m[0]) for m in matches[1]] == xlsx2json.find_matching_paths(data, "json.*.*.na*")
+    path, parent, key = matches[2][0]
+    assert path == ("json", "other") and parent[key] == 2
+
+
+def test_rule_index_matches_linear_rule_search_and_memoises_shapes():
+    """RuleIndex は従来の線形探索と同じルール列を返し、数値インデックス違いのパスは1形状として記憶する。"""
+    import pickle
+    import random
+
+    def legacy(rules, norm, orig):
+        key_path, orig_key_path = ".".join(norm), ".".join(orig)
+        for k in (key_path, orig_key_path):
+            if k in rules:
+                return rules[k]
+        for keys in (norm, orig):
+            if len(keys) >= 2 and keys[-2].isdigit() and ".".join(keys[:-1]) in rules:
+                return rules[".".join(keys[:-1])]
+        for keys in (norm, orig):
+            for i in range(len(keys) - 1, 0, -1):
+                if keys[i - 1].isdigit():
+                    continue
+                cand = rules.get(".".join(keys[:i]))
+                if cand is not None and all(r.transform_type == "split" for r in cand):
+                    return cand
+        for rule_key, rule_list in rules.items():
+            if "*" in rule_key and (
+                xlsx2json.wildcard_match_path(rule_key, key_path) or xlsx2json.wildcard_match_path(rule_key, orig_key_path)
+            ):
+                return rule_list
+        return None
+
+    rng = random.Random(11)
+    segs = ["arr", "name", "items", "1", "2", "12", "x.y"]
+    pattern_segs = segs + ["*", "*s", "1*", "*2"]
+    for _ in range(150):
+        table = {}
+        for n in range(rng.randint(1, 8)):
+            key = ".".join(rng.choice(pattern_segs) for _ in range(rng.randint(1, 4)))
+            kind = rng.choice(["split", "function"])
+            table.setdefault(key, []).append(SimpleNamespace(transform_type=kind, n=n))
+        rules = xlsx2json.RuleIndex(table)
+        for _ in range(40):
+            norm = [rng.choice(segs + [str(rng.randint(1, 30))]) for _ in range(rng.randint(1, 5))]
+            orig = norm if rng.random() < 0.5 else [rng.choice(segs) for _ in norm]
+            assert xlsx2json.get_applicable_transform_rules(rules, norm, orig) is legacy(dict(rules), norm, orig)
+
+    rules = xlsx2json.parse_array_transform_rules(
+        ["json.orders.*.name=split:,", "json.orders.1.code=function:builtins:str"], "json"
+    )
+    assert isinstance(rules, xlsx2json.RuleIndex) and list(rules) == ["orders.1.code", "orders.*.name"]
+    for i in range(1, 1001):
+        assert rules.lookup(["orders", str(i), "name"], ["orders", str(i), "name"]) is rules["orders.*.name"]
+    assert len(rules._compiled_index.memo) == 2  # "1" はルール中の数値リテラルのため別形状
+    picklable = xlsx2json.parse_array_transform_rules(["json.orders.1.code=function:builtins:str"], "json")
+    restored = pickle.loads(pickle.dumps(picklable))
+    assert restored.lookup(["orders", "1", "code"], ["orders", "1", "code"]) == restored["orders.1.code"]
+
+
+def test_command_server_mode_matches_per_value_command_and_recovers(tmp_path):
+    """command[server] は1プロセスを使い回し、1値1プロセス方式と同じ解釈で結果を返す。"""
+    starts = tmp_path / "starts.log"
+    script = tmp_path / "upper_server.py"
+    script.write_text(
+        "import json, os, sys, time\n"
+        f"open({str(starts)!r}, 'a').write('x')\n"
+        "framing = sys.argv[1] if len(sys.argv) > 1 else 'oneshot'\n"
+        "def convert(text):\n"
+        "    if text == 'CRASH':\n"
+        "        os._exit(3)\n"
+        "    if text == 'SLOW':\n"
+        "        time.sleep(5)\n"
+        "    if text == 'BAD':\n"
+        "        raise ValueError('bad input')\n"
+        "    if text.startswith('{'):\n"
+        "        return json.dumps(dict(json.loads(text), seen=True))\n"
+        "    return text.upper()\n"
+        "out = sys.stdout.buffer\n"
+        "if framing == 'oneshot':\n"
+        "    sys.stdout.write(convert(sys.stdin.read()))\n"
+        "elif framing == 'ndjson':\n"
+        "    for line in sys.stdin.buffer:\n"
+        "        req = json.loads(line)\n"
+        "        try:\n"
+        "            resp = {'id': req['id'], 'output': convert(req['input'])}\n"
+        "        except ValueError as e:\n"
+        "            resp = {'id': req['id'], 'error': str(e)}\n"
+        "        out.write((json.dumps(resp) + '\\n').encode()); out.flush()\n"
+        "else:\n"
+        "    while True:\n"
+        "        header = sys.stdin.buffer.readline()\n"
+        "        if not header:\n"
+        "            break\n"
+        "        rid, n = header.split()\n"
+        "        payload = convert(sys.stdin.buffer.read(int(n)).decode()).encode()\n"
+        "        out.write(b'%s ok %d\\n' % (rid, len(payload)) + payload); out.flush()\n"
+    )
+    py = sys.executable
+    oneshot = xlsx2json.ArrayTransformRule("v", "command", f"{py} {script}")
+    server = xlsx2json.ArrayTransformRule(
+        "v", "command", f"{py} {script} ndjson", options={"server": "", "timeout": "1"}
+    )
+    values = ["abc", ["a", "b"], {"k": 1}, "line1\nline2"]
+    starts.write_text("")
+    expected = [oneshot.transform(v) for v in values]
+    assert expected == ["ABC", ["A", "B"], {"k": 1, "seen": True}, "LINE1\nLINE2"]
+    starts.write_text("")
+    assert [server.transform(v) for v in values] == expected
+    assert starts.read_text() == "x"
+
+    # エラー応答・異常終了・タイムアウトは元の値を返し、後続は再起動したプロセスで継続する
+    assert server.transform("BAD") == "BAD"
+    assert server.transform("CRASH") == "CRASH"
+    assert server.transform("SLOW") == "SLOW"
+    assert server.transform("ok") == "OK"
+    # 標準入力を失ったプロセスへの要求は異常終了として扱う（プールが再起動する）
+    lost = xlsx2json.CommandServer([py, str(script), "ndjson"])
+    lost.proc.stdin.close()
+    lost.proc.stdin = None
+    with pytest.raises(xlsx2json._CommandServerCrashed):
+        lost.request(1, "x", 1)
+    lost.close()
+
+    length = xlsx2json.ArrayTransformRule(
+        "v", "command", f"{py} {script} length", options={"server": "", "framing": "length", "pool": "2"}
+    )
+    assert [length.transform(v) for v in values] == expected
+
+    rules = xlsx2json.parse_array_transform_rules(
+        [f"json.v=command[server,pool=2,timeout=5]:{py} {script} ndjson"], "json"
+    )
+    (rule,) = rules["v"]
+    assert rule._command_pool is not None and rule._command_pool.size == 2
+    with pytest.raises(ValueError):
+        xlsx2json.ArrayTransformRule("v", "command", "cat", options={"servr": ""})
+    for pool in (server, length):
+        pool._command_pool.close()
+    rule._command_pool.close()
+
+
+def test_parallel_transform_executors_match_serial_results(tmp_path, capsys):
+    """parallel 指定のルールは thread/process で並列変換し、逐次と同じ結果をマッチ順に書き戻す。"""
+    mod = tmp_path / "par_funcs.py"
+    mod.write_text(
+        "import threading, time\n"
+        "active = [0, 0]\n"
+        "lock = threading.Lock()\n"
+        "def slow_upper(v):\n"
+        "    with lock:\n"
+        "        active[0] += 1\n"
+        "        active[1] = max(active[1], active[0])\n"
+        "    print('converting', v)\n"
+        "    time.sleep(0.02)\n"
+        "    with lock:\n"
+        "        active[0] -= 1\n"
+        "    if v == 'boom':\n"
+        "        raise ValueError('boom')\n"
+        "    return str(v).upper()\n"
+    )
+
+    def make_data():
+        return {"items": [{"name": f"n{i}", "code": "boom" if i == 3 else f"c{i}"} for i in range(12)]}
+
+    def run(option):
+        rules = xlsx2json.parse_array_transform_rules(
+            [f"json.items.*.*={option}{mod}:slow_upper"], "json"
+        )
+        return xlsx2json.apply_wildcard_transforms(make_data(), rules, "json")
+
+    expected = run("function:")
+    assert expected["items"][3]["code"] == "boom"
+    assert expected["items"][0] == {"name": "N0", "code": "C0"}
+    thread_result = run("function[parallel=6]:")
+    assert thread_result == expected
+    assert list(thread_result["items"][5]) == ["name", "code"]
+    rules = xlsx2json.parse_array_transform_rules([f"json.items.*.*=function[parallel=6]:{mod}:slow_upper"], "json")
+    (par_rule,) = rules["items.*.*"]
+    par_rule._transform_func.__globals__["active"][1] = 0
+    xlsx2json.apply_wildcard_transforms(make_data(), rules, "json")
+    assert par_rule._transform_func.__globals__["active"][1] > 1
+    assert run("function[parallel=4,executor=process]:") == expected
+    assert run("function[parallel=4,executor=serial]:") == expected
+    # 変換関数の print は各スレッドで捕捉され、標準出力へ漏れない
+    assert "converting" not in capsys.readouterr().out
+    assert not isinstance(sys.stdout, xlsx2json._ThreadRoutedStream)
+
+    assert isinstance(xlsx2json.TransformExecutor.for_rules([par_rule]), xlsx2json.ThreadTransformExecutor)
+    with pytest.raises(ValueError):
+        xlsx2json.ArrayTransformRule("x", "command", "cat", options={"server": "", "executor": "process", "parallel": "2"})
+    with pytest.raises(ValueError):
+        xlsx2json.ArrayTransformRule("x", "function", f"{mod}:slow_upper", options={"parallel": "0"})
+
+
+def test_batch_function_transform_gathers_matches_and_checks_length(tmp_path, caplog):
+    """batch_function はパターンの全マッチで1回呼ばれ、結果はマッチ順に書き戻される。"""
+    mod = tmp_path / "batch_funcs.py"
+    mod.write_text(
+        "calls = []\n"
+        "def upper_all(values):\n"
+        "    calls.append(list(values))\n"
+        "    return [str(v).upper() for v in values]\n"
+        "def drop_one(values):\n"
+        "    return list(values)[1:]\n"
+        "def tag(node):\n"
+        "    return dict(node, tagged=True)\n"
+    )
+    sample = str(Path(__file__).parent / "samples" / "transform.py")
+
+    def make_data():
+        return {"rows": [{"code": ["a", "b"]}, {"code": ["c"]}, {"code": ["d", "e", "f"]}], "x": "single"}
+
+    per_value = xlsx2json.apply_wildcard_transforms(
+        make_data(),
+        xlsx2json.parse_array_transform_rules([f"json.rows.*.code.*=function:{sample}:upper"], "json"),
+        "json",
+    )
+    rules = xlsx2json.parse_array_transform_rules(
+        [f"json.rows.*.code.*=batch_function:{mod}:upper_all"], "json"
+    )
+    (rule,) = rules["rows.*.code.*"]
+    calls = rule._transform_func.__globals__["calls"]
+    batched = xlsx2json.apply_wildcard_transforms(make_data(), rules, "json")
+    assert batched == per_value
+    assert calls == [["a", "b", "c", "d", "e", "f"]]
+    assert xlsx2json.apply_wildcard_transforms(
+        make_data(),
+        xlsx2json.parse_array_transform_rules([f"json.rows.*.code.*=batch_function:{sample}:upper_batch"], "json"),
+        "json",
+    ) == per_value
+
+    # 通常ルールとの連結: dict 要素のリストは要素単位でバッチへ展開される
+    chained = xlsx2json.parse_array_transform_rules(
+        [f"json.rows=function:{mod}:tag", f"json.rows=batch_function:{mod}:upper_all"], "json"
+    )
+    out = xlsx2json.apply_wildcard_transforms({"rows": [{"k": 1}, {"k": 2}]}, chained, "json")
+    assert out["rows"] == ["{'K': 1, 'TAGGED': TRUE}", "{'K': 2, 'TAGGED': TRUE}"]
+
+    # 定義名の挿入時など単一値では1要素のバッチとして呼ばれる
+    assert rule.transform("single") == "SINGLE"
+
+    # 長さ不一致は明確なエラーとして拒否し、値は変更しない
+    bad = xlsx2json.parse_array_transform_rules([f"json.rows.*.code.*=batch_function:{mod}:drop_one"], "json")
+    (bad_rule,) = bad["rows.*.code.*"]
+    with pytest.raises(ValueError, match="returned 5 values for 6 inputs"):
+        bad_rule.transform_batch(["a", "b", "c", "d", "e", "f"])
+    with caplog.at_level(logging.ERROR):
+        assert xlsx2json.apply_wildcard_transforms(make_data(), bad, "json") == make_data()
+    # バッチの失敗はパターン単位で1回だけ記録する
+    (record,) = [r for r in caplog.records if r.levelno == logging.ERROR]
+    assert "パターン=rows.*.code.*" in record.getMessage() and "マッチ数=6" in record.getMessage()
+    with pytest.raises(ValueError):
+        xlsx2json.ArrayTransformRule("x", "batch_function", f"{mod}:upper_all", options={"parallel": "2"})
+
+
+def test_container_dag_numbered_keys_are_not_their_own_parent():
+    """末尾がインデックスのコンテナキー（json.orders.1）は自身を親にせず、クリティカルパスも停止する。"""
+    names = ["json.リスト1.1", "json.parent.1", "json.parent.1.child.1", "json.orders", "json.orders.1"]
+    assert xlsx2json.build_container_dag(names) == {
+        "json.リスト1.1": None,
+        "json.parent.1": None,
+        "json.parent.1.child.1": "json.parent.1",
+        "json.orders": None,
+        "json.orders.1": None,
+    }
+    path, total = xlsx2json.container_critical_path(
+        {"json.parent.1": 1.0, "json.parent.1.child.1": 2.0, "json.リスト1.1": 2.5, "json.orders.1": 0.1}
+    )
+    assert path == ["json.parent.1", "json.parent.1.child.1"] and total == 3.0
+
+    st = xlsx2json.ProcessingStats()
+    for name in ("json.parent.1", "json.parent.1.child.1"):
+        st.add_container_time(name, 0.01)
+    st.log_summary()
+
+
+def test_ooxml_reader_matches_openpyxl_for_escaped_strings(tmp_path: Path):
+    """共有文字列・インライン文字列の _xHHHH_ エスケープは openpyxl と同じ値で返す。"""
+    import zipfile
+
+    escaped = {"A1": "a_x000D_b", "A2": "_x005F_x000D_", "A3": "tab_x0009_z", "A4": "通常"}
+    wb = Workbook()
+    ws = wb.active
+    for i, coord in enumerate(escaped):
+        ws[coord] = f"PLACEHOLDER{i}"
+    set_defined_names(wb, {f"json.v{i}": f"Sheet!${coord[0]}${coord[1:]}" for i, coord in enumerate(escaped, 1)})
+    base = tmp_path / "base.xlsx"
+    wb.save(base)
+
+    # openpyxl が書くインライン文字列を共有文字列テーブル参照へ置き換える
+    src = zipfile.ZipFile(base)
+    sst = "".join(f"<si><t>{v}</t></si>" for v in escaped.values())
+    shared = tmp_path / "shared.xlsx"
+    with zipfile.ZipFile(shared, "w") as out:
+        for name in src.namelist():
+            text = src.read(name).decode("utf-8")
+            if name == "xl/worksheets/sheet1.xml":
+                for i, coord in enumerate(escaped):
+                    text = text.replace(
+                        f'<c r="{coord}" t="inlineStr"><is><t>PLACEHOLDER{i}</t></is></c>', f'<c r="{coord}" t="s"><v>{i}</v></c>'
+                    )
+            elif name == "xl/_rels/workbook.xml.rels":
+                text = text.replace(
+                    "</Relationships>",
+                    '<Relationship Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings"'
+                    ' Target="sharedStrings.xml" Id="rIdSst" /></Relationships>',
+                )
+            elif name == "[Content_Types].xml":
+                text = text.replace(
+                    "</Types>",
+                    '<Override PartName="/xl/sharedStrings.xml" ContentType="application/'
+                    'vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml" /></Types>',
+                )
+            out.writestr(name, text)
+        out.writestr(
+            "xl/sharedStrings.xml",
+            f'<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">{sst}</sst>',
+        )
+    inline = tmp_path / "inline.xlsx"
+    with zipfile.ZipFile(inline, "w") as out:
+        for name in src.namelist():
+            text = src.read(name).decode("utf-8")
+            for i, value in enumerate(escaped.values()):
+                text = text.replace(f"PLACEHOLDER{i}<", f"{value}<")
+            out.writestr(name, text)
+
+    for path in (shared, inline):
+        ref_ws = load_workbook(path, data_only=True).active
+        expected = {coord: ref_ws[coord].value for coord in escaped}
+        for sparse in (False, True):
+            nat_ws = xlsx2json.load_workbook_native(path, sparse=sparse).active
+            assert {coord: nat_ws[coord].value for coord in escaped} == expected
+        result = xlsx2json.parse_named_ranges_with_prefix(path, prefix="json", reader="ooxml")
+        assert result == xlsx2json.parse_named_ranges_with_prefix(path, prefix="json", reader="openpyxl")
+        assert [result[f"v{i}"] for i in range(1, 5)] == list(expected.values())
+
+
+def test_wildcard_transforms_rewalk_only_patterns_below_replaced_nodes(monkeypatch):
+    """構造を変えた置換の後は、置換ノードより深くに届く後続パターンだけを走査し直す。"""
+    walks = []
+    original = xlsx2json.PatternTrie.match_all
+
+    def counting(self, data, n):
+        walks.append(n)
+        return original(self, data, n)
+
+    monkeypatch.setattr(xlsx2json.PatternTrie, "match_all", counting)
+    data = {"items": [{"tags": "a,b", "codes": "x;y", "name": "n"} for _ in range(3)]}
+    rules = xlsx2json.parse_array_transform_rules(
+        ["json.items.*.tags=split:,", "json.items.*.codes=split:;", "json.items.*.name=split:-"], "json"
+    )
+    out = xlsx2json.apply_wildcard_transforms(data, rules, "json")
+    assert out["items"][0] == {"tags": ["a", "b"], "codes": ["x", "y"], "name": ["n"]}
+    assert walks == [3]
+
+    # 置換で生まれた要素に届くパターンは再走査されて適用される
+    walks.clear()
+    rules = xlsx2json.parse_array_transform_rules(
+        [
+            "json.items.*.tags=split:,",
+            f"json.items.*.tags.*=function:{Path(__file__).parent / 'samples' / 'transform.py'}:upper",
+        ],
+        "json",
+    )
+    out = xlsx2json.apply_wildcard_transforms({"items": [{"tags": "a,b"}]}, rules, "json")
+    assert out == {"items": [{"tags": ["A", "B"]}]}
+    assert walks == [2, 1]
+
+
+def test_border_grid_run_tables_saturate_to_one_byte_per_cell():
+    """ラン長表は1セル1バイトで飽和させ、飽和を超える連続罫線も正確な長さを返す。"""
+    wb = Workbook()
+    ws = wb.active
+    thin = Side(style="thin")
+    for c in range(1, 601):
+        ws.cell(row=1, column=c).border = Border(top=thin)
+    for r in range(1, 301):
+        ws.cell(row=r, column=2).border = Border(top=thin, left=thin)
+    grid = xlsx2json.BorderGrid.from_worksheet(ws)
+    assert grid.run_length(1, 1, "top") == 600
+    assert grid.run_length(1, 345, "top") == 256
+    assert grid.run_length(1, 601, "top") == 0
+    assert grid.run_length(1, 2, "left") == 300 and grid.run_length(45, 2, "left") == 256
+    assert grid.row_all(1, 1, 600, "top") and not grid.row_all(1, 1, 601, "top")
+    assert grid.col_all(2, 1, 300, "left") and not grid.col_all(2, 1, 301, "left")
+    table = grid._run_table("top")
+    assert table.itemsize == 1 and len(table) == grid.n_rows * grid.n_cols
+
+
+def test_defined_name_index_tracks_name_content_and_is_not_mutated_by_prelude():
+    """改名・宛先変更で索引を再構築し、前処理を繰り返しても生成名はキャッシュへ蓄積されない。"""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Sheet"
+    ws["A1"] = "x"
+    set_defined_names(wb, {"json.a": "Sheet!$A$1", "json.b": "Sheet!$B$2"})
+    prev = xlsx2json.get_current_context()
+    xlsx2json.set_current_context(xlsx2json.Context(processing_stats=xlsx2json.ProcessingStats()))
+    try:
+        index = xlsx2json.defined_name_index(wb)
+        assert index.destinations("json.b")[0].coord == "$B$2"
+        wb.defined_names["json.b"].attr_text = "Sheet!$C$3"
+        assert xlsx2json.defined_name_index(wb).destinations("json.b")[0].coord == "$C$3"
+        dn = wb.defined_names.pop("json.b")
+        dn.name = "json.c"
+        wb.defined_names.add(dn)
+        renamed = xlsx2json.defined_name_index(wb)
+        assert renamed.has("json.c") and not renamed.has("json.b")
+
+        cached = xlsx2json.defined_name_index(wb)
+        names_before = set(cached.names(xlsx2json.NAME_KINDS_ALL))
+        for _ in range(2):
+            state = xlsx2json._prepare_parsing_prelude(
+                wb=wb,
+                prefix="json",
+                containers={},
+                global_max_elements=None,
+                extraction_policy=xlsx2json._DEFAULT_EXTRACTION_POLICY,
+            )
+            assert state["name_index"] is not cached
+        assert xlsx2json.defined_name_index(wb) is cached
+        assert set(cached.names(xlsx2json.NAME_KINDS_ALL)) == names_before
+
+        with xlsx2json.pinned_defined_name_index(wb) as pinned:
+            wb.defined_names["json.a"].attr_text = "Sheet!$D$4"
+            assert xlsx2json.defined_name_index(wb) is pinned
+            xlsx2json.invalidate_defined_name_index(wb)
+            assert xlsx2json.defined_name_index(wb).destinations("json.a")[0].coord == "$D$4"
+    finally:
+        xlsx2json.set_current_context(prev)
+
+
+@pytest.mark.skipif(
+    "fork" not in __import__("multiprocessing").get_all_start_methods(), reason="シート並列は fork 環境のみ"
+)
+def test_sheet_jobs_keep_sheet_dimensions_and_share_one_pool_per_file(tmp_path: Path, monkeypatch):
+    """ワーカーの読取によるシート寸法の拡張は親へ反映され、プールはファイル単位で1つ（fork は初回利用時）。"""
+
+    def build() -> Workbook:
+        wb = Workbook()
+        for i in range(4):
+            ws = wb.active if i == 0 else wb.create_sheet()
+            ws.title = f"Branch{i}"
+            for r in range(1 + i % 3):
+                set_cells(ws, {f"B{2 + r}": f"2025-0{i + 1}-{r + 1:02d}", f"C{2 + r}": f"B{i}-{r}"})
+        set_defined_names(wb, {"json.orders.1.date": "Branch0!$B$2", "json.orders.1.customer": "Branch0!$C$2"})
+        return wb
+
+    containers = {"json.orders": {"direction": "row", "increment": 1, "range": "$B$2:$C$6"}}
+
+    def run(sheet_jobs):
+        wb = build()
+        prev = xlsx2json.get_current_context()
+        xlsx2json.set_current_context(
+            xlsx2json.Context(processing_stats=xlsx2json.ProcessingStats(), sheet_jobs=sheet_jobs)
+        )
+        try:
+            generated = xlsx2json.generate_cell_names_from_containers(containers, wb, None)
+        finally:
+            xlsx2json.set_current_context(prev)
+        return generated, [(ws.title, ws.max_row, ws.max_column) for ws in wb.worksheets]
+
+    serial = run(1)
+    assert run(3) == serial
+    assert any(max_row == 6 for _t, max_row, _m in serial[1])
+    # 他のスレッドが動いている間は fork せず逐次処理する
+    import threading
+
+    release = threading.Event()
+    waiter = threading.Thread(target=release.wait)
+    waiter.start()
+    try:
+        assert not xlsx2json._fork_pool_available()
+        assert run(3) == serial
+    finally:
+        release.set()
+        waiter.join()
+
+    pools = []
+    orig_create = xlsx2json.SheetAnalysisPool.create
+    monkeypatch.setattr(
+        xlsx2json.SheetAnalysisPool,
+        "create",
+        classmethod(lambda cls, wb_, n: pools.append(orig_create(wb_, n)) or pools[-1]),
+    )
+    wb = build()
+    prev = xlsx2json.get_current_context()
+    xlsx2json.set_current_context(xlsx2json.Context(processing_stats=xlsx2json.ProcessingStats(), sheet_jobs=3))
+    try:
+        with xlsx2json.sheet_analysis_pool(wb) as pool:
+            assert pool._executor is None
+            for _ in range(2):
+                xlsx2json.generate_cell_names_from_containers(containers, wb, None)
+            assert pool._executor is not None
+        assert pool._executor is None and xlsx2json.get_current_context().sheet_pool is None
+    finally:
+        xlsx2json.set_current_context(prev)
+    assert pools == [pool]
+
+
+@pytest.mark.skipif(
+    "fork" not in __import__("multiprocessing").get_all_start_methods(), reason="プロセス並列は fork 環境のみ"
+)
+def test_sheet_pool_closes_before_process_transforms(tmp_path: Path, caplog):
+    """シート解析プールは事前準備の後に閉じ、変換段の executor=process は fork したワーカーで実行する。"""
+    wb = Workbook()
+    for i in range(3):
+        ws = wb.active if i == 0 else wb.create_sheet()
+        ws.title = f"Branch{i}"
+        for r in range(3):
+            set_cells(ws, {f"B{2 + r}": f"B{i}-{r}"})
+    set_defined_names(wb, {"json.orders.1.name": "Branch0!$B$2"})
+    path = tmp_path / "branches.xlsx"
+    wb.save(path)
+    module = tmp_path / "pid_mod.py"
+    module.write_text("import os\ndef pid(v):\n    return os.getpid()\n")
+    rules = xlsx2json.parse_array_transform_rules(
+        [f"json.orders.*.name=function[parallel=2,executor=process]:{module}:pid"], "json"
+    )
+    containers = {"json.orders": {"direction": "row", "increment": 1, "range": "$B$2:$B$4"}}
+
+    prev = xlsx2json.get_current_context()
+    xlsx2json.set_current_context(xlsx2json.Context(processing_stats=xlsx2json.ProcessingStats(), sheet_jobs=3))
+    try:
+        with caplog.at_level(logging.WARNING):
+            result = xlsx2json.parse_named_ranges_with_prefix(
+                path, "json", containers=containers, array_transform_rules=rules
+            )
+        assert xlsx2json.get_current_context().sheet_pool is None
+    finally:
+        xlsx2json.set_current_context(prev)
+    pids = [order["name"] for order in result["json"]["orders"]]
+    assert len(pids) == 3 and os.getpid() not in pids
+    assert "fork が利用できない" not in caplog.text
+
+    # fork できない間の並列指定の無効化は WARNING で通知する
+    import threading
+
+    release = threading.Event()
+    waiter = threading.Thread(target=release.wait)
+    waiter.start()
+    try:
+        caplog.clear()
+        with caplog.at_level(logging.WARNING):
+            assert xlsx2json.ProcessTransformExecutor(2).map(str, [1, 2]) == ["1", "2"]
+            assert xlsx2json.SheetAnalysisPool.create(wb, 3) is None
+        assert [r.levelname for r in caplog.records] == ["WARNING", "WARNING"]
+        assert "executor=process" in caplog.records[0].getMessage()
+        assert "--sheet-jobs=3" in caplog.records[1].getMessage()
+    finally:
+        release.set()
+        waiter.join()
+
+
+def test_sparse_load_bounds_follow_container_direction_and_scan_margins():
+    """疎読込の構築範囲は矩形検出と同じマージンで決まり、range の無い繰り返し方向だけを延長対象とする。"""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Sheet"
+    ws.cell(row=200, column=120, value="end")
+    set_defined_names(wb, {"json.items.1.name": "Sheet!$D$100", "json.items.2.name": "Sheet!$E$100"})
+
+    row_m, col_m = xlsx2json.SPARSE_ROW_MARGIN, xlsx2json.SPARSE_COL_MARGIN
+    box = (100 - row_m, max(1, 4 - col_m), 100 + row_m, 5 + col_m)
+    bounds, strides = xlsx2json.sparse_load_plan(wb)
+    # シート寸法（200行/120列）まで広げない
+    assert bounds["Sheet"] == box == xlsx2json.compute_sparse_load_bounds(wb)["Sheet"]
+    assert strides == {"Sheet": {"row": 1}}
+
+    containers = {"json.items": {"direction": "column", "increment": 2}}
+    assert xlsx2json.sparse_load_plan(wb, containers) == ({"Sheet": box}, {"Sheet": {"column": 2}})
+    assert xlsx2json.sparse_load_plan(wb, {"items": {"direction": "column"}})[1] == {"Sheet": {"column": 1}}
+    # range を宣言したコンテナは range（＋マージン）までで延長しない
+    ranged = {"json.items": {"direction": "row", "increment": 1, "range": "$D$100:$E$150"}}
+    bounds, strides = xlsx2json.sparse_load_plan(wb, ranged)
+    assert bounds["Sheet"][2] == 150 + xlsx2json.SPARSE_ROW_MARGIN and strides == {}
+
+
+def test_sparse_load_stops_repeating_rows_at_first_empty_stride(tmp_path: Path):
+    """range の無い繰り返しコンテナは内容が途切れた所で延長を打ち切り、表の下の作業領域を構築しない。"""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Sheet"
+    for i in range(40):
+        set_cells(ws, {(2 + i, 2): f"n{i}", (2 + i, 3): i})
+    draw_rect_border(ws, top=2, left=2, bottom=41, right=3)
+    for r in range(80, 600):
+        ws.cell(row=r, column=2, value=f"scratch{r}")
+    set_defined_names(wb, {"json.items.1.name": "Sheet!$B$2", "json.items.1.qty": "Sheet!$C$2"})
+    path = tmp_path / "scratch.xlsx"
+    wb.save(path)
+    containers = {"json.items": {"direction": "row", "increment": 1, "labels": ["name"]}}
+
+    for reader in xlsx2json.READERS:
+        kwargs = dict(prefix="json", containers=containers, reader=reader)
+        full = xlsx2json.parse_named_ranges_with_prefix(path, **kwargs)
+        assert xlsx2json.parse_named_ranges_with_prefix(path, load_mode="sparse", **kwargs) == full
+        assert len(full["items"]) == 40
+    loaded = (
+        xlsx2json.load_workbook_sparse(path, containers),
+        xlsx2json.load_workbook_native(path, sparse=True, containers=containers),
+    )
+    for swb in loaded:
+        sws = swb["Sheet"]
+        assert sws["B41"].value == "n39" and sws.max_row == 599
+        assert max(r for r, _c in sws._cells) < 80
+        assert sws.loaded_bounds[2] < 80
+
+
+def test_sparse_loader_openpyxl_internals_are_available(tmp_path: Path):
+    """load_workbook_sparse が依存する openpyxl の非公開 API が存在する（openpyxl 更新時の検知用）。"""
+    from openpyxl.worksheet._reader import WorkSheetParser
+
+    path = tmp_path / "internals.xlsx"
+    Workbook().save(path)
+    ro = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for attr in ("_cell_styles", "_borders", "_date_formats", "_timedelta_formats", "epoch"):
+            assert hasattr(ro, attr), f"openpyxl の読み取り専用 Workbook に {attr} がありません"
+        ro_ws = ro.worksheets[0]
+        for attr in ("_get_source", "_shared_strings"):
+            assert hasattr(ro_ws, attr), f"openpyxl の ReadOnlyWorksheet に {attr} がありません"
+        assert callable(getattr(WorkSheetParser, "parse", None)), "openpyxl の WorkSheetParser.parse がありません"
+    finally:
+        ro.close()
+
+
+def test_run_plan_transform_rule_errors_are_reported_per_file(tmp_path, monkeypatch):
+    """変換ルールの解析エラーはコンバータ生成時に送出せず、従来どおり各ファイルの処理エラーとして記録する。"""
+    in_dir = tmp_path / "in"
+    in_dir.mkdir()
+    for i in range(2):
+        wb = Workbook()
+        set_cells(wb.active, {"A1": f"a{i}"})
+        set_defined_names(wb, {"json.items": "Sheet!$A$1"})
+        wb.save(in_dir / f"b{i}.xlsx")
+
+    def broken(*_a, **_k):
+        raise ValueError("ルール不正")
+
+    monkeypatch.setattr(xlsx2json, "parse_array_transform_rules", broken)
+    cfg = xlsx2json.ProcessingConfig(
+        input_files=[in_dir], output_dir=tmp_path / "out", transform_rules=["json.items=split:,"]
+    )
+    conv = xlsx2json.Xlsx2JsonConverter(cfg)
+    assert isinstance(conv.plan.transform_error, ValueError)
+    assert conv.process_files([in_dir]) == 0
+    errors = conv.processing_stats.errors
+    assert len(errors) == 2 and all("ファイル処理エラー" in e and "ルール不正" in e for e in errors)
+    assert not (tmp_path / "out").exists()
+
+
+def test_rule_index_is_read_only_and_built_once_per_parse(monkeypatch):
+    """RuleIndex は構築時にルール表を複製する読取専用 Mapping で、解析結果の索引は参照毎に作り直さない。"""
+    split_rule = SimpleNamespace(transform_type="split")
+    func_rule = SimpleNamespace(transform_type="function")
+    table = {"parent": [func_rule]}
+    rules = xlsx2json.RuleIndex(table)
+    keys = ["parent", "child"]
+    assert xlsx2json.get_applicable_transform_rules(rules, keys, keys) is None
+    # 元の dict/list を変更しても構築済みの索引は変わらない
+    table["parent"][0] = split_rule
+    table["items.*"] = [func_rule]
+    assert rules["parent"] == [func_rule] and "items.*" not in rules
+    assert xlsx2json.get_applicable_transform_rules(rules, keys, keys) is None
+    with pytest.raises(TypeError):
+        rules["parent"] = [split_rule]
+    assert rules == {"parent": [func_rule]}
+
+    compiles = []
+    orig = xlsx2json.RuleIndex._compile
+    monkeypatch.setattr(xlsx2json.RuleIndex, "_compile", lambda self: compiles.append(1) or orig(self))
+    parsed = xlsx2json.parse_array_transform_rules(["json.arr.*.name=split:,"], "json")
+    for i in range(1, 50):
+        path = ["arr", str(i), "name"]
+        assert xlsx2json.get_applicable_transform_rules(parsed, path, path) is parsed["arr.*.name"]
+    assert len(compiles) == 1
+    assert xlsx2json.as_rule_index(parsed) is parsed and isinstance(xlsx2json.as_rule_index(None), xlsx2json.RuleIndex)
+
+
+@pytest.mark.skipif(
+    "fork" not in __import__("multiprocessing").get_all_start_methods(), reason="プロセス並列は fork 環境のみ"
+)
+def test_command_server_chain_with_process_executor_does_not_use_inherited_servers(tmp_path, caplog):
+    """常駐コマンドを含むルール列は executor=process でも親の常駐プロセスを fork 先で使わない。"""
+    script = tmp_path / "srv.py"
+    script.write_text(
+        "import json, sys\n"
+        "for line in sys.stdin.buffer:\n"
+        "    req = json.loads(line)\n"
+        "    sys.stdout.write(json.dumps({'id': req['id'], 'output': req['input'].upper()}) + '\\n')\n"
+        "    sys.stdout.flush()\n"
+    )
+    module = tmp_path / "ident_mod.py"
+    module.write_text("def ident(v):\n    return v\n")
+    rules = xlsx2json.parse_array_transform_rules(
+        [
+            f"json.a.*=command[server,timeout=3]:{sys.executable} {script}",
+            f"json.a.*=function[parallel=2,executor=process]:{module}:ident",
+        ],
+        "json",
+    )
+    chain = rules["a.*"]
+    assert xlsx2json.TransformExecutor.for_rules(chain).kind == "thread"
+    with caplog.at_level(logging.ERROR):
+        assert xlsx2json.apply_wildcard_transforms({"a": {"x": "one"}}, rules, "json") == {"a": {"x": "ONE"}}
+        out = xlsx2json.apply_wildcard_transforms({"a": {k: k for k in "pqrs"}}, rules, "json")
+    assert out == {"a": {k: k.upper() for k in "pqrs"}}
+    assert "Command timeout" not in caplog.text
+
+    # 常駐プロセスの読取スレッドが動いている間は fork せず、スレッドで実行する
+    server_rule = chain[0]
+    assert not xlsx2json._fork_pool_available()
+    results = xlsx2json.ProcessTransformExecutor(2).map(server_rule.transform, ["u", "v", "w", "z"])
+    assert results == ["U", "V", "W", "Z"] and "Command timeout" not in caplog.text
+    server_rule._command_pool.close()
+
+
+def test_extraction_plan_recounts_label_series_with_plain_reads(tmp_path):
+    """ラベルで件数が決まるコンテナは、適用時にラベルセルのみ読み直して件数を求める（上限は親範囲）。"""
+    thin = Side(style="thin")
+
+    def build(path, n):
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "S"
+        ws["A1"], ws["B1"], ws["D1"] = "name", "qty", "title"
+        # 枠線付きの固定レイアウト（使用範囲は値の件数に依存しない）
+        for r in range(1, 7):
+            for c in (1, 2):
+                ws.cell(row=r, column=c).border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        for i in range(n):
+            ws.cell(row=2 + i, column=1, value=f"item{i + 1}")
+            ws.cell(row=2 + i, column=2, value=i + 1)
+        for nm, ref in (
+            ("json.items", "'S'!$A$2:$B$6"),
+            ("json.items.1.name", "'S'!$A$2"),
+            ("json.items.1.qty", "'S'!$B$2"),
+            ("json.title", "'S'!$D$1"),
+        ):
+            wb.defined_names[nm] = DefinedName(nm, attr_text=ref)
+        wb.save(path)
+        return path
+
+    containers = {"json.items": {"direction": "row", "increment": 1, "labels": ["name"]}}
+    template = build(tmp_path / "t.xlsx", 2)
+    real_load = xlsx2json.load_workbook_for_extraction
+    with patch.object(xlsx2json, "load_workbook_for_extraction", side_effect=real_load) as load:
+        plan = json.loads(json.dumps(xlsx2json.compile_extraction_plan(template, "json", containers=containers)))
+    # ブックの読み込みは1度だけで、指紋は読み込み直したブックで求めたものと一致する
+    assert load.call_count == 1
+    assert plan["fingerprint"] == xlsx2json.workbook_template_fingerprint(
+        real_load(template), plan["border-samples"], extent_sheets=plan["extent-sheets"]
+    )
+    (record,) = plan["series"]
+    assert record["count-labels"] == [[1, 2]] and record["count-cap"] == 5
+
+    for n in (0, 1, 4, 5):
+        path = build(tmp_path / f"i{n}.xlsx", n)
+        xlsx2json.set_current_context(xlsx2json.Context(processing_stats=xlsx2json.ProcessingStats()))
+        expected = xlsx2json.parse_named_ranges_with_prefix(path, "json", containers=containers)
+        xlsx2json.set_current_context(xlsx2json.Context(processing_stats=xlsx2json.ProcessingStats()))
+        with patch.object(xlsx2json, "_analyze_sheet_for_container", side_effect=AssertionError("解析段は不要")):
+            actual = xlsx2json.parse_named_ranges_with_prefix(
+                path, "json", containers=containers, extraction_plan=plan
+            )
+        assert actual == expected and not xlsx2json.stats().warnings
+        assert len(actual["json"].get("items", [])) == n
+
+
+def test_extraction_plan_applies_to_files_with_a_different_row_count(tmp_path):
+    """件数をラベルで数え直すシートは使用範囲を指紋に含めず、行数の異なるブックにもプランを適用する。"""
+
+    def build(path, n):
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "S"
+        ws["A1"], ws["B1"], ws["D1"] = "name", "qty", "title"
+        for i in range(n):
+            ws.cell(row=2 + i, column=1, value=f"item{i + 1}")
+            ws.cell(row=2 + i, column=2, value=i + 1)
+        set_defined_names(wb, {"json.items.1.name": "S!$A$2", "json.items.1.qty": "S!$B$2", "json.title": "S!$D$1"})
+        wb.save(path)
+        return path
+
+    containers = {"json.items": {"direction": "row", "increment": 1, "labels": ["name"]}}
+    template = build(tmp_path / "t.xlsx", 50)
+    plan = json.loads(json.dumps(xlsx2json.compile_extraction_plan(template, "json", containers=containers)))
+    assert plan["extent-sheets"] == []
+
+    path = build(tmp_path / "short.xlsx", 40)
+    xlsx2json.set_current_context(xlsx2json.Context(processing_stats=xlsx2json.ProcessingStats()))
+    expected = xlsx2json.parse_named_ranges_with_prefix(path, "json", containers=containers)
+    xlsx2json.set_current_context(xlsx2json.Context(processing_stats=xlsx2json.ProcessingStats()))
+    with patch.object(xlsx2json, "_analyze_sheet_for_container", side_effect=AssertionError("解析段は不要")):
+        actual = xlsx2json.parse_named_ranges_with_prefix(path, "json", containers=containers, extraction_plan=plan)
+    assert actual == expected and not xlsx2json.stats().warnings
+    assert len(actual["json"]["items"]) == 40
+
+    # 矩形検出のあるシート・件数をそのまま適用するシートのみ使用範囲を照合する
+    series = [
+        {"sheet": "Fixed", "count-labels": None, "range-count": None},
+        {"sheet": "Labels", "count-labels": [[1, 2]], "range-count": None},
+        {"sheet": "Ranged", "count-labels": None, "range-count": 3},
+    ]
+    assert xlsx2json._plan_extent_sheets([["Rects", "A1", 0, []]], series) == ["Fixed", "Rects"]
+    wb = Workbook()
+    wb.active.title = "Fixed"
+    wb.create_sheet("Labels")
+    before = xlsx2json.workbook_template_fingerprint(wb, extent_sheets=["Fixed"])
+    wb["Labels"]["A100"] = "x"
+    assert xlsx2json.workbook_template_fingerprint(wb, extent_sheets=["Fixed"]) == before
+    wb["Fixed"]["A100"] = "x"
+    assert xlsx2json.workbook_template_fingerprint(wb, extent_sheets=["Fixed"]) != before
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
     pytest.main([__file__, "-v"])
@@ -15,16 +15,41 @@ import subprocess
 import io
 import sys
 import shlex
+import threading
+import weakref
+import copy
+import hashlib
+import functools
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import islice
 import yaml
-from contextlib import redirect_stdout, redirect_stderr
+from contextlib import contextmanager, redirect_stdout, redirect_stderr
 from dataclasses import dataclass, field
 from pathlib import Path
-from types import TracebackType
-from typing import Any, Dict, List, Optional, Tuple, TypeGuard, Union, cast, Callable, Sequence, Iterable, Mapping
+from types import SimpleNamespace, TracebackType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeGuard,
+    Union,
+    cast,
+)
 
 # モジュール全体で使用する外部ライブラリ
 from openpyxl import load_workbook, Workbook
+from openpyxl.styles.borders import Border
 from openpyxl.utils import column_index_from_string, get_column_letter
+from openpyxl.utils.cell import coordinate_to_tuple, range_boundaries
 from jsonschema import Draft7Validator, FormatChecker
 
 # ロガー
@@ -46,6 +71,11 @@ class ProcessingStats:
     - cells_generated: JSONセル（項目）生成数
     - cells_read: Excelセル読取数
     - empty_cells_skipped: 空セルをスキップした数
+    - border_cache_hits/border_cache_misses: 罫線グリッド（`border_grid()`）のヒット/ミス（構築）数
+    - anchor_cache_hits/anchor_cache_misses: アンカー矩形キャッシュのヒット/ミス数
+    - conversion_cache_hits/conversion_cache_misses: 変換結果キャッシュ（--cache-dir）のヒット/ミス数
+    - prelude_cache_hits/prelude_cache_misses/prelude_cache_evictions: パース前派生情報 LRU のヒット/ミス/追い出し数
+    - container_seconds: コンテナ毎の処理時間（秒、wall time の累計）
     - errors: 発生したエラーメッセージの一覧
     - start_time/end_time: 処理の開始/終了時刻（秒）
     """
@@ -54,6 +84,16 @@ class ProcessingStats:
     cells_generated: int = 0
     cells_read: int = 0
     empty_cells_skipped: int = 0
+    border_cache_hits: int = 0
+    border_cache_misses: int = 0
+    anchor_cache_hits: int = 0
+    anchor_cache_misses: int = 0
+    conversion_cache_hits: int = 0
+    conversion_cache_misses: int = 0
+    prelude_cache_hits: int = 0
+    prelude_cache_misses: int = 0
+    prelude_cache_evictions: int = 0
+    container_seconds: Dict[str, float] = field(default_factory=dict)
     errors: List[str] = field(default_factory=list)
     warnings: List[str] = field(default_factory=list)
     start_time: Optional[float] = None
@@ -82,6 +122,26 @@ class ProcessingStats:
             len(self.errors),
             duration if duration is not None else -1.0,
         )
+        logger.info(
+            "キャッシュ統計: border hit=%d miss=%d, anchor hit=%d miss=%d, conversion hit=%d miss=%d, "
+            "prelude hit=%d miss=%d evict=%d",
+            self.border_cache_hits,
+            self.border_cache_misses,
+            self.anchor_cache_hits,
+            self.anchor_cache_misses,
+            self.conversion_cache_hits,
+            self.conversion_cache_misses,
+            self.prelude_cache_hits,
+            self.prelude_cache_misses,
+            self.prelude_cache_evictions,
+        )
+        if self.container_seconds:
+            path, total = container_critical_path(self.container_seconds)
+            logger.info(
+                "コンテナ処理時間のクリティカルパス: %s（計 %.3fs）",
+                " → ".join(f"{name}={self.container_seconds[name]:.3f}s" for name in path),
+                total,
+            )
         # テスト互換: 各項目を日本語で個別にも出力
         logger.info("処理されたコンテナ数: %d", self.containers_processed)
         logger.info("エラー数: %d", len(self.errors))
@@ -93,6 +153,16 @@ class ProcessingStats:
         self.cells_generated = 0
         self.cells_read = 0
         self.empty_cells_skipped = 0
+        self.border_cache_hits = 0
+        self.border_cache_misses = 0
+        self.anchor_cache_hits = 0
+        self.anchor_cache_misses = 0
+        self.conversion_cache_hits = 0
+        self.conversion_cache_misses = 0
+        self.prelude_cache_hits = 0
+        self.prelude_cache_misses = 0
+        self.prelude_cache_evictions = 0
+        self.container_seconds.clear()
         self.errors.clear()
         self.start_time = None
         self.end_time = None
@@ -102,11 +172,34 @@ class ProcessingStats:
         logger.warning(message)
         self.warnings.append(message)
 
+    def add_container_time(self, container_name: str, seconds: float) -> None:
+        self.container_seconds[container_name] = self.container_seconds.get(container_name, 0.0) + seconds
+
     def get_duration(self) -> float:
         if self.start_time is None or self.end_time is None:
             return 0.0
         return max(0.0, self.end_time - self.start_time)
 
+    def merge(self, other: "ProcessingStats") -> None:
+        """別プロセス等で収集した統計を加算する（開始/終了時刻は対象外）。"""
+        self.containers_processed += other.containers_processed
+        self.cells_generated += other.cells_generated
+        self.cells_read += other.cells_read
+        self.empty_cells_skipped += other.empty_cells_skipped
+        self.border_cache_hits += other.border_cache_hits
+        self.border_cache_misses += other.border_cache_misses
+        self.anchor_cache_hits += other.anchor_cache_hits
+        self.anchor_cache_misses += other.anchor_cache_misses
+        self.conversion_cache_hits += other.conversion_cache_hits
+        self.conversion_cache_misses += other.conversion_cache_misses
+        self.prelude_cache_hits += other.prelude_cache_hits
+        self.prelude_cache_misses += other.prelude_cache_misses
+        self.prelude_cache_evictions += other.prelude_cache_evictions
+        for name, seconds in other.container_seconds.items():
+            self.add_container_time(name, seconds)
+        self.errors.extend(other.errors)
+        self.warnings.extend(other.warnings)
+
 
 @dataclass(frozen=True)
 class CLIConfig:
@@ -714,6 +807,15 @@ def find_region_bounds_for_positions(
     return (top, left, bottom, right) if comp >= 1.0 else None
 
 
+# 矩形検出の探索予算（候補辺判定の回数上限）。0 で無制限（既定は無制限で、指定時のみ打ち切る）。
+RECT_SCAN_BUDGET_DEFAULT = 0
+# 罫線グリッドを使えない（全探索にフォールバックする）シートで名前無し検出時に走査する左上ウィンドウ
+RECT_BRUTEFORCE_WINDOW = 30
+# セル名マップ付きの矩形検出で、名前付きセルの外接矩形に付与する探索マージン（行/列）
+RECT_SCAN_ROW_MARGIN = 20
+RECT_SCAN_COL_MARGIN = 10
+
+
 @dataclass(frozen=True)
 class ProcessingConfig:
     """処理設定を管理するデータクラス"""
@@ -730,6 +832,25 @@ class ProcessingConfig:
     # 出力形状オプション: 指定したルート名を配列のオブジェクト（{groupKey: {...}}）にラップ
     # ログフォーマット（デフォルトはタイムスタンプ付き）。設定/CLIで上書き可能。
     log_format: Optional[str] = None
+    # ワークブック読込モード（full: 全セル構築 / sparse: 定義名・コンテナの参照範囲のみ構築）
+    load_mode: str = "full"
+    # 読込バックエンド（openpyxl: 参照実装 / ooxml: XML 直接解析）
+    reader: str = "openpyxl"
+    # 矩形検出の探索予算（0 で無制限）
+    rect_scan_budget: int = RECT_SCAN_BUDGET_DEFAULT
+    # 並列変換のワーカープロセス数（1 で逐次処理）
+    jobs: int = 1
+    # コンテナのシート単位解析の並列ワーカープロセス数（1 で逐次処理）
+    sheet_jobs: int = 1
+    # 独立したコンテナ部分木（ルート名が異なるコンテナ群）の並列ワーカープロセス数（1 で逐次処理）
+    container_jobs: int = 1
+    # テンプレートの抽出プラン（--plan）と、プランの保存先（--compile-template）
+    plan: Optional[Path] = None
+    compile_template: Optional[Path] = None
+    # 変換結果キャッシュ（入力内容と実効設定のハッシュが一致する入力をスキップ）
+    cache_dir: Optional[Path] = None
+    force: bool = False
+    cache_prune: bool = False
 
 
 @dataclass
@@ -737,11 +858,61 @@ class Context:
     """実行時コンテキスト。
 
     - processing_stats: 処理統計（アクセスは原則 `stats()` アクセサ経由）
-    - border_cache / anchor_rects_cache: 罫線/アンカー矩形のキャッシュ
+    - anchor_rects_cache: アンカー矩形のキャッシュ
+    - border_grids: シート毎の (罫線世代, 罫線ビットグリッド)（`border_grid()` アクセサ経由。シート破棄で自動解放）
+    - border_versions: シート毎の罫線世代番号。世代の異なるグリッドは再構築され、
+      罫線を変更した場合は `invalidate_borders()` で世代を進める
+    - rect_scan_budget: 矩形検出の探索予算（0 で無制限）
+    - sheet_jobs: コンテナのシート単位解析の並列ワーカープロセス数（1 で逐次処理）
+    - container_jobs: 独立したコンテナ部分木の並列ワーカープロセス数（1 で逐次処理）
+    - name_indexes: ワークブック毎の定義名索引（`defined_name_index()` アクセサ経由。定義名の内容で照合）
+    - pinned_name_indexes: `pinned_defined_name_index()` の区間中、照合を省いて返す索引
+    - sheet_pool: 解析中のファイルで共有するシート解析プール（`sheet_analysis_pool()` の区間中のみ）
+    - plan_recorder: 抽出プラン作成中のみ、コンテナ×シートの出力指示を記録するリスト
+    - element_streams: パース中のみ、要素を生成名を介さずに結果ツリーへ逐次挿入するコンテナ（`element_streaming()` の区間中）
     """
     processing_stats: "ProcessingStats"
-    border_cache: dict[tuple, bool] = field(default_factory=dict)
     anchor_rects_cache: dict[tuple, list] = field(default_factory=dict)
+    border_grids: "weakref.WeakKeyDictionary[Any, Tuple[int, Optional[BorderGrid]]]" = field(
+        default_factory=weakref.WeakKeyDictionary
+    )
+    border_versions: dict[int, int] = field(default_factory=dict)
+    rect_scan_budget: int = RECT_SCAN_BUDGET_DEFAULT
+    sheet_jobs: int = 1
+    container_jobs: int = 1
+    name_indexes: "weakref.WeakKeyDictionary[Any, DefinedNameIndex]" = field(
+        default_factory=weakref.WeakKeyDictionary
+    )
+    pinned_name_indexes: "weakref.WeakKeyDictionary[Any, DefinedNameIndex]" = field(
+        default_factory=weakref.WeakKeyDictionary
+    )
+    sheet_pool: Optional["SheetAnalysisPool"] = None
+    plan_recorder: Optional[List[Dict[str, Any]]] = None
+    element_streams: Optional["ElementStreams"] = None
+
+    def border_version(self, worksheet) -> int:
+        return self.border_versions.get(id(worksheet), 0)
+
+    def invalidate_borders(self, worksheet=None) -> None:
+        """罫線の変更を通知し、関連キャッシュ（罫線グリッド/アンカー矩形）を無効化する。
+
+        worksheet を指定した場合はそのシートの世代を進めて該当エントリのみ破棄し、
+        省略時は全シート分を破棄する（ワークブック切替時）。
+        """
+        if worksheet is None:
+            self.anchor_rects_cache.clear()
+            self.border_grids.clear()
+            self.border_versions.clear()
+            return
+        ws_id = id(worksheet)
+        self.border_versions[ws_id] = self.border_versions.get(ws_id, 0) + 1
+        title = getattr(worksheet, "title", None)
+        for key in [k for k in self.anchor_rects_cache if k[1] == title]:
+            del self.anchor_rects_cache[key]
+        try:
+            self.border_grids.pop(worksheet, None)
+        except TypeError:
+            pass
 
 
 # 現在のグローバル実行コンテキスト（後方互換のため初期化時に processing_stats を共有）
@@ -767,29 +938,267 @@ def set_current_context(ctx: Context) -> None:
     processing_stats = ctx.processing_stats
 
 
-def border_cache() -> dict:
-    return get_current_context().border_cache
-
-
 def anchor_rects_cache() -> dict:
     return get_current_context().anchor_rects_cache
 
 
+def invalidate_border_cache(worksheet=None) -> None:
+    """罫線を変更した後に呼び出し、現在の Context の罫線関連キャッシュを無効化する。"""
+    get_current_context().invalidate_borders(worksheet)
+
+
+def border_grid(worksheet) -> Optional["BorderGrid"]:
+    """ワークシートの罫線ビットグリッドを返す（初回アクセス時に1パスで構築し Context に保持）。
+
+    グリッドはシートの罫線世代と組で保持し、`invalidate_border_cache()` で世代が進んだシートは
+    再構築する。参照のヒット/ミスは ProcessingStats の border_cache_hits/misses に計上する。
+    title を持たない、またはセル辞書を公開しないシート（テスト用ダミー等）は None を返し、
+    呼び出し側はセル単位の判定へフォールバックする。
+    """
+    if getattr(worksheet, "title", None) is None:
+        return None
+    ctx = get_current_context()
+    version = ctx.border_version(worksheet)
+    try:
+        entry = ctx.border_grids.get(worksheet)
+        if entry is not None and entry[0] == version:
+            ctx.processing_stats.border_cache_hits += 1
+            return entry[1]
+        ctx.processing_stats.border_cache_misses += 1
+        grid = BorderGrid.from_worksheet(worksheet)
+        ctx.border_grids[worksheet] = (version, grid)
+    except TypeError:
+        # 弱参照不可のシート実装
+        return None
+    return grid
+
+
 def stats() -> "ProcessingStats":
     """現在の処理統計を返す（Context 経由）。"""
     return get_current_context().processing_stats
 
 
+@dataclass(frozen=True)
+class RunPlan:
+    """実行全体で不変な前処理結果（変換ルールと読込済み関数、スキーマ検証器、スキーマ索引）。
+
+    ファイル毎に再構築すると関数モジュールの再読込やコマンド疎通確認が毎回走るため、
+    コンバータ生成時に1度だけコンパイルし、全ファイル（プールのワーカーではプロセス毎に1度）で共有する。
+    変換ルールの解析エラーは transform_error に保持し、従来どおり各ファイルの処理エラーとして記録する。
+    """
+
+    transform_rules: Optional["RuleIndex"] = None
+    validator: Optional[Draft7Validator] = None
+    schema_index: Optional["SchemaIndex"] = None
+    extraction_plan: Optional[Dict[str, Any]] = None
+    transform_error: Optional[Exception] = None
+
+    @classmethod
+    def compile(cls, config: ProcessingConfig) -> "RunPlan":
+        transform_rules = None
+        transform_error = None
+        if config.transform_rules:
+            try:
+                transform_rules = parse_array_transform_rules(
+                    config.transform_rules,
+                    config.prefix,
+                    config.schema,
+                    config.trim,
+                )
+            except Exception as e:
+                logger.debug("変換ルールの解析に失敗しました（ファイル毎にエラーとして記録）: %s", e)
+                transform_error = e
+        validator = None
+        schema_index = None
+        if config.schema:
+            # date-time / time などの format 検証を有効化
+            validator = Draft7Validator(config.schema, format_checker=FormatChecker())
+            schema_index = SchemaIndex(config.schema)
+        extraction_plan = load_extraction_plan(config.plan) if config.plan else None
+        if extraction_plan is not None and extraction_plan.get("settings") != extraction_plan_settings(config):
+            logger.warning(f"抽出プランの作成時と設定が異なるため、プランを使わずに通常解析を行います: {config.plan}")
+            extraction_plan = None
+        return cls(
+            transform_rules=transform_rules,
+            validator=validator,
+            schema_index=schema_index,
+            extraction_plan=extraction_plan,
+            transform_error=transform_error,
+        )
+
+
+# プールのワーカープロセス毎に1度だけ構築するコンバータ（RunPlan を再利用する）
+_worker_converter: Optional["Xlsx2JsonConverter"] = None
+
+
+def _init_pool_worker(config: ProcessingConfig) -> None:
+    global _worker_converter
+    _worker_converter = Xlsx2JsonConverter(config)
+
+
+def _process_file_in_worker(config: ProcessingConfig, xlsx_file: Path) -> "ProcessingStats":
+    """プロセスプールのワーカー: 独立した Context で1ファイルを変換し、そのファイルの統計を返す。"""
+    converter = _worker_converter
+    if converter is None or converter.config != config:
+        converter = Xlsx2JsonConverter(config)
+    converter.processing_stats = ProcessingStats()
+    set_current_context(
+        Context(
+            processing_stats=converter.processing_stats,
+            rect_scan_budget=config.rect_scan_budget,
+            sheet_jobs=config.sheet_jobs,
+            container_jobs=config.container_jobs,
+        )
+    )
+    try:
+        converter._process_single_file(xlsx_file)
+    except Exception as e:
+        converter.processing_stats.add_error(f"ファイル処理エラー {xlsx_file}: {e}")
+    return converter.processing_stats
+
+
+def _worker_error_stats(xlsx_file: Path, error: BaseException) -> "ProcessingStats":
+    logger.error("ファイル処理エラー %s: %s", xlsx_file, error)
+    st = ProcessingStats()
+    st.add_error(f"ファイル処理エラー {xlsx_file}: {error}")
+    return st
+
+
+def _file_sha256(path: Union[str, Path]) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _transform_source_files(transform_rules: Optional[Dict[str, List["ArrayTransformRule"]]]) -> List[Path]:
+    """function 変換ルールが読み込むソースファイル（file.py またはモジュールの実体）を列挙する。"""
+    files: set[Path] = set()
+    for rule_list in (transform_rules or {}).values():
+        for rule in rule_list:
+            if rule.transform_type not in ("function", "batch_function") or ":" not in rule.transform_spec:
+                continue
+            module_or_file = rule.transform_spec.rsplit(":", 1)[0]
+            try:
+                if module_or_file.endswith(".py"):
+                    origin = module_or_file
+                else:
+                    spec = importlib.util.find_spec(module_or_file)
+                    origin = getattr(spec, "origin", None) if spec is not None else None
+                if origin and Path(origin).is_file():
+                    files.add(Path(origin).resolve())
+            except Exception as e:
+                logger.debug("transform source lookup skipped: %s: %s", module_or_file, e)
+    return sorted(files)
+
+
+def compute_effective_config_hash(config: ProcessingConfig, plan: Optional[RunPlan] = None) -> str:
+    """出力に影響する設定（prefix/コンテナ/変換ルール/スキーマ等）と変換モジュール・本体ソースのハッシュ。"""
+    payload = {
+        "prefix": config.prefix,
+        "trim": config.trim,
+        "output_format": config.output_format,
+        "schema": config.schema,
+        "containers": config.containers,
+        "transform_rules": config.transform_rules,
+        "max_elements": config.max_elements,
+        "load_mode": config.load_mode,
+        "reader": config.reader,
+        "rect_scan_budget": config.rect_scan_budget,
+        "plan": _file_sha256(config.plan) if config.plan and Path(config.plan).is_file() else None,
+        "sources": {
+            str(p): _file_sha256(p)
+            for p in [Path(__file__).resolve(), *_transform_source_files(plan.transform_rules if plan else None)]
+        },
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+
+
+class ConversionCache:
+    """変換結果のマニフェスト（<cache_dir>/xlsx2json-cache.json）。
+
+    エントリは入力ファイルの絶対パスをキーに、入力内容ハッシュ・実効設定ハッシュ・出力パスを保持する。
+    両ハッシュが一致し出力が存在する入力は再変換不要と判定する。
+    """
+
+    MANIFEST_NAME = "xlsx2json-cache.json"
+    VERSION = 1
+
+    def __init__(self, cache_dir: Union[str, Path], config_hash: str):
+        self.path = Path(cache_dir) / self.MANIFEST_NAME
+        self.config_hash = config_hash
+        self.entries: Dict[str, Dict[str, str]] = {}
+        self._dirty = False
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if isinstance(data, dict) and data.get("version") == self.VERSION and isinstance(data.get("entries"), dict):
+                self.entries = data["entries"]
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"変換キャッシュを読み込めないため初期化します: {self.path}: {e}")
+
+    @staticmethod
+    def _key(xlsx_file: Path) -> str:
+        return str(Path(xlsx_file).resolve())
+
+    def is_fresh(self, xlsx_file: Path, input_hash: str, output_path: Path) -> bool:
+        entry = self.entries.get(self._key(xlsx_file))
+        return bool(
+            entry
+            and entry.get("input") == input_hash
+            and entry.get("config") == self.config_hash
+            and entry.get("output") == str(output_path)
+            and Path(output_path).is_file()
+        )
+
+    def record(self, xlsx_file: Path, input_hash: str, output_path: Path) -> None:
+        self.entries[self._key(xlsx_file)] = {
+            "input": input_hash,
+            "config": self.config_hash,
+            "output": str(output_path),
+        }
+        self._dirty = True
+
+    def discard(self, xlsx_file: Path) -> None:
+        if self.entries.pop(self._key(xlsx_file), None) is not None:
+            self._dirty = True
+
+    def prune(self) -> int:
+        """入力/出力が存在しない、または設定ハッシュが現在と異なるエントリを削除し、削除件数を返す。"""
+        stale = [
+            k
+            for k, e in self.entries.items()
+            if e.get("config") != self.config_hash or not Path(k).is_file() or not Path(e.get("output", "")).is_file()
+        ]
+        for k in stale:
+            del self.entries[k]
+        self._dirty = self._dirty or bool(stale)
+        return len(stale)
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps({"version": self.VERSION, "entries": self.entries}, ensure_ascii=False, indent=1),
+            encoding="utf-8",
+        )
+        tmp.replace(self.path)
+        self._dirty = False
+
+
 class Xlsx2JsonConverter:
     """Excel から JSON への変換を行うメインクラス"""
 
     def __init__(self, config: ProcessingConfig):
         self.config = config
         self.processing_stats = ProcessingStats()
-        self.validator = None
-        if config.schema:
-            # date-time / time などの format 検証を有効化
-            self.validator = Draft7Validator(config.schema, format_checker=FormatChecker())
+        # 変換ルール/スキーマは実行単位で1度だけコンパイルし、全ファイルで共有する
+        self.plan = RunPlan.compile(config)
+        self.validator = self.plan.validator
 
     def process_files(self, input_files: List[Union[str, Path]]) -> int:
         """ファイルリストを処理する"""
@@ -798,11 +1207,28 @@ class Xlsx2JsonConverter:
         # そのままコンバータのサマリに反映される
         self.processing_stats.start_processing()
         # Context に集約（後方互換のため processing_stats も同期）
-        set_current_context(Context(processing_stats=self.processing_stats))
+        set_current_context(
+            Context(
+                processing_stats=self.processing_stats,
+                rect_scan_budget=self.config.rect_scan_budget,
+                sheet_jobs=self.config.sheet_jobs,
+                container_jobs=self.config.container_jobs,
+            )
+        )
 
+        cache: Optional[ConversionCache] = None
         try:
             xlsx_files = self._collect_xlsx_files(input_files)
+            input_hashes: Dict[Path, str] = {}
+            if self.config.cache_dir:
+                cache = ConversionCache(self.config.cache_dir, compute_effective_config_hash(self.config, self.plan))
+                xlsx_files = self._filter_cached_files(xlsx_files, cache, input_hashes)
+            succeeded: Dict[Path, bool] = {}
+            if self.config.jobs > 1 and len(xlsx_files) > 1:
+                succeeded = self._process_files_parallel(xlsx_files)
+                xlsx_files = []
             for xlsx_file in xlsx_files:
+                n_errors = len(self.processing_stats.errors)
                 try:
                     self._process_single_file(xlsx_file)  # 各ファイルを処理
                 except Exception as e:
@@ -814,18 +1240,123 @@ class Xlsx2JsonConverter:
                     logger.exception(
                         f"ファイル処理中に例外。処理を継続します: {xlsx_file}"
                     )
+                succeeded[xlsx_file] = len(self.processing_stats.errors) == n_errors
+            if cache is not None:
+                for xlsx_file, ok in succeeded.items():
+                    if ok:
+                        cache.record(xlsx_file, input_hashes[xlsx_file], self._output_path_for(xlsx_file))
+                    else:
+                        cache.discard(xlsx_file)
         except Exception as e:
             self.processing_stats.add_error(f"処理中にエラーが発生: {e}")
             # ここは最上位ハンドラとしてスタックトレースを残す
             logger.exception("処理全体で未処理例外が発生しました")
             return 1
         finally:
+            if cache is not None:
+                try:
+                    if self.config.cache_prune:
+                        logger.info("変換キャッシュから古いエントリを %d 件削除しました", cache.prune())
+                    cache.save()
+                except Exception as e:
+                    logger.warning(f"変換キャッシュを保存できませんでした: {e}")
             self.processing_stats.end_processing()
             self.processing_stats.log_summary()
 
         # エラーがあっても処理完了の場合は0を返す（従来の動作を維持）
         return 0
 
+    def _filter_cached_files(
+        self, xlsx_files: List[Path], cache: ConversionCache, input_hashes: Dict[Path, str]
+    ) -> List[Path]:
+        """入力内容ハッシュを求め、キャッシュ上で最新の入力を除いたリストを返す（--force 時は全件）。"""
+        pending: List[Path] = []
+        for xlsx_file in xlsx_files:
+            input_hashes[xlsx_file] = _file_sha256(xlsx_file)
+            if not self.config.force and cache.is_fresh(
+                xlsx_file, input_hashes[xlsx_file], self._output_path_for(xlsx_file)
+            ):
+                self.processing_stats.conversion_cache_hits += 1
+                logger.debug(f"変換キャッシュにヒットしたためスキップ: {xlsx_file}")
+                continue
+            self.processing_stats.conversion_cache_misses += 1
+            pending.append(xlsx_file)
+        return pending
+
+    def _output_path_for(self, xlsx_file: Path) -> Path:
+        """入力ファイルに対応する出力パス（_process_single_file/_write_output と同じ規則）。"""
+        out_dir = Path(self.config.output_dir) if self.config.output_dir else (xlsx_file.parent / "output")
+        extension = ".yaml" if self.config.output_format == "yaml" else ".json"
+        return out_dir / f"{xlsx_file.stem}{extension}"
+
+    def _process_files_parallel(self, xlsx_files: List[Path]) -> Dict[Path, bool]:
+        """ファイル単位でプロセスプールへ分配し、各ファイルの統計を入力順に集約する。
+
+        返り値はファイル毎の成否（エラーが記録されなかったか）。
+
+        ワーカーは独立した Context（キャッシュ/統計）で処理し、出力は逐次処理と同一。
+        ワーカーが異常終了した場合は未完了ファイルを新しいプールで再実行し、
+        再度異常終了した場合は残りを1ファイルずつ隔離実行して原因ファイルのみをエラーとする。
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        from concurrent.futures.process import BrokenProcessPool
+
+        results: Dict[Path, ProcessingStats] = {}
+        pending = list(xlsx_files)
+        for attempt in range(2):
+            broken = False
+            with ProcessPoolExecutor(
+                max_workers=min(self.config.jobs, len(pending)),
+                initializer=_init_pool_worker,
+                initargs=(self.config,),
+            ) as pool:
+                futures = {f: pool.submit(_process_file_in_worker, self.config, f) for f in pending}
+                for f, fut in futures.items():
+                    try:
+                        results[f] = fut.result()
+                    except BrokenProcessPool:
+                        broken = True
+                    except Exception as e:
+                        results[f] = _worker_error_stats(f, e)
+            pending = [f for f in pending if f not in results]
+            if not broken or not pending:
+                break
+            logger.warning("ワーカープロセスが異常終了しました。未完了 %d 件を再実行します", len(pending))
+        for f in pending:
+            # 隔離実行（異常終了したファイルのみをエラーとして記録）
+            try:
+                with ProcessPoolExecutor(max_workers=1, initializer=_init_pool_worker, initargs=(self.config,)) as pool:
+                    results[f] = pool.submit(_process_file_in_worker, self.config, f).result()
+            except BrokenProcessPool:
+                results[f] = _worker_error_stats(f, RuntimeError("ワーカープロセスが異常終了しました"))
+            except Exception as e:
+                results[f] = _worker_error_stats(f, e)
+        for f in xlsx_files:
+            self.processing_stats.merge(results[f])
+        return {f: not results[f].errors for f in xlsx_files}
+
+    def compile_template(self, input_files: List[Union[str, Path]], plan_path: Path) -> int:
+        """先頭の入力ブックをテンプレートとして解析し、抽出プランを JSON で保存する。"""
+        xlsx_files = self._collect_xlsx_files(input_files)
+        if not xlsx_files:
+            logger.error("テンプレートとなる入力ファイルがありません")
+            return 1
+        template = xlsx_files[0]
+        plan = compile_extraction_plan(
+            template,
+            self.config.prefix,
+            containers=self.config.containers,
+            global_max_elements=self.config.max_elements,
+            load_mode=self.config.load_mode,
+            reader=self.config.reader,
+            settings=extraction_plan_settings(self.config),
+        )
+        plan_path = Path(plan_path)
+        plan_path.parent.mkdir(parents=True, exist_ok=True)
+        plan_path.write_text(json.dumps(plan, ensure_ascii=False, indent=2), encoding="utf-8")
+        logger.info(f"抽出プランを保存しました: {plan_path}（テンプレート: {template}）")
+        return 0
+
     def _collect_xlsx_files(self, inputs: List[Union[str, Path]]) -> List[Path]:
         """入力からXLSXファイルを収集"""
         files = []
@@ -841,28 +1372,28 @@ class Xlsx2JsonConverter:
         """単一ファイルの処理"""
         logger.debug(f"Processing: {xlsx_file}")
         # ワークブック毎にキャッシュをクリア（Context 経由）
-        border_cache().clear()
-        anchor_rects_cache().clear()
+        invalidate_border_cache()
         try:
-            # 変換ルールの処理
-            array_transform_rules = None
-            if self.config.transform_rules:
-                array_transform_rules = parse_array_transform_rules(
-                    self.config.transform_rules,
-                    self.config.prefix,
-                    self.config.schema,
-                    self.config.trim,
-                )
-
+            # 変換ルールの解析エラー（RunPlan で検出）はファイル単位のエラーとして記録する
+            if self.plan.transform_error is not None:
+                raise self.plan.transform_error.with_traceback(None)
             # 解析を実行（global_max_elements は None の場合は渡さない）
             _extra: Dict[str, Any] = {}
             if self.config.max_elements is not None:
                 _extra["global_max_elements"] = self.config.max_elements
+            if self.config.load_mode != "full":
+                _extra["load_mode"] = self.config.load_mode
+            if self.config.reader != "openpyxl":
+                _extra["reader"] = self.config.reader
+            if self.plan.schema_index is not None:
+                _extra["schema_index"] = self.plan.schema_index
+            if self.plan.extraction_plan is not None:
+                _extra["extraction_plan"] = self.plan.extraction_plan
             data = parse_named_ranges_with_prefix(
                 xlsx_file,
                 self.config.prefix,
                 array_split_rules=None,
-                array_transform_rules=array_transform_rules,
+                array_transform_rules=self.plan.transform_rules,
                 containers=self.config.containers,
                 schema=self.config.schema,
                 **_extra,
@@ -1216,20 +1747,79 @@ def prepare_containers_and_generated_names(
         generated = generate_cell_names_from_containers(
             containers, wb, global_max_elements, prefix=prefix, extraction_policy=extraction_policy
         )
-        # 生成されたセル名を _generated_names に登録（既存定義名があってもオーバーライド可能）
-        for name, range_ref in generated.items():
-            prefixed_name = name if name.startswith(f"{prefix}.") else f"{prefix}.{name}"
-            set_generated_name(wb, prefixed_name, range_ref)
-            if prefixed_name in wb.defined_names:
-                logger.debug(
-                    "生成名を既存定義名に対するオーバーライドとして登録: %s", prefixed_name
-                )
-            else:
-                logger.debug("生成名を登録: %s -> %r", prefixed_name, range_ref)
+        register_generated_names(wb, generated, prefix=prefix)
         logger.debug(f"コンテナ処理完了: {len(generated)}個のセル名を生成")
     return containers, user_provided, generated
 
 
+def register_generated_names(wb, generated: Dict[str, Any], *, prefix: str) -> None:
+    """生成されたセル名を _generated_names に登録する（既存定義名があってもオーバーライド可能）。"""
+    for name, range_ref in generated.items():
+        prefixed_name = name if name.startswith(f"{prefix}.") else f"{prefix}.{name}"
+        set_generated_name(wb, prefixed_name, range_ref)
+        if prefixed_name in wb.defined_names:
+            logger.debug(
+                "生成名を既存定義名に対するオーバーライドとして登録: %s", prefixed_name
+            )
+        else:
+            logger.debug("生成名を登録: %s -> %r", prefixed_name, range_ref)
+
+
+class GeneratedRef(NamedTuple):
+    """生成名が指すセル範囲（1始まり、解析済み）。"Sheet!$A$1" 文字列の代わりに保持する。"""
+
+    sheet: str
+    top: int
+    left: int
+    bottom: int
+    right: int
+
+    @property
+    def shape(self) -> str:
+        """"cell" / "row"（1xN） / "col"（Nx1） / "2d" のいずれか。"""
+        if self.top == self.bottom and self.left == self.right:
+            return "cell"
+        if self.top == self.bottom:
+            return "row"
+        if self.left == self.right:
+            return "col"
+        return "2d"
+
+    def coord(self) -> str:
+        start = f"${get_column_letter(self.left)}${self.top}"
+        if self.shape == "cell":
+            return start
+        return f"{start}:${get_column_letter(self.right)}${self.bottom}"
+
+    def __str__(self) -> str:
+        return f"{self.sheet}!{self.coord()}"
+
+
+class GeneratedDefinedName:
+    """生成名を DefinedName 互換（attr_text / destinations）で扱う軽量オブジェクト。
+
+    GeneratedRef を受け取った場合は解析済み座標を ref に保持し、文字列の再解析を行わない。
+    それ以外（コンテナが読み取った値）は "Sheet!coord" 形式のみ宛先として扱い、
+    "A1" や "A1:B2" のようなセル値を座標と取り違えない（読取順・期待形状に影響させない）。
+    """
+
+    __slots__ = ("attr_text", "destinations", "ref")
+
+    def __init__(self, attr_text: Any):
+        self.ref: Optional[GeneratedRef] = None
+        if isinstance(attr_text, GeneratedRef):
+            self.ref = attr_text
+            self.attr_text: Any = str(attr_text)
+            self.destinations = [(attr_text.sheet, attr_text.coord())]
+            return
+        self.attr_text = attr_text
+        if isinstance(attr_text, str) and "!" in attr_text:
+            sheet_part, range_part = attr_text.split("!", 1)
+            self.destinations = [(sheet_part, range_part)]
+        else:
+            self.destinations = []
+
+
 def build_all_names_with_generated(wb) -> tuple[Dict[str, Any], set[str]]:
     """定義名辞書に生成名を統合して返す。
 
@@ -1245,21 +1835,293 @@ def build_all_names_with_generated(wb) -> tuple[Dict[str, Any], set[str]]:
         for gen_name, gen_range in gm.items():
             if gen_name in all_names:
                 continue
-            # 簡易的なDefinedName互換を提供
-            class GeneratedDefinedName:
-                def __init__(self, attr_text):
-                    self.attr_text = attr_text
-                    if "!" in attr_text:
-                        sheet_part, range_part = attr_text.split("!")
-                        self.destinations = [(sheet_part, range_part)]
-                    else:
-                        self.destinations = [("Sheet1", attr_text)]
-
             all_names[gen_name] = GeneratedDefinedName(gen_range)
             logger.debug(f"生成セル名追加: {gen_name} -> {gen_range}")
     return all_names, defined_only_name_keys
 
 
+# =============================================================================
+# Defined Name Index
+# =============================================================================
+
+# 名前の種別（DefinedNameIndex のクエリ対象をビットで指定）
+NAME_KIND_DEFINED = 1  # ワークブックの定義名
+NAME_KIND_GENERATED = 2  # 定義名と統合した時点の生成名
+NAME_KIND_LATE = 4  # 統合後に追加された補助生成名
+NAME_KINDS_BASE = NAME_KIND_DEFINED | NAME_KIND_GENERATED  # 従来の all_name_keys に相当
+NAME_KINDS_ALL = NAME_KINDS_BASE | NAME_KIND_LATE
+_NAME_KIND_SLOTS = ((NAME_KIND_DEFINED, 0), (NAME_KIND_GENERATED, 1), (NAME_KIND_LATE, 2))
+
+
+class _NameTrieNode:
+    __slots__ = ("children", "kinds", "counts")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_NameTrieNode"] = {}
+        # このノード自体が名前である場合の種別ビット
+        self.kinds = 0
+        # 部分木（自身を含む）に含まれる種別ごとの名前数
+        self.counts = [0, 0, 0]
+
+    def count(self, kinds: int) -> int:
+        return sum(self.counts[slot] for kind, slot in _NAME_KIND_SLOTS if kinds & kind)
+
+
+@dataclass(frozen=True)
+class NameDestination:
+    """事前解析済みの定義名宛先。
+
+    - sheet_index: ワークブック内のシート位置（不明時 None）
+    - bounds: (start_row, start_col, end_row, end_col)（記述順のまま）。解析不能な座標は None
+    """
+
+    sheet: str
+    coord: str
+    sheet_index: Optional[int]
+    bounds: Optional[Tuple[int, int, int, int]]
+
+
+def _parse_destination_bounds(coord: str) -> Optional[Tuple[int, int, int, int]]:
+    """宛先座標を (start_row, start_col, end_row, end_col) に解析する（compute_top_left_pos と同じ規則）。"""
+    c = coord.replace("$", "")
+    if ":" in c:
+        (sc, sr), (ec, er) = parse_range(c)
+        return (sr, sc, er, ec)
+    m = re.match(r"^([A-Z]+)(\d+)$", c)
+    if not m:
+        return None
+    col = column_index_from_string(m.group(1))
+    row = int(m.group(2))
+    return (row, col, row, col)
+
+
+class DefinedNameIndex:
+    """定義名・生成名をドット区切りセグメントのトライで保持する索引（ワークブック毎に1つ）。
+
+    - 接頭辞/子孫クエリ、非数値の子の有無、文字列接頭辞の有無を名前数に依存せず判定
+    - 定義名の宛先（同名の重複定義を含む）を事前解析して保持
+    - 生成名は with_generated() で統合した複製に持たせ、クエリ側は種別ビットで対象を選ぶ
+    """
+
+    def __init__(self) -> None:
+        self._root = _NameTrieNode()
+        self._kinds: Dict[str, int] = {}
+        self._destinations: Dict[str, List[NameDestination]] = {}
+        self._bad_destinations: set[str] = set()
+        self._duplicated: set[str] = set()
+        self.signature: Any = None
+
+    @staticmethod
+    def _defined_names_signature(workbook) -> Any:
+        """定義名の内容（名前 → 宛先文字列）。改名・宛先変更・追加・削除のいずれでも変わる。"""
+        dn_list = getattr(workbook.defined_names, "definedName", None)
+        if dn_list is not None:
+            return tuple((getattr(dn, "name", None), getattr(dn, "attr_text", None)) for dn in dn_list)
+        return tuple((name, getattr(dn, "attr_text", None)) for name, dn in workbook.defined_names.items())
+
+    @classmethod
+    def from_workbook(cls, workbook) -> "DefinedNameIndex":
+        index = cls()
+        sheet_pos = {sn: i for i, sn in enumerate(getattr(workbook, "sheetnames", []) or [])}
+        dn_list = getattr(workbook.defined_names, "definedName", None)
+        if dn_list is not None:
+            entries = [(getattr(dn, "name", None), dn) for dn in dn_list]
+        else:
+            entries = [(name, workbook.defined_names[name]) for name in list(workbook.defined_names)]
+        for name, dn in entries:
+            if not name:
+                continue
+            if name in index._destinations:
+                index._duplicated.add(name)
+            index.add(name, NAME_KIND_DEFINED)
+            dests = index._destinations.setdefault(name, [])
+            for sn, coord in dn.destinations:
+                try:
+                    bounds = _parse_destination_bounds(coord) if isinstance(coord, str) else None
+                except Exception:
+                    bounds = None
+                    index._bad_destinations.add(name)
+                dests.append(NameDestination(sn, coord, sheet_pos.get(sn), bounds))
+        index.signature = cls._defined_names_signature(workbook)
+        return index
+
+    def add(self, name: str, kind: int) -> None:
+        if self._kinds.get(name, 0) & kind:
+            return
+        slot = next(sl for k, sl in _NAME_KIND_SLOTS if k == kind)
+        node = self._root
+        node.counts[slot] += 1
+        for seg in name.split("."):
+            nxt = node.children.get(seg)
+            if nxt is None:
+                nxt = node.children[seg] = _NameTrieNode()
+            node = nxt
+            node.counts[slot] += 1
+        node.kinds |= kind
+        self._kinds[name] = self._kinds.get(name, 0) | kind
+
+    def with_generated(self, snapshot_names: Iterable[str], late_names: Iterable[str] = ()) -> "DefinedNameIndex":
+        """定義名と統合済みの名前（snapshot）と、その後に追加された生成名（late）を加えた複製を返す。
+
+        自身（キャッシュされた定義名のみの索引）は変更しない。宛先情報は複製間で共有する。
+        """
+        merged = type(self)()
+        merged._destinations = self._destinations
+        merged._bad_destinations = self._bad_destinations
+        merged._duplicated = self._duplicated
+        merged.signature = self.signature
+        for name, kinds in self._kinds.items():
+            for kind, _slot in _NAME_KIND_SLOTS:
+                if kinds & kind:
+                    merged.add(name, kind)
+        for name in snapshot_names:
+            if not merged._kinds.get(name, 0) & NAME_KIND_DEFINED:
+                merged.add(name, NAME_KIND_GENERATED)
+        for name in late_names:
+            if not merged._kinds.get(name, 0) & NAME_KINDS_BASE:
+                merged.add(name, NAME_KIND_LATE)
+        return merged
+
+    def _node(self, name: str) -> Optional[_NameTrieNode]:
+        node: Optional[_NameTrieNode] = self._root
+        for seg in name.split("."):
+            node = node.children.get(seg) if node is not None else None
+            if node is None:
+                return None
+        return node
+
+    def has(self, name: str, kinds: int = NAME_KINDS_BASE) -> bool:
+        return bool(self._kinds.get(name, 0) & kinds)
+
+    def names(self, kinds: int = NAME_KINDS_BASE) -> List[str]:
+        return [n for n, k in self._kinds.items() if k & kinds]
+
+    def has_descendants(self, name: str, kinds: int = NAME_KINDS_BASE) -> bool:
+        """`name + "."` で始まる名前が存在するか。"""
+        node = self._node(name)
+        if node is None:
+            return False
+        own = sum(1 for kind, _slot in _NAME_KIND_SLOTS if kinds & kind & node.kinds)
+        return node.count(kinds) - own > 0
+
+    def iter_descendants(self, name: str, kinds: int = NAME_KINDS_BASE) -> Iterable[str]:
+        """`name + "."` で始まる名前を列挙する（順序不定）。"""
+        node = self._node(name)
+        if node is None:
+            return
+        stack = [(name + "." + seg, child) for seg, child in node.children.items()]
+        while stack:
+            full, cur = stack.pop()
+            if not cur.count(kinds):
+                continue
+            if cur.kinds & kinds:
+                yield full
+            stack.extend((full + "." + seg, child) for seg, child in cur.children.items())
+
+    def has_non_numeric_child(self, name: str, kinds: int = NAME_KINDS_BASE) -> bool:
+        """`name.<seg>[...]` のうち seg が空でも数値でもない名前が存在するか。"""
+        node = self._node(name)
+        if node is None:
+            return False
+        return any(seg and not seg.isdigit() and child.count(kinds) for seg, child in node.children.items())
+
+    def has_string_prefix(self, prefix: str, kinds: int = NAME_KINDS_BASE) -> bool:
+        """文字列として prefix で始まる名前が存在するか（セグメント境界に限らない）。"""
+        head, dot, last = prefix.rpartition(".")
+        node = self._node(head) if dot else self._root
+        if node is None:
+            return False
+        return any(seg.startswith(last) and child.count(kinds) for seg, child in node.children.items())
+
+    def destinations(self, name: str) -> List[NameDestination]:
+        return self._destinations.get(name, [])
+
+    def top_left_pos(self, name: str, sheet_order: Dict[str, int]) -> Optional[tuple[int, int, int]]:
+        """定義名の読み取り順キー（compute_top_left_pos 相当）。索引に無い名前・重複定義名は None。"""
+        if name not in self._destinations or name in self._duplicated:
+            return None
+        if name in self._bad_destinations:
+            return (10**9, 10**9, 10**9)
+        best: tuple[int, int, int] | None = None
+        for d in self._destinations[name]:
+            if d.bounds is None:
+                continue
+            cand = (sheet_order.get(d.sheet, 10**9), d.bounds[0], d.bounds[1])
+            if best is None or cand < best:
+                best = cand
+        return best if best is not None else (10**9, 10**9, 10**9)
+
+
+def defined_name_index(workbook) -> Optional[DefinedNameIndex]:
+    """ワークブックの DefinedNameIndex を返す（Context に保持し、定義名の内容が変われば再構築）。
+
+    定義名を列挙できないワークブック（テスト用モック等）では None を返し、呼び出し側は線形走査に戻る。
+    内容の照合は定義名数に比例するため、`pinned_defined_name_index()` の区間中は照合済みの索引をそのまま返す。
+    """
+    ctx = get_current_context()
+    try:
+        pinned = ctx.pinned_name_indexes.get(workbook)
+    except TypeError:
+        pinned = None
+    if pinned is not None:
+        return pinned
+    try:
+        signature = DefinedNameIndex._defined_names_signature(workbook)
+    except Exception:
+        return None
+    cache = ctx.name_indexes
+    try:
+        index = cache.get(workbook)
+    except TypeError:
+        index = None
+    if index is not None and index.signature == signature:
+        return index
+    try:
+        index = DefinedNameIndex.from_workbook(workbook)
+    except Exception as e:
+        logger.debug("DefinedNameIndex build failed: %s", e)
+        return None
+    try:
+        cache[workbook] = index
+    except TypeError:
+        pass
+    return index
+
+
+def invalidate_defined_name_index(workbook) -> None:
+    """定義名を書き換えた後に呼び出し、ワークブックの DefinedNameIndex を破棄する（固定も解除）。"""
+    ctx = get_current_context()
+    try:
+        ctx.name_indexes.pop(workbook, None)
+        ctx.pinned_name_indexes.pop(workbook, None)
+    except TypeError:
+        pass
+
+
+@contextmanager
+def pinned_defined_name_index(workbook) -> Iterator[Optional[DefinedNameIndex]]:
+    """区間中は定義名を書き換えない前提で、照合済みの索引を内容照合なしに返すよう固定する。
+
+    区間中に定義名を変更する場合は invalidate_defined_name_index() を呼ぶこと。
+    """
+    index = defined_name_index(workbook)
+    pins = get_current_context().pinned_name_indexes
+    try:
+        previous = pins.get(workbook)
+        if index is not None:
+            pins[workbook] = index
+    except TypeError:
+        yield index
+        return
+    try:
+        yield index
+    finally:
+        if previous is not None:
+            pins[workbook] = previous
+        else:
+            pins.pop(workbook, None)
+
+
 # Core Utilities
 # =============================================================================
 
@@ -1429,6 +2291,20 @@ def get_named_range_values(wb, defined_name) -> Any:
 
     形状保持が必要な特殊ケースは別ヘルパー（get_named_range_values_preserve_shape）で対応する。
     """
+    ref = getattr(defined_name, "ref", None)
+    if isinstance(ref, GeneratedRef):
+        # 解析済み座標を直接参照
+        try:
+            ws = wb[ref.sheet]
+        except Exception as e:
+            raise ValueError(f"No valid destinations for defined name: {e}")
+        if ref.shape == "cell":
+            return ws.cell(row=ref.top, column=ref.left).value
+        return [
+            ws.cell(row=r, column=c).value
+            for r in range(ref.top, ref.bottom + 1)
+            for c in range(ref.left, ref.right + 1)
+        ]
     flat_values: List[Any] = []
     single_cell_only = True
     for sheet_name, coord in getattr(defined_name, "destinations", []) or []:
@@ -1552,6 +2428,9 @@ def compute_top_left_pos(
     - 範囲の場合は左上座標、単一セルの場合はその座標
     - 異常時は非常に大きい値のタプルを返し、末尾に回す
     """
+    ref = getattr(defined_name_obj, "ref", None)
+    if isinstance(ref, GeneratedRef):
+        return (sheet_order.get(ref.sheet, 10**9), ref.top, ref.left)
     best: tuple[int, int, int] | None = None
     try:
         for sheet_name, coord in getattr(defined_name_obj, "destinations", []) or []:
@@ -1772,11 +2651,14 @@ def compute_container_parents_with_children(
     container_parent_names: set[str],
     all_name_keys: List[str],
     gen_map: Optional[Dict[str, Any]],
+    name_index: Optional[DefinedNameIndex] = None,
 ) -> set[str]:
     """親コンテナ名のうち、子要素（定義名 or 生成名）が1つ以上存在する親を返す。"""
     result: set[str] = set()
     if not container_parent_names:
         return result
+    if name_index is not None:
+        return {cpn for cpn in container_parent_names if name_index.has_descendants(cpn, NAME_KINDS_ALL)}
     for cpn in container_parent_names:
         prefix_c = cpn + "."
         has_defined_child = any(
@@ -1990,12 +2872,11 @@ def generate_subarray_names_for_field_anchors(wb, normalized_prefix: str) -> Non
                 else:
                     ci = sc
                     ri = sr + (i - 1)
-                addr = f"{sheet_name}!${get_column_letter(ci)}${ri}"
                 gen_name = f"{base}.{i}"
                 # 既存定義名があれば生成しない（尊重）
                 if gen_name in getattr(wb, "defined_names", {}):
                     continue
-                set_generated_name(wb, gen_name, addr)
+                set_generated_name(wb, gen_name, GeneratedRef(sheet_name, ri, ci, ri, ci))
     except Exception as _e:
         # 生成補助は必須ではないため失敗しても続行
         logger.debug("generate_subarray_names_for_field_anchors skipped due to error: %s", _e)
@@ -2649,6 +3530,28 @@ def resolve_path_keys_with_schema(
         return (path_keys, True)
 
 
+class SchemaIndex:
+    """スキーマによるパス解決（resolve_path_keys_with_schema）の結果をパス単位で保持する索引。
+
+    スキーマは実行中に変化しない前提で、同一パスの再解決（正規表現照合）を省く。
+    """
+
+    __slots__ = ("schema", "_resolved")
+
+    def __init__(self, schema: Dict[str, Any]):
+        self.schema = schema
+        self._resolved: Dict[Tuple[str, ...], Tuple[Tuple[str, ...], bool]] = {}
+
+    def resolve(self, path_keys: List[str]) -> Tuple[List[str], bool]:
+        key = tuple(path_keys)
+        hit = self._resolved.get(key)
+        if hit is None:
+            resolved, broken = resolve_path_keys_with_schema(path_keys=list(path_keys), schema=self.schema)
+            hit = (tuple(resolved), broken)
+            self._resolved[key] = hit
+        return list(hit[0]), hit[1]
+
+
 def finalize_insertion_for_parent_array_element(
     *,
     current_element: Dict[str, Any],
@@ -2726,6 +3629,7 @@ def should_suppress_value_insertion(
     container_parent_names: set[str],
     container_parents_with_children: set[str],
     group_labels: set[str],
+    name_index: Optional[DefinedNameIndex] = None,
 ) -> bool:
     """エントリ収集段階で値の挿入を抑止すべきかを判定する。
 
@@ -2743,7 +3647,13 @@ def should_suppress_value_insertion(
         # 2) アンカー末端 (.1) で非数値の子を持つ場合
         if keys and keys[-1] == "1":
             parent_prefix = name + "."
-            for child in all_name_keys:
+            if name_index is not None:
+                if name_index.has_non_numeric_child(name):
+                    return True
+                child_names: Iterable[str] = ()
+            else:
+                child_names = all_name_keys
+            for child in child_names:
                 if not child.startswith(parent_prefix) or len(child) <= len(parent_prefix):
                     continue
                 tail_first = child[len(parent_prefix):].split(".")[0]
@@ -2754,6 +3664,8 @@ def should_suppress_value_insertion(
         if len(keys) >= 3 and keys[-1] in group_labels and keys[-2].isdigit():
             # 例: json.<root>.<idx>.<label> に対して json.<root>.<idx>.1 またはその子があれば抑止
             base = f"{normalized_prefix}{keys[0]}.{keys[1]}.1"
+            if name_index is not None:
+                return name_index.has(base) or name_index.has_descendants(base)
             for k in all_name_keys:
                 if k == base or k.startswith(base + "."):
                     return True
@@ -2785,6 +3697,7 @@ def collect_entries_in_sheet_order(
         "container_parents_with_children", set()
     )
     group_labels = suppress_ctx.get("group_labels", set())
+    name_index = suppress_ctx.get("name_index")
 
     # ルート最初出現位置（同一ルート内の安定化に使用）
     root_first_pos: Dict[str, tuple[int, int, int]] = suppress_ctx.get(
@@ -2805,21 +3718,28 @@ def collect_entries_in_sheet_order(
             container_parent_names=container_parent_names,
             container_parents_with_children=container_parents_with_children,
             group_labels=group_labels,
+            name_index=name_index,
         ):
             continue
-        pos_key = compute_top_left_pos(defined_name, sheet_order)
+        pos_key = name_index.top_left_pos(name, sheet_order) if name_index is not None else None
+        if pos_key is None:
+            pos_key = compute_top_left_pos(defined_name, sheet_order)
         entries.append((pos_key, name, defined_name, keys))
 
-    def _entry_sort_key(x: Tuple[tuple[int, int, int], str, Any, List[str]]):
-        pos, nm, _dn, ks = x
-        root = ks[0] if ks else ""
-        root_pos = root_first_pos.get(root, (10**9, 10**9, 10**9))
-        return (root_pos[0], root_pos[1], root_pos[2], pos[0], pos[1], pos[2], nm)
-
-    entries.sort(key=_entry_sort_key)
+    entries.sort(key=lambda x: entry_sort_key(x, root_first_pos))
     return entries
 
 
+def entry_sort_key(
+    entry: Tuple[tuple[int, int, int], str, Any, List[str]], root_first_pos: Dict[str, tuple[int, int, int]]
+) -> tuple:
+    """エントリの読取順キー（ルートの初出位置 → 名前の左上座標 → 名前）。"""
+    pos, nm, _dn, ks = entry
+    root = ks[0] if ks else ""
+    root_pos = root_first_pos.get(root, (10**9, 10**9, 10**9))
+    return (root_pos[0], root_pos[1], root_pos[2], pos[0], pos[1], pos[2], nm)
+
+
 def reorder_roots_by_sheet_order(
     result: Dict[str, Any],
     root_first_pos: Dict[str, tuple[int, int, int]] | None,
@@ -3045,7 +3965,13 @@ def get_value_for_defined_or_generated_name(
     """
     if gen_map is not None and name in gen_map:
         logger.debug("コンテナ生成セル名の値を直接取得: %s -> %r", name, gen_map[name])
-        return (False, gen_map[name])
+        gen_val = gen_map[name]
+        if isinstance(gen_val, GeneratedRef):
+            try:
+                return (False, get_named_range_values(wb, GeneratedDefinedName(gen_val)))
+            except Exception:
+                return (False, "")
+        return (False, gen_val)
     # 深いネストかつ生成名配下はスキップ
     if should_skip_deep_nested_defined_name(name, gen_map):
         logger.debug("生成名配下の深いネスト定義名をスキップ: %s", name)
@@ -3078,6 +4004,7 @@ def process_array_path_entry(
     defined_only_name_keys: set[str],
     safe_insert: Callable[[Union[Dict[str, Any], List[Any]], List[str], Any, str, str, List[str], List[str]], None],
     user_provided_containers: bool = False,
+    name_index: Optional[DefinedNameIndex] = None,
 ) -> bool:
     """配列パス（array.i.*）の処理を行い、処理済みなら True を返す。"""
     if len(path_keys) < 2 or not re.fullmatch(r"\d+", path_keys[1]):
@@ -3172,6 +4099,7 @@ def process_array_path_entry(
             normalized_prefix=normalized_prefix,
             all_name_keys=all_name_keys,
             container_parent_names=container_parent_names,
+            name_index=name_index,
         ):
             return True
 
@@ -3835,6 +4763,7 @@ def suppress_label_terminal_if_applicable(
     normalized_prefix: str,
     all_name_keys: List[str],
     container_parent_names: set[str],
+    name_index: Optional[DefinedNameIndex] = None,
 ) -> bool:
     """配列要素直下のラベル終端（例: json.A.1.lv1）を抑制するか。
 
@@ -3855,6 +4784,8 @@ def suppress_label_terminal_if_applicable(
             normalized_prefix = normalized_prefix + "."
         base = normalized_prefix + ".".join(original_path_keys[:2])  # json.A.1
         anchor_prefix = base + ".1"  # json.A.1.1
+        if name_index is not None:
+            return name_index.has_string_prefix(anchor_prefix)
         for k in all_name_keys:
             if k.startswith(anchor_prefix):
                 return True
@@ -4137,38 +5068,247 @@ def _insert_path_string_step(
 # Array Transform Rules
 # =============================================================================
 
+COMMAND_TIMEOUT_DEFAULT = 30.0
+COMMAND_SERVER_FRAMINGS = ("ndjson", "length")
+COMMAND_RULE_OPTIONS = ("timeout", "server", "pool", "framing")
+TRANSFORM_RULE_OPTIONS = ("parallel", "executor")
+TRANSFORM_EXECUTORS = ("serial", "thread", "process")
+RULE_OPTIONS_RE = re.compile(r"^(batch_function|function|command|split)\[([^\]]*)\]:(.*)$", re.DOTALL)
 
-class ArrayTransformRule:
-    """配列変換ルールを表すクラス"""
 
-    def __init__(
-        self,
-        path: str,
-        transform_type: str,
-        transform_spec: str,
-        trim_enabled: bool = False,
-        *,
-        apply_to_list_as_whole: bool = False,
-    ):
-        # パラメータの基本検証
-        if not path:
-            raise ValueError("pathは空ではない文字列である必要があります。")
-        if not transform_type:
-            raise ValueError("transform_typeは空ではない文字列である必要があります。")
-        if not transform_spec:
-            raise ValueError("transform_specは空ではない文字列である必要があります。")
+class CommandServerError(RuntimeError):
+    """常駐コマンド（command[server]）がエラー応答を返した、または再起動後も応答できなかった。"""
 
-        self.path = path
-        self.transform_type = transform_type  # 'function', 'command', 'split'
-        self.transform_spec = transform_spec
-        self.trim_enabled = trim_enabled
-        # リスト値に対して関数を配列全体へ1回だけ適用するか（既定: 各要素へ個別適用）
-        self._transform_func: Optional[Callable] = None
-        self._setup_transform()
 
-    def _setup_transform(self):
-        """変換関数をセットアップ"""
-        if self.transform_type == "function":
+class _CommandServerCrashed(RuntimeError):
+    pass
+
+
+class CommandServer:
+    """1つの常駐コマンドプロセスとの要求/応答（リクエストID付きフレーム）。
+
+    - ndjson: 要求 {"id": n, "input": "..."} / 応答 {"id": n, "output": "..."} または {"id": n, "error": "..."} を1行ずつ
+    - length: 要求 "<id> <bytes>\n<payload>" / 応答 "<id> ok|error <bytes>\n<payload>"（UTF-8）
+    応答は読取スレッドが ID 毎に受け取り、要求側はタイムアウト付きで待つ。
+    """
+
+    def __init__(self, argv: List[str], framing: str = "ndjson"):
+        self.framing = framing
+        self.proc = subprocess.Popen(
+            argv, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=0
+        )
+        self._responses: Dict[int, tuple[bool, str]] = {}
+        self._cond = threading.Condition()
+        self._alive = True
+        threading.Thread(target=self._read_loop, daemon=True).start()
+        threading.Thread(target=self._drain_stderr, args=(" ".join(argv),), daemon=True).start()
+
+    def _read_frame(self) -> Optional[tuple[int, bool, str]]:
+        stdout = self.proc.stdout
+        if stdout is None:
+            return None
+        header = stdout.readline()
+        if not header:
+            return None
+        if self.framing == "ndjson":
+            msg = json.loads(header.decode("utf-8"))
+            if "error" in msg:
+                return int(msg["id"]), False, str(msg["error"])
+            return int(msg["id"]), True, str(msg.get("output", ""))
+        request_id, status, length = header.decode("ascii").split()
+        payload = b""
+        while len(payload) < int(length):
+            chunk = stdout.read(int(length) - len(payload))
+            if not chunk:
+                return None
+            payload += chunk
+        return int(request_id), status == "ok", payload.decode("utf-8")
+
+    def _read_loop(self) -> None:
+        try:
+            while True:
+                frame = self._read_frame()
+                if frame is None:
+                    break
+                with self._cond:
+                    self._responses[frame[0]] = frame[1:]
+                    self._cond.notify_all()
+        except Exception:
+            logger.debug("command server stdout reader stopped", exc_info=True)
+        finally:
+            with self._cond:
+                self._alive = False
+                self._cond.notify_all()
+
+    def _drain_stderr(self, label: str) -> None:
+        stderr = self.proc.stderr
+        if stderr is None:
+            return
+        for line in iter(stderr.readline, b""):
+            logger.warning("Command stderr: %s", line.decode("utf-8", "replace").rstrip("\n"), extra={"transform_spec": label})
+
+    def request(self, request_id: int, payload: str, timeout: float) -> tuple[bool, str]:
+        """payload を送って応答 (成功か, 出力/エラー文) を待つ。タイムアウトは TimeoutExpired。"""
+        data = payload.encode("utf-8")
+        if self.framing == "ndjson":
+            frame = (json.dumps({"id": request_id, "input": payload}, ensure_ascii=False) + "\n").encode("utf-8")
+        else:
+            frame = f"{request_id} {len(data)}\n".encode("ascii") + data
+        stdin = self.proc.stdin
+        if stdin is None:
+            raise _CommandServerCrashed("stdin is closed")
+        try:
+            stdin.write(frame)
+            stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise _CommandServerCrashed(str(e)) from e
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while request_id not in self._responses:
+                if not self._alive:
+                    raise _CommandServerCrashed(f"returncode={self.proc.poll()}")
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise subprocess.TimeoutExpired(self.proc.args, timeout)
+                self._cond.wait(remaining)
+            return self._responses.pop(request_id)
+
+    def close(self) -> None:
+        try:
+            if self.proc.stdin is not None:
+                self.proc.stdin.close()
+        except Exception:
+            pass
+        try:
+            self.proc.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+
+
+def _close_command_servers(servers: List[CommandServer]) -> None:
+    while servers:
+        servers.pop().close()
+
+
+class CommandServerPool:
+    """1ルール分の常駐コマンドのプール（最大 size プロセス、必要時に起動）。
+
+    プロセスが異常終了した要求は新しいプロセスで1度だけ再送し、タイムアウトしたプロセスは破棄する。
+    """
+
+    def __init__(self, argv: List[str], *, size: int = 1, timeout: float = COMMAND_TIMEOUT_DEFAULT, framing: str = "ndjson"):
+        self.argv = argv
+        self.size = size
+        self.timeout = timeout
+        self.framing = framing
+        self.started = 0
+        self._idle: List[CommandServer] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self._next_id = 0
+        weakref.finalize(self, _close_command_servers, self._idle)
+
+    def _start(self) -> CommandServer:
+        server = CommandServer(self.argv, self.framing)
+        with self._lock:
+            self.started += 1
+        return server
+
+    def request(self, payload: str) -> str:
+        with self._slots:
+            with self._lock:
+                server = self._idle.pop() if self._idle else None
+                self._next_id += 1
+                request_id = self._next_id
+            if server is None:
+                server = self._start()
+            retried = False
+            while True:
+                try:
+                    ok, text = server.request(request_id, payload, self.timeout)
+                except _CommandServerCrashed as e:
+                    server.close()
+                    if retried:
+                        raise CommandServerError(f"command server crashed: {e}") from e
+                    logger.warning("Command server exited (%s); restarting: %s", e, " ".join(self.argv))
+                    server, retried = self._start(), True
+                    continue
+                except BaseException:
+                    server.close()
+                    raise
+                with self._lock:
+                    self._idle.append(server)
+                if not ok:
+                    raise CommandServerError(text)
+                return text
+
+    def close(self) -> None:
+        with self._lock:
+            _close_command_servers(self._idle)
+
+
+class ArrayTransformRule:
+    """配列変換ルールを表すクラス"""
+
+    def __init__(
+        self,
+        path: str,
+        transform_type: str,
+        transform_spec: str,
+        trim_enabled: bool = False,
+        *,
+        apply_to_list_as_whole: bool = False,
+        options: Optional[Dict[str, str]] = None,
+    ):
+        # パラメータの基本検証
+        if not path:
+            raise ValueError("pathは空ではない文字列である必要があります。")
+        if not transform_type:
+            raise ValueError("transform_typeは空ではない文字列である必要があります。")
+        if not transform_spec:
+            raise ValueError("transform_specは空ではない文字列である必要があります。")
+
+        self.path = path
+        self.transform_type = transform_type  # 'function', 'batch_function', 'command', 'split'
+        self.transform_spec = transform_spec
+        self.trim_enabled = trim_enabled
+        # ルールオプション（"command[server,pool=4]:..." の角括弧内）
+        self.options: Dict[str, str] = dict(options or {})
+        # リスト値に対して関数を配列全体へ1回だけ適用するか（既定: 各要素へ個別適用）
+        self._transform_func: Optional[Callable] = None
+        self._command_pool: Optional[CommandServerPool] = None
+        self.parallel = 1
+        self.executor = "serial"
+        self._setup_transform()
+
+    def _setup_transform(self):
+        """変換関数をセットアップ
+
+        共通オプション（"function[parallel=8]:..." 等）:
+        - parallel=N: ワイルドカード等のパターン変換で、マッチした値を最大 N 並列で変換する（既定 1）
+        - executor=serial|thread|process: 並列実行のバックエンド（既定: parallel>1 なら thread）
+        """
+        # batch_function はパターンのマッチ全体で1回呼ぶため並列オプションは持たない
+        allowed = set(TRANSFORM_RULE_OPTIONS) if self.transform_type != "batch_function" else set()
+        if self.transform_type == "command":
+            allowed |= set(COMMAND_RULE_OPTIONS)
+        unknown = set(self.options) - allowed
+        if unknown:
+            raise ValueError(f"Unknown {self.transform_type} option(s): {', '.join(sorted(unknown))}")
+        try:
+            self.parallel = int(self.options.get("parallel", "1"))
+        except ValueError:
+            raise ValueError(f"parallel must be a positive integer: {self.options['parallel']}")
+        if self.parallel < 1:
+            raise ValueError(f"parallel must be a positive integer: {self.options['parallel']}")
+        self.executor = self.options.get("executor") or ("thread" if self.parallel > 1 else "serial")
+        if self.executor not in TRANSFORM_EXECUTORS:
+            raise ValueError(f"executor must be one of {'/'.join(TRANSFORM_EXECUTORS)}: {self.executor}")
+        if self.executor == "process" and "server" in self.options:
+            # 常駐コマンドのパイプと読取スレッドは fork 先へ引き継げない
+            raise ValueError("executor=process cannot be combined with command server mode")
+        if self.transform_type in ("function", "batch_function"):
             self._setup_python_function()
         elif self.transform_type == "command":
             self._setup_command()
@@ -4263,7 +5403,35 @@ class ArrayTransformRule:
         logger.debug(f"Loaded transform function: {self.transform_spec}")
 
     def _setup_command(self):
-        """外部コマンドのセットアップ"""
+        """外部コマンドのセットアップ
+
+        オプション:
+        - timeout=秒: 1値（1要求）あたりのタイムアウト（既定 30 秒）
+        - server: コマンドをルール毎に常駐させ、値をフレームで送受信する（1値1プロセス起動を回避）
+        - pool=N: server モードの常駐プロセス数（既定 1）
+        - framing=ndjson|length: server モードのフレーム形式（既定 ndjson）
+        """
+        try:
+            self._command_timeout = float(self.options.get("timeout", COMMAND_TIMEOUT_DEFAULT))
+        except ValueError:
+            raise ValueError(f"command timeout must be a number: {self.options['timeout']}")
+        if self._command_timeout <= 0:
+            raise ValueError(f"command timeout must be positive: {self.options['timeout']}")
+        if "server" in self.options:
+            framing = self.options.get("framing", "ndjson")
+            if framing not in COMMAND_SERVER_FRAMINGS:
+                raise ValueError(f"command framing must be one of {'/'.join(COMMAND_SERVER_FRAMINGS)}: {framing}")
+            try:
+                pool_size = int(self.options.get("pool", "1"))
+            except ValueError:
+                raise ValueError(f"command pool must be a positive integer: {self.options['pool']}")
+            if pool_size < 1:
+                raise ValueError(f"command pool must be a positive integer: {self.options['pool']}")
+            # 常駐プロセスは最初の値の変換時に起動する
+            self._command_pool = CommandServerPool(
+                shlex.split(self.transform_spec), size=pool_size, timeout=self._command_timeout, framing=framing
+            )
+            return
         # コマンドが実行可能かチェック
         try:
             result = subprocess.run(
@@ -4291,6 +5459,9 @@ class ArrayTransformRule:
             if self.trim_enabled and isinstance(result, list):
                 return self._apply_trim_recursively(result)
             return result
+        elif self.transform_type == "batch_function":
+            # パターン変換以外（定義名の挿入時など）では1要素のバッチとして呼ぶ
+            return self.transform_batch([value])[0]
         elif self.transform_type == "command":
             return self._transform_with_command(value)
         elif self.transform_type == "split":
@@ -4298,6 +5469,24 @@ class ArrayTransformRule:
         else:
             return value
 
+    def transform_batch(self, values: List[Any]) -> List[Any]:
+        """batch_function: マッチした値のリストで関数を1回呼び、同じ長さの結果リストを返す。
+
+        戻り値がリスト/タプルでない、または長さが入力と異なる場合は ValueError。
+        """
+        result = self._transform_with_function(list(values))
+        if not isinstance(result, (list, tuple)):
+            raise ValueError(
+                f"batch_function {self.transform_spec} must return a list, got {type(result).__name__}"
+            )
+        if len(result) != len(values):
+            raise ValueError(
+                f"batch_function {self.transform_spec} returned {len(result)} values for {len(values)} inputs"
+            )
+        if self.trim_enabled:
+            return [self._apply_trim_recursively(v) if isinstance(v, list) else v for v in result]
+        return list(result)
+
     def _apply_trim_recursively(self, data: Any) -> Any:
         """多次元配列に対して再帰的にstripを適用"""
         if isinstance(data, list):
@@ -4334,8 +5523,16 @@ class ArrayTransformRule:
         stdout_capture = io.StringIO()
         stderr_capture = io.StringIO()
 
-        with redirect_stdout(stdout_capture), redirect_stderr(stderr_capture):
-            result = self._transform_func(value)
+        if isinstance(sys.stdout, _ThreadRoutedStream):
+            # スレッド実行器の実行中は sys.stdout を差し替えず、このスレッドの出力だけを捕捉する
+            _std_capture.stdout, _std_capture.stderr = stdout_capture, stderr_capture
+            try:
+                result = self._transform_func(value)
+            finally:
+                _std_capture.stdout = _std_capture.stderr = None
+        else:
+            with redirect_stdout(stdout_capture), redirect_stderr(stderr_capture):
+                result = self._transform_func(value)
 
         # ログは無加工（トリム無し）で全量出力
         stdout_content = stdout_capture.getvalue()
@@ -4369,42 +5566,11 @@ class ArrayTransformRule:
         - フラット（全要素がスカラー）の list/tuple は従来通り 改行結合
         - それ以外のスカラー値は str() 変換
         この方針で "構造" を壊さずにコマンドへ受け渡し可能にする。
+        server オプション指定時は常駐プロセスへ送り、出力の解釈規則は同じ。
         """
-
-        def _is_scalar(x: Any) -> bool:
-            return isinstance(x, (str, int, float, bool)) or x is None
-
-        def _is_flat_scalar_list(v: Any) -> bool:
-            return isinstance(v, (list, tuple)) and all(_is_scalar(e) for e in v)
-
-        def _json_default(o: Any):  # JSON化できない set 等を救済
-            if isinstance(o, set):
-                try:
-                    return sorted(list(o))
-                except Exception:  # noqa: BLE001
-                    return list(o)
-            raise TypeError(f"Object of type {type(o)} is not JSON serializable")
-
-        treat_multiline_as_list = False
-
-        if isinstance(value, dict):
-            try:
-                input_str = json.dumps(value, ensure_ascii=False, default=_json_default)
-            except Exception:  # noqa: BLE001
-                input_str = str(value)
-        elif isinstance(value, (list, tuple)):
-            if _is_flat_scalar_list(value):
-                # フラット: 改行結合（既存コマンド sort -u 等との親和性を保つ）
-                input_str = "\n".join("" if v is None else str(v) for v in value)
-                treat_multiline_as_list = True
-            else:
-                try:
-                    input_str = json.dumps(value, ensure_ascii=False, default=_json_default)
-                except Exception:  # noqa: BLE001
-                    # 失敗したら安全側で repr 文字列
-                    input_str = str(value)
-        else:
-            input_str = str(value) if value is not None else ""
+        input_str, treat_multiline_as_list = self._command_input(value)
+        if self._command_pool is not None:
+            return self._transform_with_command_server(value, input_str, treat_multiline_as_list)
         try:
             result = subprocess.run(
                 shlex.split(self.transform_spec),
@@ -4412,7 +5578,7 @@ class ArrayTransformRule:
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 text=True,
-                timeout=30,
+                timeout=getattr(self, "_command_timeout", COMMAND_TIMEOUT_DEFAULT),
             )
         except subprocess.TimeoutExpired:
             logger.error(
@@ -4462,8 +5628,83 @@ class ArrayTransformRule:
             )
             return value
 
-        output = result.stdout
+        return self._parse_command_output(result.stdout, treat_multiline_as_list)
+
+    def _transform_with_command_server(self, value: Any, input_str: str, treat_multiline_as_list: bool) -> Any:
+        """常駐コマンドへ1値を送って変換（失敗時は 1値1プロセス方式と同様に元の値を返す）。"""
+        assert self._command_pool is not None
+        try:
+            output = self._command_pool.request(input_str)
+        except subprocess.TimeoutExpired:
+            logger.error(
+                "Command timeout: %s",
+                self.transform_spec,
+                extra={"transform_spec": self.transform_spec},
+            )
+            return value
+        except CommandServerError as e:
+            logger.warning(
+                "Command failed: %s (%s)",
+                self.transform_spec,
+                e,
+                extra={"transform_spec": self.transform_spec},
+            )
+            return value
+        except Exception as e:
+            logger.error(
+                "Command execution error: %s: %s",
+                self.transform_spec,
+                e,
+                extra={"transform_spec": self.transform_spec},
+            )
+            return value
+        if output:
+            logger.debug("Command stdout: %s", output, extra={"transform_spec": self.transform_spec})
+        return self._parse_command_output(output, treat_multiline_as_list)
+
+    @staticmethod
+    def _command_input(value: Any) -> tuple[str, bool]:
+        """コマンドへ渡す入力文字列と、出力を行配列として解釈するか（フラット配列入力か）を返す。"""
+
+        def _is_scalar(x: Any) -> bool:
+            return isinstance(x, (str, int, float, bool)) or x is None
+
+        def _is_flat_scalar_list(v: Any) -> bool:
+            return isinstance(v, (list, tuple)) and all(_is_scalar(e) for e in v)
+
+        def _json_default(o: Any):  # JSON化できない set 等を救済
+            if isinstance(o, set):
+                try:
+                    return sorted(list(o))
+                except Exception:  # noqa: BLE001
+                    return list(o)
+            raise TypeError(f"Object of type {type(o)} is not JSON serializable")
+
+        treat_multiline_as_list = False
+
+        if isinstance(value, dict):
+            try:
+                input_str = json.dumps(value, ensure_ascii=False, default=_json_default)
+            except Exception:  # noqa: BLE001
+                input_str = str(value)
+        elif isinstance(value, (list, tuple)):
+            if _is_flat_scalar_list(value):
+                # フラット: 改行結合（既存コマンド sort -u 等との親和性を保つ）
+                input_str = "\n".join("" if v is None else str(v) for v in value)
+                treat_multiline_as_list = True
+            else:
+                try:
+                    input_str = json.dumps(value, ensure_ascii=False, default=_json_default)
+                except Exception:  # noqa: BLE001
+                    # 失敗したら安全側で repr 文字列
+                    input_str = str(value)
+        else:
+            input_str = str(value) if value is not None else ""
+        return input_str, treat_multiline_as_list
 
+    @staticmethod
+    def _parse_command_output(output: str, treat_multiline_as_list: bool) -> Any:
+        """コマンド出力の解釈: JSON → （フラット配列入力時）複数行を行配列 → 文字列。"""
         # 1. JSON として解釈できれば優先（後続加工を避ける）
         try:
             return json.loads(output.strip())
@@ -4484,12 +5725,13 @@ def parse_array_transform_rules(  # noqa: PLR0915 長さは後続リファクタ
     prefix: str,
     schema: Optional[Dict[str, Any]] = None,
     trim_enabled: bool = False,
-) -> Dict[str, List[ArrayTransformRule]]:
+) -> "RuleIndex":
     """
     配列変換ルールのパース。
     形式: "json.path=function:module:func_name" または "json.path=command:cat"
     ワイルドカード対応: "json.arr.*.name=split:," または "json.arr.*=range:A1:B2:function:builtins:len"
     連続適用対応: 同一セル名に対する複数の--transform指定を順次適用
+    返り値はパス→ルール列の読取専用 Mapping である RuleIndex（get_applicable_transform_rules の検索索引を持つ）。
     """
     if not prefix:
         raise ValueError("prefixは空ではない文字列である必要があります。")
@@ -4519,14 +5761,25 @@ def parse_array_transform_rules(  # noqa: PLR0915 長さは後続リファクタ
                 path = path[1:]
         return path, has_wildcard
 
-    def _parse_spec(spec: str) -> tuple[str, str]:
+    def _parse_spec(spec: str) -> tuple[str, str, Dict[str, str]]:
+        # "command[server,pool=4]:..." 形式のルールオプション
+        m = RULE_OPTIONS_RE.match(spec)
+        if m:
+            options: Dict[str, str] = {}
+            for item in m.group(2).split(","):
+                name, _, val = item.strip().partition("=")
+                if name:
+                    options[name] = val.strip()
+            return m.group(1), m.group(3), options
+        if spec.startswith("batch_function:"):
+            return "batch_function", spec[len("batch_function:") :], {}
         if spec.startswith("function:"):
-            return "function", spec[len("function:") :]
+            return "function", spec[len("function:") :], {}
         if spec.startswith("command:"):
-            return "command", spec[len("command:") :]
+            return "command", spec[len("command:") :], {}
         if spec.startswith("split:"):
-            return "split", spec[len("split:") :]
-        return "function", spec
+            return "split", spec[len("split:") :], {}
+        return "function", spec, {}
 
     def _insert_rule(dst: Dict[str, List[ArrayTransformRule]], key: str, rule_obj: ArrayTransformRule) -> None:
         if key not in dst:
@@ -4540,6 +5793,8 @@ def parse_array_transform_rules(  # noqa: PLR0915 長さは後続リファクタ
             func = None
             if "function" in raw:
                 func = f"function:{raw['function']}" if not str(raw['function']).startswith(("function:", "command:", "split:")) else raw['function']
+            elif "batch_function" in raw:
+                func = f"batch_function:{raw['batch_function']}"
             elif "command" in raw:
                 func = f"command:{raw['command']}"
             elif "split" in raw:
@@ -4559,8 +5814,8 @@ def parse_array_transform_rules(  # noqa: PLR0915 長さは後続リファクタ
         path, has_wildcard = _normalize_path(path)
 
         try:
-            transform_type, actual_spec = _parse_spec(transform_spec)
-            rule_obj = ArrayTransformRule(path, transform_type, actual_spec, trim_enabled)
+            transform_type, actual_spec, options = _parse_spec(transform_spec)
+            rule_obj = ArrayTransformRule(path, transform_type, actual_spec, trim_enabled, options=options)
             if has_wildcard:
                 _insert_rule(wildcard_rules, path, rule_obj)
             else:
@@ -4573,7 +5828,153 @@ def parse_array_transform_rules(  # noqa: PLR0915 長さは後続リファクタ
         # 既存仕様: 記載順（後勝ち）を保持するためそのまま更新
         rules.update(wildcard_rules)
 
-    return rules
+    return RuleIndex(rules)
+
+
+RULE_INDEX_MEMO_SIZE = 4096
+
+
+class RuleIndex(Mapping[str, List[ArrayTransformRule]]):
+    """変換ルール表（パス→ルール列の読取専用 Mapping）と get_applicable_transform_rules の検索索引。
+
+    parse_array_transform_rules（RunPlan）でルールを解析した時点で1度だけ構築し、以降は変更しない。
+    完全一致・配列要素親はハッシュ表、split 祖先はセグメントトライ、ワイルドカードは
+    分割済みパターン（セグメント数で分類）で解決し、パス深さに比例した時間で答える。
+    結果はパス形状（ルールに現れない数値インデックスを畳んだキー列）毎にメモ化する。
+    """
+
+    __slots__ = ("_rules", "_compiled_index")
+
+    def __init__(self, rules: Optional[Mapping[str, Iterable[ArrayTransformRule]]] = None):
+        # 呼び出し側の dict/list を後から変更しても索引と食い違わないよう複製して保持する
+        self._rules: Dict[str, List[ArrayTransformRule]] = {k: list(v) for k, v in (rules or {}).items()}
+        self._compiled_index = self._compile()
+
+    def __getitem__(self, key: str) -> List[ArrayTransformRule]:
+        return self._rules[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rules)
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._rules
+
+    def __repr__(self) -> str:
+        return f"RuleIndex({self._rules!r})"
+
+    def __reduce__(self):
+        return (type(self), (self._rules,))
+
+    def _compile(self) -> SimpleNamespace:
+        split_trie: dict = {}
+        wildcards_by_len: Dict[int, List[tuple[int, tuple[str, ...], List[ArrayTransformRule]]]] = {}
+        literal_digits: set[str] = set()
+        partial_digit_segments: List[str] = []
+        for order, (rule_key, rule_list) in enumerate(self._rules.items()):
+            segments = rule_key.split(".")
+            literal_digits.update(seg for seg in segments if seg.isdigit())
+            if "*" in rule_key:
+                parts = tuple(seg for seg in segments if seg)
+                wildcards_by_len.setdefault(len(parts), []).append((order, parts, rule_list))
+                partial_digit_segments.extend(seg for seg in parts if seg != "*" and "*" in seg)
+            elif all(getattr(r, "transform_type", None) == "split" for r in rule_list):
+                node = split_trie
+                for seg in segments:
+                    node = node.setdefault(seg, {})
+                node[None] = rule_list
+        return SimpleNamespace(
+            split_trie=split_trie,
+            wildcards_by_len=wildcards_by_len,
+            literal_digits=literal_digits,
+            partial_digit_segments=list(dict.fromkeys(partial_digit_segments)),
+            memo={},
+        )
+
+    def _shape(self, keys: Sequence[str], index: SimpleNamespace) -> tuple:
+        """数値セグメントを、ルール中の数値リテラル/部分ワイルドカードとの一致結果で代表させたキー列。"""
+        shape: List[Any] = []
+        for key in keys:
+            if key.isdigit() and key not in index.literal_digits:
+                shape.append((None, tuple(_segment_match(p, key) for p in index.partial_digit_segments)))
+            else:
+                shape.append(key)
+        return tuple(shape)
+
+    def lookup(
+        self, normalized_path_keys: List[str], original_path_keys: List[str]
+    ) -> Optional[List[ArrayTransformRule]]:
+        """get_applicable_transform_rules と同じ優先順位で適用ルール列を返す。"""
+        index = self._compiled_index
+        memo_key = (self._shape(normalized_path_keys, index), self._shape(original_path_keys, index))
+        try:
+            return index.memo[memo_key]
+        except KeyError:
+            pass
+        result = self._resolve(index, normalized_path_keys, original_path_keys)
+        if len(index.memo) >= RULE_INDEX_MEMO_SIZE:
+            index.memo.clear()
+        index.memo[memo_key] = result
+        return result
+
+    def _resolve(
+        self, index: SimpleNamespace, normalized_path_keys: List[str], original_path_keys: List[str]
+    ) -> Optional[List[ArrayTransformRule]]:
+        key_path = ".".join(normalized_path_keys)
+        orig_key_path = ".".join(original_path_keys)
+
+        def _find_exact_match() -> Optional[List[ArrayTransformRule]]:
+            if key_path in self:
+                return self[key_path]
+            if orig_key_path in self:
+                return self[orig_key_path]
+            return None
+
+        def _find_array_element_parent_match() -> Optional[List[ArrayTransformRule]]:
+            for keys in (normalized_path_keys, original_path_keys):
+                if len(keys) >= 2 and keys[-2].isdigit():
+                    parent = ".".join(keys[:-1])
+                    if parent in self:
+                        return self[parent]
+            return None
+
+        def _find_split_parent_match() -> Optional[List[ArrayTransformRule]]:
+            # 祖先パス（キー列の接頭辞を '.' 連結した文字列）をトライで1回辿り、最も近い祖先を採用
+            for keys in (normalized_path_keys, original_path_keys):
+                node: Optional[dict] = index.split_trie
+                nearest = None
+                for key in keys[:-1]:
+                    for seg in key.split("."):
+                        node = node.get(seg) if node is not None else None
+                    if node is None:
+                        break
+                    # 直近親が数値のケースは配列要素親に任せるためスキップ
+                    if None in node and not key.isdigit():
+                        nearest = node[None]
+                if nearest is not None:
+                    return nearest
+            return None
+
+        def _find_wildcard_match() -> Optional[List[ArrayTransformRule]]:
+            norm_parts = [p for p in key_path.split(".") if p]
+            orig_parts = [p for p in orig_key_path.split(".") if p]
+            candidates = list(index.wildcards_by_len.get(len(norm_parts), ()))
+            if len(orig_parts) != len(norm_parts):
+                candidates = sorted(candidates + index.wildcards_by_len.get(len(orig_parts), []), key=lambda c: c[0])
+            for _order, parts, rule_list in candidates:
+                for actual in (norm_parts, orig_parts):
+                    if len(actual) == len(parts) and all(_segment_match(pp, ap) for pp, ap in zip(parts, actual)):
+                        return rule_list
+            return None
+
+        return (
+            _find_exact_match()
+            or _find_array_element_parent_match()
+            or _find_split_parent_match()
+            or _find_wildcard_match()
+        )
 
 
 def get_applicable_transform_rules(
@@ -4597,79 +5998,16 @@ def get_applicable_transform_rules(
     """
     if not transform_rules:
         return None
+    # 通常は parse_array_transform_rules が返す RuleIndex が渡される。dict を直接渡された場合は都度索引化する
+    index = transform_rules if isinstance(transform_rules, RuleIndex) else RuleIndex(transform_rules)
+    return index.lookup(normalized_path_keys, original_path_keys)
 
-    key_path = ".".join(normalized_path_keys)
-    orig_key_path = ".".join(original_path_keys)
-
-    def _find_exact_match() -> Optional[List[ArrayTransformRule]]:
-        if key_path in transform_rules:
-            return transform_rules[key_path]
-        if orig_key_path in transform_rules:
-            return transform_rules[orig_key_path]
-        return None
-
-    def _find_array_element_parent_match() -> Optional[List[ArrayTransformRule]]:
-        """配列要素（数値インデックス）直下の親パスに定義された非ワイルドカードを探索。
-
-        - 対象パスが少なくとも 2 セグメント以上で、直前の親が数値セグメントのときのみ候補にする
-        - normalized/original の両方で確認する
-        - 深い階層で連続する数値があるケースは、最も末端の直近親のみ対象（即時の親）
-        """
-        # normalized 側で探索
-        if len(normalized_path_keys) >= 2 and normalized_path_keys[-2].isdigit():
-            parent_norm = ".".join(normalized_path_keys[:-1])
-            if parent_norm in transform_rules:
-                return transform_rules[parent_norm]
-        # original 側で探索
-        if len(original_path_keys) >= 2 and original_path_keys[-2].isdigit():
-            parent_orig = ".".join(original_path_keys[:-1])
-            if parent_orig in transform_rules:
-                return transform_rules[parent_orig]
-        return None
-
-    def _find_wildcard_match() -> Optional[List[ArrayTransformRule]]:
-        for rule_key, rule_list in transform_rules.items():
-            if "*" in rule_key and (
-                wildcard_match_path(rule_key, key_path)
-                or wildcard_match_path(rule_key, orig_key_path)
-            ):
-                return rule_list
-        return None
-
-    def _all_split_rules(rule_list: List[ArrayTransformRule]) -> bool:
-        return all(getattr(r, "transform_type", None) == "split" for r in rule_list)
-
-    def _find_split_parent_match() -> Optional[List[ArrayTransformRule]]:
-        """辞書親（数値でない）に定義された split ルールを最近傍の祖先から検索して返す。"""
-        # normalized 側: 末尾を削りながら探索
-        for i in range(len(normalized_path_keys) - 1, 0, -1):
-            parent_parts = normalized_path_keys[:i]
-            # 直近親が数値のケースは配列要素親に任せるためスキップ
-            if parent_parts and parent_parts[-1].isdigit():
-                continue
-            parent_path = ".".join(parent_parts)
-            if parent_path in transform_rules:
-                cand = transform_rules[parent_path]
-                if _all_split_rules(cand):
-                    return cand
-        # original 側
-        for i in range(len(original_path_keys) - 1, 0, -1):
-            parent_parts = original_path_keys[:i]
-            if parent_parts and parent_parts[-1].isdigit():
-                continue
-            parent_path = ".".join(parent_parts)
-            if parent_path in transform_rules:
-                cand = transform_rules[parent_path]
-                if _all_split_rules(cand):
-                    return cand
-        return None
 
-    return (
-        _find_exact_match()
-        or _find_array_element_parent_match()
-        or _find_split_parent_match()
-        or _find_wildcard_match()
-    )
+def as_rule_index(transform_rules: Optional[Mapping[str, Any]]) -> RuleIndex:
+    """変換ルール表を RuleIndex として返す（RuleIndex はそのまま、dict はここで1度だけ索引化する）。"""
+    if isinstance(transform_rules, RuleIndex):
+        return transform_rules
+    return RuleIndex(transform_rules)
 
 
 def apply_transform_rules_for_path(
@@ -4718,83 +6056,235 @@ def apply_transform_rules_for_path(
 
 
 # =============================================================================
-# Wildcard helpers (module-level)
+# Transform Executors
 # =============================================================================
 
+# スレッド実行器の実行中に変換関数の標準出力/標準エラーを捕捉しているスレッドの出力先
+_std_capture = threading.local()
 
-def wildcard_match_path(pattern: str, actual_path: str) -> bool:
-    """拡張ワイルドカードマッチ。
 
-    契約/仕様:
-    - セグメント区切りは '.'
-    - セグメント数は一致している必要がある（配列要素は 1 始まりの数値セグメントとして現れる）
-    - セグメント全体が '*' の場合: 任意1セグメントに一致
-    - セグメント内の部分ワイルドカードをサポート（例: '*items', 'pre*', 'mid*post'）
-      → '*' は同一セグメント内で 0 文字以上にマッチ（正規表現は不使用）
-    - リストそのもののノードには一致させない方針（要素レベルでの一致のみを想定）。
+class _ThreadRoutedStream:
+    """スレッド実行器の実行中の sys.stdout/stderr。捕捉中のスレッドの出力だけをそのスレッドの捕捉先へ送る。
 
-    例:
-    - pattern='json.a.*.b' は 'json.a.1.b' / 'json.a.2.b' に一致
-    - pattern='json.ro*.*.na*' は 'json.root.1.name' / 'json.root.2.natural' に一致
+    redirect_stdout はプロセス全体の sys.stdout を差し替えるため、並行する変換同士で捕捉が混ざらないようにする。
     """
-    pattern_parts = [p for p in pattern.split('.') if p]
-    actual_parts = [p for p in actual_path.split('.') if p]
-    if len(pattern_parts) != len(actual_parts):
-        return False
 
-    def seg_match(pp: str, ap: str) -> bool:
-        if pp == '*':
-            return True
-        if '*' not in pp:
-            return pp == ap
-        # 部分ワイルドカード: 連続 '*' は一つに畳んで処理
-        # 例: '*items' -> suffix match, 'pre*' -> prefix match, 'a*b*c' -> subsequence match
-        tokens = [t for t in pp.split('*')]
-        if len(tokens) == 1:
-            # '*' が末尾にあったケースで split 結果が ['xxx', ''] になるのでここは通常到達しない
-            return pp == ap
-        # 位置合わせ: 最初のトークンは先頭一致、最後のトークンは末尾一致、中間は順序出現
-        # 空トークンはスキップ
-        cur = 0
-        first_token_consumed = False
-        for i, tk in enumerate(tokens):
-            if tk == '':
-                continue
-            if i == 0:  # 先頭
-                if not ap.startswith(tk):
-                    return False
-                cur = len(tk)
-                first_token_consumed = True
-                continue
-            # 中間/末尾: 残りを検索
-            idx = ap.find(tk, cur)
-            if idx < 0:
-                return False
-            cur = idx + len(tk)
-            if i == len(tokens) - 1 and tokens[-1] != '' and not ap.endswith(tk):
-                # 末尾トークンは末尾一致
-                return False
-        # 末尾が '' の場合は何でも可
-        # 先頭トークンが '' のとき（pp 始まりが '*'）も上記ロジックで許容
-        return True
+    def __init__(self, original: Any, attr: str):
+        self._original = original
+        self._attr = attr
 
-    return all(seg_match(pp, ap) for pp, ap in zip(pattern_parts, actual_parts))
+    def _target(self) -> Any:
+        return getattr(_std_capture, self._attr, None) or self._original
 
+    def write(self, text: str) -> int:
+        return self._target().write(text)
 
-def handle_parent_level_for_double_index_array(
-    *,
-    wb: Any,
-    defined_name: Any,
-    value: Any,
-    array_ref: List[Any],
-    array_name: str,
-    array_index: int,
-    path_keys: List[str],
-    name: str,
-    normalized_prefix: str,
-    gen_map: Optional[Dict[str, Any]],
-    expected_field_shape: Dict[Tuple[str, str], str],
-) -> bool:
+    def flush(self) -> None:
+        self._target().flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._target(), name)
+
+
+@contextmanager
+def _routed_std_streams() -> Iterator[None]:
+    if isinstance(sys.stdout, _ThreadRoutedStream):
+        yield
+        return
+    saved = sys.stdout, sys.stderr
+    sys.stdout = _ThreadRoutedStream(saved[0], "stdout")  # type: ignore[assignment]
+    sys.stderr = _ThreadRoutedStream(saved[1], "stderr")  # type: ignore[assignment]
+    try:
+        yield
+    finally:
+        sys.stdout, sys.stderr = saved
+
+
+def run_transform_chain(rules: List[ArrayTransformRule], value: Any) -> Any:
+    """1つの値へルール列を順に適用する（dict 要素のみのリストは要素毎に適用）。"""
+    new_value = value
+    for rule in rules:
+        if is_json_list(new_value) and all(is_json_dict(e) for e in new_value):
+            new_value = [rule.transform(elem) for elem in new_value]
+        else:
+            new_value = rule.transform(new_value)
+    return new_value
+
+
+def _transform_job(rules: List[ArrayTransformRule], value: Any) -> tuple[bool, Any]:
+    """run_transform_chain の結果を (成功か, 変換後の値または例外) で返す（ジョブ毎の失敗を他へ波及させない）。"""
+    try:
+        return True, run_transform_chain(rules, value)
+    except Exception as e:
+        return False, e
+
+
+class TransformExecutor:
+    """変換ジョブの実行器（serial: 呼び出し元スレッドで順に実行）。
+
+    map は入力順に結果を返すため、結果の書き戻し順は実行器によらず決定的。
+    """
+
+    kind = "serial"
+
+    def __init__(self, max_workers: int = 1):
+        self.max_workers = max_workers
+
+    def map(self, fn: Callable[[Any], Any], items: List[Any]) -> List[Any]:
+        return [fn(item) for item in items]
+
+    @staticmethod
+    def for_rules(rules: Sequence[ArrayTransformRule]) -> "TransformExecutor":
+        """ルール列の parallel/executor オプションから実行器を選ぶ（最大の parallel、process 指定を優先）。
+
+        ルール列のいずれかが常駐コマンド（command[server]）を使う場合、process 指定はスレッドで実行する
+        （常駐プロセスとの通信は親プロセスでのみ行う）。
+        """
+        parallel_rules = [
+            r for r in rules if getattr(r, "parallel", 1) > 1 and getattr(r, "executor", "serial") != "serial"
+        ]
+        if not parallel_rules:
+            return TransformExecutor()
+        workers = max(r.parallel for r in parallel_rules)
+        if any(r.executor == "process" for r in parallel_rules):
+            if any(getattr(r, "_command_pool", None) is not None for r in rules):
+                logger.warning("常駐コマンドを含むルール列のため、executor=process をスレッドで実行します")
+                return ThreadTransformExecutor(workers)
+            return ProcessTransformExecutor(workers)
+        return ThreadTransformExecutor(workers)
+
+
+class ThreadTransformExecutor(TransformExecutor):
+    """スレッドプールで実行（外部コマンドや GIL を解放する関数向け）。"""
+
+    kind = "thread"
+
+    def map(self, fn: Callable[[Any], Any], items: List[Any]) -> List[Any]:
+        if len(items) <= 1:
+            return super().map(fn, items)
+        from concurrent.futures import ThreadPoolExecutor
+
+        with _routed_std_streams(), ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as pool:
+            return list(pool.map(fn, items))
+
+
+def _run_transform_jobs_in_worker(bounds: Tuple[int, int]) -> List[Any]:
+    """変換ワーカー: fork 時に引き継いだ (関数, 値列) のうち bounds の区間を変換する。"""
+    fn, items = _fork_worker_state
+    start, stop = bounds
+    return [fn(item) for item in items[start:stop]]
+
+
+class ProcessTransformExecutor(TransformExecutor):
+    """fork したワーカープロセスで実行（CPU 負荷の高い Python 関数向け）。
+
+    ワーカーは fork 時点のルール（読込済みの変換関数）と値を引き継ぎ、結果のみを返す。
+    fork が使えない環境（他のスレッドの実行中を含む）ではスレッドで実行し、失敗したチャンクは自プロセスで再実行する。
+    """
+
+    kind = "process"
+
+    def map(self, fn: Callable[[Any], Any], items: List[Any]) -> List[Any]:
+        if len(items) <= 1:
+            return super().map(fn, items)
+        if not _fork_pool_available():
+            logger.warning("fork が利用できないため executor=process の変換をスレッドで並列実行します")
+            return ThreadTransformExecutor(self.max_workers).map(fn, items)
+        workers = min(self.max_workers, len(items))
+        chunk = max(1, -(-len(items) // (workers * 4)))
+        bounds = [(i, min(i + chunk, len(items))) for i in range(0, len(items), chunk)]
+        results: List[Any] = []
+        with _fork_pool(workers, (fn, items)) as pool:
+            futures = [pool.submit(_run_transform_jobs_in_worker, b) for b in bounds]
+            for (start, stop), future in zip(bounds, futures):
+                try:
+                    results.extend(future.result())
+                except Exception:
+                    logger.debug("変換ワーカーが失敗したため自プロセスで再実行: %d-%d", start, stop, exc_info=True)
+                    results.extend(fn(item) for item in items[start:stop])
+        return results
+
+
+# =============================================================================
+# Wildcard helpers (module-level)
+# =============================================================================
+
+
+def _segment_match(pp: str, ap: str) -> bool:
+    """パターンの1セグメント pp（'*' / 部分ワイルドカード可）が実セグメント ap に一致するか。"""
+    if pp == '*':
+        return True
+    if '*' not in pp:
+        return pp == ap
+    # 部分ワイルドカード: 連続 '*' は一つに畳んで処理
+    # 例: '*items' -> suffix match, 'pre*' -> prefix match, 'a*b*c' -> subsequence match
+    tokens = [t for t in pp.split('*')]
+    if len(tokens) == 1:
+        # '*' が末尾にあったケースで split 結果が ['xxx', ''] になるのでここは通常到達しない
+        return pp == ap
+    # 位置合わせ: 最初のトークンは先頭一致、最後のトークンは末尾一致、中間は順序出現
+    # 空トークンはスキップ
+    cur = 0
+    first_token_consumed = False
+    for i, tk in enumerate(tokens):
+        if tk == '':
+            continue
+        if i == 0:  # 先頭
+            if not ap.startswith(tk):
+                return False
+            cur = len(tk)
+            first_token_consumed = True
+            continue
+        # 中間/末尾: 残りを検索
+        idx = ap.find(tk, cur)
+        if idx < 0:
+            return False
+        cur = idx + len(tk)
+        if i == len(tokens) - 1 and tokens[-1] != '' and not ap.endswith(tk):
+            # 末尾トークンは末尾一致
+            return False
+    # 末尾が '' の場合は何でも可
+    # 先頭トークンが '' のとき（pp 始まりが '*'）も上記ロジックで許容
+    return True
+
+
+def wildcard_match_path(pattern: str, actual_path: str) -> bool:
+    """拡張ワイルドカードマッチ。
+
+    契約/仕様:
+    - セグメント区切りは '.'
+    - セグメント数は一致している必要がある（配列要素は 1 始まりの数値セグメントとして現れる）
+    - セグメント全体が '*' の場合: 任意1セグメントに一致
+    - セグメント内の部分ワイルドカードをサポート（例: '*items', 'pre*', 'mid*post'）
+      → '*' は同一セグメント内で 0 文字以上にマッチ（正規表現は不使用）
+    - リストそのもののノードには一致させない方針（要素レベルでの一致のみを想定）。
+
+    例:
+    - pattern='json.a.*.b' は 'json.a.1.b' / 'json.a.2.b' に一致
+    - pattern='json.ro*.*.na*' は 'json.root.1.name' / 'json.root.2.natural' に一致
+    """
+    pattern_parts = [p for p in pattern.split('.') if p]
+    actual_parts = [p for p in actual_path.split('.') if p]
+    if len(pattern_parts) != len(actual_parts):
+        return False
+
+    return all(_segment_match(pp, ap) for pp, ap in zip(pattern_parts, actual_parts))
+
+
+def handle_parent_level_for_double_index_array(
+    *,
+    wb: Any,
+    defined_name: Any,
+    value: Any,
+    array_ref: List[Any],
+    array_name: str,
+    array_index: int,
+    path_keys: List[str],
+    name: str,
+    normalized_prefix: str,
+    gen_map: Optional[Dict[str, Any]],
+    expected_field_shape: Dict[Tuple[str, str], str],
+) -> bool:
     """二重数値インデックス配列に対する親レベル（parent.i.*）の処理を行う。
 
     契約:
@@ -4999,6 +6489,82 @@ def find_matching_paths(
     return matches
 
 
+class PatternTrie:
+    """変換パターン群をセグメント単位で共有したトライ（'*' / 部分ワイルドカードの辺を持つ）。
+
+    `match_all` は結果ツリーを1回だけ走査し、全パターンのマッチを find_matching_paths と
+    同じ前順で返す。どのパターンの接頭辞にも一致しない部分木は走査しない。
+    """
+
+    __slots__ = ("exact", "star", "partial", "terminals")
+
+    def __init__(self) -> None:
+        self.exact: Dict[str, PatternTrie] = {}
+        self.star: Optional[PatternTrie] = None
+        self.partial: Dict[str, PatternTrie] = {}
+        self.terminals: List[int] = []
+
+    @classmethod
+    def compile(cls, patterns: Sequence[str]) -> "PatternTrie":
+        root = cls()
+        for index, pattern in enumerate(patterns):
+            node = root
+            for seg in (p for p in pattern.split(".") if p):
+                if seg == "*":
+                    if node.star is None:
+                        node.star = cls()
+                    node = node.star
+                elif "*" in seg:
+                    node = node.partial.setdefault(seg, cls())
+                else:
+                    node = node.exact.setdefault(seg, cls())
+            node.terminals.append(index)
+        return root
+
+    def step(self, segment: str) -> List["PatternTrie"]:
+        """実セグメント segment で遷移できる子ノードを返す。"""
+        out: List[PatternTrie] = []
+        node = self.exact.get(segment)
+        if node is not None:
+            out.append(node)
+        if self.star is not None:
+            out.append(self.star)
+        for seg, node in self.partial.items():
+            if _segment_match(seg, segment):
+                out.append(node)
+        return out
+
+    def match_all(self, data: JSONValue, pattern_count: int) -> List[List[tuple[tuple[str, ...], Any, Any]]]:
+        """パターン毎のマッチ (パス, 親コンテナ, 親内のキー/0始まり添字) を前順で返す。
+
+        パスは find_matching_paths と同じく配列要素を 1 始まりの数値セグメントで表す。
+        ドット区切りパスで解決できないキー（非文字列・空・'.' を含む）の部分木は対象外。
+        """
+        matches: List[List[tuple[tuple[str, ...], Any, Any]]] = [[] for _ in range(pattern_count)]
+
+        def _visit(node: JSONValue, path: tuple[str, ...], states: List[PatternTrie]) -> None:
+            if is_json_dict(node):
+                children: Iterable[tuple[Any, str, JSONValue]] = (
+                    (k, k, v) for k, v in node.items() if isinstance(k, str) and k and "." not in k
+                )
+            elif is_json_list(node):
+                children = ((i, str(i + 1), v) for i, v in enumerate(node))
+            else:
+                return
+            for key, seg, child in children:
+                next_states = [n for st in states for n in st.step(seg)]
+                if not next_states:
+                    continue
+                child_path = path + (seg,)
+                for st in next_states:
+                    for index in st.terminals:
+                        matches[index].append((child_path, node, key))
+                _visit(child, child_path, next_states)
+
+        _visit(data, (), [self])
+        return matches
+
+
 def log_transform_progress(
     *,
     step_index: int,
@@ -5338,163 +6904,1296 @@ def preseed_root_keys(
 
 
 # =============================================================================
-# Named Range Parsing
+# Workbook Loading (sparse / referenced-cells-only)
 # =============================================================================
 
+# ワークブック読込モード
+#  - full:   openpyxl で全セル・全スタイルを構築（従来動作）
+#  - sparse: 定義名/コンテナが参照する外接矩形内のセル値と罫線のみ構築
+LOAD_MODES = ("full", "sparse")
+
+# 疎読込で参照矩形に付与するマージン。
+# 矩形検出の探索マージン（compute_scan_bounds_for_rect_detection と共通）+ 隣接セル罫線参照の1セル分。
+SPARSE_ROW_MARGIN = RECT_SCAN_ROW_MARGIN + 1
+SPARSE_COL_MARGIN = RECT_SCAN_COL_MARGIN + 1
+
+
+class SparseCell:
+    """疎読込ワークシートのセル（値と罫線のみ保持）。"""
+
+    __slots__ = ("row", "column", "value", "border")
+
+    def __init__(self, row: int, column: int, value: Any = None, border: Any = None):
+        self.row = row
+        self.column = column
+        self.value = value
+        self.border = border if border is not None else _EMPTY_BORDER
+
+    def __repr__(self) -> str:
+        return f"<SparseCell {get_column_letter(self.column)}{self.row}>"
+
+
+# 罫線なしセルで共有する空 Border（差し替えのみで変更はしない）
+_EMPTY_BORDER = Border()
+
+
+class SparseWorksheet:
+    """参照範囲内のセルのみを保持する読み取り専用ワークシート。
+
+    変換処理が使用する openpyxl Worksheet の最小インターフェース
+    （title / max_row / max_column / cell() / ws[coord]）のみを提供する。
+    保持していないセルは値 None・罫線なしとして返す。
+    openpyxl と同様、範囲外アクセスで max_row / max_column が拡張される。
+    """
+
+    def __init__(self, title: str, max_row: int = 1, max_column: int = 1):
+        self.title = title
+        self.max_row = max_row
+        self.max_column = max_column
+        self.loaded_bounds: Optional[Tuple[int, int, int, int]] = None
+        self._cells: Dict[Tuple[int, int], SparseCell] = {}
+
+    def cell(self, row: int, column: int, value: Any = None) -> SparseCell:
+        if row < 1 or column < 1:
+            raise ValueError("Row or column values must be at least 1")
+        if row > self.max_row:
+            self.max_row = row
+        if column > self.max_column:
+            self.max_column = column
+        found = self._cells.get((row, column))
+        if found is not None:
+            return found
+        return SparseCell(row, column)
+
+    def __getitem__(self, key: str) -> Any:
+        min_col, min_row, max_col, max_row = range_boundaries(str(key))
+        if not any([min_col, min_row, max_col, max_row]):
+            raise IndexError(f"{key} is not a valid coordinate or range")
+        if not min_row:
+            # 列範囲（例: A:B）
+            cols = tuple(
+                tuple(self.cell(row=r, column=c) for r in range(1, self.max_row + 1))
+                for c in range(min_col, max_col + 1)
+            )
+            return cols[0] if min_col == max_col else cols
+        if not min_col:
+            # 行範囲（例: 1:2）
+            rows = tuple(
+                tuple(self.cell(row=r, column=c) for c in range(1, self.max_column + 1))
+                for r in range(min_row, max_row + 1)
+            )
+            return rows[0] if min_row == max_row else rows
+        if ":" not in str(key):
+            return self.cell(row=min_row, column=min_col)
+        return tuple(
+            tuple(self.cell(row=r, column=c) for c in range(min_col, max_col + 1))
+            for r in range(min_row, max_row + 1)
+        )
 
-def _prepare_parsing_prelude(
-    *,
-    wb,
-    prefix: str,
-    containers: Optional[Dict[str, Dict]],
-    global_max_elements: Optional[int],
-    extraction_policy: ExtractionPolicy,
-) -> Dict[str, Any]:
-    """パース前の派生情報をまとめて構築し、状態辞書を返す。"""
-    # コンテナ準備
-    containers, user_provided_containers, _generated_names = prepare_containers_and_generated_names(
-        wb,
-        prefix=prefix,
-        containers=containers,
-        global_max_elements=global_max_elements,
-        extraction_policy=extraction_policy,
-    )
+    def _store(self, row: int, column: int, value: Any, border: Any) -> SparseCell:
+        c = SparseCell(row, column, value, border)
+        self._cells[(row, column)] = c
+        return c
 
-    # prefix の正規化
-    normalized_prefix = prefix if prefix.endswith(".") else prefix + "."
 
-    # 定義名 + 生成名を統合（初期スナップショット）
-    all_names, defined_only_name_keys = build_all_names_with_generated(wb)
+class SparseWorkbook:
+    """SparseWorksheet を束ねる読み取り専用ワークブック。
 
-    # 既存仕様: フィールド直下の *.field.1 用に補助生成名を後から追加
-    try:
-        generate_subarray_names_for_field_anchors(wb, normalized_prefix)
-    except Exception as _e:
-        logger.debug("subarray name generation skipped due to error: %s", _e)
+    defined_names は openpyxl の DefinedNameDict をそのまま保持する。
+    """
 
-    all_name_keys = list(all_names.keys())
-    # 生成名マップ（補助生成名含む、最新状態）
-    gen_map = get_generated_names_map(wb)
+    def __init__(self, defined_names: Any, worksheets: List[SparseWorksheet], active_index: int = 0):
+        self.defined_names = defined_names
+        self.worksheets = worksheets
+        self._by_title = {ws.title: ws for ws in worksheets}
+        self._active_index = active_index if 0 <= active_index < len(worksheets) else 0
 
-    # *.field と *.field.1 の重複抑止集合
-    excluded_indexed_field_names: set[str] = compute_excluded_indexed_field_names(
-        normalized_prefix, all_name_keys, all_names
-    )
+    @property
+    def sheetnames(self) -> List[str]:
+        return [ws.title for ws in self.worksheets]
 
-    # 各フィールドの期待形状（1D/2D）
-    expected_field_shape: Dict[Tuple[str, str], str] = learn_expected_field_shapes(
-        normalized_prefix, all_name_keys, all_names
-    )
+    @property
+    def active(self) -> Optional[SparseWorksheet]:
+        return self.worksheets[self._active_index] if self.worksheets else None
 
-    # ルート直下の数値キー
-    numeric_root_keys = compute_numeric_root_keys(normalized_prefix, all_names)
+    def __getitem__(self, key: str) -> SparseWorksheet:
+        try:
+            return self._by_title[key]
+        except KeyError:
+            raise KeyError(f"Worksheet {key} does not exist.")
 
-    # 二重数値インデックス（array.i.j.*）が存在する配列名集合
-    arrays_with_double_index: set[str] = find_arrays_with_double_index(
-        normalized_prefix=normalized_prefix, all_name_keys=all_name_keys, gen_map=gen_map
-    )
+    def __contains__(self, key: str) -> bool:
+        return key in self._by_title
 
-    container_parent_names: set[str] = set(containers.keys()) if containers else set()
-    container_parents_with_children: set[str] = compute_container_parents_with_children(
-        container_parent_names=container_parent_names,
-        all_name_keys=all_name_keys,
-        gen_map=gen_map,
-    )
+    def close(self) -> None:
+        return None
 
-    # groupLabel -> rootName
-    group_to_root: dict[str, str] = compute_group_to_root_map(
-        containers=containers,
-        prefix=prefix,
-        normalized_prefix=normalized_prefix,
-        all_name_keys=all_name_keys,
-    )
 
-    # アンカー名とグループラベル
-    anchor_names: set[str] = compute_anchor_names(normalized_prefix, all_name_keys)
-    group_labels: set[str] = compute_group_labels_from_anchors(
-        anchor_names, containers, prefix=prefix, normalized_prefix=normalized_prefix
-    )
+def _iter_destination_bounds(defined_name) -> Iterable[Tuple[Optional[str], Optional[int], Optional[int], Optional[int], Optional[int]]]:
+    """定義名の宛先を (sheet, min_row, min_col, max_row, max_col) で列挙する。
 
-    # シート順序とルート最初の出現位置
-    sheet_order: Dict[str, int] = {ws.title: idx for idx, ws in enumerate(wb.worksheets)}
-    root_first_pos: Dict[str, tuple[int, int, int]] = collect_root_first_positions(
-        normalized_prefix, defined_only_name_keys, all_names, sheet_order
-    )
+    行/列全体参照（A:A, 1:1）は該当軸を None で返す。#REF! 等の無効宛先はスキップ。
+    """
+    try:
+        dests = list(getattr(defined_name, "destinations", []) or [])
+    except Exception:
+        return
+    for sheet_name, coord in dests:
+        if not coord or "REF" in str(coord).upper():
+            continue
+        try:
+            min_col, min_row, max_col, max_row = range_boundaries(str(coord))
+        except Exception:
+            continue
+        yield sheet_name, min_row, min_col, max_row, max_col
 
-    return {
-        "containers": containers,
-        "user_provided_containers": user_provided_containers,
-        "normalized_prefix": normalized_prefix,
-        "all_names": all_names,
-        "defined_only_name_keys": defined_only_name_keys,
-        "all_name_keys": all_name_keys,
-        "gen_map": gen_map,
-        "excluded_indexed_field_names": excluded_indexed_field_names,
-        "expected_field_shape": expected_field_shape,
-        "numeric_root_keys": numeric_root_keys,
-        "arrays_with_double_index": arrays_with_double_index,
-        "container_parent_names": container_parent_names,
-        "container_parents_with_children": container_parents_with_children,
-        "group_to_root": group_to_root,
-        "anchor_names": anchor_names,
-        "group_labels": group_labels,
-        "sheet_order": sheet_order,
-        "root_first_pos": root_first_pos,
-    }
 
+def _union_bounds(
+    cur: Optional[Tuple[int, int, int, int]], add: Tuple[int, int, int, int]
+) -> Tuple[int, int, int, int]:
+    if cur is None:
+        return add
+    return (min(cur[0], add[0]), min(cur[1], add[1]), max(cur[2], add[2]), max(cur[3], add[3]))
 
-def _iterate_and_fill_entries(
-    *,
-    wb,
-    schema: Optional[Dict[str, Any]],
-    array_transform_rules: Optional[Dict[str, List[ArrayTransformRule]]],
-    prefix: str,
-    root_result: Dict[str, Any],
-    state: Dict[str, Any],
-    safe_insert,
-    user_provided_containers: bool,
-) -> None:
-    """定義名/生成名を走査し、値の取得→変換→配分→挿入までを一括処理。"""
-    # ルートキーの事前挿入で順序を安定化
-    preseed_root_keys(root_result=root_result, root_first_pos=state["root_first_pos"])
 
-    entries = collect_entries_in_sheet_order(
-        all_names=state["all_names"],
-        normalized_prefix=state["normalized_prefix"],
-        excluded_indexed_field_names=state["excluded_indexed_field_names"],
-        sheet_order=state["sheet_order"],
-        suppress_ctx={
-            "all_name_keys": state["all_name_keys"],
-            "container_parent_names": state["container_parent_names"],
-            "container_parents_with_children": state["container_parents_with_children"],
-            "group_labels": state["group_labels"],
-            "root_first_pos": state["root_first_pos"],
-        },
-    )
+def compute_sparse_load_bounds(
+    workbook,
+    containers: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Tuple[int, int, int, int]]:
+    """疎読込で構築するシート毎の外接矩形 {sheet: (min_row, min_col, max_row, max_col)} を返す。
 
-    for _pos, name, defined_name, original_path_keys in entries:
-        path_keys = original_path_keys.copy()
+    契約:
+    - 全定義名の宛先とコンテナの range の外接矩形にマージン（SPARSE_ROW_MARGIN/SPARSE_COL_MARGIN）を付与する。
+      抽出時の矩形検出は名前付きセルの周囲（同じマージン）のみを走査する。
+      セル名マップ無しの検出（シート全体を走査）は抽出では使わないため対象外
+    - range を持つ繰り返しコンテナはその range（＋マージン）までとする。range の無い繰り返し構造
+      （数値セグメントを含む定義名、または increment>0 のコンテナ）の方向は、読込時に矩形の先へ
+      内容の続く間だけ延長する（`sparse_load_plan()` / `SparseLoadWindow`）
+    - 定義名を持たないシートは含めない（セルを構築しない）
+    """
+    return sparse_load_plan(workbook, containers)[0]
 
-        if schema is not None:
-            schema_path_keys, schema_broken = resolve_path_keys_with_schema(
-                path_keys=path_keys, schema=schema
-            )
-            if not schema_broken:
-                path_keys = schema_path_keys
 
-        _skip, value = get_value_for_defined_or_generated_name(
-            wb=wb, name=name, defined_name=defined_name, gen_map=state["gen_map"]
-        )
-        if _skip:
-            continue
+def sparse_load_plan(
+    workbook,
+    containers: Optional[Dict[str, Any]] = None,
+) -> Tuple[Dict[str, Tuple[int, int, int, int]], Dict[str, Dict[str, int]]]:
+    """疎読込の (シート毎の外接矩形, シート毎の延長方向 {direction: ストライド}) を返す。
+
+    延長方向は range の無い繰り返し構造の direction で、ストライドはそのコンテナの increment（最低1）。
+    数値セグメントを含む定義名は、その名前を含む最も深いコンテナ（無ければ row 方向・ストライド1）に従う。
+    """
+    sheet_dims: Dict[str, Tuple[int, int]] = {}
+    for ws in getattr(workbook, "worksheets", []) or []:
+        sheet_dims[ws.title] = (int(ws.max_row or 1), int(ws.max_column or 1))
+
+    raw: Dict[str, Tuple[int, int, int, int]] = {}
+    open_strides: Dict[str, Dict[str, int]] = {}
+
+    def _add(sheet: Optional[str], b: Tuple[Optional[int], Optional[int], Optional[int], Optional[int]]) -> None:
+        targets = [sheet] if sheet in sheet_dims else []
+        if sheet is None:
+            targets = list(sheet_dims.keys())
+        for sn in targets:
+            dim_r, dim_c = sheet_dims[sn]
+            r0, c0, r1, c1 = b
+            rect = (r0 or 1, c0 or 1, r1 or dim_r, c1 or dim_c)
+            raw[sn] = _union_bounds(raw.get(sn), rect)
+
+    def _open(sheet: str, direction: str, stride: int) -> None:
+        strides = open_strides.setdefault(sheet, {})
+        strides[direction] = max(strides.get(direction, 0), stride)
+
+    def _container_shape(cdef: Dict[str, Any]) -> Tuple[str, int, bool]:
+        """(direction, ストライド, range 宣言の有無)。"""
+        direction = str(cdef.get("direction", "row") or "row").lower()
+        try:
+            increment = int(cdef.get("increment", 0) or 0)
+        except (TypeError, ValueError):
+            increment = 0
+        range_spec = cdef.get("range")
+        return direction, max(increment, 1), isinstance(range_spec, str) and bool(range_spec)
+
+    container_defs: Dict[str, Dict[str, Any]] = {
+        str(k): (v if isinstance(v, dict) else {}) for k, v in (containers or {}).items()
+    }
 
-        # 末端（スカラー）で None の場合は空プレースホルダに変換して形状復元の対象にする
-        # （同階層に有効データがあるときに null として出力されるようにするため）
-        if value is None or (not isinstance(value, (list, dict)) and DataCleaner.is_empty_value(value)):
-            value = ""
+    def _owner_shape(name: str) -> Tuple[str, int, bool]:
+        """name を含む最も深いコンテナの形（接頭辞無しのキーも照合。無ければ row・ストライド1・range 無し）。"""
+        parts = name.split(".")
+        for n in range(len(parts) - 1, 0, -1):
+            for key in (".".join(parts[:n]), ".".join(parts[1:n])):
+                if key in container_defs:
+                    return _container_shape(container_defs[key])
+        return "row", 1, False
 
-        # 1. 変換ルール
-        if try_apply_transform_and_insert(
+    try:
+        dn_items = list(workbook.defined_names.items())
+    except Exception:
+        dn_items = []
+    name_sheets: Dict[str, set[str]] = {}
+    for name, dn in dn_items:
+        for sn, r0, c0, r1, c1 in _iter_destination_bounds(dn):
+            _add(sn, (r0, c0, r1, c1))
+            if sn in sheet_dims:
+                name_sheets.setdefault(name, set()).add(sn)
+                if any(seg.isdigit() for seg in str(name).split(".")):
+                    direction, stride, declared = _owner_shape(str(name))
+                    if not declared:
+                        _open(sn, direction, stride)
+
+    for cont_key, cdef in container_defs.items():
+        direction, stride, declared = _container_shape(cdef)
+        try:
+            increment = int(cdef.get("increment", 0) or 0)
+        except (TypeError, ValueError):
+            increment = 0
+        repeating = increment > 0 or cont_key.rsplit(".", 1)[-1].isdigit()
+        sheets_for_key = name_sheets.get(cont_key) or set(raw.keys())
+        range_spec = cdef.get("range")
+        if declared and range_spec not in name_sheets:
+            try:
+                (sc, sr), (ec, er) = parse_range(range_spec)
+                for sn in list(raw.keys()):
+                    _add(sn, (sr, sc, er, ec))
+            except ValueError:
+                logger.debug("疎読込: コンテナ範囲を解釈できません: %s", range_spec)
+                declared = False
+        if repeating and not declared:
+            for sn in sheets_for_key:
+                _open(sn, direction, stride)
+
+    bounds: Dict[str, Tuple[int, int, int, int]] = {}
+    for sn, (r0, c0, r1, c1) in raw.items():
+        bounds[sn] = (
+            max(1, r0 - SPARSE_ROW_MARGIN),
+            max(1, c0 - SPARSE_COL_MARGIN),
+            r1 + SPARSE_ROW_MARGIN,
+            c1 + SPARSE_COL_MARGIN,
+        )
+    return bounds, {sn: strides for sn, strides in open_strides.items() if sn in bounds}
+
+
+class SparseLoadWindow:
+    """疎読込でセルを構築する範囲（行優先のストリーム解析で使う）。
+
+    矩形 bounds に加え、延長方向（row/column）では最後に内容（値または罫線）があった行/列から
+    ストライド以内に内容がある限り範囲を延ばし、ストライド分の空き（空のストライド）で打ち切る。
+    行方向の内容は矩形の列範囲、列方向の内容は（延長後の）行範囲で判定する。
+    列方向の延長候補は解析の終わりに打ち切り位置を決めてから構築する。
+    """
+
+    def __init__(self, bounds: Tuple[int, int, int, int], strides: Optional[Mapping[str, int]] = None):
+        self.r0, self.c0, self.r1, self.c1 = bounds
+        self.row_stride = int((strides or {}).get("row", 0))
+        self.col_stride = int((strides or {}).get("column", 0))
+        self._last_row = self.r1
+        self._pending: List[Tuple[int, int, Any, Any]] = []
+
+    def contains(self, row: int, col: int) -> bool:
+        """(row, col) が構築候補か（値の変換前の判定。列方向の延長候補を含む）。"""
+        if row < self.r0 or col < self.c0:
+            return False
+        if row > self.r1 and not (self.row_stride and row <= self._last_row + self.row_stride):
+            return False
+        return col <= self.c1 or self.col_stride > 0
+
+    def store(self, ws: SparseWorksheet, row: int, col: int, value: Any, border: Any) -> None:
+        """contains() を満たす内容のあるセルを構築する（列方向の延長候補は保留する）。"""
+        if col > self.c1:
+            self._pending.append((row, col, value, border))
+            return
+        ws._store(row, col, value, border)
+        if row > self._last_row:
+            self._last_row = row
+
+    def finish(self, ws: SparseWorksheet) -> Tuple[int, int, int, int]:
+        """保留した列方向の候補を打ち切り位置まで構築し、実際に構築した範囲を返す。"""
+        last_col = self.c1
+        for col in sorted({c for _r, c, _v, _b in self._pending}):
+            if col > last_col + self.col_stride:
+                break
+            last_col = col
+        for row, col, value, border in self._pending:
+            if col <= last_col:
+                ws._store(row, col, value, border)
+        self._pending = []
+        last_row = self._last_row + self.row_stride if self.row_stride else self.r1
+        return (self.r0, self.c0, min(last_row, max(ws.max_row, self.r1)), last_col)
+
+
+def _border_has_any_side(border: Any) -> bool:
+    for side in ("left", "right", "top", "bottom"):
+        s = getattr(border, side, None)
+        if s is not None and getattr(s, "style", None) is not None:
+            return True
+    return False
+
+
+def _apply_merged_borders_sparse(ws: SparseWorksheet, merged_ranges: Iterable[Any], bounds: Tuple[int, int, int, int]) -> None:
+    """結合セル範囲の罫線を openpyxl 通常読込（MergedCellRange.format）と同じ規則で反映する。
+
+    - 左上セルは右下セルの right/bottom を取り込む
+    - 左上以外は値 None の結合セルとなり、外周セルへ左上の各辺が伝播する
+    範囲外（bounds 外）のセルは構築しない。
+    """
+    b_r0, b_c0, b_r1, b_c1 = bounds
+
+    def _inside(r: int, c: int) -> bool:
+        return b_r0 <= r <= b_r1 and b_c0 <= c <= b_c1
+
+    for mr in merged_ranges:
+        try:
+            min_row, min_col, max_row, max_col = mr.min_row, mr.min_col, mr.max_row, mr.max_col
+        except Exception:
+            continue
+        if max_row < b_r0 or min_row > b_r1 or max_col < b_c0 or min_col > b_c1:
+            continue
+        start = ws._cells.get((min_row, min_col)) or SparseCell(min_row, min_col)
+        end = ws._cells.get((max_row, max_col))
+        if end is not None:
+            start.border = start.border + Border(right=end.border.right, bottom=end.border.bottom)
+        # 左上以外は結合セル（値なし・罫線なし）に置換
+        for r in range(max(min_row, b_r0), min(max_row, b_r1) + 1):
+            for c in range(max(min_col, b_c0), min(max_col, b_c1) + 1):
+                if (r, c) != (min_row, min_col):
+                    ws._store(r, c, None, Border())
+        if _inside(min_row, min_col):
+            ws._cells[(min_row, min_col)] = start
+        edges = {
+            "top": [(min_row, c) for c in range(min_col, max_col + 1)],
+            "bottom": [(max_row, c) for c in range(min_col, max_col + 1)],
+            "left": [(r, min_col) for r in range(min_row, max_row + 1)],
+            "right": [(r, max_col) for r in range(min_row, max_row + 1)],
+        }
+        for side_name, coords in edges.items():
+            side = getattr(start.border, side_name)
+            if side and side.style is None:
+                continue
+            add = Border(**{side_name: side})
+            for r, c in coords:
+                if not _inside(r, c):
+                    continue
+                target = ws._cells.get((r, c))
+                if target is None:
+                    target = ws._store(r, c, None, Border())
+                target.border = target.border + add
+        for r, c in ((min_row, min_col), (max_row, max_col)):
+            if r > ws.max_row:
+                ws.max_row = r
+            if c > ws.max_column:
+                ws.max_column = c
+
+
+def _load_sheet_cells_sparse(ro_wb, ro_ws, ws: SparseWorksheet, window: SparseLoadWindow) -> Tuple[int, int, int, int]:
+    """読み取り専用シートの XML をストリーム解析し、window 内のセルのみ構築して構築範囲を返す。
+
+    max_row / max_column は通常読込と一致させるため全セルから算出する。
+    """
+    from openpyxl.worksheet._reader import WorkSheetParser
+
+    cell_styles = ro_wb._cell_styles
+    borders = ro_wb._borders
+    max_row = 0
+    max_col = 0
+    with ro_ws._get_source() as src:
+        parser = WorkSheetParser(
+            src,
+            ro_ws._shared_strings,
+            data_only=True,
+            epoch=ro_wb.epoch,
+            date_formats=ro_wb._date_formats,
+            timedelta_formats=ro_wb._timedelta_formats,
+        )
+        for row_idx, row in parser.parse():
+            for c in row:
+                col = c["column"]
+                if col > max_col:
+                    max_col = col
+                if row_idx > max_row:
+                    max_row = row_idx
+                if not window.contains(row_idx, col):
+                    continue
+                value = c["value"]
+                border = None
+                style_id = c.get("style_id") or 0
+                if style_id:
+                    try:
+                        border = borders[cell_styles[style_id].borderId]
+                    except Exception:
+                        border = None
+                if value is None and (border is None or not _border_has_any_side(border)):
+                    continue
+                window.store(ws, row_idx, col, value, border)
+        merged = getattr(parser, "merged_cells", None)
+    ws.max_row = max(max_row, 1)
+    ws.max_column = max(max_col, 1)
+    bounds = window.finish(ws)
+    if merged is not None:
+        _apply_merged_borders_sparse(ws, getattr(merged, "mergeCell", []) or [], bounds)
+    return bounds
+
+
+def load_workbook_sparse(xlsx_path: Path, containers: Optional[Dict[str, Any]] = None) -> SparseWorkbook:
+    """定義名とコンテナが参照する範囲のセル値・罫線のみを構築してワークブックを返す。
+
+    openpyxl の読み取り専用モードで定義名を先に読み、sparse_load_plan の矩形内（と延長方向）の
+    セルだけを SparseWorksheet に保持する。範囲外の未命名データ（作業用シート/列）は構築しない。
+    """
+    ro = load_workbook(xlsx_path, read_only=True, data_only=True)
+    try:
+        bounds_by_sheet, strides_by_sheet = sparse_load_plan(ro, containers)
+        sheets: List[SparseWorksheet] = []
+        for ro_ws in ro.worksheets:
+            ws = SparseWorksheet(ro_ws.title, int(ro_ws.max_row or 1), int(ro_ws.max_column or 1))
+            bounds = bounds_by_sheet.get(ro_ws.title)
+            if bounds is not None:
+                window = SparseLoadWindow(bounds, strides_by_sheet.get(ro_ws.title))
+                ws.loaded_bounds = _load_sheet_cells_sparse(ro, ro_ws, ws, window)
+            sheets.append(ws)
+        try:
+            active_index = ro.worksheets.index(ro.active)
+        except Exception:
+            active_index = 0
+        loaded = sum(len(ws._cells) for ws in sheets)
+        logger.debug("疎読込: sheets=%d loaded_cells=%d bounds=%s", len(sheets), loaded, bounds_by_sheet)
+        return SparseWorkbook(ro.defined_names, sheets, active_index)
+    finally:
+        ro.close()
+
+
+# =============================================================================
+# Native OOXML Reader (openpyxl を介さない抽出用バックエンド)
+# =============================================================================
+
+# ワークブック読込バックエンド
+#  - openpyxl: openpyxl の Workbook/Worksheet を使用（参照実装）
+#  - ooxml:    xlsx(zip) 内の XML を直接ストリーム解析して SparseWorkbook を構築
+READERS = ("openpyxl", "ooxml")
+
+_OOXML_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_OOXML_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_OOXML_PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+
+def _q(tag: str) -> str:
+    return f"{{{_OOXML_MAIN_NS}}}{tag}"
+
+
+class NativeDefinedName:
+    """ネイティブリーダーの定義名（openpyxl DefinedName の使用部分のみ互換）。"""
+
+    __slots__ = ("name", "attr_text", "localSheetId", "hidden")
+
+    def __init__(self, name: str, attr_text: str, localSheetId: Optional[int] = None, hidden: Optional[bool] = None):
+        self.name = name
+        self.attr_text = attr_text
+        self.localSheetId = localSheetId
+        self.hidden = hidden
+
+    @property
+    def value(self) -> str:
+        return self.attr_text
+
+    @property
+    def destinations(self) -> Iterable[Tuple[str, str]]:
+        """(sheet, coord) を列挙。openpyxl と同様にシート名の '' はそのまま返す。"""
+        from openpyxl.utils.cell import SHEETRANGE_RE
+
+        for part in _split_defined_name_areas(self.attr_text or ""):
+            m = SHEETRANGE_RE.match(part)
+            if m is None or m.end() != len(part):
+                continue
+            yield (m.group("notquoted") or m.group("quoted")), m.group("cells")
+
+    def __repr__(self) -> str:
+        return f"<NativeDefinedName {self.name}={self.attr_text}>"
+
+
+def _split_defined_name_areas(text: str) -> List[str]:
+    """'Sheet1'!$A$1,Sheet2!$B$2 をクォート外のカンマで分割する。"""
+    parts: List[str] = []
+    buf: List[str] = []
+    in_quote = False
+    for ch in text:
+        if ch == "'":
+            in_quote = not in_quote
+        if ch == "," and not in_quote:
+            parts.append("".join(buf).strip())
+            buf = []
+            continue
+        buf.append(ch)
+    if buf:
+        parts.append("".join(buf).strip())
+    return [p for p in parts if p]
+
+
+def _ooxml_resolve_target(base_dir: str, target: str) -> str:
+    if target.startswith("/"):
+        return target.lstrip("/")
+    parts: List[str] = [p for p in base_dir.split("/") if p]
+    for seg in target.split("/"):
+        if seg == "..":
+            if parts:
+                parts.pop()
+        elif seg and seg != ".":
+            parts.append(seg)
+    return "/".join(parts)
+
+
+def _ooxml_read_rels(zf, rels_path: str, base_dir: str) -> Dict[str, Tuple[str, str]]:
+    """rels を {rId: (type, zip内パス)} で返す（存在しなければ空）。"""
+    import xml.etree.ElementTree as ET
+
+    if rels_path not in zf.namelist():
+        return {}
+    root = ET.fromstring(zf.read(rels_path))
+    out: Dict[str, Tuple[str, str]] = {}
+    for rel in root.iter(f"{{{_OOXML_PKG_REL_NS}}}Relationship"):
+        if rel.get("TargetMode") == "External":
+            continue
+        out[rel.get("Id", "")] = (rel.get("Type", ""), _ooxml_resolve_target(base_dir, rel.get("Target", "")))
+    return out
+
+
+def _ooxml_text_content(node) -> str:
+    """<si>/<is> から書式を除いた文字列を得る（直下 t と r/t を連結、ルビ rPh は除外）。"""
+    snippets: List[str] = []
+    for child in node:
+        if child.tag == _q("t"):
+            snippets.append(child.text or "")
+        elif child.tag == _q("r"):
+            t = child.find(_q("t"))
+            if t is not None and t.text is not None:
+                snippets.append(t.text)
+    return "".join(snippets)
+
+
+def _ooxml_read_shared_strings(zf, path: Optional[str]) -> List[str]:
+    import xml.etree.ElementTree as ET
+
+    strings: List[str] = []
+    if not path or path not in zf.namelist():
+        return strings
+    tag_si = _q("si")
+    root = None
+    with zf.open(path) as src:
+        for ev, node in ET.iterparse(src, events=("start", "end")):
+            if ev == "start":
+                if root is None:
+                    root = node
+                continue
+            if node.tag == tag_si:
+                # openpyxl（read_string_table）と同じく "_" のエスケープ x005F_ だけを取り除く
+                strings.append(_ooxml_text_content(node).replace("x005F_", ""))
+                # 処理済みの <si> をツリーから外し、解析中に保持し続けないようにする
+                root.remove(node)
+    return strings
+
+
+def _ooxml_read_styles(zf, path: Optional[str]) -> Tuple[List[Any], set[int], set[int]]:
+    """styles.xml から (xf毎の Border, 日付書式xf集合, 経過時間書式xf集合) を返す。
+
+    Border は罫線レコード数ぶんだけ構築し、xf（セルスタイル）から参照する。
+    """
+    import xml.etree.ElementTree as ET
+    from openpyxl.styles.borders import Side
+    from openpyxl.styles.numbers import builtin_format_code, is_date_format, is_timedelta_format
+
+    if not path or path not in zf.namelist():
+        return [], set(), set()
+    root = ET.fromstring(zf.read(path))
+
+    custom_formats: Dict[int, str] = {}
+    num_fmts = root.find(_q("numFmts"))
+    if num_fmts is not None:
+        for nf in num_fmts.findall(_q("numFmt")):
+            try:
+                custom_formats[int(nf.get("numFmtId", "0"))] = nf.get("formatCode", "")
+            except ValueError:
+                continue
+
+    border_records: List[Any] = []
+    borders_el = root.find(_q("borders"))
+    if borders_el is not None:
+        for b in borders_el.findall(_q("border")):
+            sides: Dict[str, Any] = {}
+            for side_name in ("left", "right", "top", "bottom"):
+                el = b.find(_q(side_name))
+                style = el.get("style") if el is not None else None
+                try:
+                    sides[side_name] = Side(style=style)
+                except Exception:
+                    sides[side_name] = Side()
+            border_records.append(Border(**sides))
+
+    xf_borders: List[Any] = []
+    date_xfs: set[int] = set()
+    timedelta_xfs: set[int] = set()
+    cell_xfs = root.find(_q("cellXfs"))
+    if cell_xfs is not None:
+        for idx, xf in enumerate(cell_xfs.findall(_q("xf"))):
+            try:
+                border_id = int(xf.get("borderId", "0"))
+            except ValueError:
+                border_id = 0
+            xf_borders.append(border_records[border_id] if 0 <= border_id < len(border_records) else None)
+            try:
+                fmt_id = int(xf.get("numFmtId", "0"))
+            except ValueError:
+                fmt_id = 0
+            fmt = custom_formats[fmt_id] if fmt_id in custom_formats else builtin_format_code(fmt_id)
+            if is_date_format(fmt):
+                date_xfs.add(idx)
+            if is_timedelta_format(fmt):
+                timedelta_xfs.add(idx)
+    return xf_borders, date_xfs, timedelta_xfs
+
+
+@dataclass(frozen=True)
+class _OoxmlSheetRef:
+    title: str
+    path: str
+
+
+@dataclass(frozen=True)
+class _OoxmlBookInfo:
+    sheets: List[_OoxmlSheetRef]
+    defined_names: Dict[str, NativeDefinedName]
+    shared_strings_path: Optional[str]
+    styles_path: Optional[str]
+    epoch: Any
+    active_index: int
+
+
+def _ooxml_read_workbook(zf) -> _OoxmlBookInfo:
+    """workbook.xml（シート一覧・ブック定義名・1904年基準）と関連パスを読む。
+
+    シート限定の定義名（localSheetId 付き）は openpyxl と同様にブック定義名へ含めない。
+    """
+    import xml.etree.ElementTree as ET
+    from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900
+
+    wb_path = "xl/workbook.xml"
+    for _rid, (rtype, target) in _ooxml_read_rels(zf, "_rels/.rels", "").items():
+        if rtype.endswith("/officeDocument"):
+            wb_path = target
+            break
+    base_dir = wb_path.rsplit("/", 1)[0] if "/" in wb_path else ""
+    rels_path = (f"{base_dir}/" if base_dir else "") + "_rels/" + wb_path.rsplit("/", 1)[-1] + ".rels"
+    rels = _ooxml_read_rels(zf, rels_path, base_dir)
+
+    root = ET.fromstring(zf.read(wb_path))
+    sheets: List[_OoxmlSheetRef] = []
+    sheets_el = root.find(_q("sheets"))
+    if sheets_el is not None:
+        for sh in sheets_el.findall(_q("sheet")):
+            rel = rels.get(sh.get(f"{{{_OOXML_REL_NS}}}id", ""))
+            if rel is None or not rel[0].endswith("/worksheet"):
+                continue
+            sheets.append(_OoxmlSheetRef(title=sh.get("name", ""), path=rel[1]))
+
+    defined_names: Dict[str, NativeDefinedName] = {}
+    dn_el = root.find(_q("definedNames"))
+    if dn_el is not None:
+        for dn in dn_el.findall(_q("definedName")):
+            if dn.get("localSheetId") is not None:
+                continue
+            name = dn.get("name")
+            if not name:
+                continue
+            defined_names[name] = NativeDefinedName(name, dn.text or "", None, dn.get("hidden") in ("1", "true"))
+
+    pr = root.find(_q("workbookPr"))
+    date1904 = pr is not None and pr.get("date1904") in ("1", "true")
+    active_index = 0
+    view = root.find(f"{_q('bookViews')}/{_q('workbookView')}")
+    if view is not None:
+        try:
+            active_index = int(view.get("activeTab", "0"))
+        except ValueError:
+            active_index = 0
+
+    ss_path = styles_path = None
+    for _rid, (rtype, target) in rels.items():
+        if rtype.endswith("/sharedStrings"):
+            ss_path = target
+        elif rtype.endswith("/styles"):
+            styles_path = target
+    return _OoxmlBookInfo(
+        sheets=sheets,
+        defined_names=defined_names,
+        shared_strings_path=ss_path,
+        styles_path=styles_path,
+        epoch=CALENDAR_MAC_1904 if date1904 else CALENDAR_WINDOWS_1900,
+        active_index=active_index,
+    )
+
+
+def _ooxml_read_dimension(zf, path: str) -> Tuple[int, int]:
+    """<dimension ref> から (max_row, max_column) を読む（sheetData 到達で打ち切り）。"""
+    import xml.etree.ElementTree as ET
+
+    with zf.open(path) as src:
+        for _ev, node in ET.iterparse(src, events=("start",)):
+            if node.tag == _q("dimension"):
+                try:
+                    _c0, _r0, c1, r1 = range_boundaries(node.get("ref", "A1"))
+                    return int(r1 or 1), int(c1 or 1)
+                except Exception:
+                    return 1, 1
+            if node.tag == _q("sheetData"):
+                break
+    return 1, 1
+
+
+def _ooxml_cell_value(
+    node,
+    data_type: str,
+    style_id: int,
+    shared_strings: List[str],
+    date_xfs: set[int],
+    timedelta_xfs: set[int],
+    epoch: Any,
+) -> Any:
+    """<c> 要素の値を openpyxl（data_only=True）と同じ規則で Python 値へ変換する。"""
+    from openpyxl.utils.datetime import from_excel, from_ISO8601
+
+    if data_type == "inlineStr":
+        child = node.find(_q("is"))
+        return _ooxml_text_content(child) if child is not None else None
+    value = node.findtext(_q("v"), None) or None
+    if value is None:
+        return None
+    if data_type == "n":
+        num: Any = float(value) if ("." in value or "E" in value or "e" in value) else int(value)
+        if style_id in date_xfs:
+            try:
+                return from_excel(num, epoch, timedelta=style_id in timedelta_xfs)
+            except (OverflowError, ValueError):
+                return "#VALUE!"
+        return num
+    if data_type == "s":
+        return shared_strings[int(value)]
+    if data_type == "b":
+        return bool(int(value))
+    if data_type == "d":
+        return from_ISO8601(value)
+    return value
+
+
+def _ooxml_detach(parent: Any, node: Any) -> None:
+    """解析済みの要素を空にして親から外す（親が不明な場合は空にするのみ）。"""
+    node.clear()
+    if parent is not None:
+        try:
+            parent.remove(node)
+        except ValueError:
+            pass
+
+
+def _ooxml_load_sheet_cells(
+    zf,
+    ref: _OoxmlSheetRef,
+    ws: SparseWorksheet,
+    window: Optional[SparseLoadWindow],
+    shared_strings: List[str],
+    xf_borders: List[Any],
+    date_xfs: set[int],
+    timedelta_xfs: set[int],
+    epoch: Any,
+) -> Optional[Tuple[int, int, int, int]]:
+    """シート XML を iterparse で1パス解析し、window 内（None なら全域）のセルを構築して構築範囲を返す。"""
+    import xml.etree.ElementTree as ET
+
+    full = window is None
+    if window is None:
+        window = SparseLoadWindow((1, 1, sys.maxsize, sys.maxsize))
+    tag_row, tag_c, tag_merge = _q("row"), _q("c"), _q("mergeCell")
+    merged: List[Tuple[int, int, int, int]] = []
+    row_counter = 0
+    max_row = 0
+    max_col = 0
+    # 処理済みの <row>/<mergeCell> を親から外すため、開始イベントで親要素を控える
+    parents: Dict[str, Any] = {}
+    tag_parents = {_q("sheetData"): tag_row, _q("mergeCells"): tag_merge}
+    with zf.open(ref.path) as src:
+        for ev, node in ET.iterparse(src, events=("start", "end")):
+            tag = node.tag
+            if ev == "start":
+                child_tag = tag_parents.get(tag)
+                if child_tag is not None:
+                    parents[child_tag] = node
+                continue
+            if tag == tag_row:
+                r_attr = node.get("r")
+                row_counter = int(float(r_attr)) if r_attr else row_counter + 1
+                col_counter = 0
+                for c in node.iter(tag_c):
+                    coord = c.get("r")
+                    if coord:
+                        row_idx, col = coordinate_to_tuple(coord)
+                        col_counter = col
+                    else:
+                        col_counter += 1
+                        row_idx, col = row_counter, col_counter
+                    if row_idx > max_row:
+                        max_row = row_idx
+                    if col > max_col:
+                        max_col = col
+                    if not window.contains(row_idx, col):
+                        continue
+                    s_attr = c.get("s")
+                    style_id = int(s_attr) if s_attr else 0
+                    value = _ooxml_cell_value(
+                        c, c.get("t", "n"), style_id, shared_strings, date_xfs, timedelta_xfs, epoch
+                    )
+                    border = xf_borders[style_id] if style_id and style_id < len(xf_borders) else None
+                    if value is None and (border is None or not _border_has_any_side(border)):
+                        continue
+                    window.store(ws, row_idx, col, value, border)
+                _ooxml_detach(parents.get(tag_row), node)
+            elif tag == tag_merge:
+                try:
+                    mc0, mr0, mc1, mr1 = range_boundaries(node.get("ref", ""))
+                    merged.append((mr0, mc0, mr1, mc1))
+                except Exception:
+                    pass
+                _ooxml_detach(parents.get(tag_merge), node)
+    ws.max_row = max(max_row, 1)
+    ws.max_column = max(max_col, 1)
+    bounds = None if full else window.finish(ws)
+    if merged:
+        ranges = [SimpleNamespace(min_row=a, min_col=b, max_row=c, max_col=d) for a, b, c, d in merged]
+        eff = bounds if bounds is not None else (1, 1, ws.max_row, ws.max_column)
+        _apply_merged_borders_sparse(ws, ranges, eff)
+    return bounds
+
+
+def load_workbook_native(
+    xlsx_path: Path,
+    *,
+    sparse: bool = False,
+    containers: Optional[Dict[str, Any]] = None,
+) -> SparseWorkbook:
+    """openpyxl のオブジェクト構築を介さず xlsx を直接解析して SparseWorkbook を返す。
+
+    - workbook.xml の定義名/シート一覧、sharedStrings.xml、styles.xml の罫線と日付書式、
+      各シート XML を標準ライブラリの iterparse で読む
+    - セル値の型変換（数値/日付/真偽/文字列）は openpyxl の data_only 読込と一致させる
+    - sparse=True の場合は sparse_load_plan の矩形内（と延長方向）のみ構築する
+    """
+    import zipfile
+
+    with zipfile.ZipFile(xlsx_path) as zf:
+        info = _ooxml_read_workbook(zf)
+        shared_strings = _ooxml_read_shared_strings(zf, info.shared_strings_path)
+        xf_borders, date_xfs, timedelta_xfs = _ooxml_read_styles(zf, info.styles_path)
+        sheets: List[SparseWorksheet] = []
+        for ref in info.sheets:
+            max_row, max_col = _ooxml_read_dimension(zf, ref.path)
+            sheets.append(SparseWorksheet(ref.title, max_row, max_col))
+        wb = SparseWorkbook(info.defined_names, sheets, info.active_index)
+        plan: Optional[Tuple[Dict[str, Tuple[int, int, int, int]], Dict[str, Dict[str, int]]]] = None
+        if sparse:
+            plan = sparse_load_plan(wb, containers)
+        for ref, ws in zip(info.sheets, sheets):
+            window = None
+            if plan is not None:
+                bounds = plan[0].get(ref.title)
+                if bounds is None:
+                    continue
+                window = SparseLoadWindow(bounds, plan[1].get(ref.title))
+            ws.loaded_bounds = _ooxml_load_sheet_cells(
+                zf, ref, ws, window, shared_strings, xf_borders, date_xfs, timedelta_xfs, info.epoch
+            )
+    logger.debug(
+        "OOXMLリーダー: sheets=%d names=%d loaded_cells=%d",
+        len(sheets),
+        len(info.defined_names),
+        sum(len(ws._cells) for ws in sheets),
+    )
+    return wb
+
+
+def load_workbook_for_extraction(
+    xlsx_path: Path,
+    *,
+    load_mode: str = "full",
+    containers: Optional[Dict[str, Any]] = None,
+    reader: str = "openpyxl",
+):
+    """抽出用にワークブックを読み込む（load_mode: LOAD_MODES / reader: READERS のいずれか）。"""
+    if reader == "ooxml":
+        return load_workbook_native(xlsx_path, sparse=(load_mode == "sparse"), containers=containers)
+    if load_mode == "sparse":
+        return load_workbook_sparse(xlsx_path, containers=containers)
+    return load_workbook(xlsx_path, data_only=True)
+
+
+# =============================================================================
+# Named Range Parsing
+# =============================================================================
+
+
+PRELUDE_CACHE_SIZE = 32
+
+
+class PreludeCache:
+    """パース前派生情報のプロセス内 LRU（キーは名前表とコンテナ設定の指紋）。
+
+    値は呼び出し側で変更されうる集合/辞書のため、格納時と取得時に複製する。
+    """
+
+    def __init__(self, maxsize: int = PRELUDE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: Dict[str, Dict[str, Any]] = {}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self._entries.pop(key, None)
+        if value is None:
+            stats().prelude_cache_misses += 1
+            return None
+        self._entries[key] = value  # 末尾（最新）へ移動
+        stats().prelude_cache_hits += 1
+        return copy.deepcopy(value)
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries.pop(key, None)
+        self._entries[key] = copy.deepcopy(value)
+        while len(self._entries) > self.maxsize:
+            del self._entries[next(iter(self._entries))]
+            stats().prelude_cache_evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_prelude_cache = PreludeCache()
+
+
+def _prelude_fingerprint(
+    *,
+    prefix: str,
+    containers: Optional[Dict[str, Any]],
+    sheet_order: Dict[str, int],
+    all_name_keys: List[str],
+    all_names: Dict[str, Any],
+    defined_only_name_keys: set[str],
+    gen_map: Optional[Dict[str, Any]],
+) -> str:
+    """派生情報が依存する入力の指紋。
+
+    定義名は宛先をそのまま、生成名は範囲（":" を含む宛先）のみを含める。
+    派生情報の計算は生成名の値を範囲判定以外に参照しないため、値だけが異なるブック間で一致する。
+    """
+    layout: List[Any] = []
+    for name in all_name_keys:
+        dests = getattr(all_names.get(name), "destinations", None) or []
+        if name in defined_only_name_keys:
+            layout.append((name, "d", [(sn, str(coord)) for sn, coord in dests]))
+        else:
+            layout.append((name, "g", [(sn, str(coord)) if ":" in str(coord) else (sn, "") for sn, coord in dests]))
+    payload = (
+        prefix,
+        json.dumps(containers or {}, sort_keys=True, ensure_ascii=False, default=str),
+        tuple(sheet_order.items()),
+        layout,
+        tuple(gen_map.keys()) if gen_map else (),
+    )
+    return hashlib.sha1(repr(payload).encode("utf-8")).hexdigest()
+
+
+def _compute_prelude_derived(
+    *,
+    prefix: str,
+    normalized_prefix: str,
+    containers: Optional[Dict[str, Any]],
+    all_names: Dict[str, Any],
+    all_name_keys: List[str],
+    defined_only_name_keys: set[str],
+    gen_map: Optional[Dict[str, Any]],
+    name_index: Optional[DefinedNameIndex],
+    sheet_order: Dict[str, int],
+) -> Dict[str, Any]:
+    """名前表とコンテナ設定から決まる派生情報（抑止集合・形状・グループ写像・初出位置など）を算出する。"""
+    # *.field と *.field.1 の重複抑止集合
+    excluded_indexed_field_names: set[str] = compute_excluded_indexed_field_names(
+        normalized_prefix, all_name_keys, all_names
+    )
+
+    # 各フィールドの期待形状（1D/2D）
+    expected_field_shape: Dict[Tuple[str, str], str] = learn_expected_field_shapes(
+        normalized_prefix, all_name_keys, all_names
+    )
+
+    # ルート直下の数値キー
+    numeric_root_keys = compute_numeric_root_keys(normalized_prefix, all_names)
+
+    # 二重数値インデックス（array.i.j.*）が存在する配列名集合
+    arrays_with_double_index: set[str] = find_arrays_with_double_index(
+        normalized_prefix=normalized_prefix, all_name_keys=all_name_keys, gen_map=gen_map
+    )
+
+    container_parent_names: set[str] = set(containers.keys()) if containers else set()
+    container_parents_with_children: set[str] = compute_container_parents_with_children(
+        container_parent_names=container_parent_names,
+        all_name_keys=all_name_keys,
+        gen_map=gen_map,
+        name_index=name_index,
+    )
+
+    # groupLabel -> rootName
+    group_to_root: dict[str, str] = compute_group_to_root_map(
+        containers=containers,
+        prefix=prefix,
+        normalized_prefix=normalized_prefix,
+        all_name_keys=all_name_keys,
+    )
+
+    # アンカー名とグループラベル
+    anchor_names: set[str] = compute_anchor_names(normalized_prefix, all_name_keys)
+    group_labels: set[str] = compute_group_labels_from_anchors(
+        anchor_names, containers, prefix=prefix, normalized_prefix=normalized_prefix
+    )
+
+    # ルート最初の出現位置
+    root_first_pos: Dict[str, tuple[int, int, int]] = collect_root_first_positions(
+        normalized_prefix, defined_only_name_keys, all_names, sheet_order
+    )
+
+    return {
+        "excluded_indexed_field_names": excluded_indexed_field_names,
+        "expected_field_shape": expected_field_shape,
+        "numeric_root_keys": numeric_root_keys,
+        "arrays_with_double_index": arrays_with_double_index,
+        "container_parent_names": container_parent_names,
+        "container_parents_with_children": container_parents_with_children,
+        "group_to_root": group_to_root,
+        "anchor_names": anchor_names,
+        "group_labels": group_labels,
+        "root_first_pos": root_first_pos,
+    }
+
+
+def _prepare_parsing_prelude(
+    *,
+    wb,
+    prefix: str,
+    containers: Optional[Dict[str, Dict]],
+    global_max_elements: Optional[int],
+    extraction_policy: ExtractionPolicy,
+) -> Dict[str, Any]:
+    """パース前の派生情報をまとめて構築し、状態辞書を返す。"""
+    # コンテナ準備
+    containers, user_provided_containers, _generated_names = prepare_containers_and_generated_names(
+        wb,
+        prefix=prefix,
+        containers=containers,
+        global_max_elements=global_max_elements,
+        extraction_policy=extraction_policy,
+    )
+    return _build_parsing_state(
+        wb=wb, prefix=prefix, containers=containers, user_provided_containers=user_provided_containers
+    )
+
+
+def _build_parsing_state(
+    *,
+    wb,
+    prefix: str,
+    containers: Optional[Dict[str, Dict]],
+    user_provided_containers: bool,
+    plan_prelude: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """生成名の登録後の名前表から状態辞書を構築する。
+
+    plan_prelude: 抽出プランに保存した名前表の派生情報とエントリ列（名前表の指紋が一致する場合のみ再利用）
+    """
+    # prefix の正規化
+    normalized_prefix = prefix if prefix.endswith(".") else prefix + "."
+
+    # 定義名 + 生成名を統合（初期スナップショット）
+    all_names, defined_only_name_keys = build_all_names_with_generated(wb)
+
+    # 既存仕様: フィールド直下の *.field.1 用に補助生成名を後から追加
+    try:
+        generate_subarray_names_for_field_anchors(wb, normalized_prefix)
+    except Exception as _e:
+        logger.debug("subarray name generation skipped due to error: %s", _e)
+
+    all_name_keys = list(all_names.keys())
+    # 生成名マップ（補助生成名含む、最新状態）
+    gen_map = get_generated_names_map(wb)
+
+    # 定義名 + 生成名の索引（接頭辞/子孫クエリ用）
+    name_index = defined_name_index(wb)
+    if name_index is not None:
+        name_index = name_index.with_generated(all_name_keys, gen_map.keys() if gen_map else ())
+
+    # シート順序
+    sheet_order: Dict[str, int] = {ws.title: idx for idx, ws in enumerate(wb.worksheets)}
+
+    # 名前表（定義名の宛先 + 生成名の配置）とコンテナ設定のみから決まる派生情報は LRU で共有
+    prelude_key = _prelude_fingerprint(
+        prefix=prefix,
+        containers=containers,
+        sheet_order=sheet_order,
+        all_name_keys=all_name_keys,
+        all_names=all_names,
+        defined_only_name_keys=defined_only_name_keys,
+        gen_map=gen_map,
+    )
+    entries = None
+    if plan_prelude is not None and plan_prelude.get("key") == prelude_key:
+        derived = _prelude_derived_from_json(plan_prelude["derived"])
+        entries = []
+        for pos, name, keys in plan_prelude["entries"]:
+            defined_name = all_names[name]
+            # 値を保持する生成名の読取順キーは値から求まるため（compute_top_left_pos）、ここで求め直す
+            if name not in defined_only_name_keys:
+                pos = compute_top_left_pos(defined_name, sheet_order)
+            entries.append((tuple(pos), name, defined_name, list(keys)))
+        entries.sort(key=lambda x: entry_sort_key(x, derived["root_first_pos"]))
+    else:
+        derived = _prelude_cache.get(prelude_key)
+    if derived is None:
+        derived = _compute_prelude_derived(
+            prefix=prefix,
+            normalized_prefix=normalized_prefix,
+            containers=containers,
+            all_names=all_names,
+            all_name_keys=all_name_keys,
+            defined_only_name_keys=defined_only_name_keys,
+            gen_map=gen_map,
+            name_index=name_index,
+            sheet_order=sheet_order,
+        )
+        _prelude_cache.put(prelude_key, derived)
+
+    return {
+        "containers": containers,
+        "user_provided_containers": user_provided_containers,
+        "normalized_prefix": normalized_prefix,
+        "all_names": all_names,
+        "defined_only_name_keys": defined_only_name_keys,
+        "all_name_keys": all_name_keys,
+        "name_index": name_index,
+        "gen_map": gen_map,
+        "sheet_order": sheet_order,
+        "prelude_key": prelude_key,
+        "entries": entries,
+        **derived,
+    }
+
+
+# 派生情報のうち集合で保持する項目（抽出プランでは JSON 配列として保存）
+_PRELUDE_SET_KEYS = (
+    "excluded_indexed_field_names",
+    "numeric_root_keys",
+    "arrays_with_double_index",
+    "container_parent_names",
+    "container_parents_with_children",
+    "anchor_names",
+    "group_labels",
+)
+
+
+def _prelude_derived_to_json(derived: Dict[str, Any]) -> Dict[str, Any]:
+    """_compute_prelude_derived の結果を JSON 表現へ変換する。"""
+    data: Dict[str, Any] = {key: sorted(derived[key]) for key in _PRELUDE_SET_KEYS}
+    data["expected_field_shape"] = [[arr, fld, shape] for (arr, fld), shape in derived["expected_field_shape"].items()]
+    data["group_to_root"] = dict(derived["group_to_root"])
+    data["root_first_pos"] = {root: list(pos) for root, pos in derived["root_first_pos"].items()}
+    return data
+
+
+def _prelude_derived_from_json(data: Dict[str, Any]) -> Dict[str, Any]:
+    """_prelude_derived_to_json の逆変換。"""
+    derived: Dict[str, Any] = {key: set(data[key]) for key in _PRELUDE_SET_KEYS}
+    derived["expected_field_shape"] = {(arr, fld): shape for arr, fld, shape in data["expected_field_shape"]}
+    derived["group_to_root"] = dict(data["group_to_root"])
+    derived["root_first_pos"] = {root: tuple(pos) for root, pos in data["root_first_pos"].items()}
+    return derived
+
+
+def collect_state_entries(state: Dict[str, Any]) -> List[Tuple[tuple[int, int, int], str, Any, List[str]]]:
+    """状態辞書の名前表から、抑制を適用した Excel 読取順のエントリ列を返す。"""
+    return collect_entries_in_sheet_order(
+        all_names=state["all_names"],
+        normalized_prefix=state["normalized_prefix"],
+        excluded_indexed_field_names=state["excluded_indexed_field_names"],
+        sheet_order=state["sheet_order"],
+        suppress_ctx={
+            "all_name_keys": state["all_name_keys"],
+            "container_parent_names": state["container_parent_names"],
+            "container_parents_with_children": state["container_parents_with_children"],
+            "group_labels": state["group_labels"],
+            "root_first_pos": state["root_first_pos"],
+            "name_index": state.get("name_index"),
+        },
+    )
+
+
+def _iterate_and_fill_entries(
+    *,
+    wb,
+    schema: Optional[Dict[str, Any]],
+    array_transform_rules: Optional[Dict[str, List[ArrayTransformRule]]],
+    prefix: str,
+    root_result: Dict[str, Any],
+    state: Dict[str, Any],
+    safe_insert,
+    user_provided_containers: bool,
+    schema_index: Optional[SchemaIndex] = None,
+) -> None:
+    """定義名/生成名を走査し、値の取得→変換→配分→挿入までを一括処理。"""
+    # ルートキーの事前挿入で順序を安定化
+    preseed_root_keys(root_result=root_result, root_first_pos=state["root_first_pos"])
+
+    entries = state.get("entries")
+    if entries is None:
+        entries = collect_state_entries(state)
+
+    # 逐次挿入するコンテナ（配列名 → 読取り状態）
+    streams = {
+        stream.array: StreamedElements(stream, wb) for stream in (state.get("element_streams") or {}).values()
+    }
+
+    for _pos, name, defined_name, original_path_keys in entries:
+        path_keys = original_path_keys.copy()
+
+        if schema is not None:
+            if schema_index is not None and schema_index.schema is schema:
+                schema_path_keys, schema_broken = schema_index.resolve(path_keys)
+            else:
+                schema_path_keys, schema_broken = resolve_path_keys_with_schema(
+                    path_keys=path_keys, schema=schema
+                )
+            if not schema_broken:
+                path_keys = schema_path_keys
+
+        streamed = streams.get(original_path_keys[0]) if streams and original_path_keys else None
+        if streamed is not None and streamed.claims(original_path_keys):
+            if len(original_path_keys) == 2:
+                continue
+            value = cast(Dict[str, Any], streamed.first())[original_path_keys[2]]
+        else:
+            _skip, value = get_value_for_defined_or_generated_name(
+                wb=wb, name=name, defined_name=defined_name, gen_map=state["gen_map"]
+            )
+            if _skip:
+                continue
+
+        # 末端（スカラー）で None の場合は空プレースホルダに変換して形状復元の対象にする
+        # （同階層に有効データがあるときに null として出力されるようにするため）
+        if value is None or (not isinstance(value, (list, dict)) and DataCleaner.is_empty_value(value)):
+            value = ""
+
+        # 1. 変換ルール
+        if try_apply_transform_and_insert(
             array_transform_rules=array_transform_rules,
             path_keys=path_keys,
             original_path_keys=original_path_keys,
@@ -5527,6 +8226,7 @@ def _iterate_and_fill_entries(
             defined_only_name_keys=state["defined_only_name_keys"],
             safe_insert=safe_insert,
             user_provided_containers=user_provided_containers,
+            name_index=state.get("name_index"),
         ):
             continue
 
@@ -5547,30 +8247,296 @@ def _iterate_and_fill_entries(
             normalized_keys,
         )
 
+    # 逐次挿入するコンテナの残りの要素（生成名の経路では各ルートの読取順の末尾に名前順で並ぶ）
+    for streamed in streams.values():
+        streamed.insert_remaining(root_result, state=state, safe_insert=safe_insert)
+
+
+def _finalize_result(
+    *,
+    result: Dict[str, Any],
+    prefix: str,
+    state: Dict[str, Any],
+    array_transform_rules: Optional[Dict[str, List[ArrayTransformRule]]],
+    user_provided_containers: bool,
+    containers: Optional[Dict[str, Dict]],
+    schema: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """ポストパース整形パイプラインを適用し、最終出力を返す。"""
+    return apply_post_parse_pipeline(
+        result=result,
+        root_first_pos=state["root_first_pos"],
+        prefix=prefix,
+        user_provided_containers=user_provided_containers,
+        containers=containers,
+        array_transform_rules=array_transform_rules,
+        normalized_prefix=state["normalized_prefix"],
+        group_labels=state["group_labels"],
+        group_to_root=state["group_to_root"],
+        gen_map=state["gen_map"],
+        schema=schema,
+    )
+
+
+# =============================================================================
+# Extraction Plan (template)
+# =============================================================================
+
+EXTRACTION_PLAN_VERSION = 4
+
+# 抽出プランの指紋で罫線を照合する標本セル数の上限
+PLAN_BORDER_SAMPLES = 256
+
+
+def extraction_plan_settings(config: ProcessingConfig) -> Dict[str, Any]:
+    """抽出プランの作成時設定（プランは同じ設定での実行にのみ適用する）。
+
+    構造解析に効く設定はそのまま、ポストパース整形の設定（trim/スキーマ/変換ルール/出力形式）はハッシュで保持する。
+    """
+    pipeline = {
+        "trim": config.trim,
+        "schema": config.schema,
+        "transform_rules": config.transform_rules,
+        "output_format": config.output_format,
+    }
+    # 保存済みプラン（JSON）と比較できるよう JSON 表現へ正規化する
+    return json.loads(json.dumps({
+        "prefix": config.prefix,
+        "containers": config.containers or {},
+        "max-elements": config.max_elements,
+        "load-mode": config.load_mode,
+        "reader": config.reader,
+        "rect-scan-budget": config.rect_scan_budget,
+        "pipeline": hashlib.sha256(
+            json.dumps(pipeline, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+        ).hexdigest(),
+    }, ensure_ascii=False, default=str))
+
+
+def _cell_border_mask(worksheet, row: int, col: int) -> int:
+    """保持セルのみを参照して、セル自身の罫線ビットマスクを返す（セルを生成しない）。"""
+    cells = getattr(worksheet, "_cells", None)
+    cell = cells.get((row, col)) if isinstance(cells, dict) else None
+    if cell is None:
+        return 0
+    wb_borders = getattr(getattr(worksheet, "parent", None), "_borders", None)
+    style = getattr(cell, "_style", None) if wb_borders is not None else None
+    if style is not None:
+        return _border_mask(wb_borders[style.borderId])
+    border = getattr(cell, "border", None)
+    return _border_mask(border) if border is not None else 0
+
+
+def _template_layout(wb) -> Tuple[List[Tuple[str, Any]], Dict[str, Tuple[Any, Any]]]:
+    """指紋のうち定義名（全宛先）とシート名・使用範囲の部分（解析で変わる前に控えるために分離）。"""
+    names = sorted((n, wb.defined_names[n].attr_text) for n in wb.defined_names if n)
+    extents = {ws.title: (getattr(ws, "max_row", None), getattr(ws, "max_column", None)) for ws in wb.worksheets}
+    return names, extents
+
+
+def workbook_template_fingerprint(
+    wb,
+    border_samples: Iterable[Sequence[Any]] = (),
+    *,
+    extent_sheets: Iterable[str] = (),
+    layout: Optional[Tuple[List[Tuple[str, Any]], Dict[str, Tuple[Any, Any]]]] = None,
+) -> str:
+    """定義名（全宛先）、シート名、extent_sheets の使用範囲、標本セルの罫線から求めるテンプレート指紋。
+
+    罫線はシート全体ではなく border_samples の (シート, 行, 列) のみを参照する（罫線グリッドは構築しない）。
+    使用範囲は行数の異なるデータでもプランを使えるよう、読取り指示が使用範囲に依存するシートのみ照合する。
+    layout には解析前に _template_layout で控えた定義名/使用範囲を渡せる（未指定時は wb から求める）。
+    """
+    names, extents = layout if layout is not None else _template_layout(wb)
+    scoped = set(extent_sheets)
+    h = hashlib.sha1()
+    h.update(json.dumps(names, ensure_ascii=False).encode("utf-8"))
+    for title, (max_row, max_col) in extents.items():
+        h.update((f"|{title}:{max_row}x{max_col}" if title in scoped else f"|{title}").encode("utf-8"))
+    sheets = {ws.title: ws for ws in wb.worksheets}
+    for sheet, row, col in border_samples:
+        ws = sheets.get(sheet)
+        mask = _cell_border_mask(ws, row, col) if ws is not None else -1
+        h.update(f"|{sheet}!{row},{col}:{mask}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _plan_border_samples(wb, prefix: str, anchor_rects: List[Any], series: List[Dict[str, Any]]) -> List[List[Any]]:
+    """指紋で罫線を照合する標本セル（定義名の範囲の隅・アンカー矩形の隅・コンテナの基準セル）。
+
+    件数が PLAN_BORDER_SAMPLES を超える場合は等間隔に間引く。
+    """
+    samples: set[Tuple[str, int, int]] = set()
+    normalized_prefix = prefix if prefix.endswith(".") else prefix + "."
+    for name in wb.defined_names:
+        if not name or not name.startswith(normalized_prefix):
+            continue
+        for sheet, coord in iter_defined_name_destinations_all(name, wb):
+            try:
+                (sc, sr), (ec, er) = parse_range(str(coord).replace("$", ""))
+            except Exception:
+                continue
+            samples.update({(sheet, sr, sc), (sheet, er, ec)})
+    for sheet, _anchor, _tol, rects in anchor_rects:
+        for left, top, right, bottom in rects:
+            samples.update({(sheet, top, left), (sheet, top, right), (sheet, bottom, left), (sheet, bottom, right)})
+    for record in series:
+        for col, row in record["positions"].values():
+            samples.add((record["sheet"], row, col))
+    ordered = sorted(s for s in samples if s[0] is not None)
+    if len(ordered) > PLAN_BORDER_SAMPLES:
+        stride = len(ordered) / PLAN_BORDER_SAMPLES
+        ordered = [ordered[int(i * stride)] for i in range(PLAN_BORDER_SAMPLES)]
+    return [list(s) for s in ordered]
+
+
+def _plan_extent_sheets(anchor_rects: List[Any], series: List[Dict[str, Any]]) -> List[str]:
+    """読取り指示が使用範囲に依存し、指紋で使用範囲を照合するシート。
+
+    アンカー矩形は使用範囲から決まる走査範囲で検出したもの。件数をラベルや範囲で求め直さない出力指示は、
+    作成時の罫線・使用範囲で決まった件数をそのまま適用する。
+    """
+    sheets = {sheet for sheet, _anchor, _tol, _rects in anchor_rects}
+    sheets.update(
+        record["sheet"]
+        for record in series
+        if record.get("count-labels") is None and record.get("range-count") is None
+    )
+    return sorted(s for s in sheets if s is not None)
+
+
+def compile_extraction_plan(
+    xlsx_path: Path,
+    prefix: str,
+    containers: Optional[Dict[str, Dict]] = None,
+    *,
+    global_max_elements: Optional[int] = None,
+    load_mode: str = "full",
+    reader: str = "openpyxl",
+    settings: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """テンプレートのブックを1度だけ解析し、セル値に依存しない読取り指示を抽出プランとして返す。
+
+    プランには次を保持する:
+    - containers: 自動推論を反映した最終コンテナ
+    - series: コンテナ×シート毎の出力指示（基準座標・ステップ・件数、件数がラベルで決まる場合はラベルセルと上限）
+    - prelude: 名前表から決まる派生情報と、定義名/生成名 → JSON パスのエントリ列（読取順）
+    - anchor-rects: ネストしたコンテナの走査で使うアンカー矩形
+    - fingerprint / border-samples / extent-sheets: 定義名・シート名・標本セルの罫線と、
+      読取り指示が使用範囲に依存するシートの使用範囲から求める指紋
+    - settings: 作成時設定（プランは同じ設定での実行にのみ適用する）
+    出力指示は全体上限（global_max_elements）を掛けずに記録し、上限は適用時に掛ける。
+    """
+    xlsx_path = Path(xlsx_path)
+    prev_ctx = get_current_context()
+    recorder: List[Dict[str, Any]] = []
+    set_current_context(
+        Context(
+            processing_stats=ProcessingStats(),
+            rect_scan_budget=prev_ctx.rect_scan_budget,
+            plan_recorder=recorder,
+        )
+    )
+    try:
+        wb = load_workbook_for_extraction(xlsx_path, load_mode=load_mode, containers=containers, reader=reader)
+        # 解析中のセル参照で使用範囲が広がり、生成名も登録されるため、指紋の定義名/使用範囲は解析前に控える
+        layout = _template_layout(wb)
+        with pinned_defined_name_index(wb), sheet_analysis_pool(wb):
+            state = _prepare_parsing_prelude(
+                wb=wb,
+                prefix=prefix,
+                containers=containers,
+                global_max_elements=None,
+                extraction_policy=_DEFAULT_EXTRACTION_POLICY,
+            )
+            entries = collect_state_entries(state)
+        anchor_rects = [
+            [sheet, anchor, tol, [list(r) for r in rects]]
+            for (_wb_id, sheet, anchor, tol), rects in anchor_rects_cache().items()
+        ]
+        border_samples = _plan_border_samples(wb, prefix, anchor_rects, recorder)
+        extent_sheets = _plan_extent_sheets(anchor_rects, recorder)
+        fingerprint = workbook_template_fingerprint(wb, border_samples, extent_sheets=extent_sheets, layout=layout)
+    finally:
+        set_current_context(prev_ctx)
+    return {
+        "version": EXTRACTION_PLAN_VERSION,
+        "source": xlsx_path.name,
+        "prefix": prefix,
+        "load-mode": load_mode,
+        "reader": reader,
+        "settings": settings or {},
+        "fingerprint": fingerprint,
+        "border-samples": border_samples,
+        "extent-sheets": extent_sheets,
+        "containers": state["containers"],
+        "series": recorder,
+        "prelude": {
+            "key": state["prelude_key"],
+            "derived": _prelude_derived_to_json(state),
+            "entries": [[list(pos), name, keys] for pos, name, _dn, keys in entries],
+        },
+        "anchor-rects": anchor_rects,
+    }
+
 
-def _finalize_result(
+def load_extraction_plan(plan_path: Union[str, Path]) -> Dict[str, Any]:
+    """保存済みの抽出プランを読み込む（形式不正は ConfigurationError）。"""
+    plan_path = Path(plan_path)
+    try:
+        plan = json.loads(plan_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        raise ConfigurationError(f"抽出プランの読み込みに失敗しました: {plan_path}: {e}")
+    if not isinstance(plan, dict) or plan.get("version") != EXTRACTION_PLAN_VERSION or "fingerprint" not in plan:
+        raise ConfigurationError(f"抽出プランの形式が不正です: {plan_path}")
+    return plan
+
+
+def apply_extraction_plan(
+    wb,
+    plan: Dict[str, Any],
     *,
-    result: Dict[str, Any],
     prefix: str,
-    state: Dict[str, Any],
-    array_transform_rules: Optional[Dict[str, List[ArrayTransformRule]]],
-    user_provided_containers: bool,
-    containers: Optional[Dict[str, Dict]],
-    schema: Optional[Dict[str, Any]] = None,
-) -> Dict[str, Any]:
-    """ポストパース整形パイプラインを適用し、最終出力を返す。"""
-    return apply_post_parse_pipeline(
-        result=result,
-        root_first_pos=state["root_first_pos"],
+    containers: Optional[Dict[str, Dict]] = None,
+    global_max_elements: Optional[int] = None,
+    extraction_policy: Optional[ExtractionPolicy] = None,
+    source: Any = None,
+) -> Optional[Dict[str, Any]]:
+    """指紋が一致すればプランの読取り指示を適用し、_prepare_parsing_prelude と同じ状態辞書を返す。
+
+    コンテナ推論・コンテナ解析（座標解決と罫線による件数推定）は行わず、出力指示に従ったセル値の読取りと
+    生成名の登録のみを行う。名前表の指紋がテンプレートと一致すれば派生情報とエントリ列もプランから復元する。
+    プレフィックスや指紋（定義名/使用範囲/罫線）が一致しない場合は警告して None を返し、呼び出し側は通常解析を行う。
+    """
+    try:
+        fingerprint = workbook_template_fingerprint(
+            wb, plan.get("border-samples") or (), extent_sheets=plan.get("extent-sheets") or ()
+        )
+    except Exception as e:
+        logger.debug("extraction plan skipped due to error: %s", e)
+        return None
+    if plan.get("prefix") != prefix or fingerprint != plan.get("fingerprint"):
+        stats().add_warning(f"抽出プランとテンプレートが一致しないため通常解析を行います: {source}")
+        return None
+    cache = anchor_rects_cache()
+    for sheet, anchor, tol, rects in plan.get("anchor-rects", []):
+        cache[(id(wb), sheet, anchor, tol)] = [tuple(r) for r in rects]
+    plan_containers = copy.deepcopy(plan.get("containers"))
+    generated = replay_container_series(
+        wb,
+        plan_containers or {},
+        plan.get("series") or [],
+        global_max_elements=global_max_elements,
+        extraction_policy=extraction_policy,
         prefix=prefix,
-        user_provided_containers=user_provided_containers,
-        containers=containers,
-        array_transform_rules=array_transform_rules,
-        normalized_prefix=state["normalized_prefix"],
-        group_labels=state["group_labels"],
-        group_to_root=state["group_to_root"],
-        gen_map=state["gen_map"],
-        schema=schema,
+    )
+    register_generated_names(wb, generated, prefix=prefix)
+    return _build_parsing_state(
+        wb=wb,
+        prefix=prefix,
+        containers=plan_containers,
+        user_provided_containers=containers is not None,
+        plan_prelude=plan.get("prelude"),
     )
 
 
@@ -5583,6 +8549,11 @@ def parse_named_ranges_with_prefix(
     schema: Optional[Dict[str, Any]] = None,
     global_max_elements: Optional[int] = None,
     extraction_policy: Optional[ExtractionPolicy] = None,
+    load_mode: str = "full",
+    reader: str = "openpyxl",
+    schema_index: Optional[SchemaIndex] = None,
+    extraction_plan: Optional[Dict[str, Any]] = None,
+    workbook: Any = None,
 ) -> Dict[str, Any]:
     """
     Excel 名前付き範囲(prefix) を解析してネスト dict/list を返す。
@@ -5590,6 +8561,11 @@ def parse_named_ranges_with_prefix(
     array_split_rules: 配列化設定の辞書 {path: [delimiter1, delimiter2, ...]}
     array_transform_rules: 配列変換設定の辞書 {path: ArrayTransformRule}
     extraction_policy: 抽出時の共通ポリシー（未指定時は既定の現行仕様を適用）
+    load_mode: ワークブック読込モード（"full" または参照セルのみ構築する "sparse"）
+    reader: 読込バックエンド（"openpyxl" または XML を直接解析する "ooxml"）
+    schema_index: schema のパス解決結果を保持する索引（RunPlan で共有。未指定時は都度解決）
+    extraction_plan: compile_extraction_plan で作成したテンプレートの抽出プラン（指紋一致時は読取り指示のみ実行）
+    workbook: 読込済みのワークブック（指定時は xlsx_path から読み込まない）
     """
     # 文字列/PathLike を Path に正規化
     xlsx_path = Path(xlsx_path)
@@ -5607,77 +8583,115 @@ def parse_named_ranges_with_prefix(
     if not prefix:
         raise ValueError("prefixは空ではない文字列である必要があります。")
 
+    if load_mode not in LOAD_MODES:
+        raise ValueError(f"未対応の読込モードです: {load_mode}（{'/'.join(LOAD_MODES)} のいずれか）")
+    if reader not in READERS:
+        raise ValueError(f"未対応の読込バックエンドです: {reader}（{'/'.join(READERS)} のいずれか）")
+
     try:
-        wb = load_workbook(xlsx_path, data_only=True)
+        wb = (
+            workbook
+            if workbook is not None
+            else load_workbook_for_extraction(xlsx_path, load_mode=load_mode, containers=containers, reader=reader)
+        )
     except Exception as e:
         raise ValueError(f"Excelファイルの読み込みに失敗しました: {xlsx_path} - {e}")
 
     # ポリシー決定（未指定なら既定）
     policy = extraction_policy or _DEFAULT_EXTRACTION_POLICY
 
-    # 事前準備を一括計算
-    _state = _prepare_parsing_prelude(
-        wb=wb,
-        prefix=prefix,
+    # 単純な行/列コンテナは生成名を介さずに要素を結果ツリーへ逐次挿入する（生成名の経路が必要な場合は None）
+    streams = element_streams_for(
         containers=containers,
+        schema=schema,
+        array_transform_rules=array_transform_rules,
         global_max_elements=global_max_elements,
-        extraction_policy=policy,
     )
-    containers = _state["containers"]
-    user_provided_containers = _state["user_provided_containers"]
 
-    result: Dict[str, Any] = {}
-    # 明示コンテナ指定時のみ prefix 配下に格納（自動推論時は従来通りトップ直下）
-    root_result: Dict[str, Any] = (
-        result if not user_provided_containers else result.setdefault(prefix, {})
-    )
+    # 解析中は定義名を書き換えないため、定義名索引の内容照合は区間の開始時の1回のみ。
+    with pinned_defined_name_index(wb):
+        # シート解析プールはファイル単位で1つを共有し、事前準備（コンテナ解析）の終了時に閉じる。
+        # プールのスレッドが残ると、後続の変換段で executor=process の fork 並列が使えないため
+        with sheet_analysis_pool(wb), element_streaming(streams):
+            # テンプレートの抽出プラン（指紋不一致時は None となり通常解析）
+            _state = None
+            if extraction_plan is not None:
+                _state = apply_extraction_plan(
+                    wb,
+                    extraction_plan,
+                    prefix=prefix,
+                    containers=containers,
+                    global_max_elements=global_max_elements,
+                    extraction_policy=policy,
+                    source=xlsx_path,
+                )
 
-    if array_split_rules is None:
-        array_split_rules = {}
-    if array_transform_rules is None:
-        array_transform_rules = {}
-
-    # デバッグ支援: 挿入時の文脈を付与する安全ラッパー
-    def _safe_insert(
-        target_root: Union[Dict[str, Any], List[Any]],
-        keys: List[str],
-        val: Any,
-        full_path_hint: str,
-        context_name: str,
-        original_keys: List[str],
-        normalized_keys: List[str],
-    ):
-        try:
-            insert_json_path(target_root, keys, val, full_path_hint)
-        except Exception as e:
-            raise type(e)(
-                f"insert_json_pathで例外発生: name='{context_name}' "
-                f"original_keys={original_keys} normalized_keys={normalized_keys} "
-                f"target_type={type(target_root).__name__} keys={keys} full_path_hint='{full_path_hint}': {e}"
-            ) from e
+            # 事前準備を一括計算
+            if _state is None:
+                _state = _prepare_parsing_prelude(
+                    wb=wb,
+                    prefix=prefix,
+                    containers=containers,
+                    global_max_elements=global_max_elements,
+                    extraction_policy=policy,
+                )
+        _state["element_streams"] = streams
+        containers = _state["containers"]
+        user_provided_containers = _state["user_provided_containers"]
 
-    # エントリ走査と挿入
-    _iterate_and_fill_entries(
-        wb=wb,
-        schema=schema,
-        array_transform_rules=array_transform_rules,
-        prefix=prefix,
-        root_result=root_result,
-        state=_state,
-        safe_insert=_safe_insert,
-        user_provided_containers=user_provided_containers,
-    )
+        result: Dict[str, Any] = {}
+        # 明示コンテナ指定時のみ prefix 配下に格納（自動推論時は従来通りトップ直下）
+        root_result: Dict[str, Any] = (
+            result if not user_provided_containers else result.setdefault(prefix, {})
+        )
 
-    # パース後の出力整形
-    result = _finalize_result(
-        result=result,
-        prefix=prefix,
-        state=_state,
-        array_transform_rules=array_transform_rules,
-        user_provided_containers=user_provided_containers,
-        containers=containers,
-        schema=schema,
-    )
+        if array_split_rules is None:
+            array_split_rules = {}
+        # 変換ルールの検索索引はパース全体で1つ（dict で渡された場合もここで1度だけ索引化）
+        array_transform_rules = as_rule_index(array_transform_rules)
+
+        # デバッグ支援: 挿入時の文脈を付与する安全ラッパー
+        def _safe_insert(
+            target_root: Union[Dict[str, Any], List[Any]],
+            keys: List[str],
+            val: Any,
+            full_path_hint: str,
+            context_name: str,
+            original_keys: List[str],
+            normalized_keys: List[str],
+        ):
+            try:
+                insert_json_path(target_root, keys, val, full_path_hint)
+            except Exception as e:
+                raise type(e)(
+                    f"insert_json_pathで例外発生: name='{context_name}' "
+                    f"original_keys={original_keys} normalized_keys={normalized_keys} "
+                    f"target_type={type(target_root).__name__} keys={keys} full_path_hint='{full_path_hint}': {e}"
+                ) from e
+
+        # エントリ走査と挿入
+        _iterate_and_fill_entries(
+            wb=wb,
+            schema=schema,
+            array_transform_rules=array_transform_rules,
+            prefix=prefix,
+            root_result=root_result,
+            state=_state,
+            safe_insert=_safe_insert,
+            user_provided_containers=user_provided_containers,
+            schema_index=schema_index,
+        )
+
+        # パース後の出力整形
+        result = _finalize_result(
+            result=result,
+            prefix=prefix,
+            state=_state,
+            array_transform_rules=array_transform_rules,
+            user_provided_containers=user_provided_containers,
+            containers=containers,
+            schema=schema,
+        )
 
     return result
 
@@ -5972,26 +8986,199 @@ def write_data(
 # =============================================================================
 
 
+# 罫線ビット（1セル4ビット）
+BORDER_TOP = 1
+BORDER_BOTTOM = 2
+BORDER_LEFT = 4
+BORDER_RIGHT = 8
+BORDER_SIDE_BITS = {"top": BORDER_TOP, "bottom": BORDER_BOTTOM, "left": BORDER_LEFT, "right": BORDER_RIGHT}
+
+
+def _border_mask(border) -> int:
+    """Border の4辺のうちスタイルを持つ辺のビットマスク。"""
+    mask = 0
+    for side, bit in BORDER_SIDE_BITS.items():
+        sd = getattr(border, side, None)
+        if sd is not None and getattr(sd, "style", None) is not None:
+            mask |= bit
+    return mask
+
+
+# BorderGrid のラン長表の1セル当たりの上限値（array("B")）
+RUN_SATURATION = 255
+
+
+class BorderGrid:
+    """シートの罫線を1セル4ビット（1バイトに2セル）で保持するグリッド。
+
+    has_border と同じ規則（自セルの辺 または 隣接セルの対辺）を構築時に畳み込むため、
+    判定はインデックス参照のみで完結する。グリッド外のセルは罫線なし。
+    辺ごとの連続ラン長表（上辺/下辺は右方向、左辺/右辺は下方向）は初回利用時に構築し、
+    区間の連続判定を O(1) で行う。
+    """
+
+    __slots__ = ("n_rows", "n_cols", "_data", "_runs")
+
+    def __init__(self, n_rows: int, n_cols: int):
+        self.n_rows = max(0, n_rows)
+        self.n_cols = max(0, n_cols)
+        self._data = bytearray((self.n_rows * self.n_cols + 1) // 2)
+        self._runs: Dict[str, array] = {}
+
+    @classmethod
+    def from_worksheet(cls, worksheet) -> Optional["BorderGrid"]:
+        """ワークシートの保持セル（openpyxl/SparseWorksheet の `_cells`）から1パスで構築する。"""
+        cells = getattr(worksheet, "_cells", None)
+        if not isinstance(cells, dict):
+            return None
+        max_row = 0
+        max_col = 0
+        for r, c in cells.keys():
+            if r > max_row:
+                max_row = r
+            if c > max_col:
+                max_col = c
+        # 最終行/列の下・右隣にも対辺が畳み込まれるため +1
+        grid = cls(max_row + 1, max_col + 1)
+        # openpyxl のセルは罫線IDで、疎読込セルは Border オブジェクト単位でマスクをメモ化
+        wb_borders = getattr(getattr(worksheet, "parent", None), "_borders", None)
+        memo: Dict[Any, int] = {}
+        set_bits = grid._set
+        for (r, c), cell in cells.items():
+            style = getattr(cell, "_style", None) if wb_borders is not None else None
+            if style is not None:
+                key: Any = ("id", style.borderId)
+                mask = memo.get(key)
+                if mask is None:
+                    mask = memo[key] = _border_mask(wb_borders[style.borderId])
+            else:
+                border = getattr(cell, "border", None)
+                if border is None:
+                    continue
+                key = id(border)
+                mask = memo.get(key)
+                if mask is None:
+                    mask = memo[key] = _border_mask(border)
+            if not mask:
+                continue
+            set_bits(r, c, mask)
+            if mask & BORDER_TOP and r > 1:
+                set_bits(r - 1, c, BORDER_BOTTOM)
+            if mask & BORDER_BOTTOM:
+                set_bits(r + 1, c, BORDER_TOP)
+            if mask & BORDER_LEFT and c > 1:
+                set_bits(r, c - 1, BORDER_RIGHT)
+            if mask & BORDER_RIGHT:
+                set_bits(r, c + 1, BORDER_LEFT)
+        return grid
+
+    def _set(self, row: int, col: int, bits: int) -> None:
+        idx = (row - 1) * self.n_cols + (col - 1)
+        self._data[idx >> 1] |= bits << ((idx & 1) << 2)
+
+    def bits(self, row: int, col: int) -> int:
+        if row < 1 or col < 1 or row > self.n_rows or col > self.n_cols:
+            return 0
+        idx = (row - 1) * self.n_cols + (col - 1)
+        return (self._data[idx >> 1] >> ((idx & 1) << 2)) & 0xF
+
+    def has(self, row: int, col: int, side: str) -> bool:
+        return bool(self.bits(row, col) & BORDER_SIDE_BITS[side])
+
+    def signature(self) -> str:
+        """罫線ありセルの (行, 列, ビット) 列から求めるハッシュ。値の有無による使用範囲の違いには依存しない。"""
+        h = hashlib.sha1()
+        n_cols = self.n_cols
+        for i, byte in enumerate(self._data):
+            if not byte:
+                continue
+            for half in (0, 1):
+                bits = (byte >> (half << 2)) & 0xF
+                if bits:
+                    idx = (i << 1) | half
+                    h.update(f"{idx // n_cols + 1},{idx % n_cols + 1},{bits};".encode())
+        return h.hexdigest()
+
+    def _run_table(self, side: str) -> array:
+        """side の連続ラン長表（top/bottom: 右方向, left/right: 下方向）を返す。
+
+        1セル1バイトで RUN_SATURATION に飽和させて保持する（4ビットの罫線グリッドに対して
+        表のメモリを抑える）。飽和値の位置は run_length が先へ辿って正確な長さを求める。
+        """
+        table = self._runs.get(side)
+        if table is not None:
+            return table
+        bit = BORDER_SIDE_BITS[side]
+        n_rows, n_cols = self.n_rows, self.n_cols
+        table = array("B", bytes(n_rows * n_cols))
+        bits = self.bits
+        if side in ("top", "bottom"):
+            for r in range(n_rows, 0, -1):
+                base = (r - 1) * n_cols
+                run = 0
+                for c in range(n_cols, 0, -1):
+                    run = run + 1 if bits(r, c) & bit else 0
+                    table[base + c - 1] = run if run < RUN_SATURATION else RUN_SATURATION
+        else:
+            for c in range(n_cols, 0, -1):
+                run = 0
+                for r in range(n_rows, 0, -1):
+                    run = run + 1 if bits(r, c) & bit else 0
+                    table[(r - 1) * n_cols + c - 1] = run if run < RUN_SATURATION else RUN_SATURATION
+        self._runs[side] = table
+        return table
+
+    def run_length(self, row: int, col: int, side: str) -> int:
+        """(row, col) から side の罫線が連続するセル数（top/bottom は右方向、left/right は下方向）。"""
+        table = self._run_table(side)
+        horizontal = side in ("top", "bottom")
+        total = 0
+        while 1 <= row <= self.n_rows and 1 <= col <= self.n_cols:
+            run = table[(row - 1) * self.n_cols + col - 1]
+            total += run
+            if run < RUN_SATURATION:
+                break
+            # 飽和値: 先の RUN_SATURATION セルは全て罫線ありのため、その先から続きを数える
+            if horizontal:
+                col += RUN_SATURATION
+            else:
+                row += RUN_SATURATION
+        return total
+
+    def count_row(self, row: int, left: int, right: int, side: str) -> int:
+        """row 行の left..right で side の罫線があるセル数。"""
+        bit = BORDER_SIDE_BITS[side]
+        return sum(1 for c in range(left, right + 1) if self.bits(row, c) & bit)
+
+    def count_col(self, col: int, top: int, bottom: int, side: str) -> int:
+        """col 列の top..bottom で side の罫線があるセル数。"""
+        bit = BORDER_SIDE_BITS[side]
+        return sum(1 for r in range(top, bottom + 1) if self.bits(r, col) & bit)
+
+    def row_all(self, row: int, left: int, right: int, side: str) -> bool:
+        if right < left:
+            return True
+        return self.run_length(row, left, side) >= right - left + 1
+
+    def col_all(self, col: int, top: int, bottom: int, side: str) -> bool:
+        if bottom < top:
+            return True
+        return self.run_length(top, col, side) >= bottom - top + 1
+
+
 def has_border(worksheet, row, col, side):
     """
     指定セルの指定方向に罫線があるかチェック。
     自セルの辺に罫線があるか、または隣接セルの対応辺に罫線があれば True。
+    罫線グリッドを構築できるシートはグリッド参照のみで判定する。
     """
-    # メモ化（ワークブック処理中にクリアされる）
-    # DummySheet のように title が無い場合はキャッシュしない（id 再利用などで誤検知を避ける）
-    sheet_title = getattr(worksheet, "title", None)
-    cache_enabled = sheet_title is not None
-    cache_key = (id(worksheet), sheet_title, row, col, side)
-    if cache_enabled:
-        cached = border_cache().get(cache_key)
-        if cached is not None:
-            return cached
+    grid = border_grid(worksheet)
+    if grid is not None:
+        return grid.has(row, col, side)
     # 自セル側
     cell = worksheet.cell(row=row, column=col)
     border = getattr(cell.border, side, None)
     if border is not None and border.style is not None:
-        if cache_enabled:
-            border_cache()[cache_key] = True
         return True
 
     # 隣接セル側
@@ -6015,21 +9202,21 @@ def has_border(worksheet, row, col, side):
             acell = worksheet.cell(row=adj_row, column=adj_col)
             ab = getattr(acell.border, adj_side, None)
             if ab is not None and getattr(ab, "style", None) is not None:
-                if cache_enabled:
-                    border_cache()[cache_key] = True
                 return True
         except Exception:
             # ワークシート実装に依存せず安全にフォールバック
             pass
-    if cache_enabled:
-        border_cache()[cache_key] = False
     return False
-def compute_scan_bounds_for_rect_detection(worksheet, cell_names_map=None):
+
+
+def compute_scan_bounds_for_rect_detection(worksheet, cell_names_map=None, *, full_sheet: bool = False):
     """四角形検出のスキャン範囲 (min_row, min_col, max_row, max_col) を返す。
 
     セル名マップがある場合は最小外接矩形に十分なマージンを付けて探索範囲を絞る。
-    ない場合はワークシートの実質的な有効範囲（30行×30列を上限）に限定する。
+    ない場合、full_sheet=True ならワークシートの使用範囲全体を、
+    それ以外は全探索向けに左上 RECT_BRUTEFORCE_WINDOW 四方を上限とする。
     """
+    w = RECT_BRUTEFORCE_WINDOW
     if cell_names_map:
         named_rows = [row for row, _ in cell_names_map.keys()]
         named_cols = [col for _, col in cell_names_map.keys()]
@@ -6037,27 +9224,142 @@ def compute_scan_bounds_for_rect_detection(worksheet, cell_names_map=None):
             # フォールバック: 極小範囲
             min_row = 1
             min_col = 1
-            max_row = min(worksheet.max_row or 30, 30)
-            max_col = min(worksheet.max_column or 30, 30)
+            max_row = min(worksheet.max_row or w, w)
+            max_col = min(worksheet.max_column or w, w)
         else:
             ws_max_row = worksheet.max_row or (max(named_rows) + 5)
             ws_max_col = worksheet.max_column or (max(named_cols) + 5)
-            # 少し広めのマージン（現行仕様に合わせる）
-            ROW_MARGIN = 20
-            COL_MARGIN = 10
-            min_row = max(1, min(named_rows) - ROW_MARGIN)
-            min_col = max(1, min(named_cols) - COL_MARGIN)
-            max_row = min(ws_max_row, max(named_rows) + ROW_MARGIN)
-            max_col = min(ws_max_col, max(named_cols) + COL_MARGIN)
+            # 少し広めのマージン（疎読込の構築範囲も同じマージンから決まる）
+            min_row = max(1, min(named_rows) - RECT_SCAN_ROW_MARGIN)
+            min_col = max(1, min(named_cols) - RECT_SCAN_COL_MARGIN)
+            max_row = min(ws_max_row, max(named_rows) + RECT_SCAN_ROW_MARGIN)
+            max_col = min(ws_max_col, max(named_cols) + RECT_SCAN_COL_MARGIN)
     else:
         # セル名がない場合は実際のワークシートの有効範囲内に制限
         min_row, min_col = 1, 1
-        actual_max_row = worksheet.max_row if worksheet.max_row else 30
-        actual_max_col = worksheet.max_column if worksheet.max_column else 30
-        max_row, max_col = min(actual_max_row, 30), min(actual_max_col, 30)
+        actual_max_row = worksheet.max_row if worksheet.max_row else w
+        actual_max_col = worksheet.max_column if worksheet.max_column else w
+        if full_sheet:
+            max_row, max_col = actual_max_row, actual_max_col
+        else:
+            max_row, max_col = min(actual_max_row, w), min(actual_max_col, w)
     return min_row, min_col, max_row, max_col
 
 
+# 空間インデックス（矩形の包含判定・矩形内セル名の列挙）
+# バケット1辺のセル数。領域はバケット単位で登録し、登録バケット数が上限を超える巨大領域は別リストで保持する。
+SPATIAL_BUCKET_SIZE = 16
+SPATIAL_MAX_BUCKETS_PER_REGION = 256
+
+
+class CellNameIndex:
+    """セル名マップ {(row, col): name} の行別ソート済み索引。
+
+    矩形内のセル名を行優先（get_cell_names_in_region と同順）で、
+    二分探索により出力件数に比例する時間で列挙する。
+    """
+
+    __slots__ = ("_rows", "_cols_by_row", "_names")
+
+    def __init__(self, cell_names_map: Mapping[Tuple[int, int], Any]):
+        self._names = cell_names_map
+        cols_by_row: Dict[int, List[int]] = {}
+        for r, c in cell_names_map.keys():
+            cols_by_row.setdefault(r, []).append(c)
+        for cols in cols_by_row.values():
+            cols.sort()
+        self._cols_by_row = cols_by_row
+        self._rows = sorted(cols_by_row)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def iter_in_rect(self, top: int, left: int, bottom: int, right: int) -> Iterable[Tuple[int, int]]:
+        rows = self._rows
+        for i in range(bisect_left(rows, top), bisect_right(rows, bottom)):
+            r = rows[i]
+            cols = self._cols_by_row[r]
+            for j in range(bisect_left(cols, left), bisect_right(cols, right)):
+                yield (r, cols[j])
+
+    def names_in_rect(self, top: int, left: int, bottom: int, right: int) -> List[Any]:
+        return [self._names[key] for key in self.iter_in_rect(top, left, bottom, right)]
+
+    def any_in_rect(self, top: int, left: int, bottom: int, right: int) -> bool:
+        return next(iter(self.iter_in_rect(top, left, bottom, right)), None) is not None
+
+
+class RegionIndex:
+    """矩形 (top, left, bottom, right) の包含判定用の空間インデックス（バケット格子）。
+
+    - 各矩形は覆うバケットすべてに登録し、点 (top, left) を含むバケットから「R を包含する矩形」を引く
+    - 左上点もバケットに登録し、R が覆うバケットから「R に包含される矩形」を引く
+    登録順（挿入番号）を保持し、削除は番号単位で行う。
+    """
+
+    def __init__(self, bucket_size: int = SPATIAL_BUCKET_SIZE):
+        self._size = bucket_size
+        self._rects: Dict[int, Tuple[int, int, int, int]] = {}
+        self._cover: Dict[Tuple[int, int], set] = {}
+        self._large: set = set()
+        self._points: Dict[Tuple[int, int], set] = {}
+
+    def __len__(self) -> int:
+        return len(self._rects)
+
+    def _bucket_span(self, top: int, left: int, bottom: int, right: int):
+        s = self._size
+        return range(top // s, bottom // s + 1), range(left // s, right // s + 1)
+
+    def add(self, key: int, rect: Tuple[int, int, int, int]) -> None:
+        top, left, bottom, right = rect
+        self._rects[key] = rect
+        rows, cols = self._bucket_span(top, left, bottom, right)
+        if len(rows) * len(cols) > SPATIAL_MAX_BUCKETS_PER_REGION:
+            self._large.add(key)
+        else:
+            for br in rows:
+                for bc in cols:
+                    self._cover.setdefault((br, bc), set()).add(key)
+        self._points.setdefault((top // self._size, left // self._size), set()).add(key)
+
+    def remove(self, key: int) -> None:
+        top, left, bottom, right = self._rects.pop(key)
+        if key in self._large:
+            self._large.discard(key)
+        else:
+            rows, cols = self._bucket_span(top, left, bottom, right)
+            for br in rows:
+                for bc in cols:
+                    self._cover[(br, bc)].discard(key)
+        self._points[(top // self._size, left // self._size)].discard(key)
+
+    def containing(self, top: int, left: int, bottom: int, right: int) -> List[int]:
+        """R を包含する登録矩形のキー。"""
+        s = self._size
+        cands = self._cover.get((top // s, left // s), set()) | self._large
+        out = []
+        for key in cands:
+            t, lf, b, r = self._rects[key]
+            if t <= top and lf <= left and b >= bottom and r >= right:
+                out.append(key)
+        return out
+
+    def contained_in(self, top: int, left: int, bottom: int, right: int) -> List[int]:
+        """R に包含される登録矩形のキー。"""
+        rows, cols = self._bucket_span(top, left, bottom, right)
+        if len(rows) * len(cols) > len(self._rects):
+            cands: Iterable[int] = list(self._rects)
+        else:
+            cands = [k for br in rows for bc in cols for k in self._points.get((br, bc), ())]
+        out = []
+        for key in cands:
+            t, lf, b, r = self._rects[key]
+            if t >= top and lf >= left and b <= bottom and r <= right:
+                out.append(key)
+        return out
+
+
 def build_area_sorted_size_combinations(max_width: int, max_height: int) -> List[Tuple[int, int, int]]:
     """(area, width, height) の組を面積降順で生成する。
 
@@ -6078,6 +9380,7 @@ def detect_regions_from_anchors(
     """セル名アンカーから右端候補→下端確定で矩形を検出（1アンカー最大1件）。"""
     regions: List[Tuple[int, int, int, int, float]] = []
     anchors = sorted(set(cell_names_map.keys()))  # (row,col)
+    name_index = CellNameIndex(cell_names_map)
     for top, left in anchors:
         try:
             _sheet_name = getattr(worksheet, "title", "")
@@ -6118,10 +9421,7 @@ def detect_regions_from_anchors(
             )
             if comp >= 1.0:
                 # 領域内に少なくとも1つセル名が含まれること
-                cell_names_in_region = get_cell_names_in_region(
-                    cell_names_map, t2, l2, b2, r2
-                )
-                if not cell_names_in_region:
+                if not name_index.any_in_rect(t2, l2, b2, r2):
                     continue
                 regions.append((t2, l2, b2, r2, comp))
                 break  # このアンカーでは最大の1つを採用
@@ -6133,6 +9433,7 @@ def detect_regions_bruteforce(
 ) -> List[Tuple[int, int, int, int, float]]:
     """各セルを左上起点として全探索で矩形を検出。"""
     regions: List[Tuple[int, int, int, int, float]] = []
+    name_index = CellNameIndex(cell_names_map) if cell_names_map else None
     for top in range(min_row, max_row + 1):
         for left in range(min_col, max_col + 1):
             if not (
@@ -6154,16 +9455,181 @@ def detect_regions_bruteforce(
                     worksheet, top, left, bottom, right
                 )
                 if completeness >= 1.0:
-                    if cell_names_map:
-                        cell_names_in_region = get_cell_names_in_region(
-                            cell_names_map, top, left, bottom, right
-                        )
-                        if not cell_names_in_region:
-                            continue
+                    if name_index is not None and not name_index.any_in_rect(top, left, bottom, right):
+                        continue
                     regions.append((top, left, bottom, right, completeness))
     return regions
 
 
+class _ScanBudget:
+    """矩形検出の候補判定回数の予算（None/0 は無制限）。"""
+
+    def __init__(self, budget: Optional[int]):
+        self.remaining = budget if budget else None
+
+    def spend(self, n: int = 1) -> bool:
+        """n 回分を消費し、予算を使い切ったら True を返す。"""
+        if self.remaining is None:
+            return False
+        self.remaining -= n
+        return self.remaining <= 0
+
+
+def _border_run_tables(grid, min_row: int, min_col: int, n_rows: int, n_cols: int):
+    """窓内の上辺/下辺の右方向ラン長、左辺/右辺の下方向ラン長の表を返す（範囲外は 0 の番兵）。"""
+    top_run = [[0] * (n_cols + 1) for _ in range(n_rows)]
+    bottom_run = [[0] * (n_cols + 1) for _ in range(n_rows)]
+    left_run = [[0] * n_cols for _ in range(n_rows + 1)]
+    right_run = [[0] * n_cols for _ in range(n_rows + 1)]
+    bits = grid.bits
+    for i in range(n_rows - 1, -1, -1):
+        row = min_row + i
+        t_row, b_row = top_run[i], bottom_run[i]
+        l_row, l_next = left_run[i], left_run[i + 1]
+        r_row, r_next = right_run[i], right_run[i + 1]
+        for j in range(n_cols - 1, -1, -1):
+            b = bits(row, min_col + j)
+            t_row[j] = t_row[j + 1] + 1 if b & BORDER_TOP else 0
+            b_row[j] = b_row[j + 1] + 1 if b & BORDER_BOTTOM else 0
+            l_row[j] = l_next[j] + 1 if b & BORDER_LEFT else 0
+            r_row[j] = r_next[j] + 1 if b & BORDER_RIGHT else 0
+    return top_run, bottom_run, left_run, right_run
+
+
+def _name_prefix_sums(cell_names_map, min_row: int, min_col: int, max_row: int, max_col: int):
+    """セル名の2次元累積和（names[i][j] = 窓内 [0,i) x [0,j) の名前数）。名前が無ければ None。"""
+    if not cell_names_map:
+        return None
+    n_rows = max_row - min_row + 1
+    n_cols = max_col - min_col + 1
+    names = [[0] * (n_cols + 1) for _ in range(n_rows + 1)]
+    for r, c in cell_names_map.keys():
+        if min_row <= r <= max_row and min_col <= c <= max_col:
+            names[r - min_row + 1][c - min_col + 1] += 1
+    for i in range(1, n_rows + 1):
+        acc = 0
+        cur, prev = names[i], names[i - 1]
+        for j in range(1, n_cols + 1):
+            acc += cur[j]
+            cur[j] = prev[j] + acc
+    return names
+
+
+def _pareto_candidates(
+    closed: Callable[[int, int], bool], max_w: int, max_h: int, h_limit: Callable[[int], int], budget: _ScanBudget
+) -> tuple[List[Tuple[int, int, int]], bool]:
+    """1つの左上について、幅の広い順にそれまでの最大高さを超える閉矩形のみ採用する（パレート前線）。
+
+    戻り値は (候補 (面積, 幅, 高さ) のリスト, 予算を使い切ったか)。
+    """
+    cands: List[Tuple[int, int, int]] = []
+    best_h = 0
+    for w in range(max_w, 0, -1):
+        if best_h >= max_h:
+            break
+        h_lim = h_limit(w)
+        if h_lim <= best_h and budget.spend():
+            return cands, True
+        for h in range(h_lim, best_h, -1):
+            found = closed(w, h)
+            if found:
+                cands.append((w * h, w, h))
+                best_h = h
+            if budget.spend():
+                return cands, True
+            if found:
+                break
+    return cands, False
+
+
+def _all_candidates(
+    closed: Callable[[int, int], bool], max_w: int, h_limit: Callable[[int], int], budget: _ScanBudget
+) -> tuple[List[Tuple[int, int, int]], bool]:
+    """1つの左上について、全ての閉矩形を候補にする。戻り値は (候補, 予算を使い切ったか)。"""
+    cands: List[Tuple[int, int, int]] = []
+    for w in range(1, max_w + 1):
+        h_lim = h_limit(w)
+        if h_lim <= 0 and budget.spend():
+            return cands, True
+        for h in range(1, h_lim + 1):
+            if closed(w, h):
+                cands.append((w * h, w, h))
+            if budget.spend():
+                return cands, True
+    return cands, False
+
+
+def detect_regions_summed_area(
+    worksheet,
+    min_row: int,
+    min_col: int,
+    max_row: int,
+    max_col: int,
+    cell_names_map=None,
+    *,
+    maximal_only: bool = False,
+    budget: Optional[int] = None,
+) -> Optional[List[Tuple[int, int, int, int, float]]]:
+    """罫線グリッド上のランレングス表と名前の累積和表で矩形を検出（detect_regions_bruteforce と同一結果）。
+
+    各セルについて上辺/下辺の右方向ラン長、左辺/右辺の下方向ラン長を前計算し、
+    候補矩形の4辺を O(1) で判定する。セル名の包含判定も2次元累積和で O(1)。
+    同一左上の候補は全探索と同じ（面積, 幅, 高さ）降順で出力する。
+    罫線グリッドを構築できないシートでは None を返す（呼び出し側で全探索へフォールバック）。
+
+    maximal_only=True の場合、同一左上で他の候補に包含される候補を出力しない
+    （filter_overlapping_regions 適用後の結果は変わらない）。
+    budget は候補判定回数の上限で、候補判定毎に確認し、到達した時点までの結果を返し警告を記録する。
+    """
+    grid = border_grid(worksheet)
+    if grid is None:
+        return None
+    n_rows = max_row - min_row + 1
+    n_cols = max_col - min_col + 1
+    if n_rows <= 0 or n_cols <= 0:
+        return []
+
+    top_run, bottom_run, left_run, right_run = _border_run_tables(grid, min_row, min_col, n_rows, n_cols)
+    names = _name_prefix_sums(cell_names_map, min_row, min_col, max_row, max_col)
+    scan_budget = _ScanBudget(budget)
+    regions: List[Tuple[int, int, int, int, float]] = []
+    for i in range(n_rows):
+        top = min_row + i
+        for j in range(n_cols):
+            max_w = top_run[i][j]
+            max_h = left_run[i][j]
+            if not max_w or not max_h:
+                continue
+
+            def _closed(w: int, h: int, i: int = i, j: int = j) -> bool:
+                ib = i + h - 1
+                if bottom_run[ib][j] < w:
+                    return False
+                if names is not None:
+                    jr = j + w - 1
+                    return (names[ib + 1][jr + 1] - names[i][jr + 1] - names[ib + 1][j] + names[i][j]) > 0
+                return True
+
+            def _h_limit(w: int, i: int = i, j: int = j, max_h: int = max_h) -> int:
+                return min(max_h, right_run[i][j + w - 1])
+
+            if maximal_only:
+                cands, exhausted = _pareto_candidates(_closed, max_w, max_h, _h_limit, scan_budget)
+            else:
+                cands, exhausted = _all_candidates(_closed, max_w, _h_limit, scan_budget)
+            cands.sort(reverse=True)
+            left = min_col + j
+            for _area, w, h in cands:
+                regions.append((top, left, top + h - 1, left + w - 1, 1.0))
+            if exhausted:
+                stats().add_warning(
+                    f"矩形検出の探索予算({budget})に到達したため打ち切りました: "
+                    f"sheet={getattr(worksheet, 'title', '')} 到達位置 row={top} col={left}"
+                )
+                return regions
+    return regions
+
+
 def dedup_and_sort_regions(
     regions: List[Tuple[int, int, int, int, float]]
 ) -> List[Tuple[int, int, int, int, float]]:
@@ -6185,49 +9651,51 @@ def dedup_and_sort_regions(
 def filter_overlapping_regions(
     regions: List[Tuple[int, int, int, int, float]]
 ) -> List[Tuple[int, int, int, int, float]]:
-    """包含関係で冗長な小領域を除外し、大きい領域を優先して保持。"""
-    filtered: List[Tuple[int, int, int, int, float]] = []
-    for region in regions:
-        top, left, bottom, right, completeness = region
+    """包含関係で冗長な小領域を除外し、大きい領域を優先して保持。
+
+    保持中の領域は RegionIndex で管理し、包含する/包含される領域をバケット単位で引く。
+    """
+    kept: Dict[int, Tuple[int, int, int, int, float]] = {}
+    index = RegionIndex()
+    for seq, region in enumerate(regions):
+        top, left, bottom, right, _completeness = region
         region_area = (bottom - top + 1) * (right - left + 1)
-        is_redundant = False
-        for existing_region in list(filtered):
-            ex_top, ex_left, ex_bottom, ex_right, _ex_comp = existing_region
-            ex_area = (ex_bottom - ex_top + 1) * (ex_right - ex_left + 1)
-            # 既存の大きな領域に完全包含される小領域は除外
-            if (
-                top >= ex_top
-                and left >= ex_left
-                and bottom <= ex_bottom
-                and right <= ex_right
-                and region_area < ex_area
-            ):
-                is_redundant = True
-                break
-            # 新領域が既存の小領域を包含するなら既存を削除
-            if (
-                ex_top >= top
-                and ex_left >= left
-                and ex_bottom <= bottom
-                and ex_right <= right
-                and ex_area < region_area
-            ):
-                filtered.remove(existing_region)
-        if not is_redundant:
-            filtered.append(region)
-    return filtered
+        # 既存の大きな領域に完全包含される小領域は除外
+        # （包含する大領域と包含される小領域が同時に保持されることはないため、除外時は削除も発生しない）
+        if any(
+            _rect_area(kept[k]) > region_area for k in index.containing(top, left, bottom, right)
+        ):
+            continue
+        # 新領域が既存の小領域を包含するなら既存を削除
+        for k in index.contained_in(top, left, bottom, right):
+            if _rect_area(kept[k]) < region_area:
+                index.remove(k)
+                del kept[k]
+        kept[seq] = region
+        index.add(seq, (top, left, bottom, right))
+    return list(kept.values())
 
 
-def detect_rectangular_regions(worksheet, cell_names_map=None):
+def _rect_area(region) -> int:
+    return (region[2] - region[0] + 1) * (region[3] - region[1] + 1)
+
+
+def detect_rectangular_regions(worksheet, cell_names_map=None, *, scan_budget: Optional[int] = None):
     """
     罫線で囲まれた四角形領域を検出
     左上から大きい順にソートして返す
+
+    罫線グリッドを構築できるシートではセル名が無くても使用範囲全体を走査する。
+    scan_budget（未指定時は Context の rect_scan_budget、0 で無制限）で探索量を制限する。
     """
     regions: List[Tuple[int, int, int, int, float]] = []
+    scalable = border_grid(worksheet) is not None
+    if scan_budget is None:
+        scan_budget = get_current_context().rect_scan_budget
 
     # スキャン対象範囲を計算（セル名マップの有無で分岐）
     min_row, min_col, max_row, max_col = compute_scan_bounds_for_rect_detection(
-        worksheet, cell_names_map
+        worksheet, cell_names_map, full_sheet=scalable
     )
 
     lr, ur = (min(min_row, max_row), max(min_row, max_row))
@@ -6243,12 +9711,22 @@ def detect_rectangular_regions(worksheet, cell_names_map=None):
         )
 
     # 各セルを起点として四角形を検出（大きい領域から小さい領域へ）
-    # 各セルを起点として四角形を検出（大きい領域から小さい領域へ）
-    regions.extend(
-        detect_regions_bruteforce(
+    # 罫線グリッドがあればラン長/累積和表で検出し、無ければ全探索へフォールバック
+    found = detect_regions_summed_area(
+        worksheet,
+        min_row,
+        min_col,
+        max_row,
+        max_col,
+        cell_names_map,
+        maximal_only=True,
+        budget=scan_budget or None,
+    )
+    if found is None:
+        found = detect_regions_bruteforce(
             worksheet, min_row, min_col, max_row, max_col, cell_names_map
         )
-    )
+    regions.extend(found)
 
     # 重複を除去してから、大きい順、完成度順、左上位置順でソート
     regions = dedup_and_sort_regions(regions)
@@ -6261,6 +9739,9 @@ def detect_rectangular_regions(worksheet, cell_names_map=None):
 
 def _row_has_horizontal_border(ws, row: int, left: int, right: int, side: str) -> bool:
     """指定行の区間で水平ボーダーが連続しているか（キャッシュ活用）。"""
+    grid = border_grid(ws)
+    if grid is not None:
+        return grid.row_all(row, left, right, side)
     for c in range(left, right + 1):
         if not has_border(ws, row, c, side):
             return False
@@ -6269,6 +9750,9 @@ def _row_has_horizontal_border(ws, row: int, left: int, right: int, side: str) -
 
 def _col_has_vertical_border(ws, col: int, top: int, bottom: int, side: str) -> bool:
     """指定列の区間で垂直ボーダーが連続しているか（キャッシュ活用）。"""
+    grid = border_grid(ws)
+    if grid is not None:
+        return grid.col_all(col, top, bottom, side)
     for r in range(top, bottom + 1):
         if not has_border(ws, r, col, side):
             return False
@@ -6349,7 +9833,14 @@ def find_bordered_region_around_positions(
 
 
 def get_cell_names_in_region(cell_names_map, top, left, bottom, right):
-    """指定領域内のセル名を取得"""
+    """指定領域内のセル名を取得
+
+    CellNameIndex を渡した場合、または領域がセル名数より大きい場合は索引で列挙する。
+    """
+    if isinstance(cell_names_map, CellNameIndex):
+        return cell_names_map.names_in_rect(top, left, bottom, right)
+    if (bottom - top + 1) * (right - left + 1) > len(cell_names_map):
+        return CellNameIndex(cell_names_map).names_in_rect(top, left, bottom, right)
     cell_names = []
     for row in range(top, bottom + 1):
         for col in range(left, right + 1):
@@ -6365,35 +9856,35 @@ def _find_rect_from_anchor(ws, left, right, top, max_bottom=None):
     厳密に左右幅固定・横ズレ許容なし。
     """
     # 上辺の連続性チェック（left..right の全列で top の上辺があること）
-    for c in range(left, right + 1):
-        if not has_border(ws, top, c, "top"):
-            return None
+    if not _row_has_horizontal_border(ws, top, left, right, "top"):
+        return None
 
     # 探索上限
     hard_limit = (
         max_bottom if max_bottom is not None else (getattr(ws, "max_row", 200) or 200)
     )
 
+    grid = border_grid(ws)
+    if grid is not None:
+        # 左右辺は top からの下方向ラン長で連続範囲が決まるため、候補 bottom はその範囲に限定
+        width = right - left + 1
+        vertical = min(grid.run_length(top, left, "left"), grid.run_length(top, right, "right"))
+        for bottom in range(top, min(hard_limit, top + vertical - 1) + 1):
+            if grid.run_length(bottom, left, "bottom") >= width:
+                return (left, top, right, bottom)
+        return None
+
     # 下方向に走査し、左右辺が連続し、かつ下辺が閉じている最初の bottom を採用
     for bottom in range(top, hard_limit + 1):
         # 左右辺の連続性
-        ok_vertical = True
-        for r in range(top, bottom + 1):
-            if not has_border(ws, r, left, "left") or not has_border(
-                ws, r, right, "right"
-            ):
-                ok_vertical = False
-                break
-        if not ok_vertical:
+        if not (
+            _col_has_vertical_border(ws, left, top, bottom, "left")
+            and _col_has_vertical_border(ws, right, top, bottom, "right")
+        ):
             continue
 
         # 候補 bottom の下辺が全列で存在するか
-        ok_bottom = True
-        for c in range(left, right + 1):
-            if not has_border(ws, bottom, c, "bottom"):
-                ok_bottom = False
-                break
-        if ok_bottom:
+        if _row_has_horizontal_border(ws, bottom, left, right, "bottom"):
             return (left, top, right, bottom)
 
     return None
@@ -6443,7 +9934,9 @@ def _get_anchor_rects_naive(
     # キャッシュ参照（ワークブック処理中有効）
     key = (id(workbook), target_sheet, anchor_name, col_tolerance)
     if key in anchor_rects_cache():
+        stats().anchor_cache_hits += 1
         return list(anchor_rects_cache()[key])
+    stats().anchor_cache_misses += 1
     pr_left = pr_right = pr_top = pr_bottom = None
     for sn, coord in iter_defined_name_destinations_all(anchor_name or "", workbook):
         if sn != target_sheet:
@@ -6532,11 +10025,8 @@ def extract_cell_names_for_sheet(workbook, sheet_name: str, prefix: str = "json"
 
 def calculate_border_completeness(worksheet, top, left, bottom, right):
     """四角形の罫線完全度を計算（0.0-1.0）。直接辺の罫線のみを評価する。"""
-    # 注意: テスト等で罫線が動的に変更されるケースに対応するため、
-    # 完全度の再計算直前にキャッシュをクリアして整合性を担保する。
-    # これにより本関数内ではキャッシュの恩恵は薄れるが、他の探索ロジックでは
-    # has_border のメモ化が有効に働く（トレードオフ）。
-    border_cache().clear()
+    # 罫線グリッドはシートの罫線世代で管理される（罫線変更時は invalidate_border_cache() を呼ぶ）。
+    # 罫線グリッドを持つシートでは4辺の集計をビット参照で行う。
     try:
         _sheet_name = getattr(worksheet, "title", "")
     except Exception:
@@ -6552,6 +10042,19 @@ def calculate_border_completeness(worksheet, top, left, bottom, right):
     total_segments = 0
     bordered_segments = 0
 
+    grid = border_grid(worksheet)
+    if grid is not None:
+        width = right - left + 1
+        height = bottom - top + 1
+        total_segments = 2 * max(0, width) + 2 * max(0, height)
+        bordered_segments = (
+            grid.count_row(top, left, right, "top")
+            + grid.count_row(bottom, left, right, "bottom")
+            + grid.count_col(left, top, bottom, "left")
+            + grid.count_col(right, top, bottom, "right")
+        )
+        return bordered_segments / total_segments if total_segments > 0 else 0.0
+
     # 上辺をチェック
     for col in range(left, right + 1):
         total_segments += 1
@@ -6809,40 +10312,235 @@ def generate_cell_names_from_containers(
     if not containers:
         return generated_names
 
-    # コンテナ設定の妥当性を検証
-    config_errors = validate_container_config(containers, prefix=prefix)
-    if config_errors:
-        for error in config_errors:
-            logger.error(f"コンテナ設定エラー: {error}")
-        return generated_names
+    # コンテナ設定の妥当性を検証
+    config_errors = validate_container_config(containers, prefix=prefix)
+    if config_errors:
+        for error in config_errors:
+            logger.error(f"コンテナ設定エラー: {error}")
+        return generated_names
+
+    # 階層構造の整合性を検証
+    hierarchy_errors = validate_hierarchy_consistency(containers, prefix=prefix)
+    if hierarchy_errors:
+        for error in hierarchy_errors:
+            logger.error(f"階層構造エラー: {error}")
+
+    # 各コンテナを処理（親→子の階層順に安定化）
+    ordered_containers = sort_containers_by_hierarchy(containers, prefix=prefix)
+    groups = group_containers_by_root(ordered_containers, prefix=prefix)
+    container_jobs = get_current_context().container_jobs
+    parallel_groups = container_jobs > 1 and len(groups) > 1
+    if parallel_groups and not _fork_pool_available():
+        logger.warning("fork が利用できないため --container-jobs=%d を無効化し逐次処理します", container_jobs)
+        parallel_groups = False
+    if parallel_groups:
+        _run_container_groups_parallel(
+            groups,
+            ordered_containers,
+            workbook,
+            generated_names,
+            global_max_elements,
+            max_workers=container_jobs,
+            extraction_policy=extraction_policy,
+        )
+    else:
+        register_element_streams(containers, workbook, prefix=prefix)
+        with sheet_analysis_pool(workbook) as sheet_pool:
+            for container_name, container_def in ordered_containers:
+                _run_container(
+                    container_name,
+                    container_def,
+                    workbook,
+                    generated_names,
+                    global_max_elements,
+                    extraction_policy=extraction_policy,
+                    sheet_pool=sheet_pool,
+                )
+
+    logger.debug(f"生成されたセル名と値: {generated_names}")
+    return generated_names
+
+
+def _run_container(
+    container_name,
+    container_def,
+    workbook,
+    generated_names,
+    global_max_elements: Optional[int] = None,
+    *,
+    extraction_policy: Optional[ExtractionPolicy] = None,
+    sheet_pool: Optional[SheetAnalysisPool] = None,
+) -> None:
+    """1コンテナを処理し、処理時間を統計へ記録する（例外はコンテナ単位で記録して継続）。"""
+    logger.debug(f"コンテナ処理開始: {container_name}")
+    stats().containers_processed += 1
+    started = time.perf_counter()
+    try:
+        process_container(
+            container_name,
+            container_def,
+            workbook,
+            generated_names,
+            global_max_elements,
+            extraction_policy=extraction_policy,
+            sheet_pool=sheet_pool,
+        )
+    except Exception as e:
+        # コンテナ単位の最上位でエラーを検出・記録（トレース出力）
+        logger.exception(f"コンテナ {container_name} の処理中にエラー")
+    finally:
+        stats().add_container_time(container_name, time.perf_counter() - started)
+
+
+def build_container_dag(container_names: Iterable[str], prefix: str = "json") -> Dict[str, Optional[str]]:
+    """コンテナキーから親→子の DAG を構築し、各コンテナの親コンテナ（最も近い祖先、無ければ None）を返す。
+
+    祖先は数値インデックスを除いた階層パスで判定する（"json.orders.1.items" の親は "json.orders"）。
+    末尾がインデックスのキー（"json.orders.1"）は "json.orders" と同じ階層として扱い、自身を親にしない。
+    """
+    names = list(container_names)
+    by_path: Dict[str, str] = {}
+    for name in names:
+        by_path.setdefault(".".join(p for p in name.split(".") if not p.isdigit()), name)
+    parents: Dict[str, Optional[str]] = {}
+    for name in names:
+        parts = [p for p in name.split(".") if not p.isdigit()]
+        parent: Optional[str] = None
+        # 自身の階層パスより短い祖先パスを近い順に探す（prefix 直下の1階層まで）
+        for n in range(len(parts) - 1, 1, -1):
+            candidate = by_path.get(".".join(parts[:n]))
+            if candidate is not None and candidate != name:
+                parent = candidate
+                break
+        parents[name] = parent
+    return parents
+
 
-    # 階層構造の整合性を検証
-    hierarchy_errors = validate_hierarchy_consistency(containers, prefix=prefix)
-    if hierarchy_errors:
-        for error in hierarchy_errors:
-            logger.error(f"階層構造エラー: {error}")
+def group_containers_by_root(ordered_containers, prefix: str = "json") -> Dict[str, list]:
+    """階層順のコンテナ列を、互いに独立な部分木（prefix 直下のルート名が同じコンテナ群）に分ける。
 
-    # 各コンテナを処理（親→子の階層順に安定化）
-    ordered_containers = sort_containers_by_hierarchy(containers, prefix=prefix)
+    同じルート名のコンテナは生成名の名前空間を共有し、子は親の生成名を参照するため同一グループで
+    階層順に処理する。グループの並びと各グループ内の順序は入力順を保つ。
+    """
+    groups: Dict[str, list] = {}
     for container_name, container_def in ordered_containers:
-        logger.debug(f"コンテナ処理開始: {container_name}")
-        stats().containers_processed += 1
+        parts = container_name.split(".")
+        root = parts[1] if len(parts) > 1 and parts[0] == prefix else container_name
+        groups.setdefault(root, []).append((container_name, container_def))
+    return groups
+
+
+def container_critical_path(container_seconds: Mapping[str, float]) -> tuple[List[str], float]:
+    """コンテナ毎の処理時間と親子 DAG から、処理時間の合計が最大となるルート→葉の経路を返す。"""
+    if not container_seconds:
+        return [], 0.0
+    prefix = next(iter(container_seconds)).split(".", 1)[0]
+    parents = build_container_dag(container_seconds, prefix=prefix)
+    finish: Dict[str, float] = {}
+    for name in container_seconds:
+        # 未計算の祖先を辿ってから根側から順に累積する（再帰せず、循環は打ち切る）
+        chain: List[str] = []
+        node: Optional[str] = name
+        while node is not None and node not in finish and node not in chain:
+            chain.append(node)
+            node = parents.get(node)
+        base = finish.get(node, 0.0) if node is not None else 0.0
+        for member in reversed(chain):
+            base += container_seconds.get(member, 0.0)
+            finish[member] = base
+    last = max(container_seconds, key=lambda n: finish[n])
+    path: List[str] = []
+    seen: set[str] = set()
+    walk: Optional[str] = last
+    while walk is not None and walk not in seen:
+        seen.add(walk)
+        path.append(walk)
+        walk = parents.get(walk)
+    return path[::-1], finish[last]
+
+
+class _RecordingNames(dict):
+    """生成名の書き込み順を記録する辞書（ワーカーの結果を呼び出し側で再生するため）。"""
+
+    def __init__(self):
+        super().__init__()
+        self.writes: List[tuple[str, Any]] = []
+
+    def __setitem__(self, key, value):
+        self.writes.append((key, value))
+        super().__setitem__(key, value)
+
+
+def _process_container_group_in_worker(
+    group: list, global_max_elements: Optional[int], extraction_policy: Optional[ExtractionPolicy]
+) -> tuple[Dict[str, List[tuple[str, Any]]], "ProcessingStats"]:
+    """コンテナ部分木ワーカー: グループ内のコンテナを階層順に処理し、コンテナ毎の書き込み列と統計を返す。"""
+    workbook = _fork_worker_state
+    ctx = get_current_context()
+    ctx.processing_stats = ProcessingStats()
+    names = _RecordingNames()
+    writes: Dict[str, List[tuple[str, Any]]] = {}
+    for container_name, container_def in group:
+        start = len(names.writes)
+        _run_container(
+            container_name,
+            container_def,
+            workbook,
+            names,
+            global_max_elements,
+            extraction_policy=extraction_policy,
+        )
+        writes[container_name] = names.writes[start:]
+    return writes, ctx.processing_stats
+
+
+def _run_container_groups_parallel(
+    groups: Dict[str, list],
+    ordered_containers,
+    workbook,
+    generated_names: Dict[str, Any],
+    global_max_elements: Optional[int],
+    *,
+    max_workers: int,
+    extraction_policy: Optional[ExtractionPolicy],
+) -> None:
+    """独立したコンテナ部分木を fork したワーカープロセスで並列処理し、結果を決定的に統合する。
+
+    各ワーカーの書き込みを逐次処理と同じ階層順（ordered_containers）で generated_names に再生するため、
+    キー・値・挿入順は逐次処理と同一になる。ワーカーが失敗したグループは自プロセスで処理する。
+    """
+    writes: Dict[str, List[tuple[str, Any]]] = {}
+    with _fork_pool(min(max_workers, len(groups)), workbook) as executor:
+        futures = {
+            root: executor.submit(_process_container_group_in_worker, group, global_max_elements, extraction_policy)
+            for root, group in groups.items()
+        }
+        for root, group in groups.items():
+            try:
+                group_writes, worker_stats = futures[root].result()
+            except Exception:
+                logger.debug("コンテナ部分木ワーカーが失敗したため自プロセスで再実行: %s", root, exc_info=True)
+                names = _RecordingNames()
+                group_writes = {}
+                for container_name, container_def in group:
+                    start = len(names.writes)
+                    _run_container(
+                        container_name,
+                        container_def,
+                        workbook,
+                        names,
+                        global_max_elements,
+                        extraction_policy=extraction_policy,
+                    )
+                    group_writes[container_name] = names.writes[start:]
+            else:
+                stats().merge(worker_stats)
+            writes.update(group_writes)
+    for container_name, _container_def in ordered_containers:
+        for key, value in writes.get(container_name, ()):
+            generated_names[key] = value
 
-        try:
-            process_container(
-                container_name,
-                container_def,
-                workbook,
-                generated_names,
-                global_max_elements,
-                extraction_policy=extraction_policy,
-            )
-        except Exception as e:
-            # コンテナ単位の最上位でエラーを検出・記録（トレース出力）
-            logger.exception(f"コンテナ {container_name} の処理中にエラー")
 
-    logger.debug(f"生成されたセル名と値: {generated_names}")
-    return generated_names
 def enumerate_sheeted_ranges_sorted(workbook) -> list[tuple[Optional[str], Optional[str]]]:
     """ワークブックからシート名の列を取得し、ワークブック順に整列した (sheet, None) の配列を返す。"""
     sheeted_ranges: list[tuple[Optional[str], Optional[str]]] = []
@@ -7027,6 +10725,7 @@ def estimate_element_count_and_step(
         container_name=container_name,
         target_sheet=target_sheet,
         using_template=using_template,
+        limit=global_max_elements,
     )
 
     # Skip template-applied sheets with zero detection unless range deterministically provides count
@@ -7415,10 +11114,14 @@ def analyze_element_count_without_range(
     container_name: str,
     target_sheet: Optional[str],
     using_template: bool,
+    limit: Optional[int] = None,
 ) -> int:
     """
     ラベル優先の件数分析（range が無い場合の分析）。
 
+    limit（--max-elements）を指定した場合、labels の増分スキャンは limit 件で打ち切る。
+    件数は後段で全体上限によりクリップされるため、結果は打ち切らない場合と同一。
+
     件数算出ポリシー:
     - increment(eff_increment) を最優先。
       - labels がある場合: 増分スキャンし、labels のいずれかが空(None/"")になった時点で停止（矩形は参照しない）。
@@ -7471,25 +11174,14 @@ def analyze_element_count_without_range(
                     if target_sheet in getattr(workbook, "sheetnames", [])
                     else workbook.active
                 )
-                count = 0
-                # 安全上限（無限ループ防止）。現実的な大きさに設定。
-                SAFE_MAX = 2000
-                for idx in range(1, SAFE_MAX + 1):
-                    # 全ての label が非空である限り継続
-                    all_non_empty = True
-                    for lf in resolved_labels:
-                        base = pos_map[lf]
-                        c, r = calculate_target_position(
-                            base, (direction or "row").lower(), idx, eff_increment
-                        )
-                        v = read_cell_value((c, r), ws0)
-                        if v in (None, ""):
-                            all_non_empty = False
-                            break
-                    if not all_non_empty:
-                        break
-                    count += 1
-                return count
+                # 全ての label が非空である限り継続（件数の上限なし）
+                return count_label_series(
+                    ws0,
+                    [pos_map[lf] for lf in resolved_labels],
+                    (direction or "row").lower(),
+                    eff_increment,
+                    limit=limit,
+                )
             except Exception:
                 # 失敗時は矩形上限へフォールバック
                 pass
@@ -8202,6 +11894,7 @@ def collect_row_values(
     step: int,
     eff_top: int,
     eff_bottom: int,
+    block: Optional[CellBlock] = None,
 ) -> tuple[Dict[str, Any], Dict[str, Tuple[int, int]], bool]:
     """一行分のセル値を収集し、使用座標と非空判定を返す。
 
@@ -8212,6 +11905,7 @@ def collect_row_values(
     - local_index: 相対インデックス（1始まり）
     - step: ステップ幅
     - eff_top/eff_bottom: 有効範囲の上下端（行方向の判定に利用）
+    - block: 親矩形を先読みした CellBlock（指定時はブロックから値を取得）
 
     出力:
     - values_by_field: フィールド -> 値
@@ -8221,6 +11915,19 @@ def collect_row_values(
     values_by_field: Dict[str, Any] = {}
     used_positions: Dict[str, Tuple[int, int]] = {}
     non_empty = False
+    if block is not None:
+        in_range: List[str] = []
+        for fname, (c0, r0) in current_positions.items():
+            tc, tr = calculate_target_position((c0, r0), direction, local_index, step)
+            used_positions[fname] = (tc, tr)
+            values_by_field[fname] = ""
+            if eff_top <= tr <= eff_bottom:
+                in_range.append(fname)
+        for fname, val in zip(in_range, block.read_values(used_positions[f] for f in in_range)):
+            values_by_field[fname] = val
+            if val not in (None, ""):
+                non_empty = True
+        return values_by_field, used_positions, non_empty
     for fname, (c0, r0) in current_positions.items():
         tc, tr = calculate_target_position((c0, r0), direction, local_index, step)
         if tr < eff_top or tr > eff_bottom:
@@ -8420,6 +12127,12 @@ def _scan_and_emit_main(
             continue
 
     # === 3) 行ループ: 値収集→早期スキップ→数値調整→受理 ===
+        # 親矩形の行範囲×フィールド列を一括先読み（行方向のみ。列方向は従来どおり個別読取）
+        block = (
+            CellBlock.for_rows(ws0, eff_pt, eff_pb, (c for c, _r in current_positions.values()))
+            if direction == "row"
+            else None
+        )
         for local_i in range(i0, i1 + 1):
             # ラベル解決はループ内で都度行う（従来の等価動作に戻す）
             resolved_labels2 = [lf for lf in labels if lf in current_positions]
@@ -8431,6 +12144,7 @@ def _scan_and_emit_main(
                 step=eff_step_local,
                 eff_top=eff_pt,
                 eff_bottom=eff_pb,
+                block=block,
             )
 
             if not passes_numeric_row_requirements(
@@ -8594,7 +12308,12 @@ def _scan_and_emit_fallback(
         )
         if i1_fb < i0_fb:
             continue
-        # アンカー周辺の行を順次評価
+        # アンカー周辺の行を順次評価（祖先矩形の行範囲×フィールド列を一括先読み）
+        block_fb = (
+            CellBlock.for_rows(ws0, fb_pt, fb_pb, (c for c, _r in current_positions.values()))
+            if direction == "row"
+            else None
+        )
         for li in range(i0_fb, i1_fb + 1):
             vals_fb, used_pos, non_empty_fb = collect_row_values(
                 ws=ws0,
@@ -8604,6 +12323,7 @@ def _scan_and_emit_fallback(
                 step=fb_step,
                 eff_top=fb_pt,
                 eff_bottom=fb_pb,
+                block=block_fb,
             )
             seq_val_fb = extract_seq_like_value(vals_fb, None)
             if not seq_val_fb:
@@ -9060,6 +12780,201 @@ def _compute_iteration_bounds(
     i1_fb = ((region_bottom - child_anchor_row) // step) + 1 if region_bottom >= child_anchor_row else 0
     return i0_fb, i1_fb
 
+
+def _fork_pool_available() -> bool:
+    """状態を引き継ぐ fork ベースのプロセスプールが使えるか。
+
+    fork 非対応/デーモンプロセス内に加え、他のスレッド（常駐コマンドの読取スレッド等）が動いている間も不可とする。
+    fork 先には呼び出しスレッドしか複製されず、他のスレッドが保持するロックや通信状態を引き継げないため。
+    """
+    import multiprocessing
+
+    return (
+        "fork" in multiprocessing.get_all_start_methods()
+        and not multiprocessing.current_process().daemon
+        and threading.active_count() == 1
+    )
+
+
+# fork したワーカープロセスが参照する状態（ワーカー内でのみ _init_fork_worker が設定する）
+_fork_worker_state: Any = None
+
+
+def _init_fork_worker(state: Any) -> None:
+    global _fork_worker_state
+    _fork_worker_state = state
+
+
+def _fork_pool(max_workers: int, state: Any) -> Any:
+    """state を initializer 引数でワーカーへ渡す fork ベースのプロセスプールを返す。
+
+    fork ではワーカー起動時に引数を複製（pickle）しないため、ワークブック等の大きな状態もそのまま引き継げる。
+    ワーカーは初回の submit 時に起動する。呼び出し側は事前に `_fork_pool_available()` を確認する。
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    import multiprocessing
+
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=_init_fork_worker,
+        initargs=(state,),
+    )
+
+
+def _worksheet_extents(workbook) -> Dict[str, Tuple[int, int]]:
+    """シート毎の (max_row, max_column)。"""
+    return {ws.title: (ws.max_row, ws.max_column) for ws in getattr(workbook, "worksheets", ())}
+
+
+def _extend_worksheets(workbook, extents: Dict[str, Tuple[int, int]]) -> None:
+    """他プロセスの読取で拡張されたシート寸法を cell() で反映し、逐次処理と揃える。"""
+    for title, (max_row, max_col) in extents.items():
+        ws = workbook[title]
+        if ws.max_row < max_row or ws.max_column < max_col:
+            ws.cell(row=max_row, column=max_col)
+
+
+def _analyze_sheet_in_worker(
+    kwargs: Dict[str, Any], prefetch_rows: bool, parent_extents: Dict[str, Tuple[int, int]]
+) -> tuple[Optional[SheetContainerAnalysis], "ProcessingStats", Dict[str, Tuple[int, int]]]:
+    """シート解析ワーカー: fork 時点のワークブックで解析段（と要素値の先読み）を実行し、統計と共に返す。
+
+    fork 後に親で拡張されたシート寸法（parent_extents）を先に反映し、解析後のシート寸法を返して親へ反映させる。
+    """
+    workbook = _fork_worker_state
+    ctx = get_current_context()
+    ctx.processing_stats = ProcessingStats()
+    _extend_worksheets(workbook, parent_extents)
+    analysis = _analyze_sheet_for_container(workbook=workbook, **kwargs)
+    if analysis is not None and prefetch_rows and analysis.element_count > 0:
+        analysis.rows = read_dynamic_element_rows(
+            analysis.current_positions,
+            analysis.element_count,
+            kwargs["container_def"].get("direction", "row"),
+            analysis.eff_increment,
+            workbook,
+            sheet_name=kwargs["target_sheet"],
+            step_override=analysis.step_override,
+            force_emit_all=bool(analysis.range_count),
+        )
+    return analysis, ctx.processing_stats, _worksheet_extents(workbook)
+
+
+class SheetAnalysisPool:
+    """process_container のシート単位の解析段を fork したワーカープロセスで並列実行するプール。
+
+    ワーカーは fork 時点のワークブックとキャッシュを引き継いで読み取りのみを行い、
+    解析結果（連番付き一括生成のコンテナでは要素値も先読み）と統計を返す。
+    連番の割り当てとセル名の出力は呼び出し側がシート順に行うため、結果は逐次処理と同一。
+    ワーカーの読取によるシート寸法の拡張も親へ反映する。
+    プールは1ファイルの解析で1つ（`sheet_analysis_pool()`）とし、ワーカーの fork は初回の並列解析まで遅延する。
+    """
+
+    def __init__(self, workbook, max_workers: int):
+        self.workbook = workbook
+        self.max_workers = max_workers
+        self.broken = False
+        self._executor: Any = None
+
+    def _ensure_executor(self) -> Any:
+        if self._executor is None:
+            # ワーカーは初回の並列解析で fork するため、その時点でスレッドが動いていれば逐次処理にする
+            if not _fork_pool_available():
+                raise RuntimeError("fork できないためシート並列を使えません")
+            self._executor = _fork_pool(self.max_workers, self.workbook)
+        return self._executor
+
+    @classmethod
+    def create(cls, workbook, max_workers: int) -> Optional["SheetAnalysisPool"]:
+        """max_workers > 1 かつ fork が利用可能な場合のみプールを作成する（それ以外は None: 逐次処理）。"""
+        if max_workers <= 1:
+            return None
+        if not _fork_pool_available():
+            logger.warning("fork が利用できないため --sheet-jobs=%d を無効化し逐次処理します", max_workers)
+            return None
+        try:
+            return cls(workbook, max_workers)
+        except Exception:
+            logger.debug("シート解析プールを作成できないため逐次処理します", exc_info=True)
+            return None
+
+    def analyze_sheets(
+        self, sheet_kwargs: List[Dict[str, Any]], *, prefetch_rows: bool
+    ) -> List[Optional[SheetContainerAnalysis]]:
+        """各シートの解析段を並列実行し、シート順に結果を返す。
+
+        ワーカー側の失敗（プール異常終了・転送不可等）はそのシートを自プロセスで再実行するため、
+        解析自体が送出する例外は逐次処理と同じシートで呼び出し側へ伝播する。
+        """
+        futures: list = []
+        parent_extents: Dict[str, Tuple[int, int]] = {}
+        if not self.broken:
+            try:
+                executor = self._ensure_executor()
+                parent_extents = _worksheet_extents(self.workbook)
+            except Exception as e:
+                logger.warning("シート解析プールを開始できないため --sheet-jobs=%d を無効化し逐次処理します: %s", self.max_workers, e)
+                self.broken = True
+        for kwargs in sheet_kwargs:
+            if self.broken:
+                futures.append(None)
+                continue
+            try:
+                futures.append(executor.submit(_analyze_sheet_in_worker, kwargs, prefetch_rows, parent_extents))
+            except Exception:
+                self.broken = True
+                futures.append(None)
+        results: List[Optional[SheetContainerAnalysis]] = []
+        for kwargs, future in zip(sheet_kwargs, futures):
+            if future is not None:
+                try:
+                    analysis, worker_stats, worker_extents = future.result()
+                    stats().merge(worker_stats)
+                    _extend_worksheets(self.workbook, worker_extents)
+                    results.append(analysis)
+                    continue
+                except Exception:
+                    logger.debug(
+                        "シート解析ワーカーが失敗したため自プロセスで再実行: %s", kwargs["target_sheet"], exc_info=True
+                    )
+            results.append(_analyze_sheet_for_container(workbook=self.workbook, **kwargs))
+        return results
+
+    def close(self) -> None:
+        if self._executor is None:
+            return
+        try:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+        finally:
+            self._executor = None
+
+
+@contextmanager
+def sheet_analysis_pool(workbook) -> Iterator[Optional[SheetAnalysisPool]]:
+    """1ファイルの解析区間で共有するシート解析プールを返す（区間中に同じブックのプールがあれば再利用）。
+
+    単一シートのブックや sheet_jobs が 1 の場合は None（逐次処理）。区間の終了時にプールを閉じる。
+    """
+    ctx = get_current_context()
+    current = ctx.sheet_pool
+    if current is not None and current.workbook is workbook:
+        yield current
+        return
+    pool = (
+        SheetAnalysisPool.create(workbook, ctx.sheet_jobs)
+        if len(getattr(workbook, "sheetnames", [])) > 1
+        else None
+    )
+    ctx.sheet_pool = pool
+    try:
+        yield pool
+    finally:
+        ctx.sheet_pool = current
+        if pool is not None:
+            pool.close()
+
+
 def process_container(
     container_name,
     container_def,
@@ -9068,8 +12983,13 @@ def process_container(
     global_max_elements: Optional[int] = None,
     *,
     extraction_policy: Optional[ExtractionPolicy] = None,
+    sheet_pool: Optional[SheetAnalysisPool] = None,
 ):
-    """コンテナ処理（range非依存・マルチシート集約対応）"""
+    """コンテナ処理（range非依存・マルチシート集約対応）
+
+    sheet_pool を指定した場合、シート毎の解析段を並列に実行してから、
+    連番（next_index）の割り当てと出力をシート順に行う。
+    """
     # デフォルト値
     policy = extraction_policy or _DEFAULT_EXTRACTION_POLICY
     direction = container_def.get("direction", "row")
@@ -9103,6 +13023,44 @@ def process_container(
     logger.debug("SHEETS ORDER %s: %s", container_name, [s for s, _ in sheeted_ranges])
     logger.debug("NAMEFUL %s: %s", container_name, sorted(list(nameful_sheets)))
     logger.debug("TEMPLATE_SHEET %s: %s", container_name, template_sheet)
+    if sheet_pool is not None and len(sheeted_ranges) > 1:
+        sheet_kwargs = [
+            dict(
+                container_name=container_name,
+                container_def=container_def,
+                target_sheet=target_sheet,
+                base_cell_names=global_field_names,
+                nameful_sheets=nameful_sheets,
+                per_sheet_positions=per_sheet_positions,
+                template_positions=template_positions,
+                template_sheet=template_sheet,
+                global_max_elements=global_max_elements,
+            )
+            for target_sheet, _ignored in sheeted_ranges
+        ]
+        analyses = sheet_pool.analyze_sheets(
+            sheet_kwargs,
+            prefetch_rows=(
+                _uses_numbered_emission(container_name, global_max_elements)
+                and _element_stream_for(container_name) is None
+            ),
+        )
+        for (target_sheet, _ignored), analysis in zip(sheeted_ranges, analyses):
+            if analysis is None:
+                continue
+            next_index = _emit_sheet_for_container(
+                analysis=analysis,
+                container_name=container_name,
+                container_def=container_def,
+                workbook=workbook,
+                generated_names=generated_names,
+                target_sheet=target_sheet,
+                global_max_elements=global_max_elements,
+                next_index=next_index,
+                extraction_policy=extraction_policy,
+            )
+        return
+
     for target_sheet, _ignored in sheeted_ranges:
         next_index = _process_sheet_for_container(
             container_name=container_name,
@@ -9123,6 +13081,11 @@ def process_container(
 
 def iter_defined_name_destinations_all(cell_name: str, workbook):
     """同名のDefinedNameが複数存在する場合でも、全エントリのdestinationsを列挙する安全なイテレータ"""
+    index = defined_name_index(workbook)
+    if index is not None:
+        for d in index.destinations(cell_name):
+            yield d.sheet, d.coord
+        return
     # openpyxlでは workbook.defined_names.definedName に生のリストがある
     dn_list = getattr(workbook.defined_names, "definedName", None)
     if dn_list is not None:
@@ -9155,7 +13118,12 @@ def get_cell_names_in_container_range(
             return [getattr(dn, "name", "") for dn in dn_list if getattr(dn, "name", "")]
         return list(set(workbook.defined_names))
 
-    all_names = _collect_all_defined_names()
+    name_index = defined_name_index(workbook)
+    if name_index is not None:
+        # 索引から search_prefix 配下の定義名のみ取得
+        all_names = list(name_index.iter_descendants(search_prefix[:-1], NAME_KIND_DEFINED))
+    else:
+        all_names = _collect_all_defined_names()
 
     # 採用するセル名のマップと、フィールドごとの最小インデックスを管理
     cell_names: Dict[str, str] = {}
@@ -9179,6 +13147,10 @@ def get_cell_names_in_container_range(
                 return tail_parts[1], int(tail_parts[0])
             if tail_parts[1].isdigit() and not tail_parts[0].isdigit():
                 child_anchor_prefix = f"{search_prefix}{tail_parts[0]}.{tail_parts[1]}."
+                if name_index is not None:
+                    if name_index.has_non_numeric_child(child_anchor_prefix[:-1], NAME_KIND_DEFINED):
+                        return None
+                    return tail_parts[0], int(tail_parts[1])
                 for n2 in all_names:
                     if not n2.startswith(child_anchor_prefix):
                         continue
@@ -9259,15 +13231,76 @@ def generate_dynamic_cell_names_from_positions(
     1要素内の全フィールドが空値（None/""）の場合、その要素はスキップし、
     実際に生成した要素数を返す。
     """
+    rows = read_dynamic_element_rows(
+        base_positions,
+        element_count,
+        direction,
+        increment,
+        workbook,
+        sheet_name=sheet_name,
+        step_override=step_override,
+        force_emit_all=force_emit_all,
+    )
+    for offset, values in enumerate(rows):
+        _emit_generated_values(
+            container_key=container_key,
+            generated_names=generated_names,
+            emitted_idx=start_index + offset,
+            values=values,
+        )
+    return len(rows)
+
+
+def read_dynamic_element_rows(
+    base_positions: dict,
+    element_count: int,
+    direction: str,
+    increment: int,
+    workbook,
+    *,
+    sheet_name: str | None = None,
+    step_override: Optional[int] = None,
+    force_emit_all: bool = False,
+) -> list[dict[str, Any]]:
+    """generate_dynamic_cell_names_from_positions の読取段。
+
+    生成対象となる要素（全フィールド空の要素は force_emit_all でない限り除外）の値を
+    要素順に返す。セル名・連番には依存しないため、シート単位で独立に実行できる。
+    """
+    return list(
+        iter_dynamic_element_rows(
+            base_positions,
+            element_count,
+            direction,
+            increment,
+            workbook,
+            sheet_name=sheet_name,
+            step_override=step_override,
+            force_emit_all=force_emit_all,
+        )
+    )
+
+
+def iter_dynamic_element_rows(
+    base_positions: dict,
+    element_count: int,
+    direction: str,
+    increment: int,
+    workbook,
+    *,
+    sheet_name: str | None = None,
+    step_override: Optional[int] = None,
+    force_emit_all: bool = False,
+) -> Iterator[dict[str, Any]]:
+    """read_dynamic_element_rows の逐次版。要素の値（フィールド名 → 値）を1要素ずつ読み取って返す。"""
     if not base_positions or element_count <= 0:
-        return 0
+        return
     ws = (
         workbook[sheet_name]
         if (sheet_name and sheet_name in getattr(workbook, "sheetnames", []))
         else workbook.active
     )
     eff_step = _effective_step_for(step_override, increment)
-    emitted = 0
     for local_i in range(1, element_count + 1):
         _values, _positions, non_empty = _read_fields_for_local_index_from_positions(
             local_idx=local_i,
@@ -9280,17 +13313,7 @@ def generate_dynamic_cell_names_from_positions(
 
         if not non_empty and not force_emit_all:
             continue
-
-        emitted += 1
-        global_idx_emitted = start_index + emitted - 1
-        _emit_generated_values(
-            container_key=container_key,
-            generated_names=generated_names,
-            emitted_idx=global_idx_emitted,
-            values=_values,
-        )
-
-    return emitted
+        yield _values
 
 
 def _effective_step_for(step_override: Optional[int], increment: int) -> int:
@@ -9450,12 +13473,31 @@ def get_cell_position_from_name(cell_name, workbook, sheet_name: Optional[str] =
     return None
 
 
-def _process_sheet_for_container(
+@dataclass
+class SheetContainerAnalysis:
+    """コンテナ×シートの解析結果（連番 next_index に依存しない段の出力）。
+
+    rows はワーカーで先読みした生成対象要素の値（None の場合は出力段で読み取る）。
+    count_labels / count_cap は抽出プラン作成時のみ設定する件数規則で、件数がラベル走査で決まる場合の
+    ラベルセル座標と、その件数に掛かる上限（範囲・親範囲・アンカー範囲。None は上限なし）。
+    """
+    current_positions: Dict[str, Tuple[int, int]]
+    using_template: bool
+    eff_increment: int
+    labels: List[str]
+    element_count: int
+    step_override: Optional[int]
+    range_count: int
+    rows: Optional[List[Dict[str, Any]]] = None
+    count_labels: Optional[List[Tuple[int, int]]] = None
+    count_cap: Optional[int] = None
+
+
+def _analyze_sheet_for_container(
     *,
     container_name: str,
     container_def: dict,
     workbook,
-    generated_names: Dict[str, Any],
     target_sheet: Optional[str],
     base_cell_names: Dict[str, str],
     nameful_sheets: set,
@@ -9463,39 +13505,30 @@ def _process_sheet_for_container(
     template_positions: Dict[str, tuple],
     template_sheet: Optional[str],
     global_max_elements: Optional[int],
-    next_index: int,
-    extraction_policy: Optional[ExtractionPolicy],
-) -> int:
-    """Process a single sheet for the given container.
+) -> Optional[SheetContainerAnalysis]:
+    """_process_sheet_for_container の解析段（基準座標・実効 increment・要素数の推定）。
 
-    This helper is an extraction of the per-sheet body of `process_container`.
-    It intentionally performs no behavioral changes; arguments are passed through
-    and the returned `next_index` will be applied by the caller.
+    ワークブックを読み取るのみで generated_names / next_index を参照しないため、
+    シート毎に独立して（並列に）実行できる。対象外のシートでは None を返す。
     """
     # シートでフィルタして基準座標を取得（無ければテンプレを使用）
-    using_template = False
-    try:
-        current_positions, using_template = gather_current_positions_and_template(
-            container_name=container_name,
-            container_def=container_def,
-            workbook=workbook,
-            target_sheet=target_sheet,
-            nameful_sheets=nameful_sheets,
-            template_positions=template_positions,
-            template_sheet=template_sheet,
-            global_field_names=base_cell_names,
+    current_positions, using_template = gather_current_positions_and_template(
+        container_name=container_name,
+        container_def=container_def,
+        workbook=workbook,
+        target_sheet=target_sheet,
+        nameful_sheets=nameful_sheets,
+        template_positions=template_positions,
+        template_sheet=template_sheet,
+        global_field_names=base_cell_names,
+    )
+    if not current_positions:
+        logger.debug(
+            "コンテナ %s に既存のセル名が見つからずテンプレも無いためスキップ（sheet=%s）",
+            container_name,
+            target_sheet,
         )
-
-        if not current_positions:
-            logger.debug(
-                "コンテナ %s に既存のセル名が見つからずテンプレも無いためスキップ（sheet=%s）",
-                container_name,
-                target_sheet,
-            )
-            return next_index
-    except Exception:
-        # propagate to caller (process_container) as earlier behavior
-        raise
+        return None
 
     # Step 3: 実効 increment を推定（必要時）
     eff_increment, anchor_range_span = compute_effective_increment_and_anchor_span(
@@ -9531,20 +13564,114 @@ def _process_sheet_for_container(
         anchor_range_span=anchor_range_span,
         labels=labels,
     )
+    analysis = SheetContainerAnalysis(
+        current_positions=current_positions,
+        using_template=using_template,
+        eff_increment=eff_increment,
+        labels=labels,
+        element_count=element_count,
+        step_override=step_override,
+        range_count=range_count,
+    )
+    if get_current_context().plan_recorder is not None:
+        analysis.count_labels, analysis.count_cap = _label_count_rule(
+            container_name=container_name,
+            workbook=workbook,
+            target_sheet=target_sheet,
+            current_positions=current_positions,
+            eff_increment=eff_increment,
+            labels=labels,
+            range_count=range_count,
+            parent_range_span=parent_range_span_for_container,
+            anchor_range_span=anchor_range_span,
+            internal_slice_count=internal_slice_count,
+        )
+    return analysis
+
+
+def _label_count_rule(
+    *,
+    container_name: str,
+    workbook,
+    target_sheet: Optional[str],
+    current_positions: Dict[str, Tuple[int, int]],
+    eff_increment: int,
+    labels: List[str],
+    range_count: Optional[int],
+    parent_range_span: Optional[int],
+    anchor_range_span: Optional[int],
+    internal_slice_count: int,
+) -> Tuple[Optional[List[Tuple[int, int]]], Optional[int]]:
+    """estimate_element_count_and_step の件数がラベル走査（セル値）で決まる場合の規則を返す。
+
+    戻り値: (ラベルセル座標, 上限)。件数が定義名・範囲・罫線のみで決まる場合は (None, None)。
+    ラベル走査の件数 n に対し、n > 0 なら min(n, 上限)、n == 0 なら 0 が件数となる。
+    """
+    label_fields = resolve_labels_in_positions(labels, current_positions)
+    if (eff_increment or 0) <= 0 or internal_slice_count > 1 or target_sheet is None or not label_fields:
+        return None, None
+    caps = [v for v in (range_count, parent_range_span, anchor_range_span) if isinstance(v, int) and v > 0]
+    unbounded = 1 << 30
+    bottom_cap = clip_element_count_by_parent_bottom_for_single_numeric_child(
+        container_name=container_name,
+        workbook=workbook,
+        target_sheet=target_sheet,
+        current_positions=current_positions,
+        eff_increment=eff_increment,
+        step_override=None,
+        element_count=unbounded,
+    )
+    if bottom_cap < unbounded:
+        caps.append(bottom_cap)
+    return [current_positions[lf] for lf in label_fields], (min(caps) if caps else None)
+
+
+def _uses_numbered_emission(container_name: str, global_max_elements: Optional[int]) -> bool:
+    """出力段が連番付きの一括生成のみとなる（要素値を先読みできる）かを判定する。
+
+    ネストスキャン/一括生成抑止の対象（数値トークン2個以上）と、全体上限で要素数が
+    next_index に依存する場合は先読みしない。
+    """
+    if isinstance(global_max_elements, int) and global_max_elements > 0:
+        return False
+    return sum(1 for t in container_name.split(".") if t.isdigit()) < 2
+
 
-    element_count = _apply_global_max_cap(element_count, global_max_elements, next_index)
+def _emit_sheet_for_container(
+    *,
+    analysis: SheetContainerAnalysis,
+    container_name: str,
+    container_def: dict,
+    workbook,
+    generated_names: Dict[str, Any],
+    target_sheet: Optional[str],
+    global_max_elements: Optional[int],
+    next_index: int,
+    extraction_policy: Optional[ExtractionPolicy],
+) -> int:
+    """_process_sheet_for_container の出力段。シート横断の連番 next_index を割り当ててセル名を生成する。"""
+    recorder = get_current_context().plan_recorder
+    if recorder is not None:
+        recorder.append(_plan_series_record(container_name, target_sheet, analysis))
+    element_count = _apply_global_max_cap(analysis.element_count, global_max_elements, next_index)
 
     if element_count <= 0:
         return next_index
 
+    # 逐次挿入の対象はセル名を生成せず、解析段の結果のみ保持する（要素値は挿入時に読み取る）
+    stream = _element_stream_for(container_name)
+    if stream is not None:
+        stream.segments.append((target_sheet, analysis))
+        return next_index
+
     # ネストスキャン優先
     if _try_nested_scan_and_emit(
         workbook=workbook,
         target_sheet=target_sheet,
         container_name=container_name,
         direction=container_def.get("direction", "row"),
-        current_positions=current_positions,
-        labels=labels,
+        current_positions=analysis.current_positions,
+        labels=analysis.labels,
         policy=extraction_policy or _DEFAULT_EXTRACTION_POLICY,
         generated_names=generated_names,
     ):
@@ -9567,26 +13694,393 @@ def _process_sheet_for_container(
         target_sheet,
         next_index,
         element_count,
-        using_template,
+        analysis.using_template,
     )
+    if analysis.rows is not None:
+        for offset, values in enumerate(analysis.rows):
+            _emit_generated_values(
+                container_key=container_name,
+                generated_names=generated_names,
+                emitted_idx=next_index + offset,
+                values=values,
+            )
+        return next_index + len(analysis.rows)
+
     emitted = generate_dynamic_cell_names_from_positions(
         container_name,
-        current_positions,
+        analysis.current_positions,
         element_count,
         container_def.get("direction", "row"),
-        eff_increment,
+        analysis.eff_increment,
         generated_names,
         workbook,
         start_index=next_index,
         sheet_name=target_sheet,
-        step_override=step_override,
-        force_emit_all=bool(range_count),
+        step_override=analysis.step_override,
+        force_emit_all=bool(analysis.range_count),
     )
 
     next_index += int(emitted or 0)
     return next_index
 
 
+def _plan_series_record(
+    container_name: str, target_sheet: Optional[str], analysis: SheetContainerAnalysis
+) -> Dict[str, Any]:
+    """抽出プランに保存するコンテナ×シートの出力指示（解析段の結果。JSON 表現）。"""
+    return {
+        "container": container_name,
+        "sheet": target_sheet,
+        "positions": {fn: list(pos) for fn, pos in analysis.current_positions.items()},
+        "using-template": analysis.using_template,
+        "increment": analysis.eff_increment,
+        "labels": list(analysis.labels),
+        "count": analysis.element_count,
+        "step": analysis.step_override,
+        "range-count": analysis.range_count,
+        "count-labels": (
+            [list(pos) for pos in analysis.count_labels] if analysis.count_labels is not None else None
+        ),
+        "count-cap": analysis.count_cap,
+    }
+
+
+def _replay_series_analysis(
+    workbook, record: Dict[str, Any], direction: str, global_max_elements: Optional[int]
+) -> SheetContainerAnalysis:
+    """出力指示から解析段の結果を復元する。件数がラベル走査で決まる場合はラベルセルのみ読み直す。"""
+    element_count = int(record["count"])
+    count_labels = record.get("count-labels")
+    if count_labels is not None:
+        sheet = record["sheet"]
+        ws = workbook[sheet] if sheet in getattr(workbook, "sheetnames", []) else workbook.active
+        element_count = count_label_series(
+            ws,
+            [tuple(pos) for pos in count_labels],
+            (direction or "row").lower(),
+            int(record["increment"]),
+            limit=global_max_elements,
+        )
+        cap = record.get("count-cap")
+        if element_count > 0 and cap:
+            element_count = min(element_count, int(cap))
+    return SheetContainerAnalysis(
+        current_positions={fn: (pos[0], pos[1]) for fn, pos in record["positions"].items()},
+        using_template=bool(record["using-template"]),
+        eff_increment=int(record["increment"]),
+        labels=list(record["labels"]),
+        element_count=element_count,
+        step_override=record.get("step"),
+        range_count=record.get("range-count"),
+    )
+
+
+def replay_container_series(
+    workbook,
+    containers: Dict[str, Any],
+    series: List[Dict[str, Any]],
+    *,
+    global_max_elements: Optional[int] = None,
+    extraction_policy: Optional[ExtractionPolicy] = None,
+    prefix: str = "json",
+) -> Dict[str, Any]:
+    """抽出プランの出力指示を順に適用してセル名を生成する（generate_cell_names_from_containers の代替）。
+
+    コンテナ推論・定義名からの座標解決・罫線による件数推定は行わず、セル値の読取り
+    （ラベル走査と要素値）と出力段のみを実行する。連番はコンテナ毎に 1 から振る。
+    """
+    generated_names: Dict[str, Any] = {}
+    register_element_streams(containers, workbook, prefix=prefix)
+    current: Optional[str] = None
+    next_index = 1
+    for record in series:
+        container_name = record["container"]
+        if container_name != current:
+            current, next_index = container_name, 1
+        if _apply_global_max_cap(1, global_max_elements, next_index) <= 0:
+            continue
+        container_def = containers.get(container_name) or {}
+        next_index = _emit_sheet_for_container(
+            analysis=_replay_series_analysis(
+                workbook, record, container_def.get("direction", "row"), global_max_elements
+            ),
+            container_name=container_name,
+            container_def=container_def,
+            workbook=workbook,
+            generated_names=generated_names,
+            target_sheet=record["sheet"],
+            global_max_elements=global_max_elements,
+            next_index=next_index,
+            extraction_policy=extraction_policy,
+        )
+    return generated_names
+
+
+def _process_sheet_for_container(
+    *,
+    container_name: str,
+    container_def: dict,
+    workbook,
+    generated_names: Dict[str, Any],
+    target_sheet: Optional[str],
+    base_cell_names: Dict[str, str],
+    nameful_sheets: set,
+    per_sheet_positions: Dict[str, dict],
+    template_positions: Dict[str, tuple],
+    template_sheet: Optional[str],
+    global_max_elements: Optional[int],
+    next_index: int,
+    extraction_policy: Optional[ExtractionPolicy],
+) -> int:
+    """Process a single sheet for the given container.
+
+    This helper is an extraction of the per-sheet body of `process_container`:
+    the analysis stage (`_analyze_sheet_for_container`) followed by the emission
+    stage (`_emit_sheet_for_container`). The returned `next_index` will be applied
+    by the caller.
+    """
+    # 全体上限（--max-elements）に到達済みなら、以降のシートは解析（件数走査）自体を行わない
+    if _apply_global_max_cap(1, global_max_elements, next_index) <= 0:
+        return next_index
+    analysis = _analyze_sheet_for_container(
+        container_name=container_name,
+        container_def=container_def,
+        workbook=workbook,
+        target_sheet=target_sheet,
+        base_cell_names=base_cell_names,
+        nameful_sheets=nameful_sheets,
+        per_sheet_positions=per_sheet_positions,
+        template_positions=template_positions,
+        template_sheet=template_sheet,
+        global_max_elements=global_max_elements,
+    )
+    if analysis is None:
+        return next_index
+    return _emit_sheet_for_container(
+        analysis=analysis,
+        container_name=container_name,
+        container_def=container_def,
+        workbook=workbook,
+        generated_names=generated_names,
+        target_sheet=target_sheet,
+        global_max_elements=global_max_elements,
+        next_index=next_index,
+        extraction_policy=extraction_policy,
+    )
+
+
+@dataclass
+class ElementStream:
+    """要素を生成名を介さずに結果ツリーへ逐次挿入するコンテナ（prefix 直下の単純な行/列コンテナ）。
+
+    segments は出力段に渡されたシート毎の解析段の結果（シート順）。要素値は挿入時に
+    iter_dynamic_element_rows で1要素ずつ読み取るため、行数×フィールド数のセル名は作らない。
+    """
+
+    container: str
+    array: str
+    direction: str
+    segments: List[Tuple[Optional[str], SheetContainerAnalysis]] = field(default_factory=list)
+
+    def iter_elements(self, workbook) -> Iterator[Dict[str, Any]]:
+        """出力対象の要素値を、生成名の経路の連番と同じ順に返す。"""
+        for sheet_name, analysis in self.segments:
+            for values in iter_dynamic_element_rows(
+                analysis.current_positions,
+                analysis.element_count,
+                self.direction,
+                analysis.eff_increment,
+                workbook,
+                sheet_name=sheet_name,
+                step_override=analysis.step_override,
+                force_emit_all=bool(analysis.range_count),
+            ):
+                stats().cells_generated += len(values)
+                yield values
+
+
+class ElementStreams(dict):
+    """逐次挿入するコンテナ（コンテナ名 → ElementStream）。accepts は配列名毎の可否（変換ルールの対象外か）。"""
+
+    def __init__(self, accepts: Callable[[str], bool]):
+        super().__init__()
+        self.accepts = accepts
+
+
+def element_streams_for(
+    *,
+    containers: Optional[Dict[str, Any]],
+    schema: Optional[Dict[str, Any]],
+    array_transform_rules: Optional[Mapping[str, Any]],
+    global_max_elements: Optional[int],
+) -> Optional[ElementStreams]:
+    """パースで逐次挿入を使う場合に空の ElementStreams を返す。
+
+    生成名の経路が必要な場合は None:
+    - コンテナ未指定（自動推論のみ。ポストパースで生成名から配列を再構築する）
+    - スキーマ指定（エントリ毎にスキーマでキーを解決する）
+    - 先頭セグメントがワイルドカードの変換ルール（先頭が配列名の変換ルールはその配列のみ対象外）
+    - 全体上限（--max-elements。要素数が上限で抑えられるため生成名でも小さい）
+    """
+    if containers is None or schema is not None:
+        return None
+    if isinstance(global_max_elements, int) and global_max_elements > 0:
+        return None
+    rule_roots: set[str] = set()
+    for rule_key in array_transform_rules or {}:
+        head = rule_key.split(".", 1)[0]
+        if not head or "*" in head:
+            return None
+        rule_roots.add(head)
+    return ElementStreams(lambda array_name: array_name not in rule_roots)
+
+
+@contextmanager
+def element_streaming(streams: Optional[ElementStreams]) -> Iterator[Optional[ElementStreams]]:
+    """区間中、コンテナの出力段（generate_cell_names_from_containers / replay_container_series）が対象コンテナを streams へ登録する。"""
+    ctx = get_current_context()
+    previous = ctx.element_streams
+    ctx.element_streams = streams
+    try:
+        yield streams
+    finally:
+        ctx.element_streams = previous
+
+
+def register_element_streams(containers: Mapping[str, Any], workbook, *, prefix: str) -> None:
+    """逐次挿入の区間中であれば、対象コンテナを ElementStream として登録する（出力段はセル名を生成しなくなる）。"""
+    streams = get_current_context().element_streams
+    if streams is None:
+        return
+    for container_name, container_def in containers.items():
+        array_name = element_stream_array(container_name, containers, workbook, prefix=prefix)
+        if array_name is not None and streams.accepts(array_name):
+            streams[container_name] = ElementStream(
+                container=container_name, array=array_name, direction=(container_def or {}).get("direction", "row")
+            )
+
+
+def _element_stream_for(container_name: str) -> Optional[ElementStream]:
+    streams = get_current_context().element_streams
+    return streams.get(container_name) if streams else None
+
+
+def element_stream_array(container_name: str, containers: Mapping[str, Any], workbook, *, prefix: str) -> Optional[str]:
+    """コンテナの要素を逐次挿入できる場合、その配列名を返す。
+
+    対象は json.<array> / json.<array>.1 のコンテナで、次をすべて満たすもの（名前表から決まる
+    派生情報が要素の生成名の有無で変わらず、要素がフィールド毎の単純な挿入となる形）:
+    - 配列配下に他のコンテナが無い
+    - 配列配下の定義名が json.<array>.1 と、要素1の単一セルのフィールドアンカー（json.<array>.1.<field>）のみ
+    """
+    parts = container_name.split(".")
+    if parts[0] != prefix or len(parts) not in (2, 3) or not parts[1] or parts[1].isdigit():
+        return None
+    if len(parts) == 3 and not parts[2].isdigit():
+        return None
+    array_path = f"{prefix}.{parts[1]}"
+    for other in containers:
+        if other != container_name and (other == array_path or other.startswith(array_path + ".")):
+            return None
+    name_index = defined_name_index(workbook)
+    if name_index is not None:
+        names = list(name_index.iter_descendants(array_path, NAME_KIND_DEFINED))
+    else:
+        names = [nm for nm in workbook.defined_names if nm.startswith(array_path + ".")]
+    anchors = 0
+    for name in names:
+        tail = name[len(array_path) + 1 :].split(".")
+        if tail == ["1"]:
+            continue
+        if len(tail) != 2 or tail[0] != "1" or not tail[1] or tail[1].isdigit():
+            return None
+        destinations = list(iter_defined_name_destinations_all(name, workbook))
+        if len(destinations) != 1 or ":" in str(destinations[0][1]):
+            return None
+        anchors += 1
+    return parts[1] if anchors else None
+
+
+class StreamedElements:
+    """1回のパースで ElementStream の要素を読み進める状態。
+
+    生成名の経路と同じ配置となるよう、要素1の値は定義名アンカー（json.<array>.1.<field>）の
+    エントリで挿入し、残り（アンカーの無いフィールドと要素2以降）はエントリ走査の後に
+    要素順・フィールド名順で挿入する（生成名は読取順の末尾に名前順で並ぶため）。
+    """
+
+    def __init__(self, stream: ElementStream, workbook):
+        self.stream = stream
+        self._elements = stream.iter_elements(workbook)
+        self._first: Optional[Dict[str, Any]] = None
+        self._started = False
+        self._anchored: set[str] = set()
+
+    def first(self) -> Optional[Dict[str, Any]]:
+        """要素1の値（出力する要素が無ければ None）。"""
+        if not self._started:
+            self._started = True
+            self._first = next(self._elements, None)
+        return self._first
+
+    def claims(self, path_keys: List[str]) -> bool:
+        """エントリ（json.<array>.1 または json.<array>.1.<field>）を要素1が受け持つか。
+
+        受け持つ場合、json.<array>.1 自体は挿入せず、フィールドは要素1の値で挿入する。
+        要素が無い場合やアンカーのフィールドを読み取らない場合は通常どおり定義名の値を使う。
+        """
+        if len(path_keys) not in (2, 3) or path_keys[1] != "1":
+            return False
+        first = self.first()
+        if first is None:
+            return False
+        if len(path_keys) == 2:
+            return True
+        if path_keys[2] not in first:
+            return False
+        self._anchored.add(path_keys[2])
+        return True
+
+    def insert_remaining(self, root_result: Dict[str, Any], *, state: Dict[str, Any], safe_insert) -> int:
+        """アンカーで未挿入の要素1のフィールドと要素2以降を挿入し、出力した要素数を返す。"""
+        first = self.first()
+        if first is None:
+            return 0
+        self._insert(
+            root_result, 1, {fn: v for fn, v in first.items() if fn not in self._anchored}, state, safe_insert
+        )
+        count = 1
+        for count, values in enumerate(self._elements, start=2):
+            self._insert(root_result, count, values, state, safe_insert)
+        return count
+
+    def _insert(
+        self, root_result: Dict[str, Any], index: int, values: Dict[str, Any], state: Dict[str, Any], safe_insert
+    ) -> None:
+        # process_array_path_entry の 1 次元配列（array.i.field）の経路と同じ手順
+        if not values:
+            return
+        array_name = self.stream.array
+        element = ensure_array_and_element(root_result, array_name, index - 1)
+        if not isinstance(element, dict):
+            element = root_result[array_name][index - 1] = {}
+        for field_name in sorted(values):
+            value = values[field_name]
+            if value is None or DataCleaner.is_empty_value(value):
+                value = ""
+            if field_name in state["group_labels"] and suppress_label_terminal_if_applicable(
+                remaining_keys=[field_name],
+                original_path_keys=[array_name, str(index), field_name],
+                group_labels=state["group_labels"],
+                normalized_prefix=state["normalized_prefix"],
+                all_name_keys=state["all_name_keys"],
+                container_parent_names=state["container_parent_names"],
+                name_index=state.get("name_index"),
+            ):
+                continue
+            safe_insert(element, [field_name], value, field_name, self.stream.container, [field_name], [field_name])
+
+
 def get_sheet_from_defined_name(cell_name, workbook):
     """定義名から最初のシート名を取得（存在しない場合はNone）"""
     for sheet_name, _coord in iter_defined_name_destinations_all(cell_name, workbook):
@@ -9619,30 +14113,168 @@ def read_cell_value(position, worksheet):
         return ""
 
 
+LABEL_SCAN_CHUNK = 256
+
+
+def _is_blank_value(value: Any) -> bool:
+    return value is None or value == ""
+
+
+def count_label_series(
+    worksheet,
+    label_positions: Sequence[Tuple[int, int]],
+    direction: str,
+    increment: int,
+    *,
+    is_empty: Callable[[Any], bool] = _is_blank_value,
+    limit: Optional[int] = None,
+) -> int:
+    """ラベル位置 (col,row) から increment 間隔で進み、いずれかのラベルが空になる直前までの件数を返す。
+
+    件数に上限はない（使用範囲外は空のため必ず停止する）。limit（正の整数）を指定した場合は
+    limit 件に達した時点で走査を打ち切る（--max-elements の早期停止）。セル保持辞書を持つシートでは
+    ラベル列（行）をチャンク単位で取り出して最初の空位置を探し、要素×ラベルの逐次読取
+    （read_cell_value）と同じ件数・統計を返す。increment <= 0 は非繰り返しとして高々1件。
+    """
+    if not label_positions:
+        return 0
+    if increment <= 0:
+        values = [read_cell_value(pos, worksheet) for pos in label_positions]
+        return 0 if any(is_empty(v) for v in values) else 1
+    if not (isinstance(limit, int) and limit > 0):
+        limit = None
+    cells = getattr(worksheet, "_cells", None)
+    if not isinstance(cells, dict):
+        count = 0
+        while limit is None or count < limit:
+            for base in label_positions:
+                v = read_cell_value(calculate_target_position(base, direction, count + 1, increment), worksheet)
+                if is_empty(v):
+                    return count
+            count += 1
+        return count
+
+    get = cells.get
+    by_row = direction == "row"
+    start = 1
+    while True:
+        stop = start + LABEL_SCAN_CHUNK
+        if limit is not None:
+            stop = min(stop, limit + 1)
+        # (最初に空となる要素番号, ラベル順位, 値, 位置)。同一要素番号では先のラベルが優先
+        first_empty: Optional[Tuple[int, int, Any, Tuple[int, int]]] = None
+        for j, (c0, r0) in enumerate(label_positions):
+            end = first_empty[0] if first_empty is not None else stop
+            for idx in range(start, end):
+                if by_row:
+                    c, r = c0, r0 + (idx - 1) * increment
+                else:
+                    c, r = c0 + (idx - 1) * increment, r0
+                cell = get((r, c))
+                v = cell.value if cell is not None else None
+                if v is None:
+                    v = ""
+                if is_empty(v):
+                    first_empty = (idx, j, v, (c, r))
+                    break
+        if first_empty is None:
+            if limit is not None and stop > limit:
+                stats().cells_read += limit * len(label_positions)
+                return limit
+            start = stop
+            continue
+        idx, j, v, (c, r) = first_empty
+        count = idx - 1
+        st = stats()
+        st.cells_read += count * len(label_positions) + j + 1
+        if v == "":
+            st.empty_cells_skipped += 1
+        # 逐次読取と同様、使用範囲外の終端読取ではシート寸法を拡張する
+        if r > worksheet.max_row or c > worksheet.max_column:
+            try:
+                worksheet.cell(row=r, column=c)
+            except Exception:
+                logger.debug("failed to touch terminal cell (%s,%s)", r, c, exc_info=True)
+        return count
+
+
+class CellBlock:
+    """矩形範囲（指定列のみ）のセル値を一括で取り出して保持する読取ブロック。
+
+    セル保持辞書（openpyxl / SparseWorksheet の `_cells`）から直接値を取り出し、
+    `worksheet.cell()` の呼出しとセル生成を行単位の走査から排除する。
+    値と統計（cells_read / empty_cells_skipped）の規則は read_cell_value と同一で、
+    ブロック外の位置は read_cell_value へ委譲する。
+    """
+
+    __slots__ = ("worksheet", "top", "bottom", "_cols", "_max_row", "_max_col")
+
+    def __init__(self, worksheet, top: int, bottom: int, columns: Iterable[int]):
+        self.worksheet = worksheet
+        self.top = top
+        self.bottom = bottom
+        cells = worksheet._cells
+        get = cells.get
+        self._cols: Dict[int, List[Any]] = {}
+        for c in set(columns):
+            col_vals: List[Any] = []
+            for r in range(top, bottom + 1):
+                cell = get((r, c))
+                col_vals.append(cell.value if cell is not None else None)
+            self._cols[c] = col_vals
+        # 使用範囲外の読取では cell() と同様に寸法を拡張する
+        self._max_row = worksheet.max_row
+        self._max_col = worksheet.max_column
+
+    @classmethod
+    def for_rows(cls, worksheet, top: int, bottom: int, columns: Iterable[int]) -> Optional["CellBlock"]:
+        """セル保持辞書を持つシートのみブロック化する（読取専用シート等は None）。"""
+        if bottom < top or not isinstance(getattr(worksheet, "_cells", None), dict):
+            return None
+        try:
+            return cls(worksheet, top, bottom, columns)
+        except Exception as e:
+            logger.debug("cell block prefetch skipped: %s", e)
+            return None
+
+    def read_values(self, positions: Iterable[Tuple[int, int]]) -> List[Any]:
+        """位置列 (col,row) の値を read_cell_value と同じ規則で返す（統計はまとめて加算）。"""
+        out: List[Any] = []
+        n_read = 0
+        n_empty = 0
+        top = self.top
+        for col, row in positions:
+            col_vals = self._cols.get(col)
+            if col_vals is None or row < top or row > self.bottom:
+                out.append(read_cell_value((col, row), self.worksheet))
+                continue
+            if row > self._max_row or col > self._max_col:
+                self.worksheet.cell(row=row, column=col)
+                self._max_row = max(self._max_row, row)
+                self._max_col = max(self._max_col, col)
+            val = col_vals[row - top]
+            if val is None:
+                val = ""
+            n_read += 1
+            if val == "":
+                n_empty += 1
+            out.append(val)
+        if n_read:
+            st = stats()
+            st.cells_read += n_read
+            st.empty_cells_skipped += n_empty
+        return out
+
+
 def detect_card_count(base_positions, direction, increment, labels, worksheet):
     """カード数を検出"""
-    # 簡易実装：最初のアイテムの位置からincrement間隔でラベル確認
-    max_cards = 10  # 最大検索数
-    card_count = 0
-
+    # 最初のアイテムの位置から increment 間隔で、値がある（真値の）間をカードとして数える（上限なし）
     if not base_positions:
         return 0
 
     first_item = list(base_positions.keys())[0]
     base_position = base_positions[first_item]
-
-    for card_idx in range(1, max_cards + 1):
-        target_position = calculate_target_position(
-            base_position, direction, card_idx, increment
-        )
-        cell_value = read_cell_value(target_position, worksheet)
-
-        if cell_value:  # 値がある場合はカードが存在
-            card_count = card_idx
-        else:
-            break  # 空の場合は終了
-
-    return card_count
+    return count_label_series(worksheet, [base_position], direction, increment, is_empty=lambda v: not v)
 
 
 # =============================================================================
@@ -9660,6 +14292,8 @@ def main():
     try:
         config = create_config_from_args(args)
         converter = Xlsx2JsonConverter(config)
+        if config.compile_template:
+            return converter.compile_template(config.input_files, config.compile_template)
         return converter.process_files(config.input_files)
     except (ConfigurationError, FileProcessingError) as e:
         logger.error(f"エラー: {e}")
@@ -9710,6 +14344,69 @@ def create_argument_parser() -> argparse.ArgumentParser:
         type=int,
         help="全コンテナに共通で適用する要素数の上限（1以上の整数）。未指定時は無制限",
     )
+    parser.add_argument(
+        "--load-mode",
+        choices=list(LOAD_MODES),
+        default=None,
+        help="ワークブック読込モード（full: 全セル構築 / sparse: 定義名・コンテナの参照範囲のみ構築）。未指定時は full",
+    )
+    parser.add_argument(
+        "--reader",
+        choices=list(READERS),
+        default=None,
+        help="読込バックエンド（openpyxl: 参照実装 / ooxml: XML を直接解析して高速化）。未指定時は openpyxl",
+    )
+    parser.add_argument(
+        "--rect-scan-budget",
+        type=int,
+        default=None,
+        help="罫線矩形検出の探索予算（候補判定回数の上限）。未指定または 0 で無制限",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="並列変換のワーカープロセス数（1以上の整数）。未指定時は 1（逐次処理）",
+    )
+    parser.add_argument(
+        "--sheet-jobs",
+        type=int,
+        default=None,
+        help="コンテナのシート単位解析を並列化するワーカープロセス数（1以上の整数、fork 環境のみ）。未指定時は 1",
+    )
+    parser.add_argument(
+        "--container-jobs",
+        type=int,
+        default=None,
+        help="ルート名の異なるコンテナ部分木を並列処理するワーカープロセス数（1以上の整数、fork 環境のみ）。未指定時は 1",
+    )
+    parser.add_argument(
+        "--compile-template",
+        type=Path,
+        default=None,
+        metavar="PLAN",
+        help="先頭の入力ブックをテンプレートとして解析し、抽出プランを PLAN（JSON）に保存して終了",
+    )
+    parser.add_argument(
+        "--plan",
+        type=Path,
+        default=None,
+        help="--compile-template で保存した抽出プラン。定義名/罫線が一致するブックでは構造解析を省略",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="変換結果キャッシュのディレクトリ。入力内容と実効設定が前回と同じファイルは再変換しない",
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="変換結果キャッシュを参照せずに全ファイルを変換する"
+    )
+    parser.add_argument(
+        "--cache-prune",
+        action="store_true",
+        help="変換結果キャッシュから入力/出力が存在しない、または設定が異なる古いエントリを削除する",
+    )
     parser.add_argument(
         "--log-format",
         help="ログフォーマット（例: '%(asctime)s.%(msecs)03d %(levelname)s: %(message)s'。未指定時は日時付き標準フォーマット）",
@@ -9777,6 +14474,28 @@ def _apply_cli_overrides_to_config(args, cfg: Dict[str, Any]) -> Dict[str, Any]:
         cfg["output-format"] = args.output_format
     if args.max_elements is not None:
         cfg["max-elements"] = args.max_elements
+    if args.load_mode:
+        cfg["load-mode"] = args.load_mode
+    if args.reader:
+        cfg["reader"] = args.reader
+    if args.rect_scan_budget is not None:
+        cfg["rect-scan-budget"] = args.rect_scan_budget
+    if args.jobs is not None:
+        cfg["jobs"] = args.jobs
+    if args.sheet_jobs is not None:
+        cfg["sheet-jobs"] = args.sheet_jobs
+    if args.container_jobs is not None:
+        cfg["container-jobs"] = args.container_jobs
+    if args.compile_template:
+        cfg["compile-template"] = args.compile_template
+    if args.plan:
+        cfg["plan"] = args.plan
+    if args.cache_dir:
+        cfg["cache-dir"] = args.cache_dir
+    if args.force:
+        cfg["force"] = True
+    if args.cache_prune:
+        cfg["cache-prune"] = True
     if args.log_format:
         cfg["log-format"] = args.log_format
     if args.log_datefmt:
@@ -9822,9 +14541,62 @@ def _build_processing_config_from_config(cfg: Dict[str, Any], schema_obj) -> Pro
         transform_rules=cfg.get("transform", []),
         max_elements=(int(str(cfg.get("max-elements"))) if cfg.get("max-elements") not in (None, "") else None),
         log_format=(str(cfg.get("log-format")) if cfg.get("log-format") not in (None, "") else None),
+        load_mode=_resolve_load_mode(cfg.get("load-mode")),
+        reader=_resolve_reader(cfg.get("reader")),
+        rect_scan_budget=_resolve_rect_scan_budget(cfg.get("rect-scan-budget")),
+        jobs=_resolve_jobs(cfg.get("jobs")),
+        sheet_jobs=_resolve_jobs(cfg.get("sheet-jobs"), key="sheet-jobs"),
+        container_jobs=_resolve_jobs(cfg.get("container-jobs"), key="container-jobs"),
+        plan=(Path(cfg["plan"]) if cfg.get("plan") else None),
+        compile_template=(Path(cfg["compile-template"]) if cfg.get("compile-template") else None),
+        cache_dir=(Path(cfg["cache-dir"]) if cfg.get("cache-dir") else None),
+        force=bool(cfg.get("force", False)),
+        cache_prune=bool(cfg.get("cache-prune", False)),
     )
 
 
+def _resolve_load_mode(raw: Any) -> str:
+    if raw in (None, ""):
+        return "full"
+    mode = str(raw).lower()
+    if mode not in LOAD_MODES:
+        raise ConfigurationError(f"load-mode は {'/'.join(LOAD_MODES)} のいずれかである必要があります: {raw}")
+    return mode
+
+
+def _resolve_reader(raw: Any) -> str:
+    if raw in (None, ""):
+        return "openpyxl"
+    name = str(raw).lower()
+    if name not in READERS:
+        raise ConfigurationError(f"reader は {'/'.join(READERS)} のいずれかである必要があります: {raw}")
+    return name
+
+
+def _resolve_jobs(raw: Any, key: str = "jobs") -> int:
+    if raw in (None, ""):
+        return 1
+    try:
+        jobs = int(str(raw))
+    except ValueError:
+        raise ConfigurationError(f"{key} は1以上の整数である必要があります: {raw}")
+    if jobs < 1:
+        raise ConfigurationError(f"{key} は1以上の整数である必要があります: {raw}")
+    return jobs
+
+
+def _resolve_rect_scan_budget(raw: Any) -> int:
+    if raw in (None, ""):
+        return RECT_SCAN_BUDGET_DEFAULT
+    try:
+        budget = int(str(raw))
+    except ValueError:
+        raise ConfigurationError(f"rect-scan-budget は0以上の整数である必要があります: {raw}")
+    if budget < 0:
+        raise ConfigurationError(f"rect-scan-budget は0以上の整数である必要があります: {raw}")
+    return budget
+
+
 # =============================================================================
 # Wildcard and 2D Array Transform Extensions
 # =============================================================================
@@ -9847,53 +14619,175 @@ def apply_wildcard_transforms(
     if not transform_rules:
         return data
 
-    # ヘルパー関数はモジュールレベル版を利用
-
-    # 各変換ルールを適用
+    pending: List[tuple[str, List[ArrayTransformRule], List[ArrayTransformRule]]] = []
     for pattern, rule_list in transform_rules.items():
         # 非ワイルドカードかつ split のみのルールは既に挿入時点で適用済みのため二重適用をスキップ
         if "*" not in pattern:
-            if all(r.transform_type == "split" for r in rule_list):
-                continue
             # split と他種が混在する場合: split は先に適用済みとみなし除外し、残りのみ適用
-            if any(r.transform_type == "split" for r in rule_list):
-                filtered = [r for r in rule_list if r.transform_type != "split"]
-            else:
-                filtered = rule_list
-            effective_rules = filtered
+            effective_rules = [r for r in rule_list if r.transform_type != "split"]
         else:
             effective_rules = rule_list
-
-        if not effective_rules:
+        if effective_rules:
+            pending.append((pattern, rule_list, effective_rules))
+
+    # 全パターンを1回の走査でマッチし、記載順に適用する。構造（dict/list）を変えた変換の後は、
+    # 置換したノードより深い位置に届く後続パターンだけを走査し直す（記載順の逐次適用と同一の結果）
+    patterns = [[seg for seg in pattern.split(".") if seg] for pattern, _, _ in pending]
+    all_matches = PatternTrie.compile([pattern for pattern, _, _ in pending]).match_all(data, len(pending))
+    for i, (_pattern, rule_list, effective_rules) in enumerate(pending):
+        replaced = _apply_rules_to_matches(data, all_matches[i], rule_list, effective_rules)
+        if not replaced:
             continue
+        stale = [k for k in range(i + 1, len(pending)) if _pattern_reaches_below(patterns[k], replaced)]
+        if stale:
+            refreshed = PatternTrie.compile([pending[k][0] for k in stale]).match_all(data, len(stale))
+            for k, matches in zip(stale, refreshed):
+                all_matches[k] = matches
 
-        # ワイルドカード有無に関わらず find_matching_paths で探索（'*' 無しは完全一致）
-        matching_paths = find_matching_paths(data, pattern)
-        for path in matching_paths:
-            original_value = get_nested_value(data, path)
-            if original_value is None:
-                continue
+    return data
+
+
+def _pattern_reaches_below(pattern: List[str], paths: List[tuple[str, ...]]) -> bool:
+    """パターン（セグメント列）が paths のいずれかより深い位置（その部分木の中）にマッチし得るか。
+
+    置換ノード自身やその祖先へのマッチは親コンテナ経由で適用時に値を読むため影響を受けない。
+    """
+    for path in paths:
+        if len(pattern) > len(path) and all(_segment_match(ps, ap) for ps, ap in zip(pattern, path)):
+            return True
+    return False
+
+
+def _apply_rules_to_matches(
+    data: dict,
+    matches: List[tuple[tuple[str, ...], Any, Any]],
+    rule_list: List[ArrayTransformRule],
+    effective_rules: List[ArrayTransformRule],
+) -> List[tuple[str, ...]]:
+    """1パターンのマッチ（前順）へルールを適用し、構造（dict/list）が関わる置換をしたパスを返す。
+
+    置換は親コンテナの参照で行う。同一パターンのマッチは同じ深さのため互いに祖先にならない。
+    ルールに parallel 指定、または batch_function がある場合は全マッチの値をまとめて変換し、
+    結果をマッチ順に書き戻す。
+    """
+    executor = TransformExecutor.for_rules(effective_rules)
+    has_batch = any(getattr(r, "transform_type", None) == "batch_function" for r in effective_rules)
+    if has_batch or (executor.max_workers > 1 and len(matches) > 1):
+        return _apply_rules_to_matches_as_jobs(executor, matches, rule_list, effective_rules)
+    replaced: List[tuple[str, ...]] = []
+    for path, parent, key in matches:
+        original_value = parent[key]
+        if original_value is None:
+            continue
+        try:
+            new_value = run_transform_chain(effective_rules, original_value)
+            # 契約: 辞書戻り値はキー展開せず、そのまま対象ノードを置換する
+            parent[key] = new_value
+            if isinstance(original_value, (dict, list)) or isinstance(new_value, (dict, list)):
+                replaced.append(path)
+        except Exception as e:
+            logger.error(
+                "ワイルドカード変換エラー: パス=%s, ルール=%s, エラー=%s", ".".join(path), rule_list, e
+            )
+    return replaced
+
+
+def _apply_rules_to_matches_as_jobs(
+    executor: TransformExecutor,
+    matches: List[tuple[tuple[str, ...], Any, Any]],
+    rule_list: List[ArrayTransformRule],
+    effective_rules: List[ArrayTransformRule],
+) -> List[tuple[str, ...]]:
+    """_apply_rules_to_matches の一括版（並列実行・batch_function）。
+
+    同一パターンのマッチは同じ深さのため互いに祖先にならず、変換前に全値を集めても
+    逐次適用と同じ入力になる。ルール列は batch_function を境に区切り、通常ルールの区間は
+    値毎のジョブとして executor で、batch_function は全マッチの値で1回呼ぶ。
+    書き戻しはマッチ（前順）の順で行い、失敗したマッチは元の値のまま残す。
+    batch_function の失敗はパターン単位で1回だけ記録する（値毎のジョブの失敗はパス毎）。
+    """
+    targets = [(path, parent, key) for path, parent, key in matches if parent[key] is not None]
+    originals = [parent[key] for _path, parent, key in targets]
+    values = list(originals)
+    errors: List[Optional[Exception]] = [None] * len(targets)
+    batch_failed: set[int] = set()
+    for batch_rule, chain in _split_rules_at_batches(effective_rules):
+        live = [i for i, err in enumerate(errors) if err is None]
+        if not live:
+            break
+        if batch_rule is not None:
             try:
-                new_value = original_value
-                for rule in effective_rules:
-                    if is_json_list(new_value) and all(is_json_dict(e) for e in new_value):
-                        transformed_elements = [rule.transform(elem) for elem in new_value]
-                        new_value = transformed_elements
-                    else:
-                        new_value = rule.transform(new_value)
-                if isinstance(new_value, dict):
-                    # 契約: 辞書戻り値はキー展開せず、そのまま対象ノードを置換する
-                    set_nested_value(data, path, new_value)
-                elif is_json_list(new_value):
-                    set_nested_value(data, path, new_value)
-                else:
-                    set_nested_value(data, path, new_value)
+                results = _transform_batch_values(batch_rule, [values[i] for i in live])
             except Exception as e:
                 logger.error(
-                    "ワイルドカード変換エラー: パス=%s, ルール=%s, エラー=%s", path, rule_list, e
+                    "バッチ変換エラー: パターン=%s, ルール=%s, マッチ数=%d, エラー=%s",
+                    batch_rule.path,
+                    batch_rule,
+                    len(live),
+                    e,
                 )
+                for i in live:
+                    errors[i] = e
+                batch_failed.update(live)
+                continue
+            for i, new_value in zip(live, results):
+                values[i] = new_value
+            continue
+        outcomes = executor.map(functools.partial(_transform_job, chain), [values[i] for i in live])
+        for i, (ok, new_value) in zip(live, outcomes):
+            if ok:
+                values[i] = new_value
+            else:
+                errors[i] = new_value
+    replaced: List[tuple[str, ...]] = []
+    for i, ((path, parent, key), original_value, new_value, err) in enumerate(zip(targets, originals, values, errors)):
+        if err is not None:
+            if i not in batch_failed:
+                logger.error("ワイルドカード変換エラー: パス=%s, ルール=%s, エラー=%s", ".".join(path), rule_list, err)
+            continue
+        parent[key] = new_value
+        if isinstance(original_value, (dict, list)) or isinstance(new_value, (dict, list)):
+            replaced.append(path)
+    return replaced
 
-    return data
+
+def _split_rules_at_batches(
+    rules: List[ArrayTransformRule],
+) -> List[tuple[Optional[ArrayTransformRule], List[ArrayTransformRule]]]:
+    """ルール列を (batch_function ルール, []) と (None, 連続する通常ルール) の区間に分ける。"""
+    segments: List[tuple[Optional[ArrayTransformRule], List[ArrayTransformRule]]] = []
+    for rule in rules:
+        if getattr(rule, "transform_type", None) == "batch_function":
+            segments.append((rule, []))
+        elif segments and segments[-1][0] is None:
+            segments[-1][1].append(rule)
+        else:
+            segments.append((None, [rule]))
+    return segments
+
+
+def _transform_batch_values(rule: ArrayTransformRule, values: List[Any]) -> List[Any]:
+    """batch_function を値のリストへ1回適用する（dict 要素のみのリストは要素をバッチへ展開して戻す）。"""
+    flat: List[Any] = []
+    sizes: List[Optional[int]] = []
+    for value in values:
+        if is_json_list(value) and all(is_json_dict(e) for e in value):
+            sizes.append(len(value))
+            flat.extend(value)
+        else:
+            sizes.append(None)
+            flat.append(value)
+    results = rule.transform_batch(flat) if flat else []
+    out: List[Any] = []
+    pos = 0
+    for size in sizes:
+        if size is None:
+            out.append(results[pos])
+            pos += 1
+        else:
+            out.append(results[pos : pos + size])
+            pos += size
+    return out
 
 # 一般化名称（後方互換のためエイリアス）: 非ワイルドカードも含めたパターン変換適用
 apply_pattern_transforms = apply_wildcard_transforms